@@ -13,21 +13,7 @@ from PySide6.QtCore import Qt, QThread, Signal
 from pymodbus.client.serial import ModbusSerialClient
 from PySide6.QtGui import QFont
 
-
-# ============================
-# CRC
-# ============================
-def count_crc(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc >>= 1
-                crc ^= 0xA001
-            else:
-                crc >>= 1
-    return crc & 0xFFFF
+from modbus_rtu import check_crc, count_crc
 
 
 # ============================
@@ -91,7 +77,10 @@ class PollWorker(QThread):
         self.log_frame("TX", frame)
         rx = self.master.send_raw(frame)
         if rx:
-            self.log_frame("RX", rx)
+            ok = check_crc(rx)
+            self.log_frame("RX" if ok else "RX CRC ERR", rx)
+            if not ok:
+                return b""
         return rx
 
     def read_uint16(self, addr):
@@ -150,11 +139,9 @@ class PollWorker(QThread):
         crc = count_crc(frame)
         frame += struct.pack("<H", crc)
 
-        self.log_frame("TX", frame)
-        rx = self.master.send_raw(frame)
+        rx = self.send_and_recv(frame)
         if not rx:
             return
-        self.log_frame("RX", rx)
 
         if len(rx) >= 3 + 6 * 2 + 2:
             data = rx[3:3 + 12]
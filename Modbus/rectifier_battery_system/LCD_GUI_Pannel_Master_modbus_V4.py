@@ -1,42 +1,43 @@
 import sys
-import struct
 import serial
 import serial.tools.list_ports
 import datetime
 import csv
+import time
 from PySide6.QtWidgets import QSizePolicy, QFileDialog  # QFileDialog 추가
 
 from PySide6.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
-    QComboBox, QTextEdit, QMessageBox, QSplitter, QCheckBox
+    QComboBox, QTextEdit, QMessageBox, QSplitter, QCheckBox, QLineEdit,
+    QTableWidget, QTableWidgetItem, QHeaderView
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QThread, Signal, QObject
 from pymodbus.client.serial import ModbusSerialClient
 from PySide6.QtGui import QFont
 
-
-# ============================
-# CRC
-# ============================
-def count_crc(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc >>= 1
-                crc ^= 0xA001
-            else:
-                crc >>= 1
-    return crc & 0xFFFF
+from modbus_bus import BusScheduler, parse_slave_ids
+from modbus_plan import ReadPlan
+from modbus_regmap import ABNORMAL_STATUS, ALARM_ITEMS, MODULE_COUNT, MODULE_STRIDE, points, points_all
+from modbus_rtu import ModbusError, ModbusExceptionResponse, RtuSerialTransport, build_read_frame
+from modbus_tcp import is_tcp_target, open_transport
 
 
 # ============================
 # Modbus Master (Raw frame)
 # ============================
 class ModbusMaster:
+    """port : "COM3" (RTU serial) / "tcp://host:502" (Modbus TCP) / "rtu+tcp://host:4001" (gateway)"""
+
     def __init__(self, port, baudrate=9600, slave_id=33):
+        self.port = port
         self.slave_id = slave_id
+        self.baudrate = baudrate
+        self.link = None
+        self.last_error = ""
+        self.last_answered = False    # 예외 응답도 slave 가 살아 있다는 뜻
+        self.client = None
+        if is_tcp_target(port):
+            return
         self.client = ModbusSerialClient(
             port=port,
             baudrate=baudrate,
@@ -47,15 +48,104 @@ class ModbusMaster:
         )
 
     def connect(self):
-        return self.client.connect()
+        if self.client is None:
+            # TCP transport 는 직접 socket 연결
+            try:
+                self.link = open_transport(self.port, self.baudrate)
+            except (OSError, ValueError) as e:
+                self.last_error = str(e)
+                return False
+            return True
+
+        if not self.client.connect():
+            return False
+        # 포트 열기만 pymodbus 에 맡기고 송수신은 RTU framer 로 (응답 길이만큼 읽기 + 검증)
+        self.link = RtuSerialTransport(self.client.socket, self.baudrate)
+        return True
 
     def close(self):
-        self.client.close()
+        if self.client is not None:
+            self.client.close()
+        elif self.link is not None:
+            self.link.close()
+        self.link = None
 
     def send_raw(self, frame: bytes) -> bytes:
-        # pymodbus 3.x: send/recv 사용 권장[web:12][web:15]
-        self.client.send(frame)
-        return self.client.recv(256)
+        """요청 frame → 검증된 응답 frame (timeout / 예외 응답이면 b"" 와 last_error)"""
+        self.last_error = ""
+        self.last_answered = False
+        if self.link is None:
+            self.last_error = "not connected"
+            return b""
+        try:
+            rx = self.link.transact(frame)
+            self.last_answered = True
+            return rx
+        except ModbusExceptionResponse as e:
+            self.last_error = str(e)
+            self.last_answered = True
+            return b""
+        except ModbusError as e:
+            self.last_error = str(e)
+            return b""
+
+    def send_many(self, frames):
+        """요청 frame 여러 개 → [응답 frame 또는 ModbusError]
+
+        Modbus TCP 는 한꺼번에 보내고 (pipelining), serial / gateway 는 차례대로.
+        """
+        if self.link is None:
+            return [ModbusError("not connected")] * len(frames)
+        return self.link.transact_many(frames)
+
+
+# ============================
+# 읽기 계획 (레지스터 목록)
+# ============================
+# 주소 / 형식 / 배율은 modbus_regmap (모든 GUI 공용 표)
+
+# 읽기 그룹별 주기 (BusScheduler)
+#   (그룹, 주기 [s] (None = 연결 후 한 번), 우선순위 (작을수록 먼저), PollWorker 메서드)
+# 9600 bps 에서는 bus 가 병목이라 자주 바뀌는 값만 자주 읽는다.
+POLL_SCHEDULE = [
+    ("device_info", None, 0, "poll_device_info"),
+    ("barcode", None, 0, "poll_barcode"),
+    ("cells", 1.0, 1, "poll_battery"),
+    ("alarms", 2.0, 2, "poll_alarm"),
+    ("rtc", 10.0, 3, "poll_time"),
+]
+
+
+def device_info_points():
+    return points("device_info")
+
+
+def barcode_point(n: int):
+    return points("barcode", n)[0]
+
+
+def battery_points(n: int):
+    """모듈 N 화면에 필요한 레지스터 (barcode 는 barcode_point 로 따로, 연결 후 한 번)"""
+    return points("battery") + points("module", n)
+
+
+def alarm_points():
+    """Battery Missing + 모듈 1~10 Abnormal + 모듈별 알람"""
+    return points_all("alarm")
+
+
+# 전체 포트 요약 표 : (result 항목, 열 제목)
+OVERVIEW_COLUMNS = [
+    ("port", "Port"),
+    ("slave", "Slave"),
+    ("status", "Status"),
+    ("time", "Time"),
+    ("voltage", "Voltage [V]"),
+    ("current", "Current [A]"),
+    ("soc", "SOC [%]"),
+    ("alarms", "Alarms"),
+]
+OVERVIEW_INDEX = {key: i for i, (key, _) in enumerate(OVERVIEW_COLUMNS)}
 
 
 # ============================
@@ -70,239 +160,272 @@ class PollWorker(QThread):
     alarm_count_signal = Signal(int)
     error_signal = Signal(str)        # 에러 메시지
     barcode_signal = Signal(str)
+    device_signal = Signal(str)       # 장치 기본 정보 한 줄
+    bus_signal = Signal(str)          # bus 사용률 / slave 별 상태 한 줄
+    result_signal = Signal(str, int, str, object)   # port, slave, 항목, 값 (전체 포트 요약 화면용)
 
-    def __init__(self, port: str, parent=None):
+    def __init__(self, port: str, slave_ids=(33,), parent=None):
         super().__init__(parent)
         self.port = port
+        self.log_prefix = ""        # 여러 포트 동시 사용 시 로그 앞에 포트 이름
         self.master = None
         self.running = True
         self.selected_n = 1
+        # 한 RS-485 bus 에 묶인 slave 들을 BusScheduler 로 돌아가며 읽음
+        self.slave_ids = list(slave_ids)
+        self.selected_slave = self.slave_ids[0]     # 화면에 표시할 slave
+        self.current_slave = self.slave_ids[0]      # 지금 요청 중인 slave
+        self.bus = None
+        self.answered = False       # 현재 작업에서 slave 응답이 한 번이라도 있었는지
+        self.timed_out = False
+        # 흩어진 레지스터를 FC03 몇 번으로 묶어 읽음 (slave / 모듈별 계획은 처음 읽을 때 생성)
+        self.battery_plans = {}     # (slave, n) → ReadPlan
+        self.alarm_plans = {}       # slave → ReadPlan
+        self.barcodes = {}          # (slave, n) → barcode 문자열
+        # slave 별 마지막 화면 값 (표시 slave 를 바꾸면 바로 다시 보냄)
+        self.views = {slave: {} for slave in self.slave_ids}
 
     def stop(self):
         self.running = False
-        # Modbus timeout을 0.1초로 줄여서 빠르게 빠져나옴
-        if self.master and self.master.client:
-            self.master.client.timeout = 0.1
+        # 응답 대기 시간을 0.1초로 줄여서 빠르게 빠져나옴
+        if self.master and self.master.link:
+            self.master.link.response_timeout = 0.1
 
     # ---------- Raw helpers (GUI의 메서드를 그대로 옮김) ----------
     def build_read_frame(self, start_addr, count):
-        slave = 33
-        function = 0x03
-        frame = struct.pack(">B B H H", slave, function, start_addr, count)
-        crc = count_crc(frame)
-        return frame + struct.pack("<H", crc)
+        return build_read_frame(self.current_slave, start_addr, count)
 
     def send_and_recv(self, frame: bytes):
         self.log_frame("TX", frame)
         rx = self.master.send_raw(frame)
+        if self.master.last_answered:
+            self.answered = True
+        elif self.master.link is not None:
+            self.timed_out = True
         if rx:
             self.log_frame("RX", rx)
+        elif self.master.last_error:
+            self.log_signal.emit(f"{self.log_prefix}[RX ERR] {self.master.last_error}")
         return rx
 
-    def read_uint16(self, addr):
+    def read_block(self, start_addr, count):
+        """FC03 한 번 → 응답 data (실패 / 예외 응답이면 None)"""
         if not self.running:
-            return 0  # 즉시 종료
-    
-        frame = self.build_read_frame(addr, 1)
-        rx = self.send_and_recv(frame)
-        if not rx or len(rx) < 3 + 2 + 2:
-            return 0
-        data = rx[3:5]
-        return struct.unpack(">H", data)[0]
-
-    def read_int16(self, addr):
-        u = self.read_uint16(addr)
-        return struct.unpack(">h", struct.pack(">H", u))[0]
+            return None
+        # 이 작업에서 한 번도 응답 없이 timeout 났으면 나머지 묶음은 보내지 않음
+        if self.timed_out and not self.answered:
+            return None
 
-    def read_uint32(self, addr):
-        frame = self.build_read_frame(addr, 2)
-        rx = self.send_and_recv(frame)
-        if not rx or len(rx) < 3 + 4 + 2:
-            return 0
-        data = rx[3:7]
-        hi, lo = struct.unpack(">2H", data)
-        return (hi << 16) | lo
-
-    def read_int32(self, addr):
-        u32 = self.read_uint32(addr)
-        return struct.unpack(">i", struct.pack(">I", u32))[0]
-
-    def read_string(self, addr, reg_count):
-        frame = self.build_read_frame(addr, reg_count)
+        frame = self.build_read_frame(start_addr, count)
         rx = self.send_and_recv(frame)
-        if not rx or len(rx) < 3 + reg_count * 2 + 2:
-            return ""
-        data = rx[3:3 + reg_count * 2]
-        raw = bytearray()
-        for i in range(0, len(data), 2):
-            raw.append(data[i])
-            raw.append(data[i + 1])
-        try:
-            s = raw.rstrip(b"\x00").decode("ascii", errors="ignore")
-        except Exception:
-            s = ""
-        return s
+        if not rx:
+            return None
+        # slave / function / byte count / CRC 는 RtuFramer 가 확인함 → data 부분만 (복사 없이)
+        return memoryview(rx)[3:3 + count * 2]
+
+    def read_blocks(self, requests):
+        """FC03 여러 번 [(start, count)] → [응답 data 또는 None] (send_many 로 한 번에)"""
+        if not self.running or (self.timed_out and not self.answered):
+            return [None] * len(requests)
+
+        frames = [self.build_read_frame(start, count) for start, count in requests]
+        for frame in frames:
+            self.log_frame("TX", frame)
+
+        regs_list = []
+        for (start, count), result in zip(requests, self.master.send_many(frames)):
+            if isinstance(result, ModbusError):
+                if isinstance(result, ModbusExceptionResponse):
+                    self.answered = True
+                else:
+                    self.timed_out = True
+                self.log_signal.emit(f"{self.log_prefix}[RX ERR] {result}")
+                regs_list.append(None)
+                continue
+            self.answered = True
+            self.log_frame("RX", result)
+            regs_list.append(memoryview(result)[3:3 + count * 2])
+        return regs_list
 
     def log_frame(self, title, data: bytes):
         hexstr = " ".join(f"{b:02X}" for b in data)
-        self.log_signal.emit(f"[{title}] {hexstr}")
+        self.log_signal.emit(f"{self.log_prefix}[{title}] {hexstr}")
+
+    # ---------- slave 별 화면 값 ----------
+    def publish(self, key, value, slave=None):
+        """요약 화면용 값 (port, slave, 항목, 값)"""
+        self.result_signal.emit(self.port, self.current_slave if slave is None else slave, key, value)
+
+    def emit_view(self, key, signal, value):
+        """현재 slave 의 값 저장, 표시 중인 slave 면 signal 로 보냄"""
+        self.views.setdefault(self.current_slave, {})[key] = (signal, value)
+        if self.current_slave == self.selected_slave:
+            signal.emit(value)
+
+    def select_slave(self, slave: int):
+        """표시 slave 변경 (GUI thread 에서 호출) → 저장된 마지막 값을 바로 보냄"""
+        self.selected_slave = slave
+        for signal, value in list(self.views.get(slave, {}).values()):
+            signal.emit(value)
+
+    def run_task(self, fn, slave):
+        """BusScheduler 그룹 : slave 응답이 한 번이라도 있었으면 True"""
+        self.current_slave = slave
+        self.answered = False
+        self.timed_out = False
+        fn()
+        return self.answered
 
     # ---------- Time ----------
     def poll_time(self):
-        slave = 33
-        function = 0x03
-        start_addr = 0x2000
-        count = 6
+        values = ReadPlan(points("rtc")).read(self.read_block, self.read_blocks)
+        if values["second"] is None:
+            return
 
-        frame = struct.pack(">B B H H", slave, function, start_addr, count)
-        crc = count_crc(frame)
-        frame += struct.pack("<H", crc)
+        year, month, day, hour, minute, second = values.values()
+        text = (
+            f"Time : {year:04d}-{month:02d}-{day:02d} "
+            f"{hour:02d}:{minute:02d}:{second:02d}"
+        )
+        self.emit_view("time", self.time_signal, text)
+        self.publish("time", f"{hour:02d}:{minute:02d}:{second:02d}")
 
-        self.log_frame("TX", frame)
-        rx = self.master.send_raw(frame)
-        if not rx:
+    # ---------- Device info / Barcode (연결 후 한 번) ----------
+    def poll_device_info(self):
+        values = ReadPlan(device_info_points()).read(self.read_block, self.read_blocks)
+        if not self.answered:
+            return
+        parts = [f"{name} : {'-' if value is None else value}" for name, value in values.items()]
+        self.emit_view("device", self.device_signal, "  |  ".join(parts))
+
+    def poll_barcode(self, n: int = None):
+        n = self.selected_n if n is None else n
+        values = ReadPlan([barcode_point(n)]).read(self.read_block, self.read_blocks)
+        if values["barcode"] is None:
             return
-        self.log_frame("RX", rx)
-
-        if len(rx) >= 3 + 6 * 2 + 2:
-            data = rx[3:3 + 12]
-            regs = struct.unpack(">6H", data)
-            year, month, day, hour, minute, second = regs
-            text = (
-                f"Time : {year:04d}-{month:02d}-{day:02d} "
-                f"{hour:02d}:{minute:02d}:{second:02d}"
-            )
-            self.time_signal.emit(text)
+        self.barcodes[(self.current_slave, n)] = values["barcode"]
+        self.emit_view("barcode", self.barcode_signal, f"Barcode: {values['barcode']}")
 
     # ---------- Battery ----------
-    def poll_battery(self, n: int):
+    def poll_battery(self, n: int = None):
+        n = self.selected_n if n is None else n
+        key = (self.current_slave, n)
+        plan = self.battery_plans.get(key)
+        if plan is None:
+            plan = self.battery_plans[key] = ReadPlan(battery_points(n))
+        values = plan.read(self.read_block, self.read_blocks)
+
+        def val(name, default=0):
+            v = values.get(name)
+            return default if v is None else v
+
         text_batt_lines = []
         text_cell_lines = []
 
         # Temperature (global)
-        temp = self.read_int16(0xA706)
-        text_batt_lines.append(f"Battery Temperature : {temp} degC")
+        text_batt_lines.append(f"Battery Temperature : {val('temp')} degC")
         text_batt_lines.append(f"[Battery Module N = {n}]")
 
-        # Barcode
-        barcode_base = 0xC670 + (n - 1) * 32
-        barcode = self.read_string(barcode_base, 15)
-        barcode = barcode.strip('\x00').strip()
+        # Barcode (poll_barcode 가 읽어 둔 값)
+        barcode = self.barcodes.get(key, "")
         text_batt_lines.append(f"Battery Barcode : {barcode}")
 
-        # Voltage (N) UINT32 /10
-        v_base = 0xA731 + (n - 1) * 64
-        voltage_raw = self.read_uint32(v_base)
-        voltage = voltage_raw / 10.0
-        text_batt_lines.append(f"Battery Voltage : {voltage:.1f} V")
-
-        # Current (N) INT32 /10
-        c_base = 0xA733 + (n - 1) * 64
-        current_raw = self.read_int32(c_base)
-        current = current_raw / 10.0
-        text_batt_lines.append(f"Battery Current : {current:.1f} A")
+        # Voltage (N) uint32 x0.1, Current (N) int32 x0.1
+        text_batt_lines.append(f"Battery Voltage : {val('voltage'):.1f} V")
+        text_batt_lines.append(f"Battery Current : {val('current'):.1f} A")
 
         # SOC
-        soc_base = 0xA739 + (n - 1) * 64
-        soc = self.read_uint16(soc_base)
-        text_batt_lines.append(f"Battery SOC : {soc} %")
+        text_batt_lines.append(f"Battery SOC : {val('soc')} %")
 
         # 각 Cell 정보
         for i in range(1, 16):
-            addr_t = 0xA739 + i + (n - 1) * 64
-            t = self.read_int16(addr_t)            
+            t = val(f"cell_temp_{i}")
+            v = val(f"cell_volt_{i}")
+            text_cell_lines.append(f"Cell-{i:2d} Temp : {t:.1f} degC / Volt : {v:.3f} V")
 
-            addr_v = 0xA74F + i + (n - 1) * 64
-            v = self.read_uint16(addr_v) / 10
-            text_cell_lines.append(f"Cell-{i:2d} Temp : {t:2d} degC / Volt : {v:.1f} V")            
+        self.emit_view("battery", self.battery_signal, "\n".join(text_batt_lines))
+        self.emit_view("cell", self.cell_signal, "\n".join(text_cell_lines))
+        for name in ("voltage", "current", "soc"):
+            self.publish(name, values.get(name))
 
-        self.barcode_signal.emit(f"Barcode: {barcode}")
-        self.battery_signal.emit("\n".join(text_batt_lines))
-        self.cell_signal.emit("\n".join(text_cell_lines))
-        
     # ---------- Alarm ----------
-    def poll_alarm(self, n: int):
+    def poll_alarm(self, n: int = None):
+        plan = self.alarm_plans.get(self.current_slave)
+        if plan is None:
+            plan = self.alarm_plans[self.current_slave] = ReadPlan(alarm_points())
+        values = plan.read(self.read_block, self.read_blocks)
+
         lines = []
         alarm_count = 0
         fmt = "{:<35} {:<12} {:<15} {:<10}"
-        
+
         # 헤더
         lines.append(fmt.format("ALARM ITEM", "ADDRESS", "STATUS", "VALUE"))
         lines.append("-" * 72)
-        
+
         # 1) Battery Missing (global)
-        val = self.read_uint16(0x5022)
-        if val == 0:
-            st = "normal" 
-        else:            
-            st = "alarm"
-            lines.append(fmt.format("Battery Missing", "(0x5022)", st, f"(0x{val:04X})"))
+        val = values["missing"] or 0
+        if val != 0:
+            lines.append(fmt.format("Battery Missing", "(0x5022)", "alarm", f"(0x{val:04X})"))
             alarm_count += 1
-        
-        # 2) Battery Module 1~10 전체 알람 읽기
-        for module_n in range(1, 11):  # 1~10
+
+        # 2) Battery Module 1~10 전체 알람
+        for module_n in range(1, MODULE_COUNT + 1):
             # Lithium Battery N Abnormal
-            addr = 0x5036 + (module_n - 1) * 1
-            val = self.read_uint16(addr)
-            if val == 0:
-                st = "normal"
-            elif val == 1:
-                st = "Fault"
-            elif val == 2:
-                st = "Protection"
-            elif val == 3:
-                st = "Communication Fail"
-            else:
-                st = f"Unknown(0x{val:04X})"
+            addr = 0x5036 + (module_n - 1)
+            val = values[f"{module_n}:abnormal"] or 0
             if val != 0:
+                st = ABNORMAL_STATUS.get(val, f"Unknown(0x{val:04X})")
                 alarm_count += 1
                 lines.append(fmt.format(f"Lithium Batt {module_n} Abnormal", f"(0x{addr:04X})", st, f"(0x{val:04X})"))
-            
-            # 각 모듈의 주요 알람들 (0x8431 ~ 0x843D)
-            alarms = [
-                ("Charge OV", 0x8431),
-                ("Charge OC", 0x8432),
-                ("Overdischarge", 0x8433),
-                ("Heavy Load", 0x8434),
-                ("Rev Connection", 0x8435),
-                ("Over Temp", 0x8436),
-                ("Comm Fail", 0x8437),
-                ("Low Temp", 0x8438),
-                ("High Temp Prot", 0x8439),
-                ("Low Temp Prot", 0x843A),
-                ("Overcharge Prot", 0x843B),
-                ("Overdis Prot", 0x843C),
-                ("Overcur Prot", 0x843D)
-            ]
-            
-            for name, base_addr in alarms:
-                addr = base_addr + (module_n - 1) * 64
-                v = self.read_uint16(addr)
-                
-                if v == 0:
-                    st = "normal" 
-                else:
+
+            for name, base_addr, _ in ALARM_ITEMS:
+                addr = base_addr + (module_n - 1) * MODULE_STRIDE
+                v = values[f"{module_n}:{name}"] or 0
+                if v != 0:
                     alarm_count += 1
-                    st = "alarm"
-                    lines.append(fmt.format(f"Batt{module_n} {name}", f"(0x{addr:04X})", st, f"(0x{v:04X})"))
-            #lines.append(fmt.format(f"{Battery Module}-{module_n:2d}", "", "", ""))
-        self.alarm_signal.emit("\n".join(lines))
-        self.alarm_count_signal.emit(alarm_count)
-        
+                    lines.append(fmt.format(f"Batt{module_n} {name}", f"(0x{addr:04X})", "alarm", f"(0x{v:04X})"))
+
+        self.emit_view("alarm", self.alarm_signal, "\n".join(lines))
+        self.emit_view("alarm_count", self.alarm_count_signal, alarm_count)
+        self.publish("alarms", alarm_count)
+
     # ---------- 메인 루프 ----------
     def run(self):
         try:
             self.master = ModbusMaster(self.port)
             if not self.master.connect():
-                self.error_signal.emit(f"Failed to connect {self.port}")
+                detail = f" ({self.master.last_error})" if self.master.last_error else ""
+                self.error_signal.emit(f"Failed to connect {self.port}{detail}")
                 return
 
+            # POLL_SCHEDULE 그룹 × slave 를 마감 순으로 하나씩 (고정 loop + msleep(500) 대신)
+            groups = [
+                (name, period, priority, lambda slave, fn=getattr(self, method): self.run_task(fn, slave))
+                for name, period, priority, method in POLL_SCHEDULE
+            ]
+            self.bus = BusScheduler(self.slave_ids, groups, transport=self.master.link)
+            polled_n = self.selected_n
+            last_report = time.monotonic()
+
             while self.running:
-                self.poll_time()
-                self.poll_battery(self.selected_n)
-                self.poll_alarm(self.selected_n) 
-                self.msleep(500)  # 500ms 간격
-                #self.msleep(1000)  # 1초 간격
+                # 모듈 선택이 바뀌면 그 모듈의 barcode / 셀 값을 바로 읽음
+                if self.selected_n != polled_n:
+                    polled_n = self.selected_n
+                    self.bus.trigger("barcode")
+                    self.bus.trigger("cells")
+
+                wait = self.bus.run_next(lambda: self.running)
+
+                if time.monotonic() - last_report >= 1.0:
+                    last_report = time.monotonic()
+                    self.bus_signal.emit(self.bus.report())
+                    for slave, st in self.bus.stats().items():
+                        self.publish("status", st["status"], slave)
+
+                if wait > 0:
+                    # stop 반응을 위해 최대 0.2초씩
+                    self.msleep(max(1, int(min(wait, 0.2) * 1000)))
 
         except Exception as e:
             self.error_signal.emit(str(e))
@@ -312,6 +435,69 @@ class PollWorker(QThread):
                 self.master = None
 
 
+# ============================
+# Multi-port engine
+# ============================
+class PortEngine(QObject):
+    """COM 포트마다 PollWorker (I/O thread) 하나
+
+    USB-RS485 어댑터 4~8개를 한 프로그램에서 동시에 읽는다. 포트별 송수신은 각자의 thread 에서
+    (serial read 대기 중에는 GIL 을 놓으므로) 병렬로 진행되어 처리량이 포트 수만큼 늘어난다.
+    결과는 result_signal 하나로 모이고, 상세 화면 signal 은 select() 한 (port, slave) 만 보낸다.
+    """
+    result_signal = Signal(str, int, str, object)   # port, slave, 항목, 값
+    bus_signal = Signal(str, str)                   # port, bus 사용률 요약
+    log_signal = Signal(str)
+    error_signal = Signal(str)
+
+    def __init__(self, ports, slave_ids, parent=None):
+        super().__init__(parent)
+        self.ports = list(ports)
+        self.slave_ids = list(slave_ids)
+        self.selected_n = 1
+        self.workers = {}
+        for port in self.ports:
+            worker = PollWorker(port, self.slave_ids)
+            if len(self.ports) > 1:
+                worker.log_prefix = f"{port} "
+            worker.result_signal.connect(self.result_signal)
+            worker.bus_signal.connect(lambda text, port=port: self.bus_signal.emit(port, text))
+            worker.log_signal.connect(self.log_signal)
+            worker.error_signal.connect(self.error_signal)
+            self.workers[port] = worker
+        self.select(self.ports[0], self.slave_ids[0])
+
+    def start(self):
+        for worker in self.workers.values():
+            worker.start()
+
+    def isRunning(self):
+        return any(w.isRunning() for w in self.workers.values())
+
+    def set_module(self, n: int):
+        self.selected_n = n
+        for worker in self.workers.values():
+            worker.selected_n = n
+
+    def select(self, port, slave):
+        """상세 화면에 표시할 (port, slave)"""
+        for worker in self.workers.values():
+            worker.select_slave(slave if worker.port == port else None)
+
+    def stop(self, timeout_ms=None):
+        """모든 worker 에 한꺼번에 stop 을 보내고 기다림 (timeout_ms 초과 시 terminate)"""
+        for worker in self.workers.values():
+            worker.stop()
+        for worker in self.workers.values():
+            if timeout_ms is None:
+                worker.wait()
+            elif not worker.wait(timeout_ms):
+                worker.terminate()
+                worker.wait(500)
+            worker.deleteLater()
+        self.workers.clear()
+
+
 # ============================
 # GUI
 # ============================
@@ -323,7 +509,9 @@ class TimeBatteryGui(QWidget):
         
         self.log_enabled = True
         self.is_connected = False
-        self.worker: PollWorker | None = None        
+        self.engine: PortEngine | None = None
+        self.bus_texts = {}         # port → bus 사용률 요약
+        self.overview_rows = {}     # (port, slave) → 요약 표 행 번호
         
         #--- 로그 저장 관련 상태 ---
         self.save_log_enabled = False
@@ -484,7 +672,7 @@ class TimeBatteryGui(QWidget):
         for line in cell_lines:
             if line.strip() and "Cell-" in line:
                 try:
-                    # "Cell-01 Temp : 24 degC / Volt : 3.2 V" 형식 파싱
+                    # "Cell-01 Temp : 24.5 degC / Volt : 3.215 V" 형식 파싱
                     parts = line.split()
                     cell_num = int(parts[0].replace("Cell-", ""))
                     temp_str = parts[3]  # "24"
@@ -510,13 +698,47 @@ class TimeBatteryGui(QWidget):
         self.btn_connect.clicked.connect(self.connect_port)
         self.btn_disconnect.clicked.connect(self.disconnect_port)
 
+        # 한 bus 에 묶인 slave ID 목록 (예: "33, 34, 35" / "0x21 0x22")
+        self.edit_slaves = QLineEdit("33")
+        self.edit_slaves.setMaximumWidth(160)
+        self.edit_slaves.setToolTip("Slave IDs on the RS-485 bus (comma separated)")
+        self.cmb_slave = QComboBox()
+        self.cmb_slave.currentIndexChanged.connect(self.on_slave_index_changed)
+
+        # 여러 포트 동시 사용 (예: "COM3, COM4, COM5"), 비우면 위 COM Port 하나
+        self.edit_ports = QLineEdit()
+        self.edit_ports.setPlaceholderText("More ports: COM4, tcp://10.0.0.5:502, rtu+tcp://...")
+        self.edit_ports.setMaximumWidth(200)
+
         top.addWidget(QLabel("COM Port"))
         top.addWidget(self.cmb_port)
+        top.addWidget(self.edit_ports)
+        top.addWidget(QLabel("Slave IDs"))
+        top.addWidget(self.edit_slaves)
         top.addWidget(self.btn_connect)
         top.addWidget(self.btn_disconnect)
+        top.addWidget(QLabel("View"))
+        top.addWidget(self.cmb_slave)
+        top.addStretch()
 
         root_layout.addLayout(top)
 
+        # bus 사용률 / slave 상태
+        self.lbl_bus = QLabel("Bus : -")
+        self.lbl_bus.setStyleSheet("font-family: 'Courier New', monospace; font-size: 9pt;")
+        root_layout.addWidget(self.lbl_bus)
+
+        # 전체 포트 / slave 요약 (한 줄 = port + slave)
+        self.table_overview = QTableWidget(0, len(OVERVIEW_COLUMNS))
+        self.table_overview.setHorizontalHeaderLabels([title for _, title in OVERVIEW_COLUMNS])
+        self.table_overview.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table_overview.verticalHeader().setVisible(False)
+        self.table_overview.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table_overview.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table_overview.setMaximumHeight(160)
+        self.table_overview.cellDoubleClicked.connect(self.on_overview_double_clicked)
+        root_layout.addWidget(self.table_overview)
+
         # Splitter (좌: 로그, 우: 시간/배터리/셀)[web:11][web:13]
         splitter = QSplitter(Qt.Horizontal)
 
@@ -610,6 +832,11 @@ class TimeBatteryGui(QWidget):
         self.lbl_barcode.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
         right_layout.addWidget(self.lbl_barcode)
 
+        self.lbl_device = QLabel("Device : -")
+        self.lbl_device.setWordWrap(True)
+        self.lbl_device.setTextInteractionFlags(Qt.TextSelectableByMouse | Qt.TextSelectableByKeyboard)
+        right_layout.addWidget(self.lbl_device)
+
         # Battery info area
         right_layout.addWidget(QLabel("Battery Information"))
         self.text_battery = QTextEdit()
@@ -682,7 +909,9 @@ class TimeBatteryGui(QWidget):
 
         root_layout.addWidget(splitter)
         root_layout.setStretch(0, 0)
-        root_layout.setStretch(1, 1)
+        root_layout.setStretch(1, 0)
+        root_layout.setStretch(2, 0)
+        root_layout.setStretch(3, 1)
 
     # ---------- Serial ----------
     def refresh_ports(self):
@@ -691,38 +920,68 @@ class TimeBatteryGui(QWidget):
         for p in ports:
             self.cmb_port.addItem(p.device)
 
+    def selected_ports(self):
+        """COM Port 콤보 + 추가 입력 포트 (중복 제거, 순서 유지)"""
+        ports = []
+        for port in [self.cmb_port.currentText()] + self.edit_ports.text().replace(",", " ").split():
+            if port and port not in ports:
+                ports.append(port)
+        return ports
+
     def connect_port(self):
-        port = self.cmb_port.currentText()
-        if not port:
+        ports = self.selected_ports()
+        if not ports:
             QMessageBox.warning(self, "Connect", "No COM port selected")
             return
 
-        if self.worker and self.worker.isRunning():
+        if self.engine and self.engine.isRunning():
             QMessageBox.information(self, "Connect", "Already connected")
             return
         
         if self.is_connected:  # 이미 연결된 상태면 무시
             return
+
+        try:
+            slave_ids = parse_slave_ids(self.edit_slaves.text())
+        except ValueError as e:
+            QMessageBox.warning(self, "Connect", str(e))
+            return
+
+        self.cmb_slave.blockSignals(True)
+        self.cmb_slave.clear()
+        for port in ports:
+            for slave in slave_ids:
+                self.cmb_slave.addItem(f"{port} / {slave} (0x{slave:02X})", (port, slave))
+        self.cmb_slave.blockSignals(False)
+
+        self.table_overview.setRowCount(0)
+        self.overview_rows.clear()
+        self.bus_texts.clear()
+
+        self.engine = PortEngine(ports, slave_ids)
+        self.engine.set_module(self.cmb_n.currentIndex() + 1)
+        # 신호 연결[web:14] : 상세 화면은 선택한 (port, slave) worker 만 보냄
+        for worker in self.engine.workers.values():
+            worker.time_signal.connect(self.update_time)
+            worker.battery_signal.connect(self.update_battery)
+            worker.cell_signal.connect(self.update_cell)
+            worker.alarm_signal.connect(self.update_alarm)
+            worker.alarm_count_signal.connect(self.update_alarm_count)
+            worker.barcode_signal.connect(self.update_barcode)
+            worker.device_signal.connect(self.lbl_device.setText)
+        self.engine.log_signal.connect(self.append_log)
+        self.engine.error_signal.connect(self.show_error)
+        self.engine.bus_signal.connect(self.update_bus)
+        self.engine.result_signal.connect(self.update_overview)
         
-        self.worker = PollWorker(port)
-        # 신호 연결[web:14]
-        self.worker.log_signal.connect(self.append_log)
-        self.worker.time_signal.connect(self.update_time)
-        self.worker.battery_signal.connect(self.update_battery)
-        self.worker.cell_signal.connect(self.update_cell)
-        self.worker.alarm_signal.connect(self.update_alarm) 
-        self.worker.error_signal.connect(self.show_error)
-        self.worker.alarm_count_signal.connect(self.update_alarm_count)
-        self.worker.barcode_signal.connect(self.update_barcode)
-        
-        self.worker.start()
+        self.engine.start()
         #QMessageBox.information(self, "Connect", f"Connected to {port}")
-        if self.worker.isRunning():  # 연결 성공 확인
+        if self.engine.isRunning():  # 연결 성공 확인
             self.is_connected = True
-            QMessageBox.information(self, "Connect", f"Connected to {port}")
+            QMessageBox.information(self, "Connect", f"Connected to {', '.join(ports)}")
             self.update_button_styles()  # ← 색상 변경
         else:
-            self.worker = None
+            self.engine = None
             self.update_button_styles()  # 실패시 원래대로
             
     def update_barcode(self, barcode_text: str):
@@ -733,22 +992,56 @@ class TimeBatteryGui(QWidget):
         self.latest_alarm_count = count  # 이 라인 있어야 함
     
     def disconnect_port(self):
-        if self.worker:
-            self.worker.stop()
-            self.worker.master.client.timeout = 0.1  # ← timeout 급감
-            self.worker.wait(1500)  # 1.5초만 대기
-            if self.worker.isRunning():
-                self.worker.terminate()
-                self.worker.wait(500)
-            
-            self.worker.deleteLater()
-            self.worker = None
+        if self.engine:
+            self.engine.stop(1500)  # 응답 대기 시간 급감, 1.5초만 대기
+            self.engine.deleteLater()
+            self.engine = None
             self.is_connected = False
             self.update_button_styles()
             QMessageBox.information(self, "Disconnect", "Disconnected")
 
 
     # ---------- Slots ----------
+    def update_bus(self, port: str, text: str):
+        self.bus_texts[port] = text
+        if len(self.bus_texts) == 1:
+            self.lbl_bus.setText(text)
+        else:
+            self.lbl_bus.setText("\n".join(f"{p:<8} {t}" for p, t in sorted(self.bus_texts.items())))
+
+    def update_overview(self, port: str, slave: int, key: str, value):
+        """전체 포트 요약 표 : 항목 하나 갱신"""
+        column = OVERVIEW_INDEX.get(key)
+        if column is None:
+            return
+        row = self.overview_rows.get((port, slave))
+        if row is None:
+            row = self.overview_rows[(port, slave)] = self.table_overview.rowCount()
+            self.table_overview.insertRow(row)
+            self.table_overview.setItem(row, 0, QTableWidgetItem(port))
+            self.table_overview.setItem(row, 1, QTableWidgetItem(f"{slave} (0x{slave:02X})"))
+
+        if value is None:
+            text = "-"
+        elif key in ("voltage", "current"):
+            text = f"{value:.1f}"
+        else:
+            text = str(value)
+        item = self.table_overview.item(row, column)
+        if item is None:
+            self.table_overview.setItem(row, column, QTableWidgetItem(text))
+        elif item.text() != text:
+            item.setText(text)
+
+    def on_overview_double_clicked(self, row: int, column: int):
+        """요약 표 행 더블클릭 → 그 (port, slave) 를 상세 화면에"""
+        for key, r in self.overview_rows.items():
+            if r == row:
+                index = self.cmb_slave.findData(key)
+                if index >= 0:
+                    self.cmb_slave.setCurrentIndex(index)
+                break
+
     def append_log(self, text: str):
         if not self.log_enabled:
             return
@@ -763,7 +1056,7 @@ class TimeBatteryGui(QWidget):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # Battery에도 현재 모듈 표시 추가 (선택사항)
-        current_n = getattr(self.worker, 'selected_n', self.current_displayed_module)
+        current_n = getattr(self.engine, 'selected_n', self.current_displayed_module)
         
         self.text_battery.setPlainText(f"[{timestamp}]\n\n{text}")
         self.latest_battery_text = text
@@ -774,7 +1067,7 @@ class TimeBatteryGui(QWidget):
         timestamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
         # 실제 워커에서 읽은 모듈 번호만 사용
-        current_n = getattr(self.worker, 'selected_n', self.current_displayed_module)
+        current_n = getattr(self.engine, 'selected_n', self.current_displayed_module)
         
         # 라벨 업데이트 (실제 데이터와 동기화)
         self.lbl_current_module.setText(f"[Module-{current_n}]")
@@ -798,10 +1091,15 @@ class TimeBatteryGui(QWidget):
     def show_error(self, msg: str):
         QMessageBox.critical(self, "Error", msg)
 
+    def on_slave_index_changed(self, idx: int):
+        key = self.cmb_slave.itemData(idx)
+        if self.engine and key is not None:
+            self.engine.select(*key)
+
     def on_batt_index_changed(self, idx: int):
         n = idx + 1
-        if self.worker:
-            self.worker.selected_n = n
+        if self.engine:
+            self.engine.set_module(n)
             self.pending_module_change = True  # 변경 요청만 설정
         # 라벨은 절대 건드리지 않음!
         # 현재 모듈의 Cell 정보임을 명확히 표시
@@ -810,12 +1108,10 @@ class TimeBatteryGui(QWidget):
 
 
     def closeEvent(self, event):
-        if self.worker:
-            self.worker.stop()
-            #self.worker.wait(2000)            
-            self.worker.wait() #Qt 공식 문서에서도 wait()은 timeout 없이 써야 안전
-            self.worker.deleteLater()
-            self.worker = None
+        if self.engine:
+            self.engine.stop() #Qt 공식 문서에서도 wait()은 timeout 없이 써야 안전
+            self.engine.deleteLater()
+            self.engine = None
             self.is_connected = False  # ← 상태 초기화
             
         self.update_button_styles()  # ← 기본 상태로
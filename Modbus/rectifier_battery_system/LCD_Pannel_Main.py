@@ -6,21 +6,7 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import QTimer
 from pymodbus.client.serial import ModbusSerialClient
 
-
-# ============================
-# CRC (C 코드 그대로 포팅)
-# ============================
-def count_crc(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 1:
-                crc >>= 1
-                crc ^= 0xA001
-            else:
-                crc >>= 1
-    return crc & 0xFFFF
+from modbus_rtu import check_crc, count_crc
 
 
 # ============================
@@ -150,7 +136,10 @@ class TimeGui(QWidget):
         if not rx:
             return
 
-        self.log_frame("RX", rx)
+        ok = check_crc(rx)
+        self.log_frame("RX" if ok else "RX CRC ERR", rx)
+        if not ok:
+            return
 
         # 응답 파싱
         if len(rx) >= 3 + 6 * 2:
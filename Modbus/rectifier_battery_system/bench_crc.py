@@ -0,0 +1,60 @@
+# CRC-16/Modbus micro benchmark (기존 bit loop count_crc vs modbus_rtu table 방식)
+#
+# 사용 예
+#   python bench_crc.py
+#   python bench_crc.py --number 20000
+
+import argparse
+import os
+import timeit
+
+from modbus_rtu import check_crc, count_crc, count_crc_view
+
+
+def legacy_count_crc(data: bytes) -> int:
+    """GUI 스크립트에 복사되어 있던 기존 구현 (비교 기준)"""
+    crc = 0xFFFF
+    for b in data:
+        crc ^= b
+        for _ in range(8):
+            if crc & 1:
+                crc >>= 1
+                crc ^= 0xA001
+            else:
+                crc >>= 1
+    return crc & 0xFFFF
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CRC-16/Modbus micro benchmark")
+    parser.add_argument("--number", type=int, default=5000, help="case 당 반복 횟수")
+    args = parser.parse_args(argv)
+
+    # 정확성 : 표준 check 값 (CRC-16/MODBUS "123456789" = 0x4B37) + 임의 데이터
+    assert count_crc(b"123456789") == legacy_count_crc(b"123456789") == 0x4B37
+    for size in range(0, 300, 7):
+        data = os.urandom(size)
+        assert count_crc(data) == legacy_count_crc(data)
+        assert count_crc_view(b"xx" + data, 2) == legacy_count_crc(data)
+
+    cases = {
+        "TX FC03 request (6 byte)": bytes.fromhex("210320000006"),
+        "RX 125 registers (253 byte)": os.urandom(253),
+    }
+
+    print(f"{'case':<28} {'legacy [us]':>12} {'table [us]':>12} {'speedup':>8}")
+    for name, data in cases.items():
+        legacy = timeit.timeit(lambda: legacy_count_crc(data), number=args.number) / args.number * 1e6
+        table = timeit.timeit(lambda: count_crc(data), number=args.number) / args.number * 1e6
+        print(f"{name:<28} {legacy:>12.2f} {table:>12.2f} {legacy / table:>7.1f}x")
+
+    # RX 검사 (frame 전체 check_crc : memoryview 로 잘라서 계산)
+    frame = bytes.fromhex("2103020064") + bytes([0x00, 0x00])
+    crc = count_crc(frame[:-2])
+    frame = frame[:-2] + bytes([crc & 0xFF, crc >> 8])
+    t = timeit.timeit(lambda: check_crc(frame), number=args.number) / args.number * 1e6
+    print(f"{'check_crc (7 byte RX)':<28} {t:>12.2f} us")
+
+
+if __name__ == "__main__":
+    main()
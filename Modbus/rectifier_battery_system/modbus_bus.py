@@ -0,0 +1,295 @@
+# RS-485 bus 하나에 묶인 여러 slave 를 읽는 scheduler
+#
+# PollWorker 는 slave 33 (0x21) 만 읽었음. 캐비닛에는 정류기 제어기 여러 대가 한 bus 에 daisy chain 되어 있어
+# slave 마다 같은 읽기 그룹 (RTC / 셀 / 알람 ...) 을 돌리고 slave 별 상태를 따로 둔다.
+#
+# 그룹은 선언적으로 (이름, 주기, 우선순위, fn) : 주기 None 은 연결 후 한 번 (barcode, 장치 정보).
+# 고정 loop (매 cycle 전부 읽고 msleep(500)) 대신 priority queue 로
+#   - 대기 heap : 다음 실행 시각 순
+#   - 실행 heap : 실행 시각이 된 작업을 마감 (실행 시각 + 주기) 이 빠른 순, 같으면 우선순위 순 (EDF)
+# half duplex bus 라 한 번에 작업 하나만 실행하고, 1초 주기 셀 값이 10초 주기 RTC 에 밀리지 않는다.
+# 마감을 넘겨 끝난 작업 수는 late 로 센다. 밀린 주기는 몰아서 실행하지 않고 건너뛴다.
+# slave 하나가 연달아 bus 를 쓸 수 있는 시간 (slot) 을 두어, slot 을 다 쓴 slave 의 작업은
+# 다른 slave 작업이 실행 heap 에 있으면 그 뒤로 미룬다 (마감이 더 빨라도) → 느린 slave 가 bus 를 독점하지 않음.
+#
+# 응답 없는 slave 는 연속 실패 수에 따라 back-off 동안 모든 작업을 미룬다
+# → 죽은 slave 하나가 주기마다 timeout 을 쌓지 않음. back-off 후 살아나면 "한 번" 그룹을 다시 읽는다.
+#
+# bus 사용률 : transport 가 송신 ~ 응답 완료 (또는 timeout) 까지 bus 를 잡고 있던 시간 / 경과 시간
+#              wire 는 실제로 선 위에 문자가 흐른 시간 (byte 수 × 문자 시간)
+#
+#   bus = BusScheduler([33, 34], [("cells", 1.0, 1, read_cells), ("rtc", 10.0, 3, read_rtc)], transport=link)
+#   while running:
+#       wait = bus.run_next()
+#       if wait:
+#           time.sleep(wait)
+
+import heapq
+import itertools
+import time
+
+SLOT_TIME = 1.0             # [s] 다른 slave 가 기다리는 동안 slave 하나가 연달아 bus 를 쓸 수 있는 시간
+ONCE_DEADLINE = 1.0         # [s] "한 번" 그룹의 마감 여유 (실행 시각 기준)
+FAIL_THRESHOLD = 2          # 연속 실패 작업 수 → back-off 시작
+BACKOFF_BASE = 2.0          # [s] 첫 back-off, 이후 실패마다 2배
+BACKOFF_MAX = 60.0          # [s]
+
+
+def parse_slave_ids(text):
+    """"33, 34 0x23" → [33, 34, 35] (중복 제거, 순서 유지)"""
+    ids = []
+    for token in text.replace(",", " ").split():
+        try:
+            slave = int(token, 0)
+        except ValueError:
+            raise ValueError(f"slave ID 형식 오류: {token}")
+        if not 1 <= slave <= 247:
+            raise ValueError(f"slave ID 범위 (1~247) 오류: {slave}")
+        if slave not in ids:
+            ids.append(slave)
+    if not ids:
+        raise ValueError("slave ID 없음")
+    return ids
+
+
+class SlaveState:
+    """slave 하나의 상태 / 통계"""
+
+    def __init__(self, slave):
+        self.slave = slave
+        self.failures = 0           # 연속 실패 작업 수
+        self.backoff = 0.0
+        self.next_try = 0.0         # back-off 끝나는 시각 (clock 기준)
+        self.jobs = 0
+        self.errors = 0
+        self.busy = 0.0             # 누적 bus 점유 시간 [s]
+
+    @property
+    def status(self):
+        if self.failures == 0:
+            return "ok"
+        if self.failures < FAIL_THRESHOLD:
+            return "retry"
+        return "backoff"
+
+    def on_success(self):
+        """→ back-off 에서 살아났으면 True"""
+        recovered = self.failures >= FAIL_THRESHOLD
+        self.failures = 0
+        self.backoff = 0.0
+        self.next_try = 0.0
+        return recovered
+
+    def on_failure(self, now):
+        self.failures += 1
+        self.errors += 1
+        if self.failures >= FAIL_THRESHOLD:
+            self.backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (self.failures - FAIL_THRESHOLD))
+            self.next_try = now + self.backoff
+
+
+class PollJob:
+    """slave 하나 × 그룹 하나"""
+
+    __slots__ = ("slave", "name", "period", "priority", "fn", "generation", "done")
+
+    def __init__(self, slave, name, period, priority, fn):
+        self.slave = slave
+        self.name = name
+        self.period = period        # None = 연결 후 한 번
+        self.priority = priority
+        self.fn = fn
+        self.generation = 0         # trigger 로 다시 넣으면 증가 (heap 에 남은 이전 항목 무시)
+        self.done = False
+
+    def deadline(self, due):
+        return due + (self.period if self.period else ONCE_DEADLINE)
+
+
+class BusScheduler:
+    """그룹 × slave 작업을 마감 순으로 하나씩 실행
+
+    groups : [(이름, 주기 [s] 또는 None, 우선순위 (작을수록 먼저), fn)]
+             fn(slave) → 응답이 있었으면 True (예외 응답도 응답), 한 번도 응답이 없었으면 False
+    transport : busy_time / wire_time 속성을 가진 transport (없으면 작업 시간으로 대신 계산)
+    slot_time : slave 하나가 연달아 쓸 수 있는 bus 시간 [s] (다른 slave 작업이 기다릴 때만 적용)
+    """
+
+    def __init__(self, slaves, groups, transport=None, slot_time=SLOT_TIME, clock=time.monotonic):
+        if not groups:
+            raise ValueError("그룹 목록이 비어 있음")
+        self.transport = transport
+        self.slot_time = slot_time
+        self.clock = clock
+        self.states = {slave: SlaveState(slave) for slave in slaves}
+        self.jobs = {}              # (slave, 그룹) → PollJob
+        self.waiting = []           # (실행 시각, seq, generation, job)
+        self.ready = []             # (마감, 우선순위, seq, 실행 시각, generation, job)
+        self._seq = itertools.count()
+        self.late = 0               # 마감을 넘겨 끝난 작업 수
+        self.skipped = 0            # 밀려서 건너뛴 주기 수
+        self._slot_slave = None     # 지금 bus 를 연달아 쓰고 있는 slave
+        self._slot_used = 0.0       # 그 slave 가 이번 차례에 쓴 bus 시간 [s]
+
+        now = clock()
+        for slave in self.states:
+            for name, period, priority, fn in groups:
+                job = self.jobs[(slave, name)] = PollJob(slave, name, period, priority, fn)
+                self._push(job, now)
+
+        # 사용률 계산 구간 (report 마다 새로 시작)
+        self._window_start = now
+        self._window_busy = self._busy_time()
+        self._window_wire = self._wire_time()
+
+    @property
+    def slaves(self):
+        return list(self.states)
+
+    def _busy_time(self):
+        return getattr(self.transport, "busy_time", 0.0)
+
+    def _wire_time(self):
+        return getattr(self.transport, "wire_time", 0.0)
+
+    def _push(self, job, due):
+        heapq.heappush(self.waiting, (due, next(self._seq), job.generation, job))
+
+    def trigger(self, name, slave=None):
+        """그룹을 지금 바로 (다시) 읽도록 예약 ("한 번" 그룹도 다시 실행)"""
+        now = self.clock()
+        for job in self.jobs.values():
+            if job.name == name and (slave is None or job.slave == slave):
+                job.generation += 1
+                job.done = False
+                self._push(job, now)
+
+    # ---------- 실행 ----------
+    def _release(self, now):
+        while self.waiting and self.waiting[0][0] <= now:
+            due, seq, generation, job = heapq.heappop(self.waiting)
+            if generation == job.generation:
+                heapq.heappush(self.ready, (job.deadline(due), job.priority, seq, due, generation, job))
+
+    def run_next(self, running=None):
+        """실행할 작업이 있으면 하나 실행하고 0, 없으면 다음 작업까지 남은 시간 [s]"""
+        now = self.clock()
+        self._release(now)
+
+        chosen = None
+        deferred = []               # slot 을 다 쓴 slave 의 작업 (다른 slave 작업이 없을 때만 실행)
+        while self.ready:
+            entry = heapq.heappop(self.ready)
+            deadline, _, _, due, generation, job = entry
+            if generation != job.generation:
+                continue
+            state = self.states[job.slave]
+            if now < state.next_try:
+                # back-off 중 → 살아날지 확인할 시각까지 미룸
+                self._push(job, state.next_try)
+                continue
+            if job.slave == self._slot_slave and self._slot_used >= self.slot_time:
+                deferred.append(entry)
+                continue
+            chosen = entry
+            break
+
+        if chosen is None and deferred:
+            chosen = deferred.pop(0)
+        for entry in deferred:
+            heapq.heappush(self.ready, entry)
+
+        if chosen is not None:
+            deadline, _, _, due, generation, job = chosen
+            if running is not None and not running():
+                self._push(job, due)
+                return 0.0
+            self._run(job, self.states[job.slave], due, deadline)
+            return 0.0
+
+        # bus 가 비면 차례도 끝
+        self._slot_slave = None
+        self._slot_used = 0.0
+        if not self.waiting:
+            return 1.0
+        return max(0.0, self.waiting[0][0] - now)
+
+    def _run(self, job, state, due, deadline):
+        start = self.clock()
+        busy = self._busy_time()
+        answered = job.fn(job.slave)
+        end = self.clock()
+
+        used = (self._busy_time() - busy) if self.transport is not None else end - start
+        state.jobs += 1
+        state.busy += used
+        if job.slave != self._slot_slave:
+            self._slot_slave = job.slave
+            self._slot_used = 0.0
+        self._slot_used += used
+        if end > deadline:
+            self.late += 1
+
+        if not answered:
+            state.on_failure(end)
+            if job.period is None:
+                self._push(job, max(end, state.next_try))
+        elif state.on_success():
+            # back-off 에서 살아남 (재부팅 / 교체 가능) → "한 번" 그룹 다시 읽음
+            for other in self.jobs.values():
+                if other.slave == job.slave and other.period is None and other is not job:
+                    other.generation += 1
+                    other.done = False
+                    self._push(other, end)
+
+        if job.period is None:
+            job.done = job.done or answered
+            return
+
+        # 다음 주기 : 밀렸으면 몰아서 실행하지 않고 지금 이후 첫 주기로
+        next_due = due + job.period
+        if next_due < end:
+            missed = int((end - next_due) // job.period) + 1
+            self.skipped += missed
+            next_due += missed * job.period
+        self._push(job, next_due)
+
+    # ---------- 통계 ----------
+    def utilization(self, reset=True):
+        """(bus 점유율, wire 점유율) 0~1 : 마지막 reset 이후 구간"""
+        now = self.clock()
+        elapsed = now - self._window_start
+        busy = self._busy_time() - self._window_busy
+        wire = self._wire_time() - self._window_wire
+        if reset:
+            self._window_start = now
+            self._window_busy += busy
+            self._window_wire += wire
+        if elapsed <= 0:
+            return 0.0, 0.0
+        return min(1.0, busy / elapsed), min(1.0, wire / elapsed)
+
+    def report(self, reset=True):
+        """한 줄 요약 : Bus 62.0% (wire 40.1%) late 0 | 33 ok | 34 backoff 8s (fail 4)"""
+        busy, wire = self.utilization(reset)
+        parts = [f"Bus {busy * 100:.1f}% (wire {wire * 100:.1f}%) late {self.late} skip {self.skipped}"]
+        now = self.clock()
+        for state in self.states.values():
+            if state.status == "backoff":
+                wait = max(0.0, state.next_try - now)
+                parts.append(f"{state.slave} backoff {wait:.0f}s (fail {state.failures})")
+            else:
+                parts.append(f"{state.slave} {state.status}")
+        return " | ".join(parts)
+
+    def stats(self):
+        return {
+            state.slave: {
+                "status": state.status,
+                "jobs": state.jobs,
+                "errors": state.errors,
+                "failures": state.failures,
+                "busy": round(state.busy, 3),
+            }
+            for state in self.states.values()
+        }
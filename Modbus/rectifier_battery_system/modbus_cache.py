@@ -0,0 +1,105 @@
+# 레지스터 read-through cache
+#
+# pyside6_GUI_V11_modbus 는 화면을 그릴 때마다 레지스터를 하나씩 다시 읽었음
+#   - read_module_data : 셀 전압 15 + 셀 온도 15 + 모듈 전압 1 = 31회 read_register
+#   - update_module_table : 모듈 10개 → 310회, 상세 창 / 오버레이 버튼을 누를 때마다 다시 31회
+# cache 는 (slave, 주소) → (레지스터 값, 읽은 시각) 을 두고, 그룹별 TTL 안의 값이면 bus 를 건드리지 않는다.
+# poller 가 주기적으로 채우고 (refresh=True), 화면은 cache 에서 그리며 오래된 묶음만 다시 읽는다.
+#
+# ReadPlan 의 read_blocks 자리에 그대로 끼워 쓴다.
+#   cache = RegisterCache({"module": 10.0, "alarm": 2.0})
+#   values = plan.read(None, cache.reader(33, "module", link_read_blocks))
+#   values = plan.read(None, cache.reader(33, "module"))                     # cache 만 (bus 안 씀)
+#
+# poller 스레드와 GUI 스레드가 같이 쓰므로 lock 으로 보호한다.
+
+import struct
+import threading
+import time
+
+from modbus_plan import payload_count, to_payload
+
+DEFAULT_TTL = 5.0           # [s] ttl 표에 없는 그룹
+
+
+class RegisterCache:
+    """(slave, 주소) → 레지스터 값 + 읽은 시각, 그룹별 TTL"""
+
+    def __init__(self, ttl=None, default_ttl=DEFAULT_TTL, clock=time.monotonic):
+        self.ttl = dict(ttl or {})  # 그룹 → TTL [s] (None = 만료 없음)
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.words = {}             # (slave, 주소) → (값, 읽은 시각)
+        self.stats = {"hits": 0, "misses": 0, "reads": 0}
+
+    def group_ttl(self, group):
+        return self.ttl.get(group, self.default_ttl)
+
+    def store(self, slave, start, payload):
+        """응답 payload (bytes / memoryview / 레지스터 list) 를 start 부터 저장"""
+        count = payload_count(payload)
+        words = struct.unpack_from(f">{count}H", to_payload(payload))
+        now = self.clock()
+        with self.lock:
+            for i, word in enumerate(words):
+                self.words[(slave, start + i)] = (word, now)
+
+    def lookup(self, slave, start, count, max_age=None):
+        """start ~ start+count-1 이 모두 max_age [s] 안에 읽은 값이면 payload (bytes), 아니면 None"""
+        now = self.clock()
+        words = []
+        with self.lock:
+            for addr in range(start, start + count):
+                entry = self.words.get((slave, addr))
+                if entry is None or (max_age is not None and now - entry[1] > max_age):
+                    return None
+                words.append(entry[0])
+        return struct.pack(f">{count}H", *words)
+
+    def age(self, slave, start, count=1):
+        """가장 오래된 값의 나이 [s] (없는 주소가 있으면 None)"""
+        now = self.clock()
+        with self.lock:
+            entries = [self.words.get((slave, addr)) for addr in range(start, start + count)]
+        if any(entry is None for entry in entries):
+            return None
+        return now - min(entry[1] for entry in entries)
+
+    def invalidate(self, slave=None):
+        with self.lock:
+            if slave is None:
+                self.words.clear()
+            else:
+                self.words = {key: entry for key, entry in self.words.items() if key[0] != slave}
+
+    def reader(self, slave, group, read_blocks=None, refresh=False):
+        """ReadPlan.read 용 read_blocks
+
+        TTL 안의 묶음은 cache 에서, 나머지만 read_blocks 로 한 번에 읽어 저장한다.
+        read_blocks 가 None 이면 cache 만 (오래된 묶음은 None), refresh=True 면 cache 를 보지 않고 모두 읽음.
+        """
+        max_age = self.group_ttl(group)
+
+        def cached_read_blocks(requests):
+            if refresh:
+                results = [None] * len(requests)
+            else:
+                results = [self.lookup(slave, start, count, max_age) for start, count in requests]
+            stale = [i for i, payload in enumerate(results) if payload is None]
+            with self.lock:
+                self.stats["hits"] += len(requests) - len(stale)
+                self.stats["misses"] += len(stale)
+            if not stale or read_blocks is None:
+                return results
+
+            fetched = read_blocks([requests[i] for i in stale])
+            with self.lock:
+                self.stats["reads"] += len(stale)
+            for i, payload in zip(stale, fetched):
+                if payload is not None:
+                    self.store(slave, requests[i][0], payload)
+                results[i] = payload
+            return results
+
+        return cached_read_blocks
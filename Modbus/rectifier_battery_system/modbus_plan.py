@@ -0,0 +1,228 @@
+# FC03 읽기 계획 (흩어진 레지스터 → 연속 구간 묶음)
+#
+# PollWorker 는 레지스터 하나마다 FC03 요청을 보내고 있었음 (알람 141회 + 셀 35회 / cycle).
+# 9600 bps 에서 요청 1회 왕복이 약 20ms + turnaround 라서 한 cycle 이 몇 초씩 걸림.
+#
+# 읽을 주소 목록(RegPoint)을 주소 순으로 정렬해
+#   - 붙어 있거나 max_gap 레지스터 이하로 떨어진 구간은 한 요청으로 합치고 (사이 값은 버림)
+#   - 한 요청은 최대 125 레지스터 (FC03 한도)
+# 로 나눈 뒤, 응답 레지스터 배열에서 각 이름의 값을 꺼낸다.
+#
+# 사이 구간을 함께 읽다가 장비가 예외 응답(없는 주소)을 주면 그 묶음은 원래 연속 구간별로 나눠 다시 읽고,
+# 이후 cycle 에서도 나눈 계획을 쓴다.
+#
+# 해석 : 묶음마다 struct format 하나 (빈칸은 pad byte) 를 미리 만들어 두고 응답 payload 전체를
+#        unpack_from 한 번으로 푼다 (값마다 list 조회 / bit 연산 하지 않음).
+#        payload 는 응답 frame 의 data 부분 (bytes / memoryview, 복사 없이) 또는 레지스터 list.
+
+import struct
+from collections import namedtuple
+
+MAX_READ_COUNT = 125        # FC03 한 요청 최대 레지스터 수
+# 레지스터 1개 = 응답 2 byte ≈ 2ms (9600 bps), 요청 1회 고정비용 ≈ 20ms → 10개 정도 빈칸은 같이 읽는 편이 빠름
+DEFAULT_MAX_GAP = 10
+
+# kind → 레지스터 수 (string 은 RegPoint.count 사용)
+KIND_SIZE = {"uint16": 1, "int16": 1, "uint32": 2, "int32": 2}
+# kind → struct 형식 (big endian, 32bit 는 상위 word 먼저)
+KIND_FORMAT = {"uint16": "H", "int16": "h", "uint32": "I", "int32": "i"}
+
+RegPoint = namedtuple("RegPoint", "name addr kind count scale")
+
+
+def reg_point(name, addr, kind="uint16", count=None, scale=1):
+    """RegPoint 생성 (count 는 kind 로 정해지고 string 만 직접 지정)
+
+    scale 은 곱하는 배율 : 0.1 → 읽은 정수 / 10
+    """
+    if kind != "string" and kind not in KIND_SIZE:
+        raise ValueError(f"unknown kind {kind}")
+    if count is None:
+        count = KIND_SIZE.get(kind, 1)
+    return RegPoint(name, addr, kind, count, scale)
+
+
+def scale_digits(scale):
+    """배율 → 반올림 자릿수 (0.1 → 1, 0.001 → 3, 정수 배율은 None)"""
+    if isinstance(scale, int):
+        return None
+    return len(f"{scale:.10f}".rstrip("0").partition(".")[2])
+
+
+def to_payload(data):
+    """레지스터 list → bytes (bytes / memoryview 는 그대로)"""
+    if isinstance(data, (list, tuple)):
+        return struct.pack(f">{len(data)}H", *data)
+    return data
+
+
+def payload_count(data):
+    """payload 의 레지스터 수"""
+    if isinstance(data, (list, tuple)):
+        return len(data)
+    return len(data) // 2
+
+
+class ReadBlock:
+    """FC03 요청 하나 (start ~ start+count-1) 와 그 안의 RegPoint 들"""
+
+    __slots__ = ("start", "count", "points", "bridged", "_decoder")
+
+    def __init__(self, start, count, points, bridged=False):
+        self.start = start
+        self.count = count
+        self.points = points
+        self.bridged = bridged      # 빈칸(원하지 않은 주소)을 같이 읽는 묶음
+        self._decoder = None
+
+    @property
+    def decoder(self):
+        if self._decoder is None:
+            self._decoder = BlockDecoder(self)
+        return self._decoder
+
+    def __repr__(self):
+        return f"ReadBlock(0x{self.start:04X}, {self.count}, {len(self.points)} points)"
+
+
+def convert(point, raw, digits):
+    """unpack 한 값 → 표시 값 (string 은 ASCII, 숫자는 배율 적용)"""
+    if point.kind == "string":
+        return bytes(raw).rstrip(b"\x00").decode("ascii", errors="ignore").strip()
+    if point.scale == 1:
+        return raw
+    value = raw * point.scale
+    return round(value, digits) if digits is not None else value
+
+
+class BlockDecoder:
+    """ReadBlock 하나의 응답 payload → {name: 값}
+
+    점들이 겹치지 않으면 (보통) struct format 하나로 한 번에 unpack,
+    겹치면 (같은 주소를 다른 형식으로 읽는 경우) 점마다 unpack_from.
+    """
+
+    def __init__(self, block):
+        self.size = block.count * 2
+        self.points = [(p, scale_digits(p.scale)) for p in block.points]
+
+        # 주소 순으로 겹치지 않으면 format 하나 : ">4sH6xhI" (빈칸은 pad byte)
+        fmt = [">"]
+        pos = block.start
+        for point in block.points:
+            if point.addr < pos:
+                fmt = None
+                break
+            if point.addr > pos:
+                fmt.append(f"{(point.addr - pos) * 2}x")
+            fmt.append(f"{point.count * 2}s" if point.kind == "string" else KIND_FORMAT[point.kind])
+            pos = point.addr + point.count
+        self.packed = struct.Struct("".join(fmt)) if fmt else None
+
+        # 겹치는 경우 : 점마다 (Struct, byte offset)
+        self.single = [] if self.packed else [
+            (struct.Struct(f">{p.count * 2}s" if p.kind == "string" else ">" + KIND_FORMAT[p.kind]),
+             (p.addr - block.start) * 2)
+            for p in block.points
+        ]
+
+    def decode(self, data):
+        payload = to_payload(data)
+        if len(payload) < self.size:
+            raise ValueError(f"payload {len(payload)} byte < {self.size}")
+        if self.packed is not None:
+            raw_values = self.packed.unpack_from(payload)
+        else:
+            raw_values = [s.unpack_from(payload, offset)[0] for s, offset in self.single]
+        return {point.name: convert(point, raw, digits)
+                for (point, digits), raw in zip(self.points, raw_values)}
+
+
+class ReadPlan:
+    """RegPoint 목록 → ReadBlock 목록
+
+    read(read_block) : read_block(start, count) → payload (실패 / 예외 응답 시 None)
+                       결과는 {name: 값}, 읽지 못한 이름은 None
+    read(read_block, read_blocks) : read_blocks([(start, count), ...]) → [payload 또는 None]
+                       가 있으면 묶음 전체를 한 번에 넘김 (Modbus TCP pipelining)
+    """
+
+    def __init__(self, points, max_count=MAX_READ_COUNT, max_gap=DEFAULT_MAX_GAP):
+        self.points = sorted(points, key=lambda p: p.addr)
+        self.max_count = max_count
+        self.max_gap = max_gap
+        self.blocks = self.build(self.points, max_count, max_gap)
+
+    @staticmethod
+    def build(points, max_count=MAX_READ_COUNT, max_gap=DEFAULT_MAX_GAP):
+        blocks = []
+        current = None
+        end = 0             # current 의 마지막 주소 + 1
+
+        for point in points:
+            if point.count > max_count:
+                raise ValueError(f"{point.name}: {point.count} 레지스터 (최대 {max_count})")
+            point_end = point.addr + point.count
+
+            if current is not None and point.addr - end <= max_gap \
+                    and max(end, point_end) - current.start <= max_count:
+                if point.addr > end:
+                    current.bridged = True
+                current.points.append(point)
+                end = max(end, point_end)
+                current.count = end - current.start
+                continue
+
+            current = ReadBlock(point.addr, point.count, [point])
+            end = point_end
+            blocks.append(current)
+
+        return blocks
+
+    @property
+    def frame_count(self):
+        return len(self.blocks)
+
+    @staticmethod
+    def decode(block, regs):
+        try:
+            return block.decoder.decode(regs)
+        except (ValueError, struct.error):
+            return dict.fromkeys(p.name for p in block.points)
+
+    def read(self, read_block, read_blocks=None):
+        if read_blocks is None:
+            read_blocks = lambda requests: [read_block(start, count) for start, count in requests]
+
+        values = dict.fromkeys(p.name for p in self.points)
+        blocks = []
+        retry = []
+
+        results = read_blocks([(b.start, b.count) for b in self.blocks])
+        for block, regs in zip(self.blocks, results):
+            if regs is not None and payload_count(regs) >= block.count:
+                values.update(self.decode(block, regs))
+                blocks.append(block)
+            elif block.bridged:
+                retry.append(block)
+            else:
+                blocks.append(block)
+
+        if retry:
+            # 빈칸을 같이 읽다 실패 → 연속 구간별로 나눠 다시 읽음
+            # 나눈 쪽이 하나라도 성공하면 (= 장비는 응답 중) 다음 cycle 부터 나눈 계획 사용
+            split = [(block, self.build(block.points, self.max_count, 0)) for block in retry]
+            subs = [sub for _, block_subs in split for sub in block_subs]
+            results = iter(read_blocks([(sub.start, sub.count) for sub in subs]))
+            for block, block_subs in split:
+                ok = False
+                for sub in block_subs:
+                    regs = next(results)
+                    if regs is not None and payload_count(regs) >= sub.count:
+                        values.update(self.decode(sub, regs))
+                        ok = True
+                blocks.extend(block_subs if ok else [block])
+            blocks.sort(key=lambda b: b.start)
+
+        self.blocks = blocks
+        return values
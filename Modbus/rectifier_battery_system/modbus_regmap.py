@@ -0,0 +1,139 @@
+# TBC1000B 레지스터 표 (한 곳에서 관리)
+#
+# 주소 / 형식 / 배율이 GUI 마다 따로 적혀 있었음
+#   - LCD_GUI_Pannel_Master_modbus_V4 : 0xA731 / 0xA74F+i, /10
+#   - pyside6_GUI_V11_modbus          : MODBUS_CELL_VOLT_BASE_OFFSET, scale 0.001, ALARM_REGISTERS
+# 여기서는 항목마다 (이름, 주소, 형식, 배율, 단위, 그룹, 모듈 간격) 을 한 번만 적고
+# 모듈 N 주소는 addr + (N-1) * stride 로 계산한다.
+#
+# 형식 : uint16 / int16 / uint32 / int32 (상위 word 먼저) / string (count 레지스터, ASCII)
+# 배율 : 읽은 정수 × scale = 표시 값 (0.1 = /10)
+#
+#   points("module", 3)                        모듈 3 의 전압 / 전류 / SOC / 셀 값 (ReadPlan 입력)
+#   points_all("alarm", range(1, 11))          모듈 1~10 알람, 이름은 "N:항목"
+#   FIELDS["cell_volt_1"].unit                 → "V"
+
+from collections import namedtuple
+
+from modbus_plan import KIND_SIZE, reg_point
+
+MODULE_COUNT = 10
+MODULE_STRIDE = 64          # 모듈 N 데이터 / 알람 간격 (0x40)
+BARCODE_STRIDE = 32
+CELLS_PER_MODULE = 15
+
+RegField = namedtuple("RegField", "name addr kind count scale unit group stride label")
+
+
+def reg_field(name, addr, kind="uint16", count=None, scale=1, unit="", group="", stride=0, label=None):
+    """stride 가 0 이 아니면 모듈 N 항목 (addr 는 모듈 1 주소), count 는 string 만 지정"""
+    if count is None:
+        count = KIND_SIZE[kind]
+    return RegField(name, addr, kind, count, scale, unit, group, stride, label or name)
+
+
+# 모듈별 알람 (0x8431 ~ 0x843D + (N-1)*64) : (이름, 주소, 긴 이름)
+ALARM_ITEMS = [
+    ("Charge OV", 0x8431, "Charge Over Voltage"),
+    ("Charge OC", 0x8432, "Charge Over Current"),
+    ("Overdischarge", 0x8433, "Overdischarge"),
+    ("Heavy Load", 0x8434, "Heavy Load Warning"),
+    ("Rev Connection", 0x8435, "Reversely Connection"),
+    ("Over Temp", 0x8436, "Charge Over/Discharge Over Temp"),
+    ("Comm Fail", 0x8437, "Communication Failure"),
+    ("Low Temp", 0x8438, "Low Temperature"),
+    ("High Temp Prot", 0x8439, "Discharge/Charge High Temp Protection"),
+    ("Low Temp Prot", 0x843A, "Low Temperature Protection"),
+    ("Overcharge Prot", 0x843B, "Overcharge Protection"),
+    ("Overdis Prot", 0x843C, "Overdischarge Protection"),
+    ("Overcur Prot", 0x843D, "Charge/Discharge Overcurrent Protection"),
+]
+
+ABNORMAL_STATUS = {0: "normal", 1: "Fault", 2: "Protection", 3: "Communication Fail"}
+
+
+def _build_map():
+    fields = [
+        # 장치 기본 정보
+        reg_field("Manufacturer code", 0x0000, group="device_info"),
+        reg_field("Equipment type", 0x0001, group="device_info"),
+        reg_field("Protocol version", 0x0002, group="device_info"),
+        reg_field("Software version", 0x0003, group="device_info"),
+        reg_field("Hardware version", 0x0004, group="device_info"),
+        reg_field("System type", 0x0005, "string", 14, group="device_info"),
+        reg_field("Software entire version", 0x0013, "string", 14, group="device_info"),
+
+        # RTC (0x2000 ~ 0x2005)
+        reg_field("year", 0x2000, group="rtc"),
+        reg_field("month", 0x2001, group="rtc"),
+        reg_field("day", 0x2002, group="rtc"),
+        reg_field("hour", 0x2003, group="rtc"),
+        reg_field("minute", 0x2004, group="rtc"),
+        reg_field("second", 0x2005, group="rtc"),
+
+        # 배터리 공통
+        reg_field("temp", 0xA706, "int16", unit="degC", group="battery", label="Battery Temperature"),
+
+        # 모듈 N
+        reg_field("barcode", 0xC670, "string", 15, group="barcode", stride=BARCODE_STRIDE,
+                  label="Battery Barcode"),
+        reg_field("voltage", 0xA731, "uint32", scale=0.1, unit="V", group="module", stride=MODULE_STRIDE,
+                  label="Battery Voltage"),
+        reg_field("current", 0xA733, "int32", scale=0.1, unit="A", group="module", stride=MODULE_STRIDE,
+                  label="Battery Current"),
+        reg_field("soc", 0xA739, unit="%", group="module", stride=MODULE_STRIDE, label="Battery SOC"),
+    ]
+    for i in range(1, CELLS_PER_MODULE + 1):
+        fields.append(reg_field(f"cell_temp_{i}", 0xA739 + i, "int16", scale=0.1, unit="degC",
+                                group="module", stride=MODULE_STRIDE, label=f"Cell-{i} Temperature"))
+    for i in range(1, CELLS_PER_MODULE + 1):
+        fields.append(reg_field(f"cell_volt_{i}", 0xA74F + i, scale=0.001, unit="V",
+                                group="module", stride=MODULE_STRIDE, label=f"Cell-{i} Voltage"))
+
+    # 알람
+    fields.append(reg_field("missing", 0x5022, group="alarm", label="Battery Missing"))
+    fields.append(reg_field("abnormal", 0x5036, group="alarm", stride=1, label="Lithium Battery Abnormal"))
+    for name, addr, label in ALARM_ITEMS:
+        fields.append(reg_field(name, addr, group="alarm", stride=MODULE_STRIDE, label=label))
+    return fields
+
+
+REGISTER_MAP = _build_map()
+FIELDS = {field.name: field for field in REGISTER_MAP}
+
+
+def field_addr(field, n=1):
+    return field.addr + (n - 1) * field.stride
+
+
+def _point(field, name, n=1):
+    return reg_point(name, field_addr(field, n), field.kind, count=field.count, scale=field.scale)
+
+
+def group_fields(group):
+    return [field for field in REGISTER_MAP if field.group == group]
+
+
+def points(group, n=1):
+    """그룹의 RegPoint 목록 (모듈 항목은 모듈 n 주소, 이름은 그대로)"""
+    return [_point(field, field.name, n) for field in group_fields(group)]
+
+
+def points_all(group, modules=range(1, MODULE_COUNT + 1)):
+    """여러 모듈 한꺼번에 : 모듈 항목 이름은 "N:이름", 공통 항목은 한 번만"""
+    result = []
+    for field in group_fields(group):
+        if not field.stride:
+            result.append(_point(field, field.name))
+            continue
+        for n in modules:
+            result.append(_point(field, f"{n}:{field.name}", n))
+    return result
+
+
+def split_name(name):
+    """"3:voltage" → (3, "voltage"), "temp" → (None, "temp")"""
+    module, sep, base = name.partition(":")
+    if sep and module.isdigit():
+        return int(module), base
+    return None, name
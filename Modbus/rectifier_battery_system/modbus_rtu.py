@@ -0,0 +1,307 @@
+# Modbus RTU 공용 함수 (CRC-16/Modbus, 요청 frame, 응답 framer)
+#
+# count_crc 가 GUI 스크립트마다 복사되어 있었고 (bit 단위 loop, byte 당 shift 8번)
+# 수신 frame 의 CRC 는 확인하지 않았음. 여기서는 256 개 table 로 byte 당 한 번 조회하고
+# check_crc 로 모든 RX frame 을 검사한다.
+#
+# send_raw 는 client.recv(256) 으로 "1초 안에 온 만큼" 읽고 rx[3:5] 를 잘라 썼기 때문에
+# 응답이 나뉘어 오면 ([RX] 00 3C 29 같은 조각) 값이 틀리거나 timeout 까지 기다렸음.
+# RtuFramer 는 요청으로 응답 길이를 계산해 그만큼만 읽고
+#   - slave ID / function code / byte count / CRC 확인
+#   - 앞에 붙은 잡음 byte 는 버리고 다시 맞춤 (resync)
+#   - 예외 응답 (function | 0x80) 은 ModbusExceptionResponse
+# RtuSerialTransport 는 요청 사이 t3.5 (3.5 문자 시간) 간격을 지킨다.
+#
+#   from modbus_rtu import count_crc, check_crc, build_read_frame, RtuSerialTransport
+#
+# 성능 비교 : python bench_crc.py
+
+import struct
+import time
+
+CRC_POLY = 0xA001           # 0x8005 bit 반전 (LSB first)
+
+
+def _build_crc_table():
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ CRC_POLY if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC_TABLE = _build_crc_table()
+
+
+def count_crc(data, crc=0xFFFF) -> int:
+    """CRC-16/Modbus (bytes / bytearray / memoryview)
+
+    crc 에 이전 결과를 넘기면 나눠 받은 데이터를 이어서 계산할 수 있다.
+    """
+    table = CRC_TABLE
+    for b in data:
+        crc = (crc >> 8) ^ table[(crc ^ b) & 0xFF]
+    return crc
+
+
+def count_crc_view(buf, start=0, end=None) -> int:
+    """buf[start:end] 의 CRC (memoryview 로 잘라 복사 없이 계산)"""
+    return count_crc(memoryview(buf)[start:end])
+
+
+def append_crc(frame: bytes) -> bytes:
+    return frame + struct.pack("<H", count_crc(frame))
+
+
+def check_crc(frame) -> bool:
+    """수신 frame 끝 2 byte (little endian) 가 앞부분 CRC 와 같은지"""
+    if frame is None or len(frame) < 4:
+        return False
+    return count_crc_view(frame, 0, len(frame) - 2) == (frame[-2] | (frame[-1] << 8))
+
+
+def build_read_frame(slave, start_addr, count, function=0x03) -> bytes:
+    """FC03 / FC04 읽기 요청"""
+    return append_crc(struct.pack(">BBHH", slave, function, start_addr, count))
+
+# ============================
+# 응답 길이 / 시간
+# ============================
+EXCEPTION_TEXT = {
+    1: "Illegal Function",
+    2: "Illegal Data Address",
+    3: "Illegal Data Value",
+    4: "Slave Device Failure",
+    5: "Acknowledge",
+    6: "Slave Device Busy",
+    8: "Memory Parity Error",
+    10: "Gateway Path Unavailable",
+    11: "Gateway Target No Response",
+}
+
+RESPONSE_TIMEOUT = 0.5      # [s] 요청 송신 완료 후 응답 첫 byte 까지 허용 시간 (전송 시간 별도)
+BITS_PER_CHAR = 11          # start + 8 data + (parity 또는 stop) + stop
+
+
+class ModbusError(Exception):
+    """RTU 요청 실패 (timeout / 예외 응답)"""
+
+
+class ModbusTimeout(ModbusError):
+    pass
+
+
+class ModbusExceptionResponse(ModbusError):
+
+    def __init__(self, slave, function, code):
+        self.slave = slave
+        self.function = function
+        self.code = code
+        super().__init__(f"slave {slave} FC{function:02X} exception {code} "
+                         f"({EXCEPTION_TEXT.get(code, 'Unknown')})")
+
+
+def response_length(request) -> int:
+    """요청 frame → 정상 응답 frame 길이 (CRC 포함)"""
+    function = request[1]
+    if function in (0x01, 0x02):
+        quantity = (request[4] << 8) | request[5]
+        return 5 + (quantity + 7) // 8
+    if function in (0x03, 0x04):
+        quantity = (request[4] << 8) | request[5]
+        return 5 + quantity * 2
+    if function in (0x05, 0x06, 0x0F, 0x10):
+        return 8                # 주소 / 값(수량) echo
+    raise ValueError(f"지원하지 않는 function code 0x{function:02X}")
+
+
+def char_time(baudrate, bits=BITS_PER_CHAR) -> float:
+    return bits / baudrate
+
+
+def frame_gap(baudrate) -> float:
+    """t3.5 (19200 bps 초과는 규격대로 1.75ms 고정)"""
+    return 0.00175 if baudrate > 19200 else 3.5 * char_time(baudrate)
+
+
+# ============================
+# Framer
+# ============================
+class RtuFramer:
+    """수신 byte stream → expect() 한 요청에 맞는 응답 frame
+
+    feed(data) 로 받은 byte 를 넣고 pop() 으로 꺼낸다 (아직 부족하면 None).
+    needed() 는 frame 을 완성하는 데 더 필요한 최소 byte 수.
+    """
+
+    def __init__(self):
+        self.buf = bytearray()
+        self.slave = None
+        self.function = None
+        self.length = 0
+        self.discarded = 0          # resync 로 버린 byte 수 (누적)
+
+    def expect(self, request):
+        self.slave = request[0]
+        self.function = request[1]
+        self.length = response_length(request)
+        self.buf.clear()
+
+    def feed(self, data):
+        self.buf += data
+
+    def needed(self) -> int:
+        buf = self.buf
+        if len(buf) >= 2 and buf[0] == self.slave and buf[1] == self.function | 0x80:
+            return max(1, 5 - len(buf))
+        return max(1, self.length - len(buf))
+
+    def _drop(self, n=1):
+        del self.buf[:n]
+        self.discarded += n
+
+    def pop(self):
+        buf = self.buf
+        while True:
+            # slave ID 위치까지 잡음 버림
+            start = buf.find(bytes([self.slave]))
+            if start < 0:
+                self._drop(len(buf))
+                return None
+            if start:
+                self._drop(start)
+            if len(buf) < 2:
+                return None
+
+            function = buf[1]
+            if function == self.function | 0x80:
+                if len(buf) < 5:
+                    return None
+                if check_crc(buf[:5]):
+                    code = buf[2]
+                    del buf[:5]
+                    raise ModbusExceptionResponse(self.slave, self.function, code)
+                self._drop()
+                continue
+
+            if function != self.function:
+                self._drop()
+                continue
+
+            # 읽기 응답은 byte count 로 한번 더 확인 (잡음 속 우연한 slave/function 조합 걸러냄)
+            if self.function in (0x01, 0x02, 0x03, 0x04) and len(buf) >= 3 and buf[2] != self.length - 5:
+                self._drop()
+                continue
+
+            if len(buf) < self.length:
+                return None
+
+            frame = bytes(buf[:self.length])
+            if check_crc(frame):
+                del buf[:self.length]
+                return frame
+            self._drop()
+
+
+# ============================
+# Serial transport
+# ============================
+class RtuSerialTransport:
+    """pyserial 포트 (pymodbus ModbusSerialClient.socket 등) 위의 요청/응답 1회
+
+    transact(request) → 검증된 응답 frame (실패 시 ModbusError)
+    """
+
+    def __init__(self, port, baudrate=9600, response_timeout=RESPONSE_TIMEOUT):
+        self.port = port
+        self.baudrate = baudrate
+        self.response_timeout = response_timeout
+        self.gap = frame_gap(baudrate)
+        self.framer = RtuFramer()
+        self.last_activity = 0.0    # 마지막 송수신 완료 (time.monotonic)
+        self.busy_time = 0.0        # [s] 송신 시작 ~ 응답 완료 / timeout 누적 (half duplex bus 점유)
+        self.wire_time = 0.0        # [s] 실제 송수신 byte 전송 시간 누적
+
+        self.stats = {"requests": 0, "responses": 0, "timeouts": 0, "exceptions": 0, "discarded": 0}
+
+    def tx_time(self, nbytes) -> float:
+        return nbytes * char_time(self.baudrate)
+
+    def transact_many(self, requests):
+        """요청 여러 개 → [응답 frame 또는 ModbusError] (half duplex 라 차례대로)
+
+        응답이 하나도 없는 상태에서 timeout 이 나면 (slave 가 없음) 나머지는 보내지 않고 같은 오류로 채운다.
+        """
+        results = []
+        answered = False
+        for request in requests:
+            if results and not answered and isinstance(results[-1], ModbusTimeout):
+                results.append(results[-1])
+                continue
+            try:
+                results.append(self.transact(request))
+                answered = True
+            except ModbusExceptionResponse as e:
+                results.append(e)
+                answered = True
+            except ModbusError as e:
+                results.append(e)
+        return results
+
+    def transact(self, request):
+        port = self.port
+        self.stats["requests"] += 1
+
+        # 이전 frame 이후 t3.5 간격
+        wait = self.last_activity + self.gap - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        # 이전 요청의 늦은 응답 / 잡음 제거
+        if port.in_waiting:
+            port.reset_input_buffer()
+
+        self.framer.expect(request)
+        discarded = self.framer.discarded
+        started = time.monotonic()
+        received = 0
+        port.write(request)
+
+        deadline = (time.monotonic() + self.tx_time(len(request) + self.framer.length)
+                    + self.response_timeout)
+        timeout = None
+        try:
+            while True:
+                frame = self.framer.pop()
+                if frame is not None:
+                    self.stats["responses"] += 1
+                    return frame
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.stats["timeouts"] += 1
+                    raise ModbusTimeout(
+                        f"slave {request[0]} FC{request[1]:02X} 응답 없음 "
+                        f"({len(self.framer.buf)}/{self.framer.length} byte)")
+
+                # pyserial 은 timeout 을 바꿀 때마다 포트를 다시 설정함 (tcsetattr / SetCommTimeouts)
+                # → 조각마다 바꾸지 않고 남은 시간이 절반 아래로 줄었을 때만 (transaction 당 몇 번)
+                if timeout is None or remaining < timeout / 2:
+                    timeout = remaining
+                    port.timeout = timeout
+                data = port.read(self.framer.needed())
+                if data:
+                    received += len(data)
+                    self.framer.feed(data)
+
+        except ModbusExceptionResponse:
+            self.stats["exceptions"] += 1
+            raise
+
+        finally:
+            self.stats["discarded"] += self.framer.discarded - discarded
+            self.last_activity = time.monotonic()
+            self.busy_time += self.last_activity - started
+            self.wire_time += self.tx_time(len(request) + received)
@@ -0,0 +1,295 @@
+# Modbus TCP / RTU-over-TCP transport
+#
+# ModbusMaster 는 ModbusSerialClient (COM 포트) 만 썼음. UPS 는 Modbus TCP (port 502, example/Slave_modbus.py),
+# 일부 사이트는 serial-to-Ethernet gateway (RTU frame 을 TCP 로 그대로 전달) 를 거쳐야 함.
+# 두 방식 모두 RtuSerialTransport 와 같은 모양으로 쓴다.
+#   transact(request)        RTU 요청 frame (CRC 포함) → 검증된 RTU 응답 frame (실패 시 ModbusError)
+#   transact_many(requests)  → [응답 frame 또는 ModbusError] (요청 순서)
+#
+# RTU-over-TCP : socket 을 pyserial 포트 모양 (SocketPort) 으로 감싸 RtuSerialTransport 를 그대로 씀
+#                (TID 가 없으므로 한 번에 한 요청)
+# Modbus TCP   : RTU frame → MBAP header (transaction ID, unit ID) + PDU 로 바꿔 보내고,
+#                응답은 unit + PDU + CRC 로 되돌려 주므로 PollWorker / ReadPlan 의 rx[3:] 해석이 그대로 맞음.
+#                transact_many 는 요청을 max_outstanding 개까지 한꺼번에 보내고 (pipelining)
+#                응답은 transaction ID 로 짝을 맞춘다 → 원격 polling 이 요청마다 왕복 1회에 묶이지 않음.
+#
+#   open_transport("tcp://10.0.0.5:502")
+#   open_transport("rtu+tcp://10.0.0.6:4001", baudrate=9600)
+
+import select
+import socket
+import struct
+import time
+
+from modbus_rtu import (
+    ModbusError, ModbusExceptionResponse, ModbusTimeout, RtuSerialTransport,
+    append_crc, response_length,
+)
+
+MODBUS_TCP_PORT = 502
+CONNECT_TIMEOUT = 3.0       # [s]
+TCP_RESPONSE_TIMEOUT = 1.0  # [s] 네트워크 왕복 포함
+MAX_OUTSTANDING = 8         # 동시에 보내 둘 요청 수 (장비 / gateway 한도에 맞춰 조정)
+
+TCP_SCHEMES = ("tcp://", "rtu+tcp://")
+
+
+def is_tcp_target(target) -> bool:
+    return str(target).lower().startswith(TCP_SCHEMES)
+
+
+def parse_tcp_target(target):
+    """"tcp://host:port" → (scheme, host, port)
+
+    IPv6 는 "tcp://[fe80::1]:502" / "tcp://[::1]" / "tcp://fe80::1" (port 없으면 502)
+    """
+    scheme, _, rest = target.partition("://")
+    if rest.startswith("["):
+        host, sep, tail = rest[1:].partition("]")
+        if not sep or (tail and not tail.startswith(":")):
+            raise ValueError(f"TCP 주소 형식 오류: {target}")
+        port = tail[1:] or MODBUS_TCP_PORT
+    elif rest.count(":") > 1:
+        # 괄호 없는 IPv6 주소 → port 지정 불가
+        host, port = rest, MODBUS_TCP_PORT
+    else:
+        host, sep, port = rest.partition(":")
+        if not sep:
+            port = MODBUS_TCP_PORT
+    if not host:
+        raise ValueError(f"TCP 주소 형식 오류: {target}")
+    try:
+        port = int(port)
+    except ValueError:
+        raise ValueError(f"TCP port 형식 오류: {target}")
+    return scheme.lower(), host, port
+
+
+def open_transport(target, baudrate=9600):
+    """"tcp://..." → ModbusTcpTransport, "rtu+tcp://..." → RtuOverTcpTransport (연결까지)"""
+    scheme, host, port = parse_tcp_target(target)
+    if scheme == "tcp":
+        return ModbusTcpTransport(host, port)
+    return RtuOverTcpTransport(host, port, baudrate)
+
+
+# ============================
+# RTU over TCP
+# ============================
+class SocketPort:
+    """TCP socket 을 RtuSerialTransport 가 쓰는 pyserial 포트 모양으로"""
+
+    def __init__(self, sock):
+        self.sock = sock
+        self._timeout = None
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._timeout = value
+        self.sock.settimeout(value)
+
+    @property
+    def in_waiting(self) -> int:
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        return 1 if readable else 0
+
+    def reset_input_buffer(self):
+        while self.in_waiting:
+            if not self.sock.recv(4096):
+                raise ConnectionError("gateway 연결 끊김")
+
+    def write(self, data):
+        self.sock.sendall(data)
+
+    def read(self, size) -> bytes:
+        try:
+            data = self.sock.recv(size)
+        except socket.timeout:
+            return b""
+        if not data:
+            raise ConnectionError("gateway 연결 끊김")
+        return data
+
+    def close(self):
+        self.sock.close()
+
+
+class RtuOverTcpTransport(RtuSerialTransport):
+    """serial-to-Ethernet gateway : RTU frame (CRC 포함) 을 TCP 로 그대로 송수신
+
+    gateway 뒤 RS-485 는 그대로 half duplex 이므로 pipelining 없이 한 번에 한 요청.
+    t3.5 / 응답 대기 시간 계산에는 gateway 의 serial baudrate 를 쓴다.
+    """
+
+    def __init__(self, host, port, baudrate=9600, response_timeout=TCP_RESPONSE_TIMEOUT):
+        self.address = (host, port)
+        super().__init__(self._open(), baudrate, response_timeout)
+        self.stats["reconnects"] = 0
+
+    def _open(self):
+        sock = socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return SocketPort(sock)
+
+    def transact(self, request):
+        try:
+            if self.port is None:
+                self.stats["reconnects"] += 1
+                self.port = self._open()
+            return super().transact(request)
+        except OSError as e:
+            # 연결 끊김 → 다음 요청에서 다시 연결
+            self.close()
+            raise ModbusError(f"{self.address[0]}:{self.address[1]} 연결 오류: {e}")
+
+    def close(self):
+        if self.port is not None:
+            self.port.close()
+            self.port = None
+
+
+# ============================
+# Modbus TCP
+# ============================
+class ModbusTcpTransport:
+    """Modbus TCP (MBAP) : transaction ID 로 응답을 맞추고 여러 요청을 동시에 보냄"""
+
+    def __init__(self, host, port=MODBUS_TCP_PORT, response_timeout=TCP_RESPONSE_TIMEOUT,
+                 max_outstanding=MAX_OUTSTANDING):
+        self.address = (host, port)
+        self.response_timeout = response_timeout
+        self.max_outstanding = max(1, max_outstanding)
+        self.sock = None
+        self.buf = bytearray()
+        self.tid = 0
+        self.busy_time = 0.0
+        self.wire_time = 0.0        # TCP 는 RS-485 선 점유가 없음 (사용률 표시용으로 0 유지)
+        self.stats = {"requests": 0, "responses": 0, "timeouts": 0, "exceptions": 0,
+                      "discarded": 0, "reconnects": 0}
+        self.connect()
+
+    def connect(self):
+        self.close()
+        self.sock = socket.create_connection(self.address, timeout=CONNECT_TIMEOUT)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buf.clear()
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+
+    def _next_tid(self):
+        self.tid = (self.tid + 1) & 0xFFFF
+        return self.tid
+
+    def transact(self, request):
+        result = self.transact_many([request])[0]
+        if isinstance(result, ModbusError):
+            raise result
+        return result
+
+    def transact_many(self, requests):
+        results = [None] * len(requests)
+        if not requests:
+            return results
+
+        started = time.monotonic()
+        try:
+            if self.sock is None:
+                self.stats["reconnects"] += 1
+                self.connect()
+
+            pending = {}            # tid → 요청 번호
+            queue = list(range(len(requests)))
+            deadline = None
+            while queue or pending:
+                # 창 크기만큼 채워서 보냄
+                frames = []
+                while queue and len(pending) < self.max_outstanding:
+                    i = queue.pop(0)
+                    tid = self._next_tid()
+                    pending[tid] = i
+                    frames.append(self._encode(tid, requests[i]))
+                    self.stats["requests"] += 1
+                if frames:
+                    self.sock.sendall(b"".join(frames))
+                    deadline = time.monotonic() + self.response_timeout
+
+                tid, unit, pdu = self._read_adu(deadline)
+                if tid is None:
+                    # 남은 요청 모두 timeout (응답이 늦게 오면 TID 가 맞지 않아 버려짐)
+                    for i in list(pending.values()) + queue:
+                        self.stats["timeouts"] += 1
+                        results[i] = ModbusTimeout(
+                            f"unit {requests[i][0]} FC{requests[i][1]:02X} 응답 없음 ({self.address[0]})")
+                    break
+
+                i = pending.pop(tid, None)
+                if i is None:
+                    self.stats["discarded"] += 1
+                    continue
+                results[i] = self._decode(requests[i], unit, pdu)
+
+        except OSError as e:
+            # 연결 끊김 → 다음 요청에서 다시 연결
+            self.close()
+            error = ModbusError(f"{self.address[0]}:{self.address[1]} 연결 오류: {e}")
+            results = [error if r is None else r for r in results]
+
+        finally:
+            self.busy_time += time.monotonic() - started
+        return results
+
+    # ---------- frame 변환 ----------
+    @staticmethod
+    def _encode(tid, request):
+        """RTU 요청 (unit + PDU + CRC) → MBAP + PDU"""
+        pdu = request[1:-2]
+        return struct.pack(">HHHB", tid, 0, len(pdu) + 1, request[0]) + pdu
+
+    def _decode(self, request, unit, pdu):
+        """응답 PDU → RTU 모양 frame (unit + PDU + CRC) 또는 ModbusError"""
+        function = request[1]
+        if unit != request[0] or not pdu:
+            self.stats["discarded"] += 1
+            return ModbusError(f"unit {request[0]} 응답 unit / PDU 불일치")
+        if pdu[0] == function | 0x80 and len(pdu) >= 2:
+            self.stats["exceptions"] += 1
+            return ModbusExceptionResponse(unit, function, pdu[1])
+        frame = append_crc(bytes([unit]) + pdu)
+        if pdu[0] != function or len(frame) != response_length(request):
+            self.stats["discarded"] += 1
+            return ModbusError(f"unit {unit} FC{function:02X} 응답 길이 / function 불일치")
+        self.stats["responses"] += 1
+        return frame
+
+    def _read_adu(self, deadline):
+        """MBAP frame 하나 → (tid, unit, pdu), deadline 초과 시 (None, None, None)"""
+        while True:
+            if len(self.buf) >= 7:
+                tid, protocol, length, unit = struct.unpack_from(">HHHB", self.buf)
+                if protocol != 0 or not 2 <= length <= 254:
+                    # 흐름이 어긋남 → 버퍼를 비우고 남은 요청은 timeout 처리
+                    self.stats["discarded"] += len(self.buf)
+                    self.buf.clear()
+                elif len(self.buf) >= 6 + length:
+                    pdu = bytes(self.buf[7:6 + length])
+                    del self.buf[:6 + length]
+                    return tid, unit, pdu
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None, None, None
+            self.sock.settimeout(remaining)
+            try:
+                data = self.sock.recv(4096)
+            except socket.timeout:
+                return None, None, None
+            if not data:
+                raise ConnectionError("연결 끊김")
+            self.buf += data
@@ -6,6 +6,7 @@ import time
 import logging
 from logging.handlers import RotatingFileHandler
 import serial.tools.list_ports
+from collections import namedtuple
 from functools import partial
 from datetime import datetime
 
@@ -20,17 +21,19 @@ from pymodbus.client import ModbusSerialClient
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from modbus_bus import SlaveState
+from modbus_cache import RegisterCache
+from modbus_plan import ReadPlan, reg_point
+from modbus_regmap import (
+    ALARM_ITEMS, CELLS_PER_MODULE, FIELDS, MODULE_COUNT, field_addr, group_fields, points,
+)
+
 # ---------------------------
-# 장치 기본 정보 레지스터
+# 장치 기본 정보 레지스터 (modbus_regmap 공용 표에서)
 # ---------------------------
 DEVICE_INFO_REGS = {
-    "Manufacturer code": (0x0000, 1, "UNIT16"),
-    "Equipment type": (0x0001, 1, "UNIT16"),
-    "Protocol version": (0x0002, 1, "UNIT16"),
-    "Software version": (0x0003, 1, "UNIT16"),
-    "Hardware version": (0x0004, 1, "UNIT16"),
-    "System type": (0x0005, 14, "String"),  # 0x0005~0x0012 = 14 words = 28 bytes
-    "Software entire version": (0x0013, 14, "String"),  # 0x0013~0x0020
+    field.name: (field.addr, field.count, "String" if field.kind == "string" else "UNIT16")
+    for field in group_fields("device_info")
 }
 
 # ---------------------------
@@ -39,53 +42,54 @@ DEVICE_INFO_REGS = {
 ALARM_REGISTERS = {}
 
 # 1) 고정 주소 알람
-ALARM_REGISTERS.update({
-    "Battery Missing": 0x5022,  # MA (0x00: normal; 0x01: alarm)
-})
+ALARM_REGISTERS[FIELDS["missing"].label] = FIELDS["missing"].addr  # MA (0x00: normal; 0x01: alarm)
 
 # 2) Lithium Battery 1~10
-for n in range(1, 11):
-    ALARM_REGISTERS[f"Lithium Battery {n} Abnormal"] = 0x5036 + (n - 1) * 1
+for n in range(1, MODULE_COUNT + 1):
+    ALARM_REGISTERS[f"Lithium Battery {n} Abnormal"] = field_addr(FIELDS["abnormal"], n)
 
 # 3) 0x8431+(N-1)*64 패턴 (10개씩 확장)
-for n in range(1, 11):
-    base = 0x8431 + (n - 1) * 64
-    ALARM_REGISTERS.update({
-        f"Charge Over Voltage {n}": base,
-        f"Charge Over Current {n}": base + 1,
-        f"Overdischarge {n}": base + 2,
-        f"Heavy Load Warning {n}": base + 3,
-        f"Reversely Connection {n}": base + 4,
-        f"Charge Over/Discharge Over Temp {n}": base + 5,
-        f"Communication Failure {n}": base + 6,
-        f"Low Temperature {n}": base + 7,
-        f"Discharge/Charge High Temp Protection {n}": base + 8,
-        f"Low Temperature Protection {n}": base + 9,
-        f"Overcharge Protection {n}": base + 10,
-        f"Overdischarge Protection {n}": base + 11,
-        f"Charge/Discharge Overcurrent Protection {n}": base + 12,
-    })
+for n in range(1, MODULE_COUNT + 1):
+    for name, _, label in ALARM_ITEMS:
+        ALARM_REGISTERS[f"{label} {n}"] = field_addr(FIELDS[name], n)
 
 # ---------------------------
-# 설정 (업데이트된 주소 적용)
+# 설정
 # ---------------------------
-MODULE_COUNT = 10
-CELLS_PER_MODULE = 15
+MODBUS_SLAVE_ID = 33
 
-# 새 테이블 기준:
-MODBUS_MODULE_BASE = 0xA731
-MODBUS_MODULE_STRIDE = 0x40  # (64 decimal)
+# ---------------------------
+# 레지스터 cache (그룹별 TTL [s])
+# ---------------------------
+# module 은 poll 주기가 바뀌면 주기의 2배로 맞춤 (poller 가 정상이면 화면은 항상 cache 에서)
+CACHE_TTL = {
+    "module": 10.0,
+    "alarm": 2.0,
+    "device_info": None,    # 연결 중에는 바뀌지 않음
+}
+
+# 모듈 하나의 읽은 값 (AcquisitionWorker → GUI)
+ModuleData = namedtuple("ModuleData", "module cell_vs cell_ts voltage current soc temp simulated")
 
-# 새 전압 및 온도 시작 오프셋
-MODBUS_CELL_TEMP_BASE_OFFSET = 0xA73A - MODBUS_MODULE_BASE  # 0x09
-MODBUS_CELL_VOLT_BASE_OFFSET = 0xA750 - MODBUS_MODULE_BASE  # 0x1F
 
-MODBUS_CELL_TEMP_OFFSET_STEP = 1
-MODBUS_CELL_VOLT_OFFSET_STEP = 1
+def module_data(module_number, values):
+    """ReadPlan 결과 → ModuleData (셀 값 / 모듈 전압 중 하나라도 없으면 None)"""
+    cell_vs = [values.get(f"cell_volt_{i}") for i in range(1, CELLS_PER_MODULE + 1)]
+    cell_ts = [values.get(f"cell_temp_{i}") for i in range(1, CELLS_PER_MODULE + 1)]
+    mod_v = values.get("voltage")
+    if any(v is None for v in cell_vs) or any(t is None for t in cell_ts) or mod_v is None:
+        return None
+    mod_t = sum(cell_ts) / len(cell_ts)
+    return ModuleData(module_number, cell_vs, cell_ts, mod_v, values.get("current"), values.get("soc"),
+                      mod_t, False)
 
-BATTERY_VOLTAGE_OFFSET = 0xA731 - MODBUS_MODULE_BASE  # 0
-BATTERY_CURRENT_OFFSET = 0xA733 - MODBUS_MODULE_BASE  # 2
-BATTERY_SOC_OFFSET = 0xA739 - MODBUS_MODULE_BASE      # 8
+
+def simulated_module_data(module_number):
+    """읽기 실패 / 미연결 시 표시용 가상 값"""
+    cell_vs = [3.65 + 0.01 * module_number + 0.001 * i for i in range(CELLS_PER_MODULE)]
+    cell_ts = [25.0 + module_number * 0.5 + 0.1 * i for i in range(CELLS_PER_MODULE)]
+    return ModuleData(module_number, cell_vs, cell_ts, sum(cell_vs), None, None,
+                      sum(cell_ts) / len(cell_ts), True)
 
 # ---------------------------
 # 세부 팝업창 (셀 1~15)
@@ -193,6 +197,175 @@ class ModbusLogWorker:
                 self.emitter.new_txrx.emit(time_str, direction, data)
 
 
+# ---------------------------
+# 백그라운드 수집 워커 (Modbus 읽기 전용 스레드)
+# ---------------------------
+class AcquisitionWorker(QObject):
+    """요청 큐를 읽어 Modbus 읽기를 백그라운드에서 수행하고 결과를 시그널로 UI에 전달한다.
+
+    GUI 스레드는 request() 로 요청만 넣고 바로 돌아간다. 재시도 대기 / back-off 도 이 스레드에서 하므로
+    응답 없는 장비 (요청당 timeout × 재시도) 에서도 화면이 멈추지 않는다.
+    같은 요청이 아직 큐에 있으면 다시 넣지 않는다 (bus 가 느려도 요청이 쌓이지 않음).
+    """
+    module_signal = Signal(object)      # ModuleData
+    alarm_signal = Signal(object)       # {알람 이름: 값 (읽기 실패 시 None)}
+    device_signal = Signal(object)      # {장치 정보 이름: 값}
+    activity_signal = Signal(str)       # "TX" / "RX" (상태 박스 표시)
+
+    def __init__(self, cache, slave_id=MODBUS_SLAVE_ID, log=None, txrx_log=None):
+        super().__init__()
+        self.cache = cache
+        self.slave_id = slave_id
+        self.log = log or logging.info
+        self.txrx_log = txrx_log or (lambda direction, data: None)
+        self.retries = 2
+        self.retry_delay = 0.2          # seconds (재시도마다 2배)
+        self.client = None
+        self.state = SlaveState(slave_id)
+
+        # 읽기 계획은 이 스레드만 사용 (ReadPlan 은 실패 시 묶음을 나누며 바뀜)
+        self.module_plans = {n: ReadPlan(points("module", n)) for n in range(1, MODULE_COUNT + 1)}
+        self.alarm_plan = ReadPlan([reg_point(name, addr) for name, addr in ALARM_REGISTERS.items()])
+        self.device_plan = ReadPlan(points("device_info"))
+
+        self._q = queue.Queue()
+        self._pending = set()
+        self._pending_lock = threading.Lock()
+        self._running = True
+        self._thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self._thread.start()
+
+    def request(self, kind, arg=None, refresh=False):
+        """kind : "modules" / "module" (arg = 모듈 번호) / "alarms" / "device_info" """
+        item = (kind, arg, refresh)
+        with self._pending_lock:
+            if item in self._pending:
+                return
+            self._pending.add(item)
+        self._q.put(item)
+
+    def set_client(self, client):
+        """연결 / 해제 (이전 client 는 이 스레드에서 닫음 → 읽는 도중 닫히지 않음)"""
+        self._q.put(("__client__", client, None))
+
+    def stop(self):
+        self._running = False
+        self._q.put(("__stop__", None, None))
+        self._thread.join(timeout=2)
+
+    def _worker_loop(self):
+        while self._running:
+            try:
+                kind, arg, refresh = self._q.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            if kind == "__stop__":
+                break
+            if kind == "__client__":
+                self._swap_client(arg)
+                continue
+            with self._pending_lock:
+                self._pending.discard((kind, arg, refresh))
+            try:
+                if kind == "modules":
+                    for n in range(1, MODULE_COUNT + 1):
+                        if not self._running:
+                            break
+                        self.module_signal.emit(self.read_module_data(n, refresh))
+                elif kind == "module":
+                    self.module_signal.emit(self.read_module_data(arg, refresh))
+                elif kind == "alarms":
+                    reader = self.cache.reader(self.slave_id, "alarm", self.read_blocks, refresh)
+                    self.alarm_signal.emit(self.alarm_plan.read(None, reader))
+                elif kind == "device_info":
+                    reader = self.cache.reader(self.slave_id, "device_info", self.read_blocks, refresh)
+                    self.device_signal.emit(self.device_plan.read(None, reader))
+            except Exception:
+                logging.exception(f"Acquisition request {kind} failed")
+
+        self._swap_client(None)
+
+    def _swap_client(self, client):
+        old = self.client
+        self.client = client
+        if old is not None and old is not client:
+            try:
+                old.close()
+            except Exception:
+                logging.exception("Failed to close Modbus client")
+        self.state = SlaveState(self.slave_id)
+        self.cache.invalidate()
+
+    # ---------------------------
+    # 레지스터 읽기 (재시도 / back-off 포함)
+    # ---------------------------
+    def read_registers(self, address, count=1):
+        """FC03 한 번 → 레지스터 list (모든 시도 실패 시 None)"""
+        client = self.client
+        if client is None:
+            return None
+        last_exc = None
+        for attempt in range(self.retries + 1):
+            if not self._running:
+                return None
+            try:
+                self.activity_signal.emit("TX")
+                self.txrx_log("TX", f"Read @0x{address:04X}, count={count}")
+                rr = client.read_holding_registers(address=address, count=count, slave=self.slave_id)
+                self.activity_signal.emit("RX")
+                if rr is None or (hasattr(rr, "isError") and rr.isError()):
+                    last_exc = Exception("No response / Modbus error")
+                    raise last_exc
+                regs = list(rr.registers) if hasattr(rr, "registers") and rr.registers else []
+                if len(regs) < count:
+                    last_exc = Exception(f"Short response ({len(regs)}/{count})")
+                    raise last_exc
+                self.txrx_log("RX", " ".join(f"{word:04X}" for word in regs))
+                return regs
+            except Exception as e:
+                last_exc = e
+                logging.debug(f"Read register attempt {attempt} failed: {e}")
+                # 재시도 전 대기 (시도마다 2배)
+                if attempt < self.retries:
+                    time.sleep(self.retry_delay * 2 ** attempt)
+        # 모든 시도 실패
+        logging.error(f"Failed to read register 0x{address:04X} after {self.retries + 1} attempts: {last_exc}")
+        self.txrx_log("ERR", f"Read @0x{address:04X} failed: {last_exc}")
+        return None
+
+    def read_blocks(self, requests):
+        """[(start, count)] → [레지스터 list 또는 None] (ReadPlan / RegisterCache 용)
+
+        첫 묶음부터 응답이 없으면 나머지는 보내지 않고, 연속 실패 시 back-off 동안 bus 를 쉰다.
+        """
+        results = [None] * len(requests)
+        if self.client is None or time.monotonic() < self.state.next_try:
+            return results
+
+        answered = False
+        for i, (start, count) in enumerate(requests):
+            results[i] = self.read_registers(start, count)
+            if results[i] is not None:
+                answered = True
+            elif not answered:
+                break
+
+        if answered:
+            if self.state.on_success():
+                self.log(f"✅ Slave {self.slave_id} responding again")
+        else:
+            self.state.on_failure(time.monotonic())
+            if self.state.status == "backoff":
+                self.log(f"⚠ Slave {self.slave_id} not responding - retry in {self.state.backoff:.0f}s")
+        return results
+
+    def read_module_data(self, module_number, refresh=False):
+        """cache 경유 (TTL 지난 묶음만 다시 읽음), refresh=True 면 bus 에서 새로 읽어 cache 갱신"""
+        reader = self.cache.reader(self.slave_id, "module", self.read_blocks, refresh)
+        values = self.module_plans[module_number].read(None, reader)
+        return module_data(module_number, values) or simulated_module_data(module_number)
+
+
 # ---------------------------
 # 로깅 설정 (파일, 로테이팅)
 # ---------------------------
@@ -219,6 +392,13 @@ class ModbusGUI(QWidget):
         self.setWindowTitle("Modbus RTU GUI with Alarms + Battery + TX/RX Log")
         self.resize(1700, 950)
         self.client = None
+        self.slave_id = MODBUS_SLAVE_ID
+
+        # 레지스터 cache (수집 워커가 채우고 화면은 cache 에서)
+        self.cache = RegisterCache(CACHE_TTL)
+        # 화면용 cache 조회 계획 (bus 는 쓰지 않음, 워커의 계획과 따로)
+        self.view_plans = {n: ReadPlan(points("module", n)) for n in range(1, MODULE_COUNT + 1)}
+        self.pending_detail = None      # 워커 결과를 기다리는 상세 창 모듈 번호
 
         # 설정값 (UI로 변경 가능)
         self.log_file_path = os.path.join(os.path.dirname(__file__), "modbus_gui.log")
@@ -234,6 +414,16 @@ class ModbusGUI(QWidget):
         self.log_emitter.new_log.connect(self._append_log_to_widget)
         self.log_emitter.new_txrx.connect(self._append_txrx_row)
 
+        # Modbus 수집 워커 (읽기 / 재시도는 모두 백그라운드 스레드)
+        self.acq_worker = AcquisitionWorker(self.cache, self.slave_id, log=self.log_message,
+                                            txrx_log=self.add_txrx_log)
+        self.acq_worker.retries = self.modbus_retries
+        self.acq_worker.retry_delay = self.modbus_retry_delay
+        self.acq_worker.module_signal.connect(self.update_module_row)
+        self.acq_worker.alarm_signal.connect(self.show_alarms)
+        self.acq_worker.device_signal.connect(self.show_device_info)
+        self.acq_worker.activity_signal.connect(self.flash_activity)
+
         # 기본: TX/RX 로그를 기본적으로 "중지" 상태로 설정
         self.log_enabled = False
 
@@ -243,7 +433,7 @@ class ModbusGUI(QWidget):
         self.alarm_timer.timeout.connect(self.read_alarms)
         self.module_poll_timer = QTimer()
         self.module_poll_timer.setInterval(5000)
-        self.module_poll_timer.timeout.connect(self.update_module_table)
+        self.module_poll_timer.timeout.connect(self.poll_modules)
         self.module_poll_timer.start()
 
         # 전체 레이아웃
@@ -411,7 +601,7 @@ class ModbusGUI(QWidget):
         self.populate_ports()
         self.update_buttons(False)
         self.module_table.cellClicked.connect(self.handle_module_table_click)
-        self.update_module_table()
+        self.poll_modules()
 
     # ---------------------------
     # 앱 종료 시 워커 중지
@@ -422,6 +612,12 @@ class ModbusGUI(QWidget):
         except Exception:
             pass
 
+    def stop_acq_worker(self):
+        try:
+            self.acq_worker.stop()
+        except Exception:
+            pass
+
     # ---------------------------
     # 로그 위젯에 직접 추가 (메인스레드에서 실행되어야 함)
     # ---------------------------
@@ -445,6 +641,12 @@ class ModbusGUI(QWidget):
         self.rx_box.setStyleSheet("background-color: green; color: white; font-weight: bold;")
         QTimer.singleShot(2000, lambda: self.rx_box.setStyleSheet("background-color: gray; color: white;"))
 
+    def flash_activity(self, direction):
+        if direction == "TX":
+            self.flash_tx()
+        else:
+            self.flash_rx()
+
      # ---------------------------
     # Device Info 읽기
     # ---------------------------
@@ -456,19 +658,11 @@ class ModbusGUI(QWidget):
                 self.device_table.setItem(row, 2, QTableWidgetItem("N/A"))
             return
 
+        self.acq_worker.request("device_info")
+
+    def show_device_info(self, values):
         for row, (name, (addr, count, dtype)) in enumerate(DEVICE_INFO_REGS.items()):
-            val = None
-            if dtype == "UNIT16":
-                val = self.read_register(addr)
-            elif dtype == "String":
-                chars = []
-                for i in range(count):
-                    word = self.read_register(addr + i)
-                    if word is None:
-                        continue
-                    chars.append(chr((word >> 8) & 0xFF))
-                    chars.append(chr(word & 0xFF))
-                val = "".join(chars).strip()
+            val = values.get(name)
             self.device_table.setItem(row, 0, QTableWidgetItem(name))
             self.device_table.setItem(row, 1, QTableWidgetItem(f"0x{addr:04X}"))
             self.device_table.setItem(row, 2, QTableWidgetItem(str(val) if val else "N/A"))
@@ -493,11 +687,7 @@ class ModbusGUI(QWidget):
         if module_num == 11:
             self.log_message("⚠️배터리 모듈 영역이 아닙니다.")
             return 
-        if self.detail_dialog is not None and self.detail_dialog.isVisible():
-            self.detail_dialog.close()
-        cell_vs, cell_ts, mod_v, mod_t = self.read_module_data(module_num)
-        self.detail_dialog = ModuleDetailDialog(self, module_num, cell_vs, cell_ts)
-        self.detail_dialog.show()
+        self.show_module_detail(module_num)
 
     # ---------------------------
     # 포트 관련
@@ -532,9 +722,12 @@ class ModbusGUI(QWidget):
         try:
             self.client = ModbusSerialClient(port=port, baudrate=baud, stopbits=1, bytesize=8, parity='N', timeout=1)
             if self.client.connect():
+                self.acq_worker.set_client(self.client)
                 self.log_message(f"✅ Connected to {port} @ {baud}bps")
                 QMessageBox.information(self, "Connected", f"✅ {port} 연결 성공!")
                 self.update_buttons(True)
+                self.update_device_info_table()
+                self.poll_modules()
             else:
                 self.client = None
                 self.log_message(f"❌ Failed to connect to {port}")
@@ -547,7 +740,8 @@ class ModbusGUI(QWidget):
     def disconnect_modbus(self):
         if self.client:
             try:
-                self.client.close()
+                # 읽는 도중 닫히지 않도록 워커가 닫음
+                self.acq_worker.set_client(None)
                 self.client = None
                 self.log_message("✅ Modbus disconnected")
                 QMessageBox.information(self, "Disconnected", "✅ Modbus 연결 해제 완료")
@@ -560,84 +754,50 @@ class ModbusGUI(QWidget):
         self.update_buttons(False)
 
     # ---------------------------
-    # 레지스터 읽기 (재시도 로직 포함)
-    # ---------------------------
-    def read_register(self, address, count=1, slave=33, signed=False, scale=1):
-        if not self.client:
-            return None
-        last_exc = None
-        for attempt in range(self.modbus_retries + 1):
-            try:
-                self.flash_tx()
-                self.add_txrx_log("TX", f"Read @0x{address:04X}, count={count}")
-                rr = self.client.read_holding_registers(address=address, count=count, slave=slave)
-                self.flash_rx()
-                if rr is None or (hasattr(rr, "isError") and rr.isError()):
-                    last_exc = Exception("No response / Modbus error")
-                    raise last_exc
-                val = rr.registers[0] if hasattr(rr, "registers") and rr.registers else None
-                if val is not None:
-                    self.add_txrx_log("RX", f"0x{val:04X}")
-                if signed and val is not None and val > 0x7FFF:
-                    val -= 0x10000
-                return val * scale if val is not None else None
-            except Exception as e:
-                last_exc = e
-                logging.debug(f"Read register attempt {attempt} failed: {e}")
-                # 짧은 대기 후 재시도
-                if attempt < self.modbus_retries:
-                    time.sleep(self.modbus_retry_delay)
-        # 모든 시도 실패
-        logging.error(f"Failed to read register 0x{address:04X} after {self.modbus_retries + 1} attempts: {last_exc}")
-        self.add_txrx_log("ERR", f"Read @0x{address:04X} failed: {last_exc}")
-        return None
-
-    # ---------------------------
-    # 모듈 데이터 읽기 (주소 체계 반영)
+    # 모듈 데이터 (cache 에 있으면 바로, 없으면 워커에 요청)
     # ---------------------------
-    def read_module_data(self, module_number):
-        base = MODBUS_MODULE_BASE + (module_number - 1) * MODBUS_MODULE_STRIDE
-        cell_vs, cell_ts = [], []
-
-        for i in range(CELLS_PER_MODULE):
-            addr = base + MODBUS_CELL_VOLT_BASE_OFFSET + i * MODBUS_CELL_VOLT_OFFSET_STEP
-            v = self.read_register(addr, scale=0.001)
-            cell_vs.append(v)
-
-        for i in range(CELLS_PER_MODULE):
-            addr = base + MODBUS_CELL_TEMP_BASE_OFFSET + i * MODBUS_CELL_TEMP_OFFSET_STEP
-            t = self.read_register(addr, signed=True, scale=0.1)
-            cell_ts.append(t)
-
-        mod_v = self.read_register(base + BATTERY_VOLTAGE_OFFSET, count=2, scale=0.001)
-        mod_t = sum(t for t in cell_ts if t is not None) / len(cell_ts)
-
-        if any(v is None for v in cell_vs) or any(t is None for t in cell_ts) or mod_v is None:
-            cell_vs = [3.65 + 0.01 * module_number + 0.001 * i for i in range(CELLS_PER_MODULE)]
-            cell_ts = [25.0 + module_number * 0.5 + 0.1 * i for i in range(CELLS_PER_MODULE)]
-            mod_v = sum(cell_vs)
-            mod_t = sum(cell_ts) / len(cell_ts)
+    def cached_module_data(self, module_number):
+        """TTL 안의 cache 값만으로 ModuleData (bus 는 쓰지 않음, 없으면 None)"""
+        values = self.view_plans[module_number].read(None, self.cache.reader(self.slave_id, "module"))
+        return module_data(module_number, values)
+
+    def show_module_detail(self, module_number):
+        data = self.cached_module_data(module_number)
+        if data is None:
+            # 워커 결과 (update_module_row) 에서 열림
+            self.pending_detail = module_number
+            self.acq_worker.request("module", module_number)
+            return
+        self.open_detail_dialog(data)
 
-        return cell_vs, cell_ts, mod_v, mod_t
+    def open_detail_dialog(self, data):
+        if self.detail_dialog is not None and self.detail_dialog.isVisible():
+            self.detail_dialog.close()
+        self.detail_dialog = ModuleDetailDialog(self, data.module, data.cell_vs, data.cell_ts)
+        self.detail_dialog.show()
 
     def handle_module_table_click(self, row, col):
         if row + 1 == 11:
             self.log.append("⚠️ Module 11은 배터리 모듈이 아닙니다.")
             return
         if col in [1, 2]:
-            cell_vs, cell_ts, mod_v, mod_t = self.read_module_data(row + 1)
-            self.detail_dialog = ModuleDetailDialog(self, row + 1, cell_vs, cell_ts)
-            self.detail_dialog.show()
+            self.show_module_detail(row + 1)
 
     # ---------------------------
     # 모듈 테이블 업데이트
     # ---------------------------
-    def update_module_table(self):
-        for i in range(MODULE_COUNT):
-            cell_vs, cell_ts, mod_v, mod_t = self.read_module_data(i + 1)
-            self.module_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
-            self.module_table.setItem(i, 1, QTableWidgetItem(f"{mod_v:.2f}" if mod_v is not None else "N/A"))
-            self.module_table.setItem(i, 2, QTableWidgetItem(f"{mod_t:.1f}" if mod_t is not None else "N/A"))
+    def poll_modules(self):
+        """주기 poller : 모듈 전체를 bus 에서 새로 읽어 cache 를 채우도록 워커에 요청 (표는 결과 시그널로 갱신)"""
+        self.acq_worker.request("modules", refresh=bool(self.client))
+
+    def update_module_row(self, data):
+        i = data.module - 1
+        self.module_table.setItem(i, 0, QTableWidgetItem(str(data.module)))
+        self.module_table.setItem(i, 1, QTableWidgetItem(f"{data.voltage:.2f}" if data.voltage is not None else "N/A"))
+        self.module_table.setItem(i, 2, QTableWidgetItem(f"{data.temp:.1f}" if data.temp is not None else "N/A"))
+        if self.pending_detail == data.module:
+            self.pending_detail = None
+            self.open_detail_dialog(data)
 
     # ---------------------------
     # 알람 읽기
@@ -647,15 +807,12 @@ class ModbusGUI(QWidget):
             self.log_message("❌ Not connected - cannot read alarms")
             return
         self.log_message("=== Reading Alarms ===")
-        alarm_found = False
-        int_items = [(k, v) for k, v in ALARM_REGISTERS.items() if isinstance(v, int)]
-        str_items = [(k, v) for k, v in ALARM_REGISTERS.items() if not isinstance(v, int)]
+        self.acq_worker.request("alarms")
 
-        for name, addr in sorted(int_items, key=lambda kv: kv[1]) + str_items:
-            if isinstance(addr, str):
-                self.log_message(f"ℹ️ {name} uses calculated address expression: {addr}")
-                continue
-            val = self.read_register(addr)
+    def show_alarms(self, values):
+        alarm_found = False
+        for name, addr in sorted(ALARM_REGISTERS.items(), key=lambda kv: kv[1]):
+            val = values[name]
             if val is None:
                 continue
             if isinstance(val, (int, float)) and int(val) != 0:
@@ -682,6 +839,7 @@ class ModbusGUI(QWidget):
     # ---------------------------
     def change_poll_interval(self, val):
         self.module_poll_timer.setInterval(val * 1000)
+        self.cache.ttl["module"] = 2.0 * val
         self.log_message(f"Module poll interval set to {val}s")
 
     # ---------------------------
@@ -705,10 +863,12 @@ class ModbusGUI(QWidget):
 
     def change_retries(self, val):
         self.modbus_retries = val
+        self.acq_worker.retries = val
         self.log_message(f"Modbus retries set to {val}")
 
     def change_retry_delay(self, ms):
         self.modbus_retry_delay = ms / 1000.0
+        self.acq_worker.retry_delay = self.modbus_retry_delay
         self.log_message(f"Modbus retry delay set to {self.modbus_retry_delay}s")
 
     # ---------------------------
@@ -744,6 +904,7 @@ class ModbusGUI(QWidget):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     gui = ModbusGUI()
+    app.aboutToQuit.connect(gui.stop_acq_worker)
     app.aboutToQuit.connect(gui.stop_log_worker)
     gui.show()
     sys.exit(app.exec())
@@ -6,21 +6,7 @@ from PySide6.QtWidgets import *
 from PySide6.QtCore import QTimer
 from PySide6.QtCore import Qt
 
-# ============================
-# CRC (C 코드 그대로 포팅)
-# ============================
-def count_crc(data: bytes) -> int:
-    crc = 0xFFFF
-    for b in data:
-        crc ^= b
-        for _ in range(8):
-            if crc & 0x0001:
-                crc >>= 1
-                crc ^= 0xA001
-            else:
-                crc >>= 1
-    return crc & 0xFFFF
-
+from modbus_rtu import check_crc, count_crc
 
 # ============================
 # Modbus RTU Frame 생성
@@ -151,7 +137,8 @@ class BMSMonitor(QWidget):
         self.ser.write(frame)
         time.sleep(0.1)
         rx = self.ser.read(100)
-        return rx
+        # CRC 가 맞지 않는 응답은 값으로 쓰지 않음 (호출부는 길이 부족과 같이 처리)
+        return rx if check_crc(rx) else b""
 
     # ============================
     # Polling
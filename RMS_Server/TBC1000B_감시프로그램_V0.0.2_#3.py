@@ -6,33 +6,44 @@
 #--exclude-module pandas --exclude-module scipy --exclude-module IPython --exclude-module jupyter #--exclude-module notebook --exclude-module test ^
 #--exclude-module unittest --exclude-module email --exclude-module http TBC1000B_감시프로그램_V0.0.1.py
 
+import startup_timing
 import sys
-import subprocess
-import platform
+
+# --headless 는 Qt 없이 엔진만 실행 → PySide6 import 전에 분기
+if __name__ == "__main__" and "--headless" in sys.argv[1:]:
+    import tbc_engine
+    sys.exit(tbc_engine.main())
+
 import os
 import re
 from datetime import datetime
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget,
-    QVBoxLayout, QHBoxLayout, QGroupBox,
-    QLabel, QTableWidget, QTableWidgetItem,
-    QPushButton, QRadioButton, QLineEdit,
-    QDialog, QDialogButtonBox, QListWidget, QFormLayout, QMessageBox,
-    QSizePolicy, QHeaderView
-)
-from PySide6.QtCore import Qt, QTimer, QThread, Signal, QSettings
-from PySide6.QtGui import QColor, QFont
-from pysnmp.hlapi import *
-
-from pysnmp.hlapi import *
-from pysnmp.entity import engine, config
-from pysnmp.carrier.asyncore.dgram import udp
-from pysnmp.entity.rfc3413 import ntfrcv
-import asyncore
-from datetime import datetime
-from collections import deque
-import psutil
-import threading
+
+startup_timing.mark("stdlib imports")
+
+with startup_timing.measure("import PySide6"):
+    from PySide6.QtWidgets import (
+        QApplication, QMainWindow, QWidget,
+        QVBoxLayout, QHBoxLayout, QGroupBox,
+        QLabel, QTableWidget, QTableWidgetItem,
+        QPushButton, QLineEdit,
+        QDialog, QDialogButtonBox, QListWidget, QListWidgetItem, QFormLayout, QMessageBox,
+        QFileDialog, QComboBox,
+        QSizePolicy, QHeaderView, QTableView, QStyledItemDelegate,
+        QStyleOptionButton, QStyle, QStyleFactory
+    )
+    from PySide6.QtCore import (
+        Qt, QTimer, Signal, QSettings, QEvent, QObject,
+        QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+    )
+    from PySide6.QtGui import QColor, QFont, QBrush, QPen, QPainter, QPalette
+
+# pysnmp 는 tbc_engine 안에서 접속시작 시점에 지연 로드, psutil 은 첫 자원 갱신 시 로드
+with startup_timing.measure("import tbc_engine"):
+    from tbc_engine import (
+        MonitorEngine, equip_to_module, build_arg_parser, run_headless,
+        start_metrics, PROFILE_DEFAULTS, MODE_POLL, MODE_TRAP, TRAP_MODE_HEARTBEAT
+    )
+    from tbc_inventory import InventoryCache, inventory_path
 import time
 # =======================================================================================================================
 # Application Info
@@ -47,7 +58,6 @@ APP_VERSION = f"v{VERSION_MAJOR}.{VERSION_MINOR}.{VERSION_PATCH}"
 #########################################################################################################################
 
 MAX_TRAP_LOG = 1000
-TRAP_QUEUE_SIZE = 2000
 
 
 DEBUG_FLAGS = {
@@ -64,26 +74,31 @@ DEBUG_FLAGS = {
 #    "ALARM": True
 #}
 
-LABEL_BG = QColor("#E7F1FF")
-
-FAULT_ALARMS = [
-    "Board hardware fault",
-    "Cell 1 Fault",
-    "Cell 2 Fault",
-    "Cell 3 Fault",
-    "Cell 4 Fault",
-    "Cell 5 Fault",
-    "Cell 6 Fault",
-    "Cell 7 Fault",
-    "Cell 8 Fault",
-    "Cell 9 Fault",
-    "Cell 10 Fault",
-    "Cell 11 Fault",
-    "Cell 12 Fault",
-    "Cell 13 Fault",
-    "Cell 14 Fault",
-    "Cell 15 Fault"
-]
+# 요약 테이블 충전차단 라벨
+SUMMARY_ALARM_LABELS = {
+    "overcharge": "과전압 충전차단",
+    "high_temp": "고온 충전차단",
+    "overcurrent": "과전류 충전차단",
+}
+
+# LED / 접속상태 표시 색
+LED_OFF = "#505050"
+LED_TX = "#00c853"
+LED_RX_POLL = "#00c853"
+LED_RX_TRAP = "#ff9800"
+
+STATUS_IDLE = "#CCCCCC"
+STATUS_OK = "#2ECC71"
+STATUS_ERROR = "#FF6B6B"
+STATUS_DEGRADED = "#FFA94D"
+
+# 통신 상태 (tbc_health) → (접속상태 표시, LED 색)
+HEALTH_VIEW = {
+    "healthy": ("정상", STATUS_OK),
+    "degraded": ("지연", STATUS_DEGRADED),
+    "open": ("차단", STATUS_ERROR),
+    "half_open": ("재확인", STATUS_ERROR),
+}
 
 def dprint(flag, *args):
     if DEBUG_FLAGS.get(flag, False):
@@ -94,61 +109,616 @@ def log(msg):
     print(f"[{now}] {msg}")
     
 # ======================
-# Ping 기능
+# 테이블 모델 (셀 단위 변경 렌더링)
 # ======================
-def ping_host(ip):
-    param = "-n" if platform.system().lower() == "windows" else "-c"
-    try:
-        result = subprocess.run(["ping", param, "1", ip], capture_output=True, text=True, timeout=2)
-        return result.returncode == 0
-    except subprocess.TimeoutExpired:
+# 값 셀 스타일 키 → (배경, 글자색)
+# QBrush/QFont 는 한 번만 만들어 재사용 (poll 마다 QColor 생성 안함)
+CELL_STYLES = {
+    "차단": (QBrush(QColor("#FF6B6B")), QBrush(QColor("white"))),
+    "이상": (QBrush(QColor("#FF6B6B")), QBrush(QColor("white"))),
+    "경보": (QBrush(QColor("#FFA94D")), None),
+    "정상": (QBrush(QColor("#B2F2BB")), QBrush(QColor("black"))),
+    "label": (QBrush(QColor(220, 235, 255)), None),
+    # 오래된 값 (trap 위주 모드 등에서 walk 결과가 stale_after 보다 오래됨)
+    "stale": (QBrush(QColor("#E9ECEF")), QBrush(QColor("#868E96"))),
+    # 고장 정보 테이블
+    "fault": (QBrush(QColor("#F25F5C")), QBrush(QColor("white"))),
+    "board": (QBrush(QColor("#555555")), QBrush(QColor("white"))),
+}
+
+MODULE_STATUS_MAP = {
+    0: ("Online", "#B2F2BB"),
+    1: ("Offline", "#FF6B6B"),
+    2: ("Sleep", "#CED4DA"),
+    3: ("Disconnect", "#FF6B6B"),
+    4: ("충전중", "#B2F2BB"),
+    5: ("방전중", "#4DABF7"),
+    6: ("Standby", "#FFD43B"),
+    255: ("Unknown", "#CED4DA")
+}
+
+for _text, _color in MODULE_STATUS_MAP.values():
+    _fg = "white" if _color in ("#FF6B6B", "#4DABF7") else "black"
+    CELL_STYLES.setdefault(_color, (QBrush(QColor(_color)), QBrush(QColor(_fg))))
+
+BOLD_FONT = QFont()
+BOLD_FONT.setBold(True)
+
+MODULE_NO_ROLE = Qt.UserRole + 1
+
+
+def stale_cell_style(style, stale, role):
+    """Background / Foreground role 값 (stale 이면 글자는 회색, 색 없는 셀은 배경도 회색)"""
+    if role not in (Qt.BackgroundRole, Qt.ForegroundRole):
+        return None
+    if stale:
+        key = "stale" if style is None or role == Qt.ForegroundRole else style
+    else:
+        key = style
+    if key is None:
+        return None
+    bg, fg = CELL_STYLES[key]
+    return bg if role == Qt.BackgroundRole else fg
+
+
+class ModuleTableModel(QAbstractTableModel):
+    """모듈 상태 테이블 모델
+
+    행 = 모듈 번호(1부터), 열 = 전압 / 셀 Max/Min / 온도 Max/Min / 경보 / 통신상태 / 상세.
+    update_snapshot() 은 이전 값과 비교해서 바뀐 셀에 대해서만 dataChanged 를 보낸다.
+    모듈 수는 snapshot 에 따라 늘어난다 (10개 초과 지원).
+    """
+
+    HEADERS = ["모듈", "모듈 전압", "셀 전압 Max/Min[V]", "셀 온도 Max/Min[℃]", "경보", "통신상태", "모듈(셀)"]
+    COL_DETAIL = 6
+
+    def __init__(self, module_count=10, parent=None):
+        super().__init__(parent)
+        # row → [(text, style_key), ...]
+        self._rows = []
+        self._enabled = []
+        self._stale = False
+        self._resize(module_count)
+
+    def _blank_row(self, module_no):
+        return [
+            (f"#{module_no:02d}", None),
+            ("-", None),
+            ("- / -", None),
+            ("- / -", None),
+            ("-", None),
+            ("-", None),
+            ("상세", None),
+        ]
+
+    def _resize(self, count):
+        start = len(self._rows)
+        if count <= start:
+            return
+        if start:
+            self.beginInsertRows(QModelIndex(), start, count - 1)
+        for row in range(start, count):
+            self._rows.append(self._blank_row(row + 1))
+            self._enabled.append(False)
+        if start:
+            self.endInsertRows()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.HEADERS[section]
+            if role == Qt.FontRole:
+                return BOLD_FONT
+        return None
+
+    def flags(self, index):
+        if index.column() == self.COL_DETAIL and not self._enabled[index.row()]:
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        text, style = self._rows[index.row()][index.column()]
+
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == MODULE_NO_ROLE:
+            return index.row() + 1
+        return stale_cell_style(style, self._stale and index.column() != 0, role)
+
+    def set_stale(self, stale):
+        """값이 오래됨 → 회색 표시 (모듈 번호 열 제외)"""
+        if stale == self._stale:
+            return
+        self._stale = stale
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 1), self.index(len(self._rows) - 1, len(self.HEADERS) - 1))
+
+    def _set_cell(self, row, col, text, style=None):
+        if self._rows[row][col] == (text, style):
+            return
+        self._rows[row][col] = (text, style)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+
+    def update_snapshot(self, module_map, module_data, alarm_modules):
+        """decode 된 poll 결과로 테이블 갱신 (변경된 셀만 repaint)"""
+
+        if module_map:
+            self._resize(max(module_map))
+
+        for module_no, info in module_map.items():
+
+            # 모듈 번호는 1 부터 (0 / 음수는 row -1 로 마지막 행을 덮어씀)
+            if module_no < 1:
+                continue
+
+            data = module_data.get(info["equip_id"])
+            if not data:
+                continue
+
+            row = module_no - 1
+
+            if data["volt"] is not None:
+                self._set_cell(row, 1, f"{data['volt']:.1f}")
+
+            cells = [v for v in data["cells"] if v is not None]
+            if cells:
+                self._set_cell(row, 2, f"{max(cells):.2f} / {min(cells):.2f}")
+
+            temps = [v for v in data["temps"] if v is not None]
+            if temps:
+                self._set_cell(row, 3, f"{max(temps):.1f} / {min(temps):.1f}")
+
+            if module_no in alarm_modules:
+                self._set_cell(row, 4, "이상", "이상")
+            else:
+                self._set_cell(row, 4, "정상")
+
+            if data["status"] is not None:
+                status_text, color = MODULE_STATUS_MAP.get(
+                    data["status"],
+                    ("Unknown", "#CED4DA")
+                )
+                self._set_cell(row, 5, status_text, color)
+
+                # 상세 버튼 활성화
+                self._enable_detail(row)
+
+    def _enable_detail(self, row):
+        if not self._enabled[row]:
+            self._enabled[row] = True
+            index = self.index(row, self.COL_DETAIL)
+            self.dataChanged.emit(index, index)
+
+    def set_inventory(self, module_map):
+        """캐시된 inventory 의 모듈은 첫 poll 전에도 상세 버튼 활성화"""
+        if module_map:
+            self._resize(max(module_map))
+        for module_no in module_map:
+            self._enable_detail(module_no - 1)
+
+
+class ModuleRangeProxy(QSortFilterProxyModel):
+    """모듈 모델의 일부 행만 보여주는 proxy (좌측 1~5 / 우측 6~)"""
+
+    def __init__(self, first_row, last_row=None, parent=None):
+        super().__init__(parent)
+        self.first_row = first_row
+        self.last_row = last_row
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if source_row < self.first_row:
+            return False
+        return self.last_row is None or source_row <= self.last_row
+
+
+class SummaryTableModel(QAbstractTableModel):
+    """시스템 요약 정보 모델 (라벨 행 / 값 행 교대, 4 블록 x 5 열)"""
+
+    LABELS = [
+        ["설비번호", "운용 관리자", "제조사", "모델명", "시리얼번호"],
+        ["Rack 전압[V]", "SOC 충전율[%]", "Max 전압[V]", "Min 전압[V]", "Avg 전압[V]"],
+        ["Rack 전류[A]", "충방전 횟수", "Max 온도[℃]", "Min 온도[℃]", "Avg 온도[℃]"],
+        ["과전압 충전차단", "고온 충전차단", "과전류 충전차단", "Fuse 상태", "충전 릴레이"]
+    ]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._cells = []
+        self._stale = False
+        # 🔥 summary 값 위치 매핑
+        self.position_map = {}
+
+        for block, labels in enumerate(self.LABELS):
+            self._cells.append([(text, "label") for text in labels])
+            self._cells.append([("-", None) for _ in labels])
+
+            for col, text in enumerate(labels):
+                self.position_map[text] = (block * 2 + 1, col)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._cells)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.LABELS[0])
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        text, style = self._cells[index.row()][index.column()]
+
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.FontRole and style == "label":
+            return BOLD_FONT
+        # 측정값 블록(1~3)만 오래된 값 표시, 설비 정보 블록은 그대로
+        stale = self._stale and style != "label" and index.row() >= 2
+        return stale_cell_style(style, stale, role)
+
+    def set_stale(self, stale):
+        if stale == self._stale:
+            return
+        self._stale = stale
+        self.dataChanged.emit(self.index(2, 0), self.index(len(self._cells) - 1, len(self.LABELS[0]) - 1))
+
+    def set_value(self, label, text, status=None):
+        """label 위치의 값 셀 갱신. 값/상태가 같으면 아무것도 하지 않음"""
+        if label not in self.position_map:
+            return
+
+        style = None
+        if status:
+            for key in ("차단", "경보", "이상", "정상"):
+                if key in status:
+                    style = key
+                    break
+
+        row, col = self.position_map[label]
+        if self._cells[row][col] == (text, style):
+            return
+
+        self._cells[row][col] = (text, style)
+        index = self.index(row, col)
+        self.dataChanged.emit(index, index)
+
+
+class FaultTableModel(QAbstractTableModel):
+    """고장 정보 모델 : (module, cell) → record  (cell 0 = Board hardware fault)
+
+    key 로 바로 찾으므로 추가 / 갱신 / 중복 확인은 행 검색 없이 처리한다.
+    Fault 번호(#NN)는 행 위치로 그리기 때문에 삭제 후 번호를 다시 매기지 않는다.
+    삭제 버튼은 ButtonDelegate 가 그린다.
+    """
+
+    HEADERS = ["Fault", "고장 모듈 No", "고장 셀 No", "고장 셀 전압[V]", "고장 셀 온도[℃]", "삭제"]
+    COL_DELETE = 5
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._keys = []             # 표시 순서 (발생 순)
+        self._records = {}          # key → record
+        self._row_of = {}           # key → row
+        self._by_module = {}        # module_no → {key, ...}
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._records
+
+    def keys(self):
+        return list(self._keys)
+
+    def key_at(self, row):
+        return self._keys[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._keys)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.HEADERS[section]
+            if role == Qt.FontRole:
+                return BOLD_FONT
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        row, col = index.row(), index.column()
+        record = self._records[self._keys[row]]
+        board = record["cell"] == 0
+
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return f"#{row + 1:02d}"
+            if col == 1:
+                return str(record["module"])
+            if col == 2:
+                return "(Board hardware fault)" if board else str(record["cell"])
+            if col == 3:
+                return "-" if board else f"{record['volt']:.2f}"
+            if col == 4:
+                return "-" if board else f"{record['temp']:.1f}"
+            return "삭제"
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == Qt.ToolTipRole and record["alarm"]:
+            return f"{record['alarm']} ({record['alarm_time']})"
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole) and col != self.COL_DELETE:
+            # Board fault 는 Fault / 모듈 열만 빨강, 나머지는 어두운 회색
+            bg, fg = CELL_STYLES["board" if board and col >= 2 else "fault"]
+            return bg if role == Qt.BackgroundRole else fg
+        return None
+
+    # ---------- 변경 ----------
+    def add(self, module_no, cell_no, volt, temp):
+        """새 고장 추가 (이미 있으면 False)"""
+        key = (module_no, cell_no)
+        if key in self._records:
+            return False
+
+        row = len(self._keys)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._keys.append(key)
+        self._records[key] = {
+            "module": module_no, "cell": cell_no,
+            "volt": volt or 0, "temp": temp or 0,
+            "alarm": None, "alarm_time": None,
+        }
+        self._row_of[key] = row
+        self._by_module.setdefault(module_no, set()).add(key)
+        self.endInsertRows()
+        return True
+
+    def update(self, key, volt, temp):
+        """전압 / 온도 갱신 (바뀐 경우만 해당 셀 repaint)"""
+        record = self._records.get(key)
+        if record is None or (record["volt"], record["temp"]) == (volt or 0, temp or 0):
+            return
+        record["volt"], record["temp"] = volt or 0, temp or 0
+        row = self._row_of[key]
+        self.dataChanged.emit(self.index(row, 3), self.index(row, 4))
+
+    def set_module_alarm(self, module_no, text, time_text):
+        """해당 모듈 고장 행에 최근 알람 표시 (tooltip)"""
+        for key in self._by_module.get(module_no, ()):
+            record = self._records[key]
+            if (record["alarm"], record["alarm_time"]) == (text, time_text):
+                continue
+            record["alarm"], record["alarm_time"] = text, time_text
+            row = self._row_of[key]
+            self.dataChanged.emit(self.index(row, 0), self.index(row, self.COL_DELETE - 1))
+
+    def remove(self, keys):
+        """여러 고장을 한번에 삭제 (연속 행은 한번의 beginRemoveRows 로)"""
+        rows = sorted((self._row_of[k] for k in keys if k in self._records), reverse=True)
+        if not rows:
+            return
+
+        # 뒤에서부터 연속 구간 단위로 제거
+        start = end = rows[0]
+        for row in rows[1:] + [None]:
+            if row is not None and row == start - 1:
+                start = row
+                continue
+            self.beginRemoveRows(QModelIndex(), start, end)
+            for key in self._keys[start:end + 1]:
+                record = self._records.pop(key)
+                module_keys = self._by_module[record["module"]]
+                module_keys.discard(key)
+                if not module_keys:
+                    del self._by_module[record["module"]]
+            del self._keys[start:end + 1]
+            self.endRemoveRows()
+            if row is not None:
+                start = end = row
+
+        self._row_of = {key: row for row, key in enumerate(self._keys)}
+
+        # 뒤 행의 Fault 번호(#NN) 는 행 위치로 그리므로 표시만 갱신
+        if self._keys:
+            first = min(rows[-1], len(self._keys) - 1)
+            self.dataChanged.emit(self.index(first, 0), self.index(len(self._keys) - 1, 0))
+
+
+class ButtonDelegate(QStyledItemDelegate):
+    """셀 위젯 대신 직접 그리는 버튼 (행마다 QPushButton 생성 안함)"""
+
+    clicked = Signal(QModelIndex)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pressed = None
+
+    def paint(self, painter, option, index):
+        opt = QStyleOptionButton()
+        opt.rect = option.rect.adjusted(2, 2, -2, -2)
+        opt.text = index.data(Qt.DisplayRole) or ""
+
+        if index.flags() & Qt.ItemIsEnabled:
+            opt.state = QStyle.State_Enabled
+            if self._pressed == (index.row(), index.column()):
+                opt.state |= QStyle.State_Sunken
+            else:
+                opt.state |= QStyle.State_Raised
+        else:
+            opt.state = QStyle.State_None
+
+        style = option.widget.style() if option.widget else QApplication.style()
+        style.drawControl(QStyle.CE_PushButton, opt, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if not (index.flags() & Qt.ItemIsEnabled):
+            return False
+
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed = (index.row(), index.column())
+            return True
+
+        if event.type() == QEvent.MouseButtonRelease:
+            pressed = self._pressed
+            self._pressed = None
+            if pressed == (index.row(), index.column()) and option.rect.contains(event.position().toPoint()):
+                self.clicked.emit(index)
+            return True
+
         return False
 
-def apply_label_style(item: QTableWidgetItem):
-    item.setBackground(LABEL_BG)
-    item.setFont(QFont("", weight=QFont.Bold))
-    item.setTextAlignment(Qt.AlignCenter)
-
-def apply_value_style(item: QTableWidgetItem, status: str):
-    item.setTextAlignment(Qt.AlignCenter)
-    if "차단" in status:
-        item.setBackground(QColor("#FF6B6B"))
-        item.setForeground(QColor("white"))
-    elif "경보" in status:
-        item.setBackground(QColor("#FFA94D"))
-    elif "정상" in status:
-        item.setBackground(QColor("#B2F2BB"))
-
-class PingThread(QThread):
-    ping_result = Signal(bool, str)
-    def __init__(self, ip):
-        super().__init__()
-        self.ip = ip
-        self.running = True
-        
-    def run(self):
-        while self.running:
-            success = ping_host(self.ip)
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            self.ping_result.emit(success, current_time)
-            self.msleep(1000)
-            
-    def stop(self):
-        self.running = False
+# ======================
+# 화면 갱신 스케줄러 (60Hz frame tick)
+# ======================
+class RenderScheduler(QObject):
+    """UI 갱신을 모아서 frame 당 최대 1회 적용
 
-        if hasattr(self, "snmpEngine") and self.snmpEngine is not None:
-            try:
-                self.snmpEngine.transportDispatcher.jobFinished(1)
-            except:
-                pass
+    mark(key, fn)        : 다음 frame 에서 fn 실행 (같은 key 는 마지막 것만)
+    mark_later(ms, key, fn) : ms 후 frame 에서 fn 실행 (LED off 등)
+    every(ms, key, fn)   : 주기 실행 (blink, 리소스 표시)
+
+    할 일이 없으면 timer 를 멈추고 다음 deadline 까지 잠든다.
+    """
+
+    FRAME_MS = 16
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._dirty = {}
+        self._delayed = {}     # key → (deadline, fn)
+        self._periodic = {}    # key → [period, next_deadline, fn]
+        self._last_frame = 0.0
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._frame)
+
+    def mark(self, key, fn):
+        self._dirty[key] = fn
+        self._schedule()
+
+    def mark_later(self, delay_ms, key, fn):
+        self._delayed[key] = (time.monotonic() + delay_ms / 1000.0, fn)
+        self._schedule()
+
+    def cancel(self, key):
+        self._dirty.pop(key, None)
+        self._delayed.pop(key, None)
+        self._periodic.pop(key, None)
+
+    def every(self, period_ms, key, fn):
+        if key in self._periodic:
+            return
+        period = period_ms / 1000.0
+        self._periodic[key] = [period, time.monotonic() + period, fn]
+        self._schedule()
+
+    def is_periodic(self, key):
+        return key in self._periodic
+
+    def _schedule(self):
+        now = time.monotonic()
+
+        if self._dirty:
+            wake = max(now, self._last_frame + self.FRAME_MS / 1000.0)
+        else:
+            deadlines = [d for d, _ in self._delayed.values()]
+            deadlines += [p[1] for p in self._periodic.values()]
+            if not deadlines:
+                self._timer.stop()
+                return
+            wake = min(deadlines)
 
+        delay = max(0, int((wake - now) * 1000))
+
+        if self._timer.isActive() and self._timer.remainingTime() <= delay:
+            return
+        self._timer.start(delay)
+
+    def _frame(self):
+        now = time.monotonic()
+        self._last_frame = now
+
+        for key, (deadline, fn) in list(self._delayed.items()):
+            if deadline <= now:
+                del self._delayed[key]
+                self._dirty[key] = fn
+
+        for key, entry in self._periodic.items():
+            period, deadline, fn = entry
+            if deadline <= now:
+                # 늦게 깨어나도 밀린 횟수만큼 몰아서 실행하지 않음
+                entry[1] = max(deadline + period, now)
+                self._dirty[key] = fn
+
+        dirty, self._dirty = self._dirty, {}
+        for fn in dirty.values():
             try:
-                self.snmpEngine.transportDispatcher.closeDispatcher()
-            except:
-                pass
+                fn()
+            except Exception as e:
+                dprint("MODULE", "RENDER ERROR:", e)
+
+        self._schedule()
+
 
-        self.quit()
-        self.wait(1000)
+class LedWidget(QWidget):
+    """stylesheet 대신 캐시된 QBrush 로 직접 그리는 LED / 상태 표시등"""
+
+    _brushes = {}
+
+    def __init__(self, width, height, radius, color, border=None, parent=None):
+        super().__init__(parent)
+        self.setFixedSize(width, height)
+        self._radius = radius
+        self._color = None
+        self._pen = QPen(QColor(border)) if border else QPen(Qt.NoPen)
+        self.set_color(color)
+
+    @classmethod
+    def brush(cls, color):
+        b = cls._brushes.get(color)
+        if b is None:
+            b = cls._brushes[color] = QBrush(QColor(color))
+        return b
+
+    def set_color(self, color):
+        # 색이 같으면 repaint 요청 안함
+        if color == self._color:
+            return
+        self._color = color
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self._pen)
+        painter.setBrush(self.brush(self._color))
+        painter.drawRoundedRect(self.rect().adjusted(0, 0, -1, -1), self._radius, self._radius)
+        painter.end()
 
 # ======================
 # Module 상세정보 다이얼로그
@@ -172,22 +742,21 @@ class ModuleDetailDialog(QDialog):
         # ======================================================
         module_info = self.parent_ui.module_map.get(module_no)
 
-        if module_info:
-            equip_id = module_info["equip_id"]
-            swver_txt = module_info["swver"]
-            model_txt = module_info["model"]
-            barcode_txt = module_info["barcode"]
-            
-        if not equip_id:
+        if not module_info or not module_info["equip_id"]:
             QMessageBox.warning(self, "데이터 없음", "해당 모듈의 Equip ID를 찾을 수 없습니다.")
-            return       
-
-        module_data = self.parent_ui.module_data.get(equip_id)
-            
-        if not module_data:
-            QMessageBox.warning(self, "데이터 없음", "SNMP 데이터가 아직 수신되지 않았습니다.")
             return
 
+        equip_id = module_info["equip_id"]
+        swver_txt = module_info["swver"]
+        model_txt = module_info["model"]
+        barcode_txt = module_info["barcode"]
+
+        # 첫 poll 전 (inventory 캐시만 있음) → 측정값은 '-' 로 표시
+        module_data = self.parent_ui.module_data.get(equip_id) or {
+            "cells": [None] * 15,
+            "temps": [None] * 15,
+        }
+
         # ======================================================
         # 2️⃣ 상단 정보 영역
         # ======================================================
@@ -222,6 +791,8 @@ class ModuleDetailDialog(QDialog):
             label_barcode = QLabel('5.바코드: <span style="color:red;">-</span>')
         # 🔹 마우스 드래그 선택 + 복사 가능
         label_barcode.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        label_swver = QLabel(f"6.SW 버전: {swver_txt or '-'}")
+        label_model = QLabel(f"7.모델: {model_txt or '-'}")
         label_cell_legend = QLabel(
             '※ 셀 전압: '
             '<span style="background-color:#D3F9D8;"> 최고 </span> '
@@ -236,6 +807,8 @@ class ModuleDetailDialog(QDialog):
         info_layout.addWidget(label_soc)
         info_layout.addWidget(label_soh)
         info_layout.addWidget(label_barcode)
+        info_layout.addWidget(label_swver)
+        info_layout.addWidget(label_model)
         info_layout.addWidget(label_cell_legend)
         #info_layout.addStretch()
 
@@ -337,23 +910,49 @@ class ProfileDialog(QDialog):
         self.profile_dir = profile_dir
         self.selected_profile_path = None
         self.new_profile_data = None
+        self.fleet_selected = False
 
         layout = QVBoxLayout(self)
 
         layout.addWidget(QLabel("저장된 설치장소 + 시스템"))
 
+        # 검색어 + 제조사 필터 (색인에서 바로 찾음)
+        search_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("검색 (설치장소 / 시스템 / IP / 제조사 / 모델)")
+        self.maker_combo = QComboBox()
+        search_layout.addWidget(self.search_edit, 1)
+        search_layout.addWidget(self.maker_combo)
+        layout.addLayout(search_layout)
+
         self.profile_list = QListWidget()
+        self.profile_list.setUniformItemSizes(True)
         layout.addWidget(self.profile_list)
 
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
+        from tbc_profiles import ProfileIndex
+        self.profile_index = ProfileIndex(profile_dir)
         self.load_profiles()
 
+        self.search_edit.textChanged.connect(self.apply_filter)
+        self.maker_combo.currentIndexChanged.connect(self.apply_filter)
+        self.profile_list.itemDoubleClicked.connect(self.accept_selection)
+
         btn_layout = QHBoxLayout()
 
         self.new_btn = QPushButton("신규 생성")
         self.delete_btn = QPushButton("삭제")
+        self.fleet_btn = QPushButton("전체 감시")
+        self.import_btn = QPushButton("CSV 가져오기")
+        self.export_btn = QPushButton("CSV 내보내기")
 
         btn_layout.addWidget(self.new_btn)
         btn_layout.addWidget(self.delete_btn)
+        btn_layout.addWidget(self.fleet_btn)
+        btn_layout.addWidget(self.import_btn)
+        btn_layout.addWidget(self.export_btn)
 
         layout.addLayout(btn_layout)
 
@@ -362,17 +961,87 @@ class ProfileDialog(QDialog):
 
         self.new_btn.clicked.connect(self.create_new_profile)
         self.delete_btn.clicked.connect(self.delete_profile)
+        self.fleet_btn.clicked.connect(self.select_fleet)
+        self.import_btn.clicked.connect(self.import_csv)
+        self.export_btn.clicked.connect(self.export_csv)
         buttons.accepted.connect(self.accept_selection)
         buttons.rejected.connect(self.reject)
 
     def load_profiles(self):
-        if not os.path.exists(self.profile_dir):
-            os.makedirs(self.profile_dir)
+        # 바뀐 ini 만 다시 읽어서 색인 갱신
+        self.profile_index.refresh()
+
+        current = self.maker_combo.currentText()
+        self.maker_combo.blockSignals(True)
+        self.maker_combo.clear()
+        self.maker_combo.addItem("제조사 전체", "")
+        for maker in self.profile_index.distinct("maker"):
+            self.maker_combo.addItem(maker, maker)
+        self.maker_combo.setCurrentIndex(max(0, self.maker_combo.findText(current)))
+        self.maker_combo.blockSignals(False)
+
+        self.apply_filter()
+
+    def apply_filter(self):
+        results = self.profile_index.search(
+            self.search_edit.text(), maker=self.maker_combo.currentData()
+        )
 
+        self.profile_list.setUpdatesEnabled(False)
         self.profile_list.clear()
-        files = [f for f in os.listdir(self.profile_dir) if f.endswith(".ini")]
-        for f in files:
-            self.profile_list.addItem(f.replace(".ini", ""))
+        for name, entry in results:
+            text = name[:-len(".ini")]
+            if entry.get("ip"):
+                text += f"    ({entry['ip']})"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, name[:-len(".ini")])
+            if entry.get("last_connected"):
+                item.setToolTip(f"최근 접속 : {entry['last_connected']}")
+            self.profile_list.addItem(item)
+        self.profile_list.setUpdatesEnabled(True)
+
+        self.count_label.setText(f"{len(results)} / {len(self.profile_index.entries)}")
+
+    def import_csv(self):
+        from tbc_profiles import ProfileImportError
+
+        path, _ = QFileDialog.getOpenFileName(self, "사이트 목록 CSV 가져오기", "", "CSV (*.csv)")
+        if not path:
+            return
+
+        overwrite = QMessageBox.question(
+            self, "CSV 가져오기", "같은 이름의 프로파일이 있으면 덮어쓰시겠습니까?",
+            QMessageBox.Yes | QMessageBox.No, QMessageBox.No
+        ) == QMessageBox.Yes
+
+        try:
+            count = self.profile_index.import_csv(path, overwrite=overwrite)
+        except ProfileImportError as e:
+            QMessageBox.warning(self, "가져오기 실패 (변경 없음)", str(e))
+            return
+        except OSError as e:
+            QMessageBox.warning(self, "가져오기 실패 (변경 없음)", str(e))
+            return
+
+        self.load_profiles()
+        QMessageBox.information(self, "CSV 가져오기", f"{count}개 프로파일 생성")
+
+    def export_csv(self):
+        path, _ = QFileDialog.getSaveFileName(self, "사이트 목록 CSV 내보내기", "profiles.csv", "CSV (*.csv)")
+        if not path:
+            return
+
+        # 현재 검색 결과만 내보냄
+        names = [
+            self.profile_list.item(i).data(Qt.UserRole) + ".ini"
+            for i in range(self.profile_list.count())
+        ]
+        try:
+            count = self.profile_index.export_csv(path, names)
+        except OSError as e:
+            QMessageBox.warning(self, "내보내기 실패", str(e))
+            return
+        QMessageBox.information(self, "CSV 내보내기", f"{count}개 프로파일 저장")
 
     def delete_profile(self):
         current = self.profile_list.currentItem()
@@ -380,7 +1049,7 @@ class ProfileDialog(QDialog):
             QMessageBox.warning(self, "삭제 오류", "삭제할 프로파일을 선택하세요.")
             return
 
-        name = current.text()
+        name = current.data(Qt.UserRole)
         reply = QMessageBox.question(
             self,
             "삭제 확인",
@@ -423,10 +1092,14 @@ class ProfileDialog(QDialog):
             self.selected_profile_path = None
             self.accept()
 
+    def select_fleet(self):
+        self.fleet_selected = True
+        self.accept()
+
     def accept_selection(self):
         current = self.profile_list.currentItem()
         if current:
-            name = current.text()
+            name = current.data(Qt.UserRole)
             self.selected_profile_path = os.path.join(self.profile_dir, name + ".ini")
             self.accept()
         elif self.new_profile_data:
@@ -440,274 +1113,72 @@ class ProfileDialog(QDialog):
 #######################################################################################################
 
 # ======================
-# SNMP Trap Thread
+# 감시 엔진 연동
 # ======================
-class SNMPTrapThread(QThread):
-
-    trap_signal = Signal(dict)
-    rx_signal = Signal()
-    trap_time_signal = Signal()
-    def __init__(self, listen_ip="0.0.0.0", port=1162, community="skt_public"):
-        super().__init__()
-
-        self.listen_ip = listen_ip
-        self.port = int(port)
-        self.community = community
-        self.running = True
-        self.snmpEngine = None
-        self.setTerminationEnabled(True)
-        self.trap_counter = 0
-        self.trap_rate = 0
-        self.last_rate_time = time.time()
-        self.trap_queue = deque(maxlen=2000)
-
-    def run(self):
-        #print(f"[TRAP] Thread run start (listen {self.listen_ip}:{self.port})")
-        dprint("SNMP", f"[TRAP] Thread run start (listen {self.listen_ip}:{self.port})")
-        
-        self.snmpEngine = engine.SnmpEngine()
-
-        config.addTransport(
-            self.snmpEngine,
-            udp.domainName,
-            udp.UdpTransport().openServerMode(
-                (self.listen_ip, self.port)
-            )
-        )
-
-        config.addV1System(
-            self.snmpEngine,
-            "trap-area",
-            self.community
-        )
-
-        ntfrcv.NotificationReceiver(
-            self.snmpEngine,
-            self.callback
-        )
-
-        dprint("SNMP", f"[TRAP] Listening on {self.listen_ip}:{self.port}")
-        self.snmpEngine.transportDispatcher.jobStarted(1)
-
-        try:
-            self.snmpEngine.transportDispatcher.runDispatcher()
-
-        except Exception as e:
-            if "WinError 10038" not in str(e):
-                dprint("SNMP", "[TRAP] dispatcher stopped:", e)
-
-        finally:
-            try:
-                self.snmpEngine.transportDispatcher.jobFinished(1)
-            except:
-                pass
-
-            try:
-                if self.snmpEngine is not None:
-                    self.snmpEngine.transportDispatcher.closeDispatcher()
-            except:
-                pass
-
-        dprint("SNMP", "[TRAP] Thread stopped")
-
-    def callback(self, snmpEngine, stateReference,
-                 contextEngineId, contextName,
-                 varBinds, cbCtx):
-
-        #print("[TRAP CALLBACK] called")
-        dprint("SNMP", "[TRAP CALLBACK] called")
-        trap_data = {}
-
-        # LED Rx 업데이트
-        self.rx_signal.emit()
-        
-        # ⭐ 업데이트 시간 갱신
-        self.trap_time_signal.emit()
-
-        # ==============================
-        # TRAP RATE 계산
-        # ==============================
-        self.trap_counter += 1        
-
-        now = time.time()
-
-        if now - self.last_rate_time >= 1.0:
-            self.trap_rate = self.trap_counter
-            self.trap_counter = 0
-            self.last_rate_time = now
-
-        for name, val in varBinds:
-            dprint("SNMP", "  VARBIND:", str(name), "=", val.prettyPrint())
-            trap_data[str(name)] = val.prettyPrint()
-        
-        # ⭐ queue에 추가
-        self.trap_queue.append(trap_data)
-        self.trap_signal.emit(trap_data)        
-        
-
-    def stop(self):
-        #print("[TRAP] stop() called")
-        dprint("SNMP", "[TRAP] stop() called")
-        self.running = False
-        try:
-            if hasattr(self, "snmpEngine") and self.snmpEngine is not None:
-                try:
-                    self.snmpEngine.transportDispatcher.jobFinished(1)
-                except:
-                    pass
-
-                self.snmpEngine.transportDispatcher.closeDispatcher()
-        except Exception as e:
-            #print("[TRAP] closeDispatcher error:", e)
-            dprint("SNMP", "[TRAP] closeDispatcher error:", e)
-        #self.quit()
-        #self.wait()
-
-# ======================
-# SNMP Worker Thread
-# ======================
-
-class SNMPThread(QThread):
-    result_signal = Signal(bool, object)  # str → object (dict 전달 가능)
+class EngineBridge(QObject):
+    """MonitorEngine callback(poller / trap thread) → Qt signal (메인 thread 로 전달)"""
 
     tx_signal = Signal()
-    rx_signal = Signal()
-    def __init__(self, ip, community="public", port=161, once=False):
-        super().__init__()
-        self.ip = ip
-        self.community = community
-        self.port = port
-        self.running = True
-        self.once = once  # 최초 테스트 여부
-        self.snmpEngine = None   # 🔴 멤버로 보관
-
-    def run(self):
-
-        # ===============================
-        # 1️⃣ 최초 연결 테스트 (sysUpTime)
-        # ===============================
-        if self.once:
-            if hasattr(self, "parent_ui"):
-                self.tx_signal.emit()
-                
-            # ✅ 테스트용은 별도 엔진 사용
-            test_engine = SnmpEngine()
-            errorIndication, errorStatus, errorIndex, varBinds = next(
-                getCmd(
-                    test_engine,
-                    CommunityData(self.community, mpModel=1),
-                    UdpTransportTarget(
-                        (self.ip, int(self.port)),
-                        timeout=2,
-                        retries=0
-                    ),
-                    ContextData(),
-                    ObjectType(ObjectIdentity("1.3.6.1.2.1.1.3.0"))
-                )
-            )
-
-            if errorIndication or errorStatus:
-                self.result_signal.emit(False, "")
-                if hasattr(self, "parent_ui"):
-                    self.parent_ui.rx_led_on()
+    rx_poll_signal = Signal()
+    rx_trap_signal = Signal()
+    poll_signal = Signal(bool, object)
+    trap_signal = Signal(object)
+    probe_signal = Signal(object)
+    connect_signal = Signal(object)
+    health_signal = Signal(object)
+
+    def attach(self, monitor):
+        monitor.subscribe(self.on_engine_event)
+
+    def detach(self, monitor):
+        monitor.unsubscribe(self.on_engine_event)
+
+    def on_engine_event(self, event, payload):
+        if event == "tx":
+            self.tx_signal.emit()
+        elif event == "rx":
+            if payload == "trap":
+                self.rx_trap_signal.emit()
             else:
-                for varBind in varBinds:
-                    value = str(varBind[1])
-                    #print(f"[SNMP RESPONSE] sysUpTime: {value}")
-                    dprint("SNMP", f"[SNMP RESPONSE] sysUpTime: {value}")
-                    self.result_signal.emit(True, value)
-
-            return
-
-        
-        # ===============================
-        # 2️⃣ 실제 배터리 MIB Polling
-        # ===============================
-
-        base_oids = [
-            "1.3.6.1.4.1.2011.6.164.1.18.1",
-            "1.3.6.1.4.1.2011.6.164.1.17.1",            
-            "1.3.6.1.4.1.2011.6.164.1.18.2",
-            "1.3.6.1.4.1.2011.6.164.1.1.2.99"
-        ]        
-        
-        # 🔴 polling용 snmpEngine은 멤버에 저장
-        self.snmpEngine = SnmpEngine()
-        while self.running:
-
-            result_data = {}
-
-            snmpEngine = SnmpEngine()
-
-            for base_oid in base_oids:
-                # 🔵 SNMP 요청 전송 (TX blink)
-                if hasattr(self, "parent_ui"):
-                    self.tx_signal.emit()
-                
-                for (errorIndication,
-                    errorStatus,
-                    errorIndex,
-                    varBinds) in bulkCmd(
-                        snmpEngine,
-                        CommunityData(self.community, mpModel=1),
-                        UdpTransportTarget((self.ip, int(self.port))),
-                        ContextData(),
-                        0, 10,
-                        ObjectType(ObjectIdentity(base_oid)),
-                        lexicographicMode=False):
-                        
-                    if not self.running:
-                        return
-
-                    if errorIndication or errorStatus:
-                        self.result_signal.emit(False, "")
-                        break
-                    
-                    if hasattr(self, "parent_ui"):
-                        self.rx_signal.emit()
-    
-                    for varBind in varBinds:
-                        oid = str(varBind[0])
-                        value = varBind[1].prettyPrint()
-                        result_data[oid] = value
-
-            if result_data:
-                self.result_signal.emit(True, result_data)
-
-            for _ in range(50):
-                if not self.running:
-                    return
-                self.msleep(100)
-
-    def stop(self):
-        self.running = False
-        try:
-            if self.snmpEngine is not None:
-                try:
-                    self.snmpEngine.transportDispatcher.jobFinished(1)
-                except Exception:
-                    pass
-
-                self.snmpEngine.transportDispatcher.closeDispatcher()
-        except Exception:
-            pass
-        self.quit()
-        self.wait()
+                self.rx_poll_signal.emit()
+        elif event == "poll":
+            self.poll_signal.emit(True, payload)
+        elif event == "poll_error":
+            self.poll_signal.emit(False, None)
+        elif event == "trap":
+            self.trap_signal.emit(payload)
+        elif event == "probe":
+            self.probe_signal.emit(payload)
+        elif event == "connect":
+            self.connect_signal.emit(payload)
+        elif event == "health":
+            self.health_signal.emit(payload)
         
 # ======================
 # 메인 UI
 # ======================
 class BatteryMonitorUI(QMainWindow):
-    def __init__(self, profile_path, new_profile_data=None):
+    def __init__(self, profile_path, new_profile_data=None, metrics_port=0):
         super().__init__()
         self.setWindowTitle(f"{APP_NAME} {APP_VERSION}")
         
         self.resize(1200, 850)
-        self.ping_thread = None
-        self.snmp_thread = None
-        self.trap_thread = None
-        
-        self.trap_queue = deque(maxlen=TRAP_QUEUE_SIZE)
+
+        # 감시 엔진 (접속 중에만 존재) + Qt signal 연결
+        # shared_engine : fleet 모드 상세창 (엔진은 FleetEngine 소유, 구독만)
+        self.engine = None
+        self.shared_engine = False
+        self.bridge = EngineBridge(self)
+        self.bridge.tx_signal.connect(self.tx_led_on)
+        self.bridge.rx_poll_signal.connect(self.rx_led_poll)
+        self.bridge.rx_trap_signal.connect(self.rx_led_trap)
+        self.bridge.rx_trap_signal.connect(self.update_time_from_trap)
+        self.bridge.poll_signal.connect(self.handle_snmp_result)
+        self.bridge.trap_signal.connect(self.handle_trap)
+        self.bridge.probe_signal.connect(self.handle_probe)
+        self.bridge.connect_signal.connect(self.handle_connect)
+        self.bridge.health_signal.connect(self.handle_health)
+        self.health_state = "healthy"
 
         # ================================
         # 현재 소스 파일 위치 기준 logs 생성
@@ -721,14 +1192,23 @@ class BatteryMonitorUI(QMainWindow):
         self.last_update_time = ""
         self.settings = QSettings(profile_path, QSettings.IniFormat)
         self.profile_path = profile_path
+
+        # ================================
+        # 자체 상태 metrics (json 파일 + --metrics-port 지정 시 localhost endpoint)
+        # ================================
+        profile_name = os.path.splitext(os.path.basename(profile_path))[0]
+        self.metrics, self.metrics_server = start_metrics(
+            None, {"profile": profile_name}, metrics_port,
+            os.path.join(self.log_dir, f"metrics_{profile_name}.json")
+        )
+        self.last_resource_tick = None
         
         self.module_map = {}        # {module_no: equip_id}
         self.module_data = {}       # {equip_id: {battery data}}
                 
-        self.fault_list = []
+        self.fault_model = FaultTableModel(self)
         
         self.active_fault_keys = set()
-        self.last_fault_snapshot = set()
         # AlarmTable 저장
         self.current_alarm_table = []
         
@@ -736,23 +1216,19 @@ class BatteryMonitorUI(QMainWindow):
         self.alarm_blink_state = False
         self.alarm_active = False
 
-        self.alarm_blink_timer = QTimer()
-        self.alarm_blink_timer.timeout.connect(self.blink_alarm_button)
-        
-        self.tx_timer = QTimer()
-        self.tx_timer.setSingleShot(True)        
-        self.tx_timer.timeout.connect(self.tx_led_off)
+        self.alarm_lit = False
+        self.trap_counter = 0
+
+        # Trap 로그 테이블에 다음 frame 에 넣을 행
+        self.pending_trap_rows = []
 
-        self.rx_timer = QTimer()
-        self.rx_timer.setSingleShot(True)
-        self.rx_timer.timeout.connect(self.rx_led_off)
-        
         # ==============================
-        # 시스템 리소스 모니터
+        # 화면 갱신은 모두 RenderScheduler 한 곳에서 (LED, blink, 라벨, 테이블)
         # ==============================
-        self.sys_timer = QTimer()
-        self.sys_timer.timeout.connect(self.update_system_resource)
-        self.sys_timer.start(1000)   # 1초마다 업데이트
+        self.render = RenderScheduler(self)
+
+        # 시스템 리소스 모니터 (1초마다 업데이트)
+        self.render.every(1000, "sys_resource", self.update_system_resource)
 
         central = QWidget()
         self.setCentralWidget(central)
@@ -772,68 +1248,93 @@ class BatteryMonitorUI(QMainWindow):
             self.save_site_info()
         else:
             self.load_site_info()
-    
-    def update_system_resource(self):
 
-        try:
+        self.load_inventory()
 
-            cpu = psutil.cpu_percent(interval=None)
+    def load_inventory(self):
 
-            process = psutil.Process()
-            
-
-            app_mem = process.memory_info().rss
-            total_mem = psutil.virtual_memory().total
+        # 이전 접속 때 저장한 모듈 inventory → 첫 poll 전에도 상세창에 바코드 / SW 버전 표시
+        cache = InventoryCache(inventory_path(self.profile_path))
+        if cache.rows:
+            self.module_map = cache.module_map()
+            self.module_model.set_inventory(self.module_map)
+    
+    def update_system_resource(self):
 
-            app_mem_mb = app_mem / (1024*1024)
-            app_mem_percent = (app_mem / total_mem) * 100
+        try:
+            # 1초 주기 호출이 늦어진 만큼 = GUI event loop 지연
+            now = time.monotonic()
+            lag_ms = 0.0
+            if self.last_resource_tick is not None:
+                lag_ms = max(0.0, (now - self.last_resource_tick - 1.0) * 1000)
+            self.last_resource_tick = now
+
+            values = self.metrics.sample(
+                event_loop_lag_ms=lag_ms,
+                gui_pending_rows=len(self.pending_trap_rows)
+            )
 
-            #thr = threading.active_count()
-            thr = process.num_threads()
+            cpu = values["system_cpu_percent"]
+            app_mem_mb = values["process_rss_bytes"] / (1024*1024)
+            app_mem_percent = values["process_memory_percent"]
+            thr = values["process_threads"]
 
             self.cpu_label.setText(f"※ CPU: {cpu:.1f}%")
             self.mem_label.setText(
                 f"APP MEM: {app_mem_mb:.1f}MB ({app_mem_percent:.2f}%)"
             )
             self.thread_label.setText(f"THR: {thr}")            
-            if self.trap_thread:
-                rate = self.trap_thread.trap_rate
+            if self.engine and self.engine.trap_queue is not None:
+                rate = self.engine.trap_rate
 
-                queue_size = len(self.trap_thread.trap_queue)
-                queue_max = self.trap_thread.trap_queue.maxlen
+                queue_size = len(self.engine.trap_queue)
+                queue_max = self.engine.trap_queue.maxlen
 
                 self.trap_rate_label.setText(f"(TRAP/s: {rate}")
                 self.queue_label.setText(f"QUEUE: {queue_size}/{queue_max})")
 
+            if self.engine:
+                self.update_data_age()
+
+                tx_h = values.get("bytes_sent_per_hour", 0.0) / 1024
+                rx_h = values.get("bytes_received_per_hour", 0.0) / 1024
+                self.traffic_label.setText(f"TX {tx_h:.1f}KB/h RX {rx_h:.1f}KB/h")
+
         except Exception as e:
             dprint("MODULE", "SYS MON ERROR:", e)
             pass
 
-    def show_alarm_list(self):
+    def update_data_age(self):
 
-        dialog = AlarmListDialog(self)
-        dialog.exec()
-    
-    def write_trap_log(self, t, oid, ordinal, alarm, level, equip_id, equip_name, father):
+        # 마지막 walk 결과가 오래되면 표의 측정값을 회색으로 + 경과 시간 표시
+        age = self.engine.data_age()
+        stale = age is not None and age > self.engine.stale_after
 
-        date_str = datetime.now().strftime("%Y%m%d")
+        self.summary_model.set_stale(stale)
+        self.module_model.set_stale(stale)
 
-        logfile = os.path.join(self.log_dir, f"trap_{date_str}.log")
+        if age is None:
+            text = ""
+        elif age < 60:
+            text = f"({age:.0f}초 전 값)"
+        else:
+            text = f"({age / 60:.0f}분 전 값)"
 
-        line = f"{t},{oid},{ordinal},{alarm},{level},{equip_id},{equip_name},{father}\n"
+        self.data_age_label.setText(text)
+        self.data_age_label.setStyleSheet("color: #E03131;" if stale else "color: #868E96;")
 
-        with open(logfile, "a", encoding="utf-8") as f:
-            f.write(line)
-        
+    def show_alarm_list(self):
+
+        dialog = AlarmListDialog(self)
+        dialog.exec()
+    
     def tx_led_on(self):
 
         if not self.is_connected:
             return
 
-        self.tx_led.setStyleSheet(
-            "background-color: #00c853;border-radius: 4px;"
-        )
-        self.tx_timer.start(300)
+        self.render.mark("tx_led", lambda: self.tx_led.set_color(LED_TX))
+        self.render.mark_later(300, "tx_led_off", self.tx_led_off)
 
 
     def rx_led_on(self):
@@ -841,68 +1342,87 @@ class BatteryMonitorUI(QMainWindow):
         if not self.is_connected:
             return
 
-        self.rx_led.setStyleSheet(
-            "background-color: #00c853;border-radius: 4px;"
-        )
-        self.rx_timer.start(300)
+        self.render.mark("rx_led", lambda: self.rx_led.set_color(LED_RX_POLL))
+        self.render.mark_later(300, "rx_led_off", self.rx_led_off)
 
     def rx_led_poll(self):
 
-        self.rx_led.setStyleSheet(
-            "background:#00c853;border-radius:4px;"
-        )
-
-        QTimer.singleShot(120, self.rx_led_off)
+        self.render.mark("rx_led", lambda: self.rx_led.set_color(LED_RX_POLL))
+        self.render.mark_later(120, "rx_led_off", self.rx_led_off)
 
     def rx_led_trap(self):
 
-        self.rx_led.setStyleSheet(
-            "background:#ff9800;border-radius:4px;"
-        )
-
-        QTimer.singleShot(200, self.rx_led_off)
+        self.render.mark("rx_led", lambda: self.rx_led.set_color(LED_RX_TRAP))
+        self.render.mark_later(200, "rx_led_off", self.rx_led_off)
     
     def tx_led_off(self):
 
-        self.tx_led.setStyleSheet(
-            "background:#505050;border-radius:4px;"
-        )
+        self.tx_led.set_color(LED_OFF)
 
 
     def rx_led_off(self):
 
-        #self.rx_led.setStyleSheet(
-        #    "background-color: #808080;border-radius: 4px;"
-        #)
-        self.rx_led.setStyleSheet(
-            "background:#505050;border-radius:4px;"
+        self.rx_led.set_color(LED_OFF)
+
+    def set_status(self, color):
+
+        self.render.mark("status", lambda: self.status_circle.set_color(color))
+
+    def handle_probe(self, stats):
+
+        # 도달성(ICMP / SNMP sysUpTime) 결과는 상태 LED tooltip 으로 표시
+        if stats["reachable"]:
+            text = (f"응답 {stats['rtt_ms']:.2f} ms ({stats['method']})\n"
+                    f"jitter {stats['jitter_ms']:.2f} ms / 손실 {stats['loss_percent']:.1f}%")
+        else:
+            text = f"무응답 {stats['consecutive_lost']}회 / 손실 {stats['loss_percent']:.1f}%"
+
+        self.render.mark("probe_tip", lambda: self.status_circle.setToolTip(text))
+
+    def handle_health(self, health):
+
+        # 연속 실패 → 차단(back-off) / 재확인 / 복구 를 접속상태 옆에 표시
+        self.health_state = health["state"]
+        text, color = HEALTH_VIEW[health["state"]]
+
+        tip = f"연속 실패 {health['consecutive_failures']}회 / timeout {health['timeout_ms']:.0f} ms"
+        if health["retry_in"] is not None:
+            tip += f"\n재시도 {health['retry_in']:.0f}초 후 (back-off {health['backoff']:.0f}초)"
+
+        def apply():
+            self.bmu_label.setText(f"접속상태 ({text})")
+            self.bmu_label.setToolTip(tip)
+
+        self.render.mark("health", apply)
+        self.set_status(color)
+
+    def set_update_time(self, text):
+
+        # trap 폭주 시에도 라벨은 frame 당 한 번만 갱신
+        self.render.mark(
+            "update_time",
+            lambda: self.update_time_label.setText(f"최종업데이트시간 : {text}")
         )
 
     def update_time_from_trap(self):
 
         now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
-        self.update_time_label.setText(
-            f"최종업데이트시간 : {now}"            
-        )
+        self.set_update_time(now)
     
     def closeEvent(self, event):
         #print("[INFO] Program closing")
         dprint("MODULE", "[INFO] Program closing")
 
         # 이미 연결 중이면 종료 로직 호출
-        if self.is_connected:
+        if self.is_connected and not self.shared_engine:
             self.on_connect_clicked()
         
-        if hasattr(self, "snmp_thread") and self.snmp_thread:
-            if self.snmp_thread.isRunning():
-                self.snmp_thread.stop()
-                self.snmp_thread.wait(2000)
+        self.stop_engine()
 
-        if hasattr(self, "trap_thread") and self.trap_thread:
-            if self.trap_thread.isRunning():
-                self.trap_thread.stop()
-                self.trap_thread.wait(2000)
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
 
         event.accept()
         
@@ -919,59 +1439,93 @@ class BatteryMonitorUI(QMainWindow):
         QTimer.singleShot(3000, msg.accept)  # 🔥 3초 후 자동 닫힘
         msg.exec()
 
-    def handle_connection_test(self, success, value):
+    def start_engine(self, handshake=False):
+
+        # 기존 엔진 정리
+        self.stop_engine()
+
+        self.engine = MonitorEngine(
+            ip=self.ip_edit.text().strip(),
+            port=self.port_edit.text().strip(),
+            community=self.get_comm_edit.text().strip(),
+            trap_port=self.trap_port_edit.text().strip(),
+            trap_community=self.trap_comm_edit.text().strip(),
+            listen_ip="0.0.0.0",
+            log_dir=self.log_dir,
+            mode=self.mode_combo.currentData(),
+            heartbeat=float(self.settings.value("heartbeat", TRAP_MODE_HEARTBEAT)),
+            inventory_path=inventory_path(self.profile_path)
+        )
+        self.bridge.attach(self.engine)
+        self.metrics.add_source(self.engine.metrics)
+        self.engine.start(handshake=handshake)
+
+    def attach_shared_engine(self, engine):
+        """fleet 모드 상세창 : 이미 동작 중인 사이트 엔진을 구독만 한다 (접속 버튼 비활성)"""
+
+        self.engine = engine
+        self.shared_engine = True
+        self.bridge.attach(engine)
+
+        self.is_connected = True
+        self.connect_btn.setText("Fleet 감시중")
+        self.connect_btn.setEnabled(False)
+        self.set_status(STATUS_OK)
+
+        # 마지막 poll 결과가 있으면 바로 표시
+        if engine.snapshot is not None:
+            self.handle_snmp_result(True, engine.snapshot)
+        if engine.probe_stats is not None:
+            self.handle_probe(engine.probe_stats)
+        self.handle_health(engine.health.to_dict())
+
+    def stop_engine(self):
+
+        if self.engine is not None and self.shared_engine:
+            self.bridge.detach(self.engine)
+            self.engine = None
+            self.shared_engine = False
+            return
+
+        if self.engine is not None:
+            dprint("SNMP", "[INFO] Stopping monitor engine")
+            self.metrics.remove_source(self.engine.metrics)
+            self.engine.stop()
+            self.engine = None
+
+        self.summary_model.set_stale(False)
+        self.module_model.set_stale(False)
+        self.data_age_label.setText("")
 
-        if success:
+    def handle_connect(self, result):
+
+        # 엔진 handshake 결과 (이미 polling 엔진 위에서 수행 → 성공 시 바로 첫 walk 진행 중)
+        self.connect_btn.setEnabled(True)
+
+        if result["ok"]:
             current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
+            dprint("SNMP", f"[SNMP] handshake ok {result['community']}:{result['port']} "
+                           f"({result['rtt_ms']:.1f} ms)")
+
+            # 설정과 다른 후보가 응답했으면 입력칸을 실제 값으로 바꿔서 저장
+            self.get_comm_edit.setText(result["community"])
+            self.port_edit.setText(str(result["port"]))
+
             # 상태 표시 (녹색)
-            self.status_circle.setStyleSheet(
-                "background-color: #2ECC71; border-radius: 7px;"
-            )
-            self.update_time_label.setText(f"최종업데이트시간 : {current_time}")
-            
-            self.show_auto_close_message("접속 성공", "축전지 시스템 연결 성공")
+            self.set_status(STATUS_OK)
+            self.set_update_time(current_time)
 
             self.is_connected = True
             self.connect_btn.setText("접속종료")
 
-            ip = self.ip_edit.text().strip()
-            port = self.port_edit.text().strip()
-            community = self.get_comm_edit.text().strip()
-            trap_comm = self.trap_comm_edit.text().strip()
-
-            # 기존 polling thread 정리
-            if hasattr(self, "snmp_thread") and self.snmp_thread:
-               self.snmp_thread.stop()
+            self.save_connection_info()
 
-            # 🔥 Trap thread 시작
-            if hasattr(self, "trap_thread") and self.trap_thread:
-                self.trap_thread.stop()
-            
-            # 🔥 polling 시작
-            self.snmp_thread = SNMPThread(ip, community, port, once=False)
-            self.snmp_thread.tx_signal.connect(self.tx_led_on)
-            #self.snmp_thread.rx_signal.connect(self.rx_led_on)
-            self.snmp_thread.rx_signal.connect(self.rx_led_poll)
-            self.snmp_thread.parent_ui = self
-            self.snmp_thread.result_signal.connect(self.handle_snmp_result)
-            self.snmp_thread.start()
-            trap_port = int(self.trap_port_edit.text().strip())
-            
-            self.trap_thread = SNMPTrapThread(
-                listen_ip="0.0.0.0",
-                port=trap_port,
-                community=trap_comm
-            )
-            #self.trap_thread.parent_ui = self
-            #self.trap_thread.rx_signal.connect(self.rx_led_on)
-            self.trap_thread.rx_signal.connect(self.rx_led_trap)
-            self.trap_thread.trap_time_signal.connect(self.update_time_from_trap)
-            
-            self.trap_thread.trap_signal.connect(self.handle_trap)
-            self.trap_thread.start()
+            self.show_auto_close_message("접속 성공", "축전지 시스템 연결 성공")
 
         else:
+            self.stop_engine()
+            self.connect_btn.setText("접속시작")
+            self.set_status(STATUS_IDLE)
             self.show_auto_close_message("접속 실패", "축전지 시스템 연결 실패.")
 
     
@@ -1108,53 +1662,30 @@ class BatteryMonitorUI(QMainWindow):
             dprint("MODULE", "[INFO] Disconnect requested")
 
             # blink 중지
-            if hasattr(self, "alarm_blink_timer"):
-                self.alarm_blink_timer.stop()
-                if self.alarm_active:
-                    self.btn_alarm_popup.setStyleSheet(
-                    "background-color:red;color:white;font-weight:bold;"
-                    )
-                else:
-                    self.btn_alarm_popup.setStyleSheet("")
+            self.render.cancel("alarm_blink")
+            self.set_alarm_button_lit(self.alarm_active)
 
+            self.render.cancel("tx_led")
+            self.render.cancel("tx_led_off")
+            self.render.cancel("rx_led")
+            self.render.cancel("rx_led_off")
             self.tx_led_off()
             self.rx_led_off()
             
-            # SNMP Polling Thread 종료
-            if hasattr(self, "snmp_thread") and self.snmp_thread:
-                if self.snmp_thread.isRunning():
-                    dprint("SNMP", "[INFO] Stopping SNMP thread")
-                    self.snmp_thread.stop()
-                    # 🔴 타임아웃을 주고, 그래도 안 끝나면 강제 종료 시도
-                    if not self.snmp_thread.wait(3000):
-                        print("[WARN] SNMP thread did not stop in time, terminating...")
-                        self.snmp_thread.terminate()
-                        self.snmp_thread.wait(1000)
-                self.snmp_thread = None
-            # Trap Thread 종료
-            if hasattr(self, "trap_thread") and self.trap_thread:
-                if self.trap_thread.isRunning():
-                    dprint("SNMP", "[INFO] Stopping TRAP thread")
-                    self.trap_thread.stop()
-                    if not self.trap_thread.wait(3000):
-                        dprint("SNMP", "[WARN] TRAP thread did not stop in time, terminating...")
-                        self.trap_thread.terminate()
-                        self.trap_thread.wait(1000)
-                self.trap_thread = None
-            
-            if hasattr(self, "ping_thread") and self.ping_thread:
-                if self.ping_thread.isRunning():
-                    self.ping_thread.stop()
-                    self.ping_thread.wait(1000)
-                self.ping_thread = None
+            # 감시 엔진 (Polling / Trap) 종료
+            self.stop_engine()
+            self.render.cancel("probe_tip")
+            self.render.cancel("health")
+            self.status_circle.setToolTip("")
+            self.health_state = "healthy"
+            self.bmu_label.setText("접속상태")
+            self.bmu_label.setToolTip("")
             
             # 상태/데이터 초기화
             self.is_connected = False
 
             self.connect_btn.setText("접속시작")
-            self.status_circle.setStyleSheet(
-                "background-color: #CCCCCC; border-radius: 7px;"
-            )
+            self.set_status(STATUS_IDLE)
 
             self.show_auto_close_message("접속 종료", "축전지 시스템 연결 종료.")
 
@@ -1164,169 +1695,73 @@ class BatteryMonitorUI(QMainWindow):
             return
 
         # ======================================
-        # 접속 시도 (1회 테스트)
+        # 접속 시도 : 감시 엔진을 바로 띄우고 handshake 결과(handle_connect)를 기다림
         # ======================================
         ip = self.ip_edit.text().strip()
         port = self.port_edit.text().strip()
-        community = self.get_comm_edit.text().strip()
 
-        # 이미 테스트 thread가 실행중이면 실행 금지
-        if hasattr(self, "test_thread") and self.test_thread:
-            if self.test_thread.isRunning():
-                #print("[WARN] Connection test already running")
-                dprint("MODULE", "[WARN] Connection test already running")
-                return
-
-        #print(f"[INFO] SNMP connection test -> {ip}:{port}")
-        dprint("MODULE", f"[INFO] SNMP connection test -> {ip}:{port}")
+        # 이미 handshake 진행 중이면 실행 금지
+        if self.engine is not None:
+            dprint("MODULE", "[WARN] Connection handshake already running")
+            return
 
-        self.test_thread = SNMPThread(ip, community, port, once=True)
-        self.test_thread.result_signal.connect(self.handle_connection_test)
-        self.test_thread.start()
+        dprint("MODULE", f"[INFO] SNMP connect handshake -> {ip}:{port}")
 
-        #print(f"[INFO] SNMP GETNEXT started to {ip}...")
-        dprint("MODULE", f"[INFO] SNMP GETNEXT started to {ip}...")
+        self.connect_btn.setText("접속중...")
+        self.connect_btn.setEnabled(False)
+        self.start_engine(handshake=True)
  #################################################################################
     def update_module_tables(self):
 
-        status_map = {
-            0: ("Online", "#B2F2BB"),
-            1: ("Offline", "#FF6B6B"),
-            2: ("Sleep", "#CED4DA"),
-            3: ("Disconnect", "#FF6B6B"),
-            4: ("충전중", "#B2F2BB"),
-            5: ("방전중", "#4DABF7"),
-            6: ("Standby", "#FFD43B"),
-            255: ("Unknown", "#CED4DA")
-        }
         # -----------------
         # 모듈 알람 목록 생성
         # -----------------
+        equip_to_module = {
+            int(info["equip_id"]): m_no for m_no, info in self.module_map.items()
+        }
+
         alarm_modules = set()
 
         for alarm in self.current_alarm_table:
 
             equip = alarm.get("equip")
-
-            for m_no, info in self.module_map.items():
-                if int(info["equip_id"]) == int(equip):
-                    alarm_modules.add(m_no)
-                    break
-        
-        for module_no in range(1, 11):
-
-            if module_no not in self.module_map:
+            if equip is None:
                 continue
 
-            equip_id = self.module_map[module_no]["equip_id"]
+            module_no = equip_to_module.get(int(equip))
+            if module_no is not None:
+                alarm_modules.add(module_no)
 
-            if equip_id not in self.module_data:
-                continue
-
-            data = self.module_data[equip_id]
+        # 변경된 셀만 dataChanged → repaint
+        self.module_model.update_snapshot(self.module_map, self.module_data, alarm_modules)
 
-            row = (module_no - 1) % 5
-            table = self.module_table_left if module_no <= 5 else self.module_table_right
-
-            # -----------------
-            # 모듈 전압
-            # -----------------
-            if data["volt"] is not None:
-                table.item(row, 1).setText(f"{data['volt']:.1f}")
-
-            # -----------------
-            # 셀 전압 Max/Min
-            # -----------------
-            cells = [v for v in data["cells"] if v is not None]
-            if cells:
-                max_v = max(cells)
-                min_v = min(cells)
-                table.item(row, 2).setText(f"{max_v:.2f} / {min_v:.2f}")
-
-            # -----------------
-            # 온도 Max/Min
-            # -----------------            
-            temps = [v for v in data["temps"] if v is not None]
-            if temps:
-                max_t = max(temps)
-                min_t = min(temps)
-                table.item(row, 3).setText(f"{max_t:.1f} / {min_t:.1f}")
-
-            # -----------------
-            # Running Status
-            # -----------------
-            if data["status"] is not None:
-
-                status_text, color = status_map.get(
-                    data["status"],
-                    ("Unknown", "#CED4DA")
-                )
-
-                item = table.item(row, 5)
-                item.setText(status_text)
-                item.setBackground(QColor(color))
-
-                if color in ["#FF6B6B", "#4DABF7"]:
-                    item.setForeground(QColor("white"))
-                else:
-                    item.setForeground(QColor("black"))                  
-            
-                # -----------------
-                # 상세 버튼 활성화
-                # -----------------
-                btn = table.cellWidget(row, 6)
-                if btn:
-                    btn.setEnabled(True)
-            
-            # -----------------
-            # 경보 상태 표시
-            # -----------------
-            alarm_item = table.item(row, 4)
-
-            # module_map에 모듈이 없는 경우
-            if module_no not in self.module_map:
-                if alarm_item:
-                    alarm_item.setText("-")
-                continue
-
-            # 알람 여부 판단
-            if module_no in alarm_modules:
-                alarm_text = "이상"
-                color = "red"                
-                alarm_item.setForeground(QColor("white"))
-                alarm_item.setBackground(QColor("#FF6B6B"))
-            else:
-                alarm_text = "정상"
-                color = "black"
-
-            if alarm_item:
-                alarm_item.setText(alarm_text)
-            
     def update_summary_value(self, label, value, status="정상"):
-        if label not in self.summary_position_map:
-            return
-
-        row, col = self.summary_position_map[label]
-        item = self.summary_table.item(row, col)
-
-        item.setText(str(value))
-        apply_value_style(item, status)
+        self.summary_model.set_value(label, str(value), status)
     
+
     # ======================
     # 🔔 Alarm Blink
     # ======================
+    def set_alarm_button_lit(self, lit):
+
+        if lit == self.alarm_lit:
+            return
+
+        self.alarm_lit = lit
+        if lit:
+            self.btn_alarm_popup.setPalette(self.alarm_palette_on)
+            self.btn_alarm_popup.setFont(self.alarm_font_on)
+        else:
+            self.btn_alarm_popup.setPalette(self.alarm_palette_off)
+            self.btn_alarm_popup.setFont(self.alarm_font_off)
+
     def blink_alarm_button(self):
 
         if not self.alarm_active:
-            self.btn_alarm_popup.setStyleSheet("")
+            self.set_alarm_button_lit(False)
             return
 
-        if self.alarm_blink_state:
-            self.btn_alarm_popup.setStyleSheet(
-                "background-color:red;color:white;font-weight:bold;"
-            )
-        else:
-            self.btn_alarm_popup.setStyleSheet("")
+        self.set_alarm_button_lit(self.alarm_blink_state)
 
         self.alarm_blink_state = not self.alarm_blink_state
         
@@ -1359,648 +1794,228 @@ class BatteryMonitorUI(QMainWindow):
 
         dprint("SNMP", "\n==================================================\n")
     
-    def update_module_alarm(self, module_name, alarm_text, alarm_time):
+    def update_module_alarm(self, module_no, alarm_text, alarm_time):
 
         if alarm_text is None:
             return
 
-        for row in range(self.fault_table.rowCount()):
-
-            name_item = self.fault_table.item(row, 0)
-
-            if not name_item:
-                continue
-
-            if name_item.text() == module_name:
+        self.fault_model.set_module_alarm(module_no, alarm_text, alarm_time)
 
-                self.fault_table.setItem(row, 6, QTableWidgetItem(alarm_text))
-                self.fault_table.setItem(row, 7, QTableWidgetItem(alarm_time))
-
-                break
-    
-    def clear_fault_table(self):
-        for row in range(self.fault_table.rowCount()):
-            self.fault_table.setItem(row, 1, QTableWidgetItem(""))
-            self.fault_table.setItem(row, 2, QTableWidgetItem(""))
-    
         
-    def handle_snmp_result(self, success, value):
-
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    def handle_snmp_result(self, success, snapshot):
 
-        if success and isinstance(value, dict):
+        if success and isinstance(snapshot, dict):
 
-            # 상태 표시
-            self.status_circle.setStyleSheet(
-                "background-color: #2ECC71; border-radius: 7px;"
-            )
+            # 상태 표시 (응답은 오지만 느리면 degraded 색 유지)
+            self.set_status(HEALTH_VIEW.get(self.health_state, HEALTH_VIEW["healthy"])[1])
             # 접속 성공 → Alarm 버튼 활성화
             self.btn_alarm_popup.setEnabled(True)
             
-            self.update_time_label.setText(f"최종업데이트시간 : {current_time}")
-
-            # 🔥 기존 데이터 초기화
-            self.module_map.clear()
-            self.module_data.clear()
-
-            # 🔥 Active Alarm 저장 리스트
-            active_alarm_texts = []
-            
-            alarm_entries = {}
-            # ===============================
-            # OID 처리 시작
-            # ===============================
-            for oid, val in value.items():
-
-                if str(val) == "2147483647":
-                    continue
+            self.set_update_time(snapshot["time"])
 
-                val_str = str(val)
-                
-                
-                # 🔥 Alarm 정보 수집
-                # AlarmText
-                if oid.startswith("1.3.6.1.4.1.2011.6.164.1.1.2.99.1.2."):
-
-                    index = oid.split(".")[-1]
-
-                    if index not in alarm_entries:
-                        alarm_entries[index] = {}
-
-                    alarm_entries[index]["text"] = val_str                    
-                    active_alarm_texts.append(val_str)
-
-                    # 🔥 추가 (Summary용)
-                    active_alarm_texts.append(val_str)
-
-
-                # Alarm Time
-                elif oid.startswith("1.3.6.1.4.1.2011.6.164.1.1.2.99.1.5."):
-
-                    index = oid.split(".")[-1]
-
-                    if index not in alarm_entries:
-                        alarm_entries[index] = {}
-
-                    alarm_entries[index]["time"] = val_str
-
-
-                # hwEquipId
-                elif oid.startswith("1.3.6.1.4.1.2011.6.164.1.1.2.99.1.10."):
-
-                    index = oid.split(".")[-1]
-
-                    if index not in alarm_entries:
-                        alarm_entries[index] = {}
-
-                    alarm_entries[index]["equip"] = int(val_str)
-                        
-                # ====================================================
-                # 1️⃣ Summary 영역
-                # ====================================================
-                elif oid == "1.3.6.1.4.1.2011.6.164.1.17.1.1.5.96":
-                    rack_voltage = int(val_str) / 10
-                    self.update_summary_value("Rack 전압[V]", f"{rack_voltage:.1f}")
-
-                elif oid == "1.3.6.1.4.1.2011.6.164.1.17.1.1.6.96":
-                    rack_current = int(val_str) / 10
-                    self.update_summary_value("Rack 전류[A]", f"{rack_current:.1f}")
-
-                elif oid == "1.3.6.1.4.1.2011.6.164.1.17.1.1.8.96":
-                    self.update_summary_value("SOC 충전율[%]", f"{val_str} %")
-
-                elif oid == "1.3.6.1.4.1.2011.6.164.1.17.1.1.23.96":
-                    self.update_summary_value("충방전 횟수", val_str)     
-                  
-                # ====================================================
-                # 2️⃣ hwAcbBaseTable - Module 매핑 (EquipID → ModuleNo)
-                # ====================================================
-                if ".1.18.1.1.2." in oid:
-
-                    row_index = oid.split(".")[-1]
-                    equip_id = val_str
-
-                    addr_oid = f"1.3.6.1.4.1.2011.6.164.1.18.1.1.4.{row_index}"
-                    swver_oid = f"1.3.6.1.4.1.2011.6.164.1.18.1.1.5.{row_index}"
-                    model_oid = f"1.3.6.1.4.1.2011.6.164.1.18.1.1.12.{row_index}"
-                    barcode_oid = f"1.3.6.1.4.1.2011.6.164.1.18.1.1.13.{row_index}"
-                    
-                    if addr_oid in value:
-                        module_no = int(value[addr_oid])
-                        
-                        if module_no not in self.module_map:
-                            self.module_map[module_no] = {
-                                "equip_id": row_index,
-                                "swver": None,
-                                "model": None,
-                                "barcode": None
-                            }
-                        self.module_map[module_no]["swver"] = value[swver_oid]
-                        self.module_map[module_no]["model"] = value[model_oid]
-                        self.module_map[module_no]["barcode"] = value[barcode_oid]
-                        
-                        
-                # ====================================================
-                # 3️⃣ SampTable (실제 배터리 데이터)
-                # ====================================================
-                if ".1.18.2.1." in oid:
-
-                    parts = oid.split(".")
-                    column = int(parts[-2])
-                    row_index = parts[-1]
-
-                    if row_index not in self.module_data:
-                        self.module_data[row_index] = {
-                            "volt": None,
-                            "status": None,
-                            "soc": None,
-                            "soh": None,
-                            "cells": [0.0] * 15,
-                            "temps": [0.0] * 15
-                        }
-
-                    # 모듈 전압
-                    if column == 1:
-                        self.module_data[row_index]["volt"] = int(val_str) / 10
-
-                    # 상태
-                    elif column == 3:
-                        self.module_data[row_index]["status"] = int(val_str)
-
-                    # SOH
-                    elif column == 4:
-                        self.module_data[row_index]["soh"] = int(val_str)
-                    
-                        
-                    # 셀 전압 (6~20)
-                    elif 6 <= column <= 20:
-                        cell_index = column - 6
-                        try:                            
-                            self.module_data[row_index]["cells"][cell_index] = round(int(val_str) / 100, 2)
-                        except:
-                            pass
-
-                    # 셀 온도 (22~36)
-                    elif 22 <= column <= 36:
-                        temp_index = column - 22
-                        try:                            
-                            self.module_data[row_index]["temps"][temp_index] = round(int(val_str) / 10, 1)
-                        except:
-                            pass
-
-                    # SOC
-                    elif column == 52:
-                        self.module_data[row_index]["soc"] = int(val_str)
-            
-            self.current_alarm_table = list(alarm_entries.values())
-            #print(self.current_alarm_table)
-            if self.current_alarm_table:
-                dprint("ALARM", self.current_alarm_table)
-            # 🔔 Alarm 버튼 상태 업데이트
-            alarm_count = len(self.current_alarm_table)
-
-            if alarm_count > 0:
-
-                self.alarm_active = True
-
-                # 버튼 텍스트에 알람 개수 표시
-                self.btn_alarm_popup.setText(f"발생된 알람 보기 ({alarm_count})")
+            # 🔥 엔진이 decode 한 snapshot 으로 교체
+            self.module_map = snapshot["module_map"]
+            self.module_data = snapshot["module_data"]
+            self.current_alarm_table = snapshot["alarms"]
 
-                if not self.alarm_blink_timer.isActive():
-                    self.alarm_blink_timer.start(500)
-
-            else:
-
-                self.alarm_active = False
-
-                self.btn_alarm_popup.setText("발생된 알람 보기")
-
-                if self.alarm_blink_timer.isActive():
-                    self.alarm_blink_timer.stop()
-
-                self.btn_alarm_popup.setStyleSheet("")
-    
-            new_fault_snapshot = set()
-            new_fault_keys = set()
-            # 🔥 Alarm Equip → Module 변환
-            for alarm in self.current_alarm_table:
-
-                equip = alarm.get("equip")
-                alarm_text = alarm.get("text")
-                alarm_time = alarm.get("time")
-
-                module_no = None
-
-                for m_no, info in self.module_map.items():
-                    if int(info["equip_id"]) == int(equip):
-                        module_no = m_no                        
-                        module_name = f"모듈-{module_no}"
-                        break
-
-                # 모듈 알람 업데이트
-                self.update_module_alarm(module_name, alarm_text, alarm_time)
-                
-                # 고장 정보 테이블 업데이트
-                if alarm_text in FAULT_ALARMS:
-
-                    module_no = int(module_name.replace("모듈-", ""))
-
-                    cell_no = 0
-                    if "Cell" in alarm_text:
-                        try:
-                            cell_no = int(alarm_text.split(" ")[1])
-                        except:
-                            pass
-
-                    fault_key = (module_no, cell_no)
-                    new_fault_keys.add(fault_key)
-                    new_fault_snapshot.add(fault_key)
-                    
-                    if fault_key not in self.active_fault_keys:
-
-                        volt = None
-                        temp = None
-
-                        module_info = self.module_map.get(module_no)
-                        if module_info:
-                            equip_id = module_info["equip_id"]
-                            data = self.module_data.get(equip_id)
-
-                            if data:
-                                if cell_no > 0:
-                                    volt = data["cells"][cell_no-1]
-                                    temp = data["temps"][cell_no-1]
-
-                        self.add_fault(
-                            module_no,
-                            cell_no,
-                            volt if volt else 0,
-                            temp if temp else 0
-                        )
-
-                        self.active_fault_keys.add(fault_key)
-
-            # =========================
-            # Fault 변경 여부 체크
-            # =========================
-            if new_fault_snapshot == self.last_fault_snapshot:
-                # 동일하면 업데이트 안함
-                return
-            # -----------------------------
-            # 사라진 Fault 제거
-            # -----------------------------
-            removed_faults = self.active_fault_keys - new_fault_keys
-
-            if removed_faults:
-
-                rows_to_delete = []
-
-                for row, fault in enumerate(self.fault_list):
-
-                    key = (fault["module"], fault["cell"])
-
-                    if key in removed_faults:
-                        rows_to_delete.append(row)
-
-                for row in reversed(rows_to_delete):
-
-                    self.fault_table.removeRow(row)
-                    del self.fault_list[row]
-
-                self.active_fault_keys = new_fault_keys
-
-                self.refresh_fault_numbers()
-            # 🔧 Fault 테이블 초기화
-            #self.clear_fault_table()
-            #self.active_fault_keys.clear()
-            #self.fault_list.clear()
-            #self.fault_table.setRowCount(0)
-            
-            self.last_fault_snapshot = new_fault_snapshot
-            # ====================================================
-            # 🔥 Alarm Summary 업데이트
             # ====================================================
-
-            overcharge = False
-            high_temp = False
-            overcurrent = False
-
-            for alarm in active_alarm_texts:
-
-                if "Overcharge Protection" in alarm:
-                    overcharge = True
-
-                elif "Charging high temperature protection" in alarm:
-                    high_temp = True
-
-                elif "Charging Overcurrent Protection" in alarm:
-                    overcurrent = True
-
-
-            self.set_summary_alarm("과전압 충전차단", overcharge)
-            self.set_summary_alarm("고온 충전차단", high_temp)
-            self.set_summary_alarm("과전류 충전차단", overcurrent)
+            # 1️⃣ Summary 영역
             # ====================================================
-            # 🔥 모듈 테이블 갱신
-            # ====================================================
-            
-            ############################################################################################## S
-            volt_list = []
-            temp_list = []            
-            
-            dprint("SNMP", "===== Voltage Calculation =====")
-
-            for module_no in range(1, 11):
-
-                module_info = self.module_map.get(module_no)
-
-                if not module_info:
-                    #print(f"module {module_no} → module_map 없음")
-                    dprint("SNMP", f"module {module_no} → module_map 없음")
-                    continue
-
-                equip_id = module_info["equip_id"]
-                data = self.module_data.get(equip_id)
-
-                if not data:                    
-                    dprint("SNMP", f"module {module_no} → module_data 없음")
-                    continue
-
-                status = data.get("status")
-                volt = data.get("volt")                
-                dprint("SNMP", f"module {module_no} status={status} volt={volt}")
-                cells = data.get("cells", [])
-                dprint("SNMP", f"module {module_no} cells={cells}")
-
-                if status in (1,255):
-                    #print("  → 제외됨")
-                    dprint("SNMP", "  → 제외됨")
-                    continue
-
-                if volt is not None:
-                    volt_list.append(volt)
-
-                # ======================
-                # 온도 (셀1~15)
-                # ======================
-                temps = data.get("temps", [])
-                dprint("SNMP", f"module {module_no} temps={temps}")
-                for t in temps:
-                    if t is not None:
-                        temp_list.append(t)
-            
-            # ==========================
-            # 전압 계산
-            # ==========================
-            if volt_list:
+            summary = snapshot["summary"]
 
-                max_v = max(volt_list)
-                min_v = min(volt_list)
-                avg_v = sum(volt_list) / len(volt_list)
+            if summary["rack_voltage"] is not None:
+                self.update_summary_value("Rack 전압[V]", f"{summary['rack_voltage']:.1f}")
 
-                self.update_summary_value("Max 전압[V]", f"{max_v:.1f}V")
-                self.update_summary_value("Min 전압[V]", f"{min_v:.1f}V")
-                self.update_summary_value("Avg 전압[V]", f"{avg_v:.1f}V")
-
-            else:
-
-                self.update_summary_value("Max 전압[V]", "-")
-                self.update_summary_value("Min 전압[V]", "-")
-                self.update_summary_value("Avg 전압[V]", "-")
-            
-            # ======================
-            # 온도 계산
-            # ======================
-            if temp_list:
-
-                max_t = max(temp_list)
-                min_t = min(temp_list)
-                avg_t = sum(temp_list) / len(temp_list)
-
-                self.update_summary_value("Max 온도[℃]", f"{max_t:.1f}℃")
-                self.update_summary_value("Min 온도[℃]", f"{min_t:.1f}℃")
-                self.update_summary_value("Avg 온도[℃]", f"{avg_t:.1f}℃")
-
-            else:
-
-                self.update_summary_value("Max 온도[℃]", "-")
-                self.update_summary_value("Min 온도[℃]", "-")
-                self.update_summary_value("Avg 온도[℃]", "-")
-            ############################################################################################## E
-            self.update_module_tables()
-            #self.debug_dump_modules()
-            
-            now = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-            #print(f"[{now}] [UPDATE SUCCESS] SNMP 데이터 갱신 완료")
-            dprint("SNMP", f"[{now}] [UPDATE SUCCESS] SNMP 데이터 갱신 완료")
+            if summary["rack_current"] is not None:
+                self.update_summary_value("Rack 전류[A]", f"{summary['rack_current']:.1f}")
 
-        else:
-            self.status_circle.setStyleSheet(
-                "background-color: #FF6B6B; border-radius: 7px;"
-            )
-            #print("[SNMP ERROR]")
-            dprint("SNMP", "[SNMP ERROR]")
-    
-    def set_summary_alarm(self, label, is_alarm):
-        if label not in self.summary_position_map:
-            return
+            if summary["soc"] is not None:
+                self.update_summary_value("SOC 충전율[%]", f"{summary['soc']} %")
 
-        row, col = self.summary_position_map[label]
-        item = self.summary_table.item(row, col)
+            if summary["cycles"] is not None:
+                self.update_summary_value("충방전 횟수", summary["cycles"])
 
-        if is_alarm:
-            item.setText("이상")
-            item.setBackground(QColor("#FF6B6B"))
-            item.setForeground(QColor("white"))
-        else:
-            item.setText("정상")
-            item.setBackground(QColor("#B2F2BB"))
-            item.setForeground(QColor("black"))
-        
-    def handle_trap(self, trap_data):
+            if self.current_alarm_table:
+                dprint("ALARM", self.current_alarm_table)
+            # 🔔 Alarm 버튼 상태 업데이트
+            alarm_count = len(self.current_alarm_table)
 
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            if alarm_count > 0:
 
-        # -----------------------------------------
-        # snmpTrapOID (표준 OID)
-        # -----------------------------------------
-        trap_oid = trap_data.get("1.3.6.1.6.3.1.1.4.1.0", "")
+                self.alarm_active = True
 
-        # -----------------------------------------
-        # Trap 이름 매핑
-        # -----------------------------------------
-        trap_name_map = {
-            "1.3.6.1.4.1.2011.6.164.2.1.3.0.99": "hwAcbAlarmTrap",
-            "1.3.6.1.4.1.2011.6.164.2.1.3.0.100": "hwAcbAlarmResumeTrap",
-            "1.3.6.1.4.1.2011.6.164.2.1.15.0.1": "hwCabinetAlarmTrap",
-            "1.3.6.1.4.1.2011.6.164.2.1.15.0.2": "hwCabinetAlarmResumeTrap",
-        }
+                # 버튼 텍스트에 알람 개수 표시
+                self.btn_alarm_popup.setText(f"발생된 알람 보기 ({alarm_count})")
 
-        display_trap_oid = trap_oid
-        if trap_oid in trap_name_map:
-            display_trap_oid = f"{trap_oid}:{trap_name_map[trap_oid]}"
+                self.render.every(500, "alarm_blink", self.blink_alarm_button)
 
-        # -----------------------------------------
-        # 발생 / 해제 OID 그룹 정의
-        # -----------------------------------------
-        alarm_oids = {
-            "1.3.6.1.4.1.2011.6.164.2.1.3.0.99",
-            "1.3.6.1.4.1.2011.6.164.2.1.15.0.1",
-        }
+            else:
 
-        resume_oids = {
-            "1.3.6.1.4.1.2011.6.164.2.1.3.0.100",
-            "1.3.6.1.4.1.2011.6.164.2.1.15.0.2",
-        }
+                self.alarm_active = False
 
-        # -----------------------------------------
-        # 기본값 초기화
-        # -----------------------------------------
-        ordinal = ""
-        alarm = ""
-        level = ""
-        equip_id = ""
-        equip_name = ""
-        father_name = ""
+                self.btn_alarm_popup.setText("발생된 알람 보기")
 
-        # -----------------------------------------
-        # 동적 Index 대응 Prefix 정의
-        # -----------------------------------------
-        PREFIX_ORDINAL = "1.3.6.1.4.1.2011.6.164.1.1.2.2.0"
-        PREFIX_ALARM = "1.3.6.1.4.1.2011.6.164.1.1.2.100.1.2."
-        PREFIX_LEVEL = "1.3.6.1.4.1.2011.6.164.1.1.2.100.1.3."
-        PREFIX_EQUIP_NAME = "1.3.6.1.4.1.2011.6.164.1.18.1.1.3."
-        PREFIX_EQUIP_ID = "1.3.6.1.4.1.2011.6.164.1.34.1.1.2."
-        PREFIX_FATHER_NAME = "1.3.6.1.4.1.2011.6.164.1.34.1.1.3."
+                self.render.cancel("alarm_blink")
+                self.set_alarm_button_lit(False)
 
-        # -----------------------------------------
-        # 모든 varBind 순회 → 동적 index 처리
-        # -----------------------------------------
-        for oid, val in trap_data.items():
+            # 모듈 알람 업데이트
+            for alarm in self.current_alarm_table:
+                equip = alarm.get("equip")
+                module_no = equip_to_module(self.module_map, equip) if equip is not None else None
+                if module_no is not None:
+                    self.update_module_alarm(module_no, alarm.get("text"), alarm.get("time"))
 
-            if oid == PREFIX_ORDINAL:
-                ordinal = val
+            # 고장 정보 테이블 업데이트
+            self.sync_faults(snapshot["faults"])
 
-            elif oid.startswith(PREFIX_ALARM):
-                alarm = val
+            # ====================================================
+            # 🔥 Alarm Summary 업데이트
+            # ====================================================
+            for key, label in SUMMARY_ALARM_LABELS.items():
+                self.set_summary_alarm(label, snapshot["alarm_flags"][key])
 
-            elif oid.startswith(PREFIX_LEVEL):
-                level = val
+            # ==========================
+            # 전압 / 온도 계산 (Offline/Unknown 모듈 제외)
+            # ==========================
+            for name, stat, unit, fmt in (
+                ("전압[V]", snapshot["stats"]["volt"], "V", "{:.1f}"),
+                ("온도[℃]", snapshot["stats"]["temp"], "℃", "{:.1f}"),
+            ):
+                if stat:
+                    max_v, min_v, avg_v = stat
+                    self.update_summary_value(f"Max {name}", fmt.format(max_v) + unit)
+                    self.update_summary_value(f"Min {name}", fmt.format(min_v) + unit)
+                    self.update_summary_value(f"Avg {name}", fmt.format(avg_v) + unit)
+                else:
+                    self.update_summary_value(f"Max {name}", "-")
+                    self.update_summary_value(f"Min {name}", "-")
+                    self.update_summary_value(f"Avg {name}", "-")
 
-            elif oid.startswith(PREFIX_EQUIP_NAME):
-                equip_name = val
+            # ====================================================
+            # 🔥 모듈 테이블 갱신
+            # ====================================================
+            self.update_module_tables()
+            #self.debug_dump_modules()
+            
+            now = datetime.now().strftime("%H:%M:%S.%f")[:-3]
+            dprint("SNMP", f"[{now}] [UPDATE SUCCESS] SNMP 데이터 갱신 완료")
 
-            elif oid.startswith(PREFIX_EQUIP_ID):
-                equip_id = val
+        else:
+            self.set_status(STATUS_ERROR)
+            dprint("SNMP", "[SNMP ERROR]")
 
-            elif oid.startswith(PREFIX_FATHER_NAME):
-                father_name = val
+    def sync_faults(self, faults):
+        """poll 로 확인된 고장 목록과 고장 테이블 동기화"""
 
-        alarm_lower = str(alarm).lower()
-        
-        # =====================================================
-        # 🔥 과전압 충전차단 제어 (col 0)
-        # =====================================================
-        overcharge_keywords = [
-            "overcharge protection",
-            "overcharge voltage protection"
-        ]
+        new_fault_keys = set(faults)
 
-        if any(k in alarm_lower for k in overcharge_keywords):
-            if trap_oid.startswith("1.3.6.1.4.1.2011.6.164.2.1.3."):
+        # 새로 발생한 Fault 추가 (trap 으로 이미 들어온 것은 add 에서 무시)
+        # 사용자가 삭제한 Fault 는 poll 에서 사라졌다가 다시 생길 때까지 추가하지 않음
+        for fault_key in sorted(new_fault_keys - self.active_fault_keys):
+            fault = faults[fault_key]
+            self.add_fault(fault["module"], fault["cell"], fault["volt"], fault["temp"])
 
-                if trap_oid in alarm_oids:
-                    self.set_summary_alarm("과전압 충전차단", True)
-                elif trap_oid in resume_oids:
-                    self.set_summary_alarm("과전압 충전차단", False)
-                
-        # =====================================================
-        # 🔥 고온 충전차단 제어 (col 1)
-        # =====================================================
-        high_temp_keywords = [
-            "charging high temperature protection",
-            "high temperature protection",
-            "charge high temperature protection"
-        ]
+        # 표시 중인 Fault 는 전압 / 온도만 갱신
+        for fault_key in new_fault_keys & self.active_fault_keys:
+            fault = faults[fault_key]
+            self.fault_model.update(fault_key, fault["volt"], fault["temp"])
 
-        if any(k in alarm_lower for k in high_temp_keywords):
-            if trap_oid.startswith("1.3.6.1.4.1.2011.6.164.2.1.3."):
+        # -----------------------------
+        # 사라진 Fault 제거 (poll 로 확인됐던 것만)
+        # -----------------------------
+        self.fault_model.remove(self.active_fault_keys - new_fault_keys)
 
-                if trap_oid in alarm_oids:
-                    self.set_summary_alarm("고온 충전차단", True)
-                elif trap_oid in resume_oids:
-                    self.set_summary_alarm("고온 충전차단", False)                
+        self.active_fault_keys = new_fault_keys
+    
+    def set_summary_alarm(self, label, is_alarm):
+        if is_alarm:
+            self.summary_model.set_value(label, "이상", "이상")
+        else:
+            self.summary_model.set_value(label, "정상", "정상")
         
+    def handle_trap(self, trap):
+
         # =====================================================
-        # 🔥 과전류 충전차단 제어 (col 2)
+        # 🔥 과전압 / 고온 / 과전류 충전차단 발생·해제
         # =====================================================
-        over_current_temp_keywords = [
-            "charge overcurrent protection",
-            "charging overcurrent protection"
-        ]
-
-        if any(k in alarm_lower for k in over_current_temp_keywords):
-            if trap_oid.startswith("1.3.6.1.4.1.2011.6.164.2.1.3."):
-
-                if trap_oid in alarm_oids:
-                    self.set_summary_alarm("과전류 충전차단", True)
-                elif trap_oid in resume_oids:
-                    self.set_summary_alarm("과전류 충전차단", False)
+        for key, is_alarm in trap["flag_changes"].items():
+            self.set_summary_alarm(SUMMARY_ALARM_LABELS[key], is_alarm)
 
         # -----------------------------------------
         # GUI 삽입
         # -----------------------------------------
-        row = self.trap_table.rowCount()
-        self.trap_table.insertRow(row)
-
         values = [
-            current_time,
-            display_trap_oid,
-            ordinal,
-            alarm,
-            level,
-            equip_id,
-            equip_name,
-            father_name
+            trap["time"],
+            trap["display_oid"],
+            trap["ordinal"],
+            trap["alarm"],
+            trap["level"],
+            trap["equip_id"],
+            trap["equip_name"],
+            trap["father_name"]
         ]
 
-        for col, val in enumerate(values):
-
-            item = QTableWidgetItem(str(val))
-            item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-            # 발생은 빨강 / 해제는 초록
-            if col == 1:
-                if trap_oid in alarm_oids:
-                    item.setBackground(QColor("#FF6B6B"))
-                    item.setForeground(QColor("white"))
-                elif trap_oid in resume_oids:
-                    item.setBackground(QColor("#B2F2BB"))
-                    item.setForeground(QColor("black"))
-
-            self.trap_table.setItem(row, col, item)
+        # 발생은 빨강 / 해제는 초록
+        if trap["kind"] == "alarm":
+            oid_style = "이상"
+        elif trap["kind"] == "resume":
+            oid_style = "정상"
+        else:
+            oid_style = None
 
-        self.trap_table.resizeColumnsToContents()
-        self.trap_table.scrollToBottom()
-        # ⭐ 1000개 유지
-        if self.trap_table.rowCount() > MAX_TRAP_LOG:
-            self.trap_table.removeRow(0)
+        # 행 삽입은 다음 frame 에서 한 번에 (trap 폭주 시 resize/scroll 1회)
+        self.pending_trap_rows.append((values, oid_style))
+        self.render.mark("trap_table", self.flush_trap_rows)
 
-        # ⭐ 로그 파일 저장
-        self.write_trap_log(current_time, display_trap_oid, ordinal, alarm, level, equip_id, equip_name, father_name)
-        
         # Fault Trap 처리
-        self.handle_fault_trap(trap_data)
+        self.handle_fault_trap(trap)
         
         self.trap_counter += 1
-        #print("[TRAP RECEIVED]")
         dprint("SNMP", "[TRAP RECEIVED]")
-        for k, v in trap_data.items():            
+        for k, v in trap["raw"].items():
             dprint("SNMP", f"[{k}] = [{v}]")
  #################################################################################   
  
+    def flush_trap_rows(self):
+        """쌓인 Trap 행을 로그 테이블에 일괄 반영"""
+        rows = self.pending_trap_rows[-MAX_TRAP_LOG:]
+        self.pending_trap_rows = []
+
+        if not rows:
+            return
+
+        table = self.trap_table
+        table.setUpdatesEnabled(False)
+
+        for values, oid_style in rows:
+
+            row = table.rowCount()
+            table.insertRow(row)
+
+            for col, val in enumerate(values):
+
+                item = QTableWidgetItem(str(val))
+                item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+                if col == 1 and oid_style is not None:
+                    bg, fg = CELL_STYLES[oid_style]
+                    item.setBackground(bg)
+                    item.setForeground(fg)
+
+                table.setItem(row, col, item)
+
+        # ⭐ 1000개 유지
+        overflow = table.rowCount() - MAX_TRAP_LOG
+        for _ in range(overflow):
+            table.removeRow(0)
+
+        table.setUpdatesEnabled(True)
+        table.resizeColumnsToContents()
+        table.scrollToBottom()
+
     def clear_trap_log(self):
         """SNMP Trap 로그 테이블 초기화"""
+        self.pending_trap_rows = []
         if hasattr(self, "trap_table") and self.trap_table is not None:
             self.trap_table.setRowCount(0)
 
@@ -2017,7 +2032,11 @@ class BatteryMonitorUI(QMainWindow):
         summary_group = QGroupBox("시스템 요약 정보")
         summary_layout = QVBoxLayout(summary_group)
 
-        self.summary_table = QTableWidget(8, 5)
+        self.summary_model = SummaryTableModel(self)
+        self.summary_position_map = self.summary_model.position_map
+
+        self.summary_table = QTableView()
+        self.summary_table.setModel(self.summary_model)
         table = self.summary_table
 
         # 🔴 스크롤바 제거
@@ -2027,11 +2046,11 @@ class BatteryMonitorUI(QMainWindow):
         table.horizontalHeader().setVisible(False)
         table.verticalHeader().setVisible(False)
         # 편집 금지
-        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setEditTriggers(QTableView.NoEditTriggers)
 
         # 🔴 드래그 선택 가능하도록 수정
-        table.setSelectionMode(QTableWidget.ExtendedSelection)
-        table.setSelectionBehavior(QTableWidget.SelectItems)
+        table.setSelectionMode(QTableView.ExtendedSelection)
+        table.setSelectionBehavior(QTableView.SelectItems)
 
         # 🔴 포커스 허용 (복사용)
         table.setFocusPolicy(Qt.StrongFocus)
@@ -2040,49 +2059,6 @@ class BatteryMonitorUI(QMainWindow):
         table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         table.horizontalHeader().setStretchLastSection(True)
 
-        # 🔴 컬럼 자동 확장 설정 (추가)
-        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-        table.horizontalHeader().setStretchLastSection(True)
-
-        labels = [
-            ["설비번호", "운용 관리자", "제조사", "모델명", "시리얼번호"],
-            ["Rack 전압[V]", "SOC 충전율[%]", "Max 전압[V]", "Min 전압[V]", "Avg 전압[V]"],
-            ["Rack 전류[A]", "충방전 횟수", "Max 온도[℃]", "Min 온도[℃]", "Avg 온도[℃]"],
-            ["과전압 충전차단", "고온 충전차단", "과전류 충전차단", "Fuse 상태", "충전 릴레이"]
-        ]
-
-        values = [["-" for _ in range(5)] for _ in range(4)]
-
-        LABEL_BG = QColor(220, 235, 255)
-        label_font = QFont()
-        label_font.setBold(True)
-
-        # 🔥 summary 값 위치 매핑
-        self.summary_position_map = {}
-
-        for block in range(4):
-            label_row = block * 2
-            value_row = label_row + 1
-
-            for col in range(5):
-
-                # ----- 라벨 -----
-                label_text = labels[block][col]
-                label_item = QTableWidgetItem(label_text)
-                label_item.setTextAlignment(Qt.AlignCenter)
-                label_item.setBackground(LABEL_BG)
-                label_item.setFont(label_font)
-                table.setItem(label_row, col, label_item)
-
-                # ----- 값 -----
-                value_item = QTableWidgetItem(values[block][col])
-                value_item.setTextAlignment(Qt.AlignCenter)
-                apply_value_style(value_item, values[block][col])                
-                table.setItem(value_row, col, value_item)
-
-                # 위치 저장
-                self.summary_position_map[label_text] = (value_row, col)
-
         # 🔴 컬럼 최소폭 설정 (시리얼번호 컬럼)
         #table.setColumnWidth(4, 180)
 
@@ -2168,45 +2144,27 @@ class BatteryMonitorUI(QMainWindow):
 
 
     def create_module_table(self):
-        """모듈 상태 테이블 (좌우 5개씩 총 10개)"""
+        """모듈 상태 테이블 (하나의 모델을 좌: 1~5 / 우: 6~ 두 view 로 표시)"""
         group = QGroupBox("모듈 상태")
         main_layout = QHBoxLayout(group)
 
-        headers = ["모듈", "모듈 전압", "셀 전압 Max/Min[V]", "셀 온도 Max/Min[℃]", "경보", "통신상태", "모듈(셀)"]
-        LABEL_BG = QColor("#E7F1FF")
-        label_font = QFont()
-        label_font.setBold(True)
+        self.module_model = ModuleTableModel(10, self)
 
-        def create_table(start_index):
-            table = QTableWidget(5, len(headers))
-            table.setHorizontalHeaderLabels(headers)
+        def create_table(first_row, last_row):
+            proxy = ModuleRangeProxy(first_row, last_row, self)
+            proxy.setSourceModel(self.module_model)
+
+            table = QTableView()
+            table.setModel(proxy)
             table.verticalHeader().setVisible(False)
-            table.setEditTriggers(QTableWidget.NoEditTriggers)
+            table.setEditTriggers(QTableView.NoEditTriggers)
 
-            for col in range(len(headers)):
-                header_item = table.horizontalHeaderItem(col)
-                header_item.setBackground(LABEL_BG)
-                header_item.setFont(label_font)
-                header_item.setTextAlignment(Qt.AlignCenter)
-            
-            for row in range(5):
-                module_no = start_index + row + 1
-                table.setItem(row, 0, QTableWidgetItem(f"#{module_no:02d}"))
-                table.setItem(row, 1, QTableWidgetItem("-"))
-                table.setItem(row, 2, QTableWidgetItem("- / -"))
-                table.setItem(row, 3, QTableWidgetItem("- / -"))
-                table.setItem(row, 4, QTableWidgetItem("-"))
-                table.setItem(row, 5, QTableWidgetItem("-"))
-
-                btn = QPushButton("상세")
-                btn.clicked.connect(lambda checked, no=module_no: self.show_module_detail(no))
-                table.setCellWidget(row, 6, btn)
-                btn.setEnabled(False)
-
-                for col in range(1, 6):
-                    item = table.item(row, col)
-                    if item:
-                        item.setTextAlignment(Qt.AlignCenter)
+            # 상세 버튼은 delegate 가 직접 그림
+            delegate = ButtonDelegate(table)
+            delegate.clicked.connect(
+                lambda index: self.show_module_detail(index.data(MODULE_NO_ROLE))
+            )
+            table.setItemDelegateForColumn(ModuleTableModel.COL_DETAIL, delegate)
 
             table.resizeColumnsToContents()
             table.resizeRowsToContents()
@@ -2223,328 +2181,62 @@ class BatteryMonitorUI(QMainWindow):
             """)
             return table
 
-        self.module_table_left = create_table(0)
-        self.module_table_right = create_table(5)
+        self.module_table_left = create_table(0, 4)
+        self.module_table_right = create_table(5, None)
 
         main_layout.addWidget(self.module_table_left)
         main_layout.addWidget(self.module_table_right)
         
         return group
 
-    def handle_fault_trap(self, trap_data):
-
-        #print("\n================ TRAP DEBUG START ================")
-        dprint("SNMP", "\n================ TRAP DEBUG START ================")
-        #print("TRAP DATA:", trap_data)
-        dprint("SNMP", "TRAP DATA:", trap_data)
-
-        alarm_oid = "1.3.6.1.4.1.2011.6.164.2.1.3.0.99"
-        equip_oid_prefix = "1.3.6.1.4.1.2011.6.164.1.18.1.1.2."
-        alarm_oid_prefix = "1.3.6.1.4.1.2011.6.164.1.1.2.100.1.2."
-
-        alarm_text = None
-        equip_id = None
-
-        # -----------------------------------
-        # Trap OID 파싱
-        # -----------------------------------
-        for oid, value in trap_data.items():
-
-            #print(f"[TRAP VAR] {oid} = {value}")
-            dprint("SNMP", f"[TRAP VAR] {oid} = {value}")
-
-            # Alarm Text
-            if oid.startswith(alarm_oid_prefix):
-                alarm_text = value
-                #print(f"[PARSE] Alarm Text detected: {alarm_text}")
-                dprint("SNMP", f"[PARSE] Alarm Text detected: {alarm_text}")
-
-            # Equip ID
-            if oid.startswith(equip_oid_prefix):
-                equip_id = int(oid.split(".")[-1])
-                #print(f"[PARSE] Equip ID detected: {equip_id}")
-                dprint("SNMP", f"[PARSE] Equip ID detected: {equip_id}")
-
-        # -----------------------------------
-        # 필수 값 체크
-        # -----------------------------------
-        if alarm_text is None or equip_id is None:
-            #print("[ERROR] alarm_text 또는 equip_id 없음")
-            #print("alarm_text =", alarm_text)
-            #print("equip_id =", equip_id)
-            #print("================ TRAP DEBUG END =================\n")
-            dprint("SNMP", "[ERROR] alarm_text 또는 equip_id 없음")
-            dprint("SNMP", "alarm_text =", alarm_text)
-            dprint("SNMP", "equip_id =", equip_id)
-            dprint("SNMP", "================ TRAP DEBUG END =================\n")
-            return
-
-        # -----------------------------------
-        # Cell Fault 파싱
-        # -----------------------------------
-        #print("[STEP] Parsing Cell Fault from Alarm Text")
-        dprint("SNMP", "[STEP] Parsing Cell Fault from Alarm Text")
-
-        m = re.search(r'cell\s*(\d+)\s*fault', alarm_text, re.IGNORECASE)
-
-        if not m:
-            #print("[ERROR] 'Cell N Fault' 패턴이 아님:", alarm_text)
-            #print("================ TRAP DEBUG END =================\n")
-            dprint("SNMP", "[ERROR] 'Cell N Fault' 패턴이 아님:", alarm_text)
-            dprint("SNMP", "================ TRAP DEBUG END =================\n")
-            return
-
-        cell_no = int(m.group(1))
-        #print(f"[PARSE] Cell Number: {cell_no}")
-        dprint("SNMP", f"[PARSE] Cell Number: {cell_no}")
-
-        # -----------------------------------
-        # equip_id → module_no 찾기
-        # -----------------------------------
-        #print("[STEP] Searching module_map for equip_id")
-        dprint("SNMP", "[STEP] Searching module_map for equip_id")
-
-        module_no = None
-
-        for m_no, info in self.module_map.items():
-
-            #print(f"[CHECK] module {m_no} -> equip_id {info.get('equip_id')}")            
-            dprint("SNMP", f"[CHECK] module {m_no} -> equip_id {info.get('equip_id')}")            
-
-            if int(info["equip_id"]) == int(equip_id):
-                module_no = m_no
-                break
-
-        if module_no is None:
-            #print("[ERROR] module_map에서 equip_id 못찾음:", equip_id)
-            #print("module_map =", self.module_map)
-            #print("================ TRAP DEBUG END =================\n")
-            dprint("SNMP", "[ERROR] module_map에서 equip_id 못찾음:", equip_id)
-            dprint("SNMP", "module_map =", self.module_map)
-            dprint("SNMP", "================ TRAP DEBUG END =================\n")
-            return
-
-        #print(f"[PARSE] module_no found: {module_no}")
-        dprint("SNMP", f"[PARSE] module_no found: {module_no}")
-
-        # -----------------------------------
-        # module_data 조회
-        # -----------------------------------
-        module_info = self.module_map.get(module_no)
-
-        equip_id = module_info["equip_id"]
+    def handle_fault_trap(self, trap):
 
-        module_data = self.module_data.get(equip_id)
+        # 엔진이 Cell N Fault trap 을 모듈/셀 값으로 풀어서 넘겨줌
+        fault = trap["cell_fault"]
 
-        if not module_data:
-            #print("[ERROR] module_data 없음 equip_id =", equip_id)
-            #print("module_data keys =", list(self.module_data.keys()))
-            #print("================ TRAP DEBUG END =================\n")
-            dprint("SNMP", "[ERROR] module_data 없음 equip_id =", equip_id)
-            dprint("SNMP", "module_data keys =", list(self.module_data.keys()))
-            dprint("SNMP", "================ TRAP DEBUG END =================\n")
+        if fault is None:
+            dprint("SNMP", "[TRAP] cell fault 아님 또는 모듈 정보 없음:", trap["alarm"])
             return
 
-        #print("[STEP] module_data found")
-        dprint("SNMP", "[STEP] module_data found")
-
-       # -----------------------------------
-        # 셀 데이터 조회
-        # -----------------------------------
-
-        cells = module_data.get("cells", [])
-        temps = module_data.get("temps", [])
-
-        if cell_no-1 >= len(cells) or cell_no-1 >= len(temps):
-
-            #print(f"[ERROR] Cell index out of range : {cell_no}")
-            #print("cells length =", len(cells))
-            #print("temps length =", len(temps))
-            #print("================ TRAP DEBUG END =================\n")
-            dprint("SNMP", f"[ERROR] Cell index out of range : {cell_no}")
-            dprint("SNMP", "cells length =", len(cells))
-            dprint("SNMP", "temps length =", len(temps))
-            dprint("SNMP", "================ TRAP DEBUG END =================\n")
+        module_no = fault["module"]
+        cell_no = fault["cell"]
 
+        # 중복 Fault 는 add 에서 key 로 바로 걸러짐
+        if not self.add_fault(module_no, cell_no, fault["volt"], fault["temp"]):
+            dprint("SNMP", "[DUPLICATE] 이미 fault 존재 → 추가 안함")
             return
 
-        volt = cells[cell_no-1]
-        temp = temps[cell_no-1]
-
-        #print(f"[CELL DATA] Volt = {volt}")
-        #print(f"[CELL DATA] Temp = {temp}")
-        dprint("SNMP", f"[CELL DATA] Volt = {volt}")
-        dprint("SNMP", f"[CELL DATA] Temp = {temp}")
-
-        # -----------------------------
-        # 중복 Fault 체크
-        # -----------------------------
-        for fault in self.fault_list:
-            if fault["module"] == module_no and fault["cell"] == cell_no:
-                #print("[DUPLICATE] 이미 fault 존재 → 추가 안함")
-                #print("================ TRAP DEBUG END =================\n")
-                dprint("SNMP", "[DUPLICATE] 이미 fault 존재 → 추가 안함")
-                dprint("SNMP", "================ TRAP DEBUG END =================\n")
-                return
-        
-        # -----------------------------------
-        # Fault 추가
-        # -----------------------------------
-
-        #print("[STEP] Adding fault to table")
-        dprint("SNMP", "[STEP] Adding fault to table")
-
-        self.add_fault(module_no, cell_no, volt, temp)
-
-        #print("[SUCCESS] Fault added")
-        dprint("SNMP", "[SUCCESS] Fault added")
-        #print("================ TRAP DEBUG END =================\n")
-        dprint("SNMP", "================ TRAP DEBUG END =================\n")
-    
-    def refresh_fault_numbers(self):
-
-        for i, fault in enumerate(self.fault_list):
-            fault["no"] = i + 1
-            item = self.fault_table.item(i, 0)
-            if item:
-                item.setText(f"#{i+1:02d}")
-                
-    def delete_fault(self):
-
-        button = self.sender()
-        
-        if not button:
-            return
+        dprint("SNMP", f"[SUCCESS] Fault added module={module_no} cell={cell_no}")
 
-        index = self.fault_table.indexAt(button.pos())
+    def delete_fault(self, index):
 
         if not index.isValid():
             return
 
-        row = index.row()
-
-        #print(f"[FAULT DELETE] Row {row}")
-        dprint("MODULE", f"[FAULT DELETE] Row {row}")
+        key = self.fault_model.key_at(index.row())
 
-        # fault_list에서도 삭제
-        if row < len(self.fault_list):
-            del self.fault_list[row]
+        dprint("MODULE", f"[FAULT DELETE] Row {index.row()} {key}")
 
-        # 테이블 행 삭제
-        self.fault_table.removeRow(row)
-
-        # 번호 다시 정렬
-        self.refresh_fault_numbers()
+        self.fault_model.remove([key])
     
     def add_fault(self, module_no, cell_no, volt, temp):
 
-        fault_index = len(self.fault_list) + 1
-
-        fault = {
-            "no": fault_index,
-            "module": module_no,
-            "cell": cell_no,
-            "volt": volt,
-            "temp": temp
-        }
-
-        self.fault_list.append(fault)
-
-        row = self.fault_table.rowCount()
-        self.fault_table.insertRow(row)
-
-        # --------------------------------
-        # Board hardware fault 처리
-        # --------------------------------
-        if cell_no == 0:
-
-            values = [
-                f"#{fault_index:02d}",
-                str(module_no),
-                "(Board hardware fault)",
-                "-",
-                "-"
-            ]
-
-            bg_color = QColor("#555555")   # 어두운 회색
-            fg_color = QColor("white")
-
-        else:
-
-            values = [
-                f"#{fault_index:02d}",
-                str(module_no),
-                str(cell_no),
-                f"{volt:.2f}",
-                f"{temp:.1f}"
-            ]
-
-            bg_color = QColor("#F25F5C")
-            fg_color = QColor("white")
+        return self.fault_model.add(module_no, cell_no, volt, temp)
 
-        # --------------------------------
-        # 테이블 삽입
-        # --------------------------------
-        for col, val in enumerate(values):
-
-            item = QTableWidgetItem(val)
-            item.setTextAlignment(Qt.AlignCenter)
-
-            # -----------------------------
-            # Board hardware fault
-            # -----------------------------
-            if cell_no == 0:
-
-                # Fault / Module 컬럼은 기존 스타일 유지
-                if col in (0, 1):
-                    item.setBackground(QColor("#F25F5C"))
-                    item.setForeground(QColor("white"))
-
-                # Cell / Volt / Temp 는 어두운색
-                else:
-                    item.setBackground(QColor("#555555"))
-                    item.setForeground(QColor("white"))
-
-            else:
-                # 기존 Fault 스타일
-                item.setBackground(QColor("#F25F5C"))
-                item.setForeground(QColor("white"))
-
-            self.fault_table.setItem(row, col, item)
-        # --------------------------------
-        # 삭제 버튼
-        # --------------------------------
-        btn_delete = QPushButton("삭제")
-        btn_delete.clicked.connect(self.delete_fault)
-
-        self.fault_table.setCellWidget(row, len(values), btn_delete)
-        
     def create_fault_table(self):
 
         group = QGroupBox("고장 정보")
         layout = QVBoxLayout(group)
 
-        # 컬럼 6개 (Delete 추가)
-        self.fault_table = QTableWidget(0, 6)
-
-        headers = [
-            "Fault",
-            "고장 모듈 No",
-            "고장 셀 No",
-            "고장 셀 전압[V]",
-            "고장 셀 온도[℃]",
-            "삭제"
-        ]
-
-        self.fault_table.setHorizontalHeaderLabels(headers)
+        # 컬럼 6개 (삭제 버튼은 delegate 가 직접 그림)
+        self.fault_table = QTableView()
+        self.fault_table.setModel(self.fault_model)
         self.fault_table.verticalHeader().setVisible(False)
+        self.fault_table.setEditTriggers(QTableView.NoEditTriggers)
 
-        # Header 스타일
-        for col in range(len(headers)):
-            header_item = self.fault_table.horizontalHeaderItem(col)
-            header_item.setBackground(QColor("#FFF3B0"))
-            header_item.setFont(QFont("", weight=QFont.Bold))
-            header_item.setTextAlignment(Qt.AlignCenter)
+        delete_delegate = ButtonDelegate(self.fault_table)
+        delete_delegate.clicked.connect(self.delete_fault)
+        self.fault_table.setItemDelegateForColumn(FaultTableModel.COL_DELETE, delete_delegate)
 
         # 🔴 Header 스타일 (노란색)
         self.fault_table.horizontalHeader().setStyleSheet(
@@ -2554,7 +2246,7 @@ class BatteryMonitorUI(QMainWindow):
         self.fault_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
 
         # 삭제 컬럼 width 고정 (UI 안정)
-        self.fault_table.setColumnWidth(5, 80)
+        self.fault_table.setColumnWidth(FaultTableModel.COL_DELETE, 80)
 
         layout.addWidget(self.fault_table)
 
@@ -2593,6 +2285,16 @@ class BatteryMonitorUI(QMainWindow):
         self.trap_port_edit = QLineEdit("1162")
         self.trap_port_edit.setFixedWidth(70)
         layout.addWidget(self.trap_port_edit)
+        layout.addSpacing(10)
+        layout.addWidget(QLabel("감시방식"))
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItem("주기 Poll", MODE_POLL)
+        self.mode_combo.addItem("Trap 위주", MODE_TRAP)
+        self.mode_combo.setToolTip(
+            "Trap 위주 : heartbeat 주기(기본 5분) + 알람 발생/해제 trap 수신 시에만 전체 조회\n"
+            "종량제 / 저속 회선용"
+        )
+        layout.addWidget(self.mode_combo)
         layout.addSpacing(20)
         self.connect_btn = QPushButton("접속시작")
         self.connect_btn.setFixedWidth(80)
@@ -2605,11 +2307,7 @@ class BatteryMonitorUI(QMainWindow):
         self.bmu_label = QLabel("접속상태")
         layout.addWidget(self.bmu_label)
 
-        self.status_circle = QLabel()
-        self.status_circle.setFixedSize(15, 15)
-        self.status_circle.setStyleSheet(
-            "background-color: #CCCCCC; border-radius: 7px; border: 1px solid #999999;"
-        )
+        self.status_circle = LedWidget(15, 15, 7, STATUS_IDLE, border="#999999")
         layout.addWidget(self.status_circle)
 
         layout.addStretch()
@@ -2642,6 +2340,11 @@ class BatteryMonitorUI(QMainWindow):
                 if os.path.exists(self.profile_path):
                     os.rename(self.profile_path, new_profile_path)
 
+                    # inventory 캐시도 새 이름으로
+                    old_inventory = inventory_path(self.profile_path)
+                    if os.path.exists(old_inventory):
+                        os.replace(old_inventory, inventory_path(new_profile_path))
+
                 self.profile_path = new_profile_path
                 self.settings = QSettings(self.profile_path, QSettings.IniFormat)
 
@@ -2661,11 +2364,11 @@ class BatteryMonitorUI(QMainWindow):
             # ==============================
             # 시스템 요약 정보 표시
             # ==============================
-            self.summary_table.setItem(1, 0, QTableWidgetItem(equip))
-            self.summary_table.setItem(1, 1, QTableWidgetItem(manager))
-            self.summary_table.setItem(1, 2, QTableWidgetItem(maker))
-            self.summary_table.setItem(1, 3, QTableWidgetItem(model))
-            self.summary_table.setItem(1, 4, QTableWidgetItem(serial))
+            self.summary_model.set_value("설비번호", equip)
+            self.summary_model.set_value("운용 관리자", manager)
+            self.summary_model.set_value("제조사", maker)
+            self.summary_model.set_value("모델명", model)
+            self.summary_model.set_value("시리얼번호", serial)
 
             # ==============================
             # 입력창 CLEAR
@@ -2700,11 +2403,36 @@ class BatteryMonitorUI(QMainWindow):
         # ==============================
         # 시스템 요약 정보 테이블 표시
         # ==============================
-        self.summary_table.setItem(1, 0, QTableWidgetItem(equip))
-        self.summary_table.setItem(1, 1, QTableWidgetItem(manager))
-        self.summary_table.setItem(1, 2, QTableWidgetItem(maker))
-        self.summary_table.setItem(1, 3, QTableWidgetItem(model))
-        self.summary_table.setItem(1, 4, QTableWidgetItem(serial))
+        self.summary_model.set_value("설비번호", equip)
+        self.summary_model.set_value("운용 관리자", manager)
+        self.summary_model.set_value("제조사", maker)
+        self.summary_model.set_value("모델명", model)
+        self.summary_model.set_value("시리얼번호", serial)
+
+        # ==============================
+        # 접속 설정 (headless 모드와 같은 프로파일 키 사용)
+        # ==============================
+        self.ip_edit.setText(self.settings.value("ip", PROFILE_DEFAULTS["ip"]))
+        self.port_edit.setText(str(self.settings.value("port", PROFILE_DEFAULTS["port"])))
+        self.get_comm_edit.setText(self.settings.value("get_community", PROFILE_DEFAULTS["get_community"]))
+        self.set_comm_edit.setText(self.settings.value("set_community", PROFILE_DEFAULTS["set_community"]))
+        self.trap_comm_edit.setText(self.settings.value("trap_community", PROFILE_DEFAULTS["trap_community"]))
+        self.trap_port_edit.setText(str(self.settings.value("trap_port", PROFILE_DEFAULTS["trap_port"])))
+        mode_index = self.mode_combo.findData(self.settings.value("mode", MODE_POLL))
+        self.mode_combo.setCurrentIndex(max(mode_index, 0))
+
+    def save_connection_info(self):
+
+        self.settings.setValue("ip", self.ip_edit.text().strip())
+        self.settings.setValue("port", self.port_edit.text().strip())
+        self.settings.setValue("get_community", self.get_comm_edit.text().strip())
+        self.settings.setValue("set_community", self.set_comm_edit.text().strip())
+        self.settings.setValue("trap_community", self.trap_comm_edit.text().strip())
+        self.settings.setValue("trap_port", self.trap_port_edit.text().strip())
+        self.settings.setValue("mode", self.mode_combo.currentData())
+        # 프로파일 목록 정렬 / 색인용
+        self.settings.setValue("last_connected", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        self.settings.sync()
 
     def create_header(self):
 
@@ -2734,6 +2462,20 @@ class BatteryMonitorUI(QMainWindow):
         
         self.btn_alarm_popup = QPushButton("발생된 알람 보기")
         self.btn_alarm_popup.setEnabled(False)
+
+        # blink 는 stylesheet 대신 미리 만든 palette 교체로 처리
+        # (Fusion style 이어야 플랫폼과 무관하게 버튼 palette 색이 적용됨)
+        self.alarm_button_style = QStyleFactory.create("Fusion")
+        if self.alarm_button_style:
+            self.btn_alarm_popup.setStyle(self.alarm_button_style)
+
+        self.alarm_palette_off = QPalette(self.btn_alarm_popup.palette())
+        self.alarm_palette_on = QPalette(self.alarm_palette_off)
+        self.alarm_palette_on.setColor(QPalette.Button, QColor("red"))
+        self.alarm_palette_on.setColor(QPalette.ButtonText, QColor("white"))
+        self.alarm_font_off = QFont(self.btn_alarm_popup.font())
+        self.alarm_font_on = QFont(self.alarm_font_off)
+        self.alarm_font_on.setBold(True)
         self.btn_alarm_popup.clicked.connect(self.show_alarm_popup)
         
         self.alarm_list_btn = QPushButton("※ 정의된 알람 리스트")
@@ -2764,20 +2506,13 @@ class BatteryMonitorUI(QMainWindow):
         # SNMP TX / RX 상태 표시
         # =========================
 
-        self.tx_led = QLabel()
-        self.tx_led.setFixedSize(20, 10)
-        self.tx_led.setStyleSheet(
-            "background:#505050;border-radius:4px;"
-        )
-
-        self.rx_led = QLabel()
-        self.rx_led.setFixedSize(20, 10)
-        self.rx_led.setStyleSheet(
-            "background:#505050;border-radius:4px;"
-        )
+        self.tx_led = LedWidget(20, 10, 4, LED_OFF)
+        self.rx_led = LedWidget(20, 10, 4, LED_OFF)
 
         self.update_time_label = QLabel("최종업데이트시간 : 대기중")
         self.update_time_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.data_age_label = QLabel("")
+        self.data_age_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         
         self.tx_label = QLabel("Tx")
         self.tx_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
@@ -2794,6 +2529,8 @@ class BatteryMonitorUI(QMainWindow):
         left_layout.addWidget(self.rx_led)
         left_layout.addSpacing(10)        
         left_layout.addWidget(self.update_time_label)
+        left_layout.addSpacing(4)
+        left_layout.addWidget(self.data_age_label)
         left_layout.addSpacing(20)
 
         layout.addLayout(left_layout)
@@ -2852,12 +2589,15 @@ class BatteryMonitorUI(QMainWindow):
         self.thread_label = QLabel("THR: -")
         self.trap_rate_label = QLabel("(TRAP/s: 0")
         self.queue_label = QLabel("QUEUE: 0/0)")
+        self.traffic_label = QLabel("TX - RX -")
+        self.traffic_label.setToolTip("최근 1시간 SNMP / 도달성 검사 송수신량 (UDP/IP header 포함)")
 
         self.cpu_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.mem_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.thread_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.trap_rate_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
         self.queue_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
+        self.traffic_label.setAlignment(Qt.AlignRight | Qt.AlignVCenter)
 
         info_layout.addWidget(self.cpu_label)
         info_layout.addSpacing(10)
@@ -2868,6 +2608,8 @@ class BatteryMonitorUI(QMainWindow):
         info_layout.addWidget(self.trap_rate_label)
         info_layout.addSpacing(10)
         info_layout.addWidget(self.queue_label)
+        info_layout.addSpacing(10)
+        info_layout.addWidget(self.traffic_label)
 
         info_layout.addStretch()
 
@@ -2975,14 +2717,341 @@ class AlarmListDialog(QDialog):
             self.table.setItem(row, 0, QTableWidgetItem(name))
             self.table.setItem(row, 1, QTableWidgetItem(desc))
             
+# ======================
+# Fleet 모드 (전체 사이트 요약)
+# ======================
+class FleetTableModel(QAbstractTableModel):
+    """사이트 요약 테이블 모델 (행 = 사이트)
+
+    update_site() 는 바뀐 셀에 대해서만 dataChanged 를 보낸다.
+    SORT_ROLE 은 정렬용 원본 값 (숫자 열은 숫자로 정렬).
+    """
+
+    HEADERS = ["설치장소", "시스템", "IP", "랙전압[V]", "랙전류[A]", "SOC[%]", "알람", "최종업데이트", "RTT[ms]", "상태"]
+    SORT_ROLE = Qt.UserRole + 2
+    KEY_ROLE = Qt.UserRole + 3
+
+    def __init__(self, summaries, parent=None):
+        super().__init__(parent)
+        self._keys = []
+        self._rows = []        # row → [(text, style, sort_value), ...]
+        self._row_of = {}
+        for summary in summaries:
+            self._row_of[summary["key"]] = len(self._keys)
+            self._keys.append(summary["key"])
+            self._rows.append(self._make_row(summary))
+
+    @staticmethod
+    def _num(value, fmt):
+        return ("-", None, -1e9) if value is None else (format(value, fmt), None, float(value))
+
+    def _make_row(self, s):
+        if s["poll_ok"] is None:
+            status = ("대기", None, 0)
+        elif s.get("health") in ("open", "half_open"):
+            retry = s.get("retry_in")
+            status = ("통신차단" if retry is None else f"통신차단 ({retry:.0f}s)", "이상", 4)
+        elif not s["poll_ok"]:
+            status = ("통신이상", "이상", 3)
+        elif s.get("health") == "degraded":
+            status = ("지연", "경보", 2)
+        elif s["faults"] or s["alarms"]:
+            status = ("경보", "경보", 2)
+        else:
+            status = ("정상", "정상", 1)
+
+        try:
+            soc = self._num(float(s["soc"]), ".0f") if s["soc"] not in (None, "") else self._num(None, "")
+        except ValueError:
+            soc = (str(s["soc"]), None, -1e9)
+
+        rtt = self._num(s["rtt_ms"], ".1f")
+        if s["rtt_ms"] is None and s["loss_percent"]:
+            rtt = ("무응답", "이상", 1e9)
+
+        alarms = s["alarms"] + s["faults"]
+
+        return [
+            (s["site"], None, s["site"]),
+            (s["system"], None, s["system"]),
+            (s["ip"], None, tuple(int(x) if x.isdigit() else 0 for x in s["ip"].split("."))),
+            self._num(s["rack_voltage"], ".1f"),
+            self._num(s["rack_current"], ".1f"),
+            soc,
+            (str(alarms), "이상" if alarms else None, alarms),
+            (s["last_update"] or "-", "stale" if s.get("stale") else None, s["last_update"] or ""),
+            rtt,
+            status,
+        ]
+
+    def key_at(self, row):
+        return self._keys[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal:
+            if role == Qt.DisplayRole:
+                return self.HEADERS[section]
+            if role == Qt.FontRole:
+                return BOLD_FONT
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        text, style, sort_value = self._rows[index.row()][index.column()]
+
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter
+        if role == self.SORT_ROLE:
+            return sort_value
+        if role == self.KEY_ROLE:
+            return self._keys[index.row()]
+        if style is not None and role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            bg, fg = CELL_STYLES[style]
+            return bg if role == Qt.BackgroundRole else fg
+        return None
+
+    def update_site(self, summary):
+        row = self._row_of.get(summary["key"])
+        if row is None:
+            return
+
+        new = self._make_row(summary)
+        old = self._rows[row]
+        changed = [col for col in range(len(new)) if new[col][:2] != old[col][:2]]
+        self._rows[row] = new
+
+        if changed:
+            self.dataChanged.emit(self.index(row, min(changed)), self.index(row, max(changed)))
+
+
+class FleetSortProxy(QSortFilterProxyModel):
+    """정렬 + 검색 (설치장소 / 시스템 / IP)"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(FleetTableModel.SORT_ROLE)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self._text = ""
+
+    def set_search(self, text):
+        self._text = text.strip().lower()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._text:
+            return True
+        model = self.sourceModel()
+        return any(
+            self._text in str(model.index(source_row, col).data()).lower()
+            for col in (0, 1, 2)
+        )
+
+    def lessThan(self, left, right):
+        a = left.data(FleetTableModel.SORT_ROLE)
+        b = right.data(FleetTableModel.SORT_ROLE)
+        try:
+            return a < b
+        except TypeError:
+            return str(a) < str(b)
+
+
+class FleetBridge(QObject):
+    """FleetEngine callback (worker / trap / prober thread) → Qt signal"""
+
+    site_signal = Signal(str)
+
+    def on_fleet_event(self, key, event, payload):
+        if event in ("poll", "poll_error", "trap", "probe"):
+            self.site_signal.emit(key)
+
+
+class FleetWindow(QMainWindow):
+    """profiles 폴더의 모든 사이트 요약 (더블클릭 → 사이트 상세창)"""
+
+    REFRESH_MS = 250
+
+    def __init__(self, profile_dir, interval=10.0, max_concurrency=16, metrics_port=0):
+        super().__init__()
+        from tbc_fleet import FleetEngine
+
+        self.setWindowTitle(f"{APP_NAME} {APP_VERSION} - Fleet")
+        self.resize(1200, 800)
+
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        self.log_dir = os.path.join(script_dir, "logs")
+        os.makedirs(self.log_dir, exist_ok=True)
+
+        self.fleet = FleetEngine.from_profile_dir(
+            profile_dir, interval=interval, max_concurrency=max_concurrency, log_dir=self.log_dir
+        )
+        self.site_windows = {}
+        self.dirty_sites = set()
+
+        self.bridge = FleetBridge(self)
+        self.bridge.site_signal.connect(self.dirty_sites.add)
+        self.fleet.subscribe(self.bridge.on_fleet_event)
+
+        self.metrics, self.metrics_server = start_metrics(
+            self.fleet, {"profile": "fleet"}, metrics_port,
+            os.path.join(self.log_dir, "metrics_fleet.json")
+        )
+
+        central = QWidget()
+        self.setCentralWidget(central)
+        layout = QVBoxLayout(central)
+
+        top = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("검색 (설치장소 / 시스템 / IP)")
+        self.count_label = QLabel()
+        top.addWidget(self.search_edit, 1)
+        top.addWidget(self.count_label)
+        layout.addLayout(top)
+
+        self.model = FleetTableModel(self.fleet.summaries(), self)
+        self.proxy = FleetSortProxy(self)
+        self.proxy.setSourceModel(self.model)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.doubleClicked.connect(self.open_site)
+        layout.addWidget(self.table)
+
+        self.search_edit.textChanged.connect(self.proxy.set_search)
+
+        self.render = RenderScheduler(self)
+        self.render.every(self.REFRESH_MS, "fleet_rows", self.flush_rows)
+        self.render.every(1000, "fleet_metrics", self.update_counts)
+
+        self.update_counts()
+        self.fleet.start()
+
+    def flush_rows(self):
+        if not self.dirty_sites:
+            return
+        keys, self.dirty_sites = self.dirty_sites, set()
+        for key in keys:
+            site = self.fleet.sites.get(key)
+            if site is not None:
+                self.model.update_site(site.summary())
+
+    def update_counts(self):
+        values = self.metrics.sample()
+        total = len(self.fleet.sites)
+        down = values.get("fleet_sites_down", 0)
+        self.count_label.setText(
+            f"사이트 {total} / 통신이상 {down} / poll 진행 {self.fleet.in_flight}"
+        )
+
+    def open_site(self, proxy_index):
+        key = self.proxy.data(proxy_index, FleetTableModel.KEY_ROLE)
+        site = self.fleet.sites.get(key)
+        if site is None:
+            return
+
+        win = self.site_windows.get(key)
+        if win is None:
+            win = BatteryMonitorUI(site.profile["path"])
+            win.setAttribute(Qt.WA_DeleteOnClose)
+            win.destroyed.connect(lambda _=None, k=key: self.site_windows.pop(k, None))
+            win.attach_shared_engine(site.monitor)
+            self.site_windows[key] = win
+            self.fleet.poll_now(key)
+
+        win.show()
+        win.raise_()
+        win.activateWindow()
+
+    def closeEvent(self, event):
+        for win in list(self.site_windows.values()):
+            win.close()
+        self.fleet.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        event.accept()
+
+# ======================
+# 시작 시간 측정 (--startup-profile)
+# ======================
+class FirstPaintProbe(QObject):
+    """창의 첫 Paint 이벤트 시점을 기록하고 결과 출력 (--startup-exit 이면 바로 닫음)"""
+
+    def __init__(self, widget, name, report_path=None, exit_after=False):
+        super().__init__(widget)
+        self.name = name
+        self.report_path = report_path
+        self.exit_after = exit_after
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            startup_timing.mark(f"first paint: {self.name}")
+            # paint 처리가 끝난 뒤 보고 / 종료
+            QTimer.singleShot(0, lambda: self.finish(obj))
+        return False
+
+    def finish(self, widget):
+        startup_timing.report(self.report_path)
+        if self.exit_after:
+            widget.close()
+            if isinstance(widget, QDialog):
+                widget.reject()
+            QApplication.instance().exit(0)
+
+
+def watch_first_paint(widget, name, args):
+    if startup_timing.ENABLED:
+        FirstPaintProbe(widget, name, args.startup_report, args.startup_exit)
+
 # ======================
 # 실행부
 # ======================
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # --headless : GUI 없이 감시 엔진만 실행 (tbc_engine.py 와 동일)
+    args, qt_args = build_arg_parser().parse_known_args()
+    if args.headless:
+        sys.exit(run_headless(args))
+
+    with startup_timing.measure("QApplication"):
+        app = QApplication(sys.argv[:1] + qt_args)
+
+    # --fleet 지정 시 profiles 폴더 전체 감시
+    if args.fleet:
+        win = FleetWindow(os.path.abspath(args.fleet), args.interval, args.max_concurrency, args.metrics_port)
+        watch_first_paint(win, "fleet window", args)
+        win.show()
+        sys.exit(app.exec())
+
+    # --profile 지정 시 프로파일 선택창 생략
+    if args.profile:
+        with startup_timing.measure("main window"):
+            win = BatteryMonitorUI(os.path.abspath(args.profile), metrics_port=args.metrics_port)
+        watch_first_paint(win, "main window", args)
+        win.show()
+        sys.exit(app.exec())
 
     profile_dir = os.path.join(os.getcwd(), "profiles")
-    dialog = ProfileDialog(profile_dir)
+    with startup_timing.measure("profile dialog"):
+        dialog = ProfileDialog(profile_dir)
+    watch_first_paint(dialog, "profile dialog", args)
 
     # profiles 폴더가 비어있으면 바로 신규 생성
     if not os.path.exists(profile_dir) or not os.listdir(profile_dir):
@@ -2990,17 +3059,22 @@ if __name__ == "__main__":
         if not dialog.new_profile_data:
             sys.exit()
     else:
-        if not dialog.exec():
+        if not dialog.exec() or args.startup_exit:
             sys.exit()
 
+    if dialog.fleet_selected:
+        win = FleetWindow(profile_dir, args.interval, args.max_concurrency, args.metrics_port)
+        win.show()
+        sys.exit(app.exec())
+
     if dialog.selected_profile_path:
         profile_path = dialog.selected_profile_path
-        win = BatteryMonitorUI(profile_path)
+        win = BatteryMonitorUI(profile_path, metrics_port=args.metrics_port)
     else:
         site, system = dialog.new_profile_data
         safe_name = re.sub(r"[^\w\-]", "_", f"{site}_{system}")
         profile_path = os.path.join(profile_dir, safe_name + ".ini")
-        win = BatteryMonitorUI(profile_path, dialog.new_profile_data)
+        win = BatteryMonitorUI(profile_path, dialog.new_profile_data, metrics_port=args.metrics_port)
 
     win.show()
     sys.exit(app.exec())
@@ -1,19 +1,11 @@
-import subprocess
-import time
+# 배터리 MIB 시험용 agent
+#
+# 예전에는 snmpsim-data-fold 를 5초마다 실행해 battery_data.conf 값을 바꿨음.
+# 이제 tbc_simulator 의 in-process agent 를 쓴다 (옵션은 tbc_simulator.py --help).
 
-def update_battery_data():
-    while True:
-        # 여기에 당신의 BMS Python/CAN 코드 삽입
-        volt = 523 + int(time.time() % 10)  # 시뮬레이션
-        curr = -125 + int(time.time() % 5)
-        
-        # snmpsim 데이터 업데이트
-        subprocess.run([
-            "snmpsim-data-fold", 
-            "--data-dir=D:\proj\GIT_HUB\work\RMS_Server",
-            f"--oid=.1.3.6.1.4.1.2011.6.164.1.17.1.1.5.1",
-            f"--set-value={volt}"
-        ])
-        time.sleep(5)
+import sys
 
-update_battery_data()
+from tbc_simulator import main
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:] or ["--modules", "16", "--alarm-rate", "0.05"]))
@@ -0,0 +1,150 @@
+# 콜드 스타트 회귀 벤치마크
+#
+# 감시프로그램을 별도 프로세스로 N회 실행(offscreen) → 프로파일 선택창 첫 paint 후 종료.
+# 프로세스 wall time / 첫 paint 시점 / import 구간을 중앙값으로 비교하고
+# 첫 paint 시점에 pysnmp / psutil 이 로드되어 있으면 실패로 처리.
+#
+# 사용 예
+#   python bench_startup.py --update-baseline            (기준값 저장)
+#   python bench_startup.py                              (기준값 대비 검사, 회귀 시 exit 1)
+#   python bench_startup.py --runs 10 --tolerance 0.3
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GUI_SCRIPT = os.path.join(HERE, "TBC1000B_감시프로그램_V0.0.2_#3.py")
+DEFAULT_BASELINE = os.path.join(HERE, "bench_startup_baseline.json")
+
+SAMPLE_PROFILE = """[General]
+site=bench
+system=bench
+equip=1
+ip=127.0.0.1
+port=161
+"""
+
+
+def run_gui_once(workdir):
+    report_path = os.path.join(workdir, "startup.json")
+    if os.path.exists(report_path):
+        os.remove(report_path)
+
+    env = dict(os.environ)
+    env["QT_QPA_PLATFORM"] = env.get("QT_QPA_PLATFORM", "offscreen")
+    env["TBC_STARTUP_PROFILE"] = "1"
+
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, GUI_SCRIPT, "--startup-exit", "--startup-report", report_path],
+        cwd=workdir, env=env, capture_output=True, text=True, timeout=60
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if proc.returncode != 0 or not os.path.exists(report_path):
+        raise RuntimeError(f"GUI 실행 실패 (rc={proc.returncode})\n{proc.stderr}")
+
+    with open(report_path, encoding="utf-8") as f:
+        report = json.load(f)
+
+    marks = {m["name"]: m for m in report["marks"]}
+    paint = marks.get("first paint: profile dialog")
+
+    return {
+        "wall_ms": wall_ms,
+        "first_paint_ms": paint["at_ms"] if paint else report["total_ms"],
+        "import_pyside6_ms": marks.get("import PySide6", {}).get("duration_ms", 0.0),
+        "import_engine_ms": marks.get("import tbc_engine", {}).get("duration_ms", 0.0),
+        "loaded_heavy": report["loaded_heavy"],
+    }
+
+
+def run_engine_import_once():
+    """tbc_engine import 만 (headless / 테스트 경로) - pysnmp 가 같이 로드되면 안됨"""
+    code = (
+        "import sys, time; t = time.perf_counter(); import tbc_engine; "
+        "print((time.perf_counter() - t) * 1000); print('pysnmp' in sys.modules)"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=HERE, capture_output=True, text=True, timeout=60)
+    if proc.returncode != 0:
+        raise RuntimeError(f"tbc_engine import 실패\n{proc.stderr}")
+
+    ms, pysnmp_loaded = proc.stdout.split()
+    return float(ms), pysnmp_loaded == "True"
+
+
+def bench(runs):
+    with tempfile.TemporaryDirectory() as workdir:
+        os.makedirs(os.path.join(workdir, "profiles"))
+        with open(os.path.join(workdir, "profiles", "bench.ini"), "w", encoding="utf-8") as f:
+            f.write(SAMPLE_PROFILE)
+
+        # 첫 실행은 디스크 캐시 / pyc 생성용으로 버림
+        run_gui_once(workdir)
+        samples = [run_gui_once(workdir) for _ in range(runs)]
+
+    engine_samples = [run_engine_import_once() for _ in range(runs)]
+
+    result = {
+        key: round(statistics.median(s[key] for s in samples), 1)
+        for key in ("wall_ms", "first_paint_ms", "import_pyside6_ms", "import_engine_ms")
+    }
+    result["engine_import_ms"] = round(statistics.median(ms for ms, _ in engine_samples), 1)
+    result["loaded_heavy"] = sorted({m for s in samples for m in s["loaded_heavy"]})
+    result["engine_loads_pysnmp"] = any(loaded for _, loaded in engine_samples)
+    result["runs"] = runs
+    return result
+
+
+def compare(result, baseline, tolerance):
+    """기준값 대비 (1 + tolerance) 배를 넘는 항목 목록"""
+    failures = []
+    for key in ("wall_ms", "first_paint_ms", "engine_import_ms"):
+        if key not in baseline:
+            continue
+        limit = baseline[key] * (1 + tolerance)
+        if result[key] > limit:
+            failures.append(f"{key}: {result[key]:.1f} ms > {limit:.1f} ms (baseline {baseline[key]:.1f})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="TBC1000B 감시프로그램 콜드 스타트 벤치마크")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="기준값 json 경로")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="허용 증가율 (0.25 = +25%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="이번 결과를 기준값으로 저장")
+    args = parser.parse_args(argv)
+
+    result = bench(args.runs)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+    failures = []
+    if result["loaded_heavy"]:
+        failures.append(f"첫 paint 전에 로드된 모듈: {', '.join(result['loaded_heavy'])}")
+    if result["engine_loads_pysnmp"]:
+        failures.append("import tbc_engine 시 pysnmp 로드됨")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+        print(f"baseline 저장: {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            failures += compare(result, json.load(f), args.tolerance)
+    else:
+        print("baseline 없음 (--update-baseline 으로 생성)")
+
+    for msg in failures:
+        print(f"REGRESSION: {msg}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
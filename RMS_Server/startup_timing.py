@@ -0,0 +1,80 @@
+# 시작 시간 측정
+#
+# --startup-profile 인자 또는 TBC_STARTUP_PROFILE=1 환경변수로 켠다.
+# import 구간 / QApplication 생성 / 첫 화면 paint / SNMP stack 로드 시간을 기록하고
+# 종료(또는 첫 paint) 시 표로 출력 + json 저장.
+# (interpreter 자체 기동 시간은 bench_startup.py 가 프로세스 밖에서 잰다)
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+T0 = time.perf_counter()
+
+ENABLED = "--startup-profile" in sys.argv or os.environ.get("TBC_STARTUP_PROFILE") == "1"
+
+# (이름, 시작 ms, 소요 ms)
+_marks = []
+
+# 시작 시 로드되면 안 되는 무거운 모듈 (bench_startup.py 가 검사)
+HEAVY_MODULES = ("pysnmp", "psutil", "asyncore")
+
+
+def elapsed_ms():
+    return (time.perf_counter() - T0) * 1000
+
+
+def mark(name):
+    """시점 기록 (소요시간 0)"""
+    if ENABLED:
+        _marks.append((name, elapsed_ms(), 0.0))
+
+
+@contextmanager
+def measure(name):
+    """구간 소요시간 기록"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if ENABLED:
+            _marks.append((name, (start - T0) * 1000, (time.perf_counter() - start) * 1000))
+
+
+def loaded_heavy_modules():
+    return sorted(m for m in HEAVY_MODULES if m in sys.modules)
+
+
+def snapshot():
+    return {
+        "marks": [
+            {"name": name, "at_ms": round(at, 2), "duration_ms": round(dur, 2)}
+            for name, at, dur in _marks
+        ],
+        "total_ms": round(elapsed_ms(), 2),
+        "loaded_heavy": loaded_heavy_modules(),
+    }
+
+
+def report(path=None, stream=None):
+    """측정 결과 출력 (+ path 지정 시 json 저장)"""
+    if not ENABLED:
+        return None
+
+    data = snapshot()
+    stream = stream or sys.stderr
+
+    print("=========== STARTUP PROFILE ===========", file=stream)
+    for m in data["marks"]:
+        dur = f"{m['duration_ms']:9.1f} ms" if m["duration_ms"] else " " * 12
+        print(f"{m['at_ms']:9.1f} ms  {dur}  {m['name']}", file=stream)
+    print(f"loaded heavy modules: {', '.join(data['loaded_heavy']) or '-'}", file=stream)
+    print("=======================================", file=stream)
+
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    return data
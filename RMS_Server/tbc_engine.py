@@ -0,0 +1,1582 @@
+# TBC1000B 감시 엔진 (Qt 위젯 없이 동작)
+#
+# SNMP polling / Trap 수신 / 알람·고장 판단 / 이력 저장을 담당한다.
+# GUI(TBC1000B_감시프로그램_V0.0.2_#3.py)는 이 엔진에 붙는 선택적인 client 이고,
+# 화면이 없는 서버에서는 아래처럼 단독 실행한다.
+#
+#   python tbc_engine.py --profile profiles/금하로_배터리_시스템_1.ini --ip 10.30.41.67
+#   python TBC1000B_감시프로그램_V0.0.2_#3.py --headless --profile ...
+
+import argparse
+import configparser
+import json
+import logging
+import os
+import re
+import signal
+import sys
+import threading
+import time
+import weakref
+from collections import deque
+from datetime import datetime
+from types import SimpleNamespace
+
+import startup_timing
+from tbc_health import OPEN, STATE_LEVEL, TargetHealth
+from tbc_inventory import InventoryCache, inventory_path
+
+logger = logging.getLogger("tbc")
+
+TRAP_QUEUE_SIZE = 2000
+
+# 감시 방식
+#   poll : interval 마다 전체 walk (기본)
+#   trap : trap 위주 - heartbeat 주기 walk + 알람/해제 trap 수신 시 walk (종량제 회선용)
+MODE_POLL = "poll"
+MODE_TRAP = "trap"
+TRAP_MODE_HEARTBEAT = 300.0     # [s]
+TRAP_MODE_MIN_GAP = 10.0        # [s] trap 으로 인한 walk 최소 간격 (trap 폭주 시 묶음)
+TRAP_MODE_PROBE_INTERVAL = 60.0 # [s] 도달성 probe 주기
+UDP_IP_OVERHEAD = 28            # IPv4 + UDP header [byte]
+
+# 접속 handshake : 사이트마다 community 가 public / skt_public 로 다름
+CONNECT_COMMUNITIES = ("public", "skt_public")
+CONNECT_PORTS = (161,)
+CONNECT_TIMEOUT = 2.0           # [s]
+
+# =======================================================================================================================
+# EMAP MIB OID
+# =======================================================================================================================
+POLL_BASE_OIDS = [
+    "1.3.6.1.4.1.2011.6.164.1.18.1",        # hwAcbBaseTable
+    "1.3.6.1.4.1.2011.6.164.1.17.1",        # hwAcbGroupSampTable
+    "1.3.6.1.4.1.2011.6.164.1.18.2",        # hwAcbSampTable
+    "1.3.6.1.4.1.2011.6.164.1.1.2.99"       # Active Alarm Table
+]
+
+OID_SYS_UPTIME = "1.3.6.1.2.1.1.3.0"
+
+OID_ALARM_TEXT = "1.3.6.1.4.1.2011.6.164.1.1.2.99.1.2."
+OID_ALARM_TIME = "1.3.6.1.4.1.2011.6.164.1.1.2.99.1.5."
+OID_ALARM_EQUIP = "1.3.6.1.4.1.2011.6.164.1.1.2.99.1.10."
+
+OID_RACK_VOLTAGE = "1.3.6.1.4.1.2011.6.164.1.17.1.1.5.96"
+OID_RACK_CURRENT = "1.3.6.1.4.1.2011.6.164.1.17.1.1.6.96"
+OID_RACK_SOC = "1.3.6.1.4.1.2011.6.164.1.17.1.1.8.96"
+OID_RACK_CYCLES = "1.3.6.1.4.1.2011.6.164.1.17.1.1.23.96"
+
+OID_BASE_ENTRY = "1.3.6.1.4.1.2011.6.164.1.18.1.1."
+OID_BASE_EQUIP_COLUMN = "1.3.6.1.4.1.2011.6.164.1.18.1.1.2"    # inventory 확인용 (equip ID 열만)
+OID_SAMP_ENTRY = "1.3.6.1.4.1.2011.6.164.1.18.2.1."
+
+OID_SNMP_TRAP = "1.3.6.1.6.3.1.1.4.1.0"
+
+TRAP_NAME_MAP = {
+    "1.3.6.1.4.1.2011.6.164.2.1.3.0.99": "hwAcbAlarmTrap",
+    "1.3.6.1.4.1.2011.6.164.2.1.3.0.100": "hwAcbAlarmResumeTrap",
+    "1.3.6.1.4.1.2011.6.164.2.1.15.0.1": "hwCabinetAlarmTrap",
+    "1.3.6.1.4.1.2011.6.164.2.1.15.0.2": "hwCabinetAlarmResumeTrap",
+}
+
+ALARM_TRAP_OIDS = {
+    "1.3.6.1.4.1.2011.6.164.2.1.3.0.99",
+    "1.3.6.1.4.1.2011.6.164.2.1.15.0.1",
+}
+
+RESUME_TRAP_OIDS = {
+    "1.3.6.1.4.1.2011.6.164.2.1.3.0.100",
+    "1.3.6.1.4.1.2011.6.164.2.1.15.0.2",
+}
+
+ACB_TRAP_PREFIX = "1.3.6.1.4.1.2011.6.164.2.1.3."
+
+PREFIX_ORDINAL = "1.3.6.1.4.1.2011.6.164.1.1.2.2.0"
+PREFIX_ALARM = "1.3.6.1.4.1.2011.6.164.1.1.2.100.1.2."
+PREFIX_LEVEL = "1.3.6.1.4.1.2011.6.164.1.1.2.100.1.3."
+PREFIX_EQUIP_NAME = "1.3.6.1.4.1.2011.6.164.1.18.1.1.3."
+PREFIX_EQUIP_ID = "1.3.6.1.4.1.2011.6.164.1.34.1.1.2."
+PREFIX_FATHER_NAME = "1.3.6.1.4.1.2011.6.164.1.34.1.1.3."
+PREFIX_TRAP_EQUIP = "1.3.6.1.4.1.2011.6.164.1.18.1.1.2."
+
+SNMP_NO_VALUE = "2147483647"
+
+FAULT_ALARMS = [
+    "Board hardware fault",
+] + [f"Cell {i} Fault" for i in range(1, 16)]
+
+# 요약 알람 : key → (poll 알람 문구, trap 키워드)
+SUMMARY_ALARMS = {
+    "overcharge": (
+        "Overcharge Protection",
+        ["overcharge protection", "overcharge voltage protection"]
+    ),
+    "high_temp": (
+        "Charging high temperature protection",
+        ["charging high temperature protection", "high temperature protection",
+         "charge high temperature protection"]
+    ),
+    "overcurrent": (
+        "Charging Overcurrent Protection",
+        ["charge overcurrent protection", "charging overcurrent protection"]
+    ),
+}
+
+# ======================
+# Profile
+# ======================
+PROFILE_DEFAULTS = {
+    "ip": "10.30.41.67",
+    "port": "161",
+    "get_community": "skt_public",
+    "set_community": "private",
+    "trap_community": "skt_public",
+    "trap_port": "1162",
+}
+
+
+def ini_quote(value):
+    """QSettings IniFormat 과 같은 규칙으로 값 인용 (쉼표가 있으면 QSettings 가 목록으로 읽음)"""
+    value = str(value)
+    if value and (any(c in value for c in ',;"=\\') or value != value.strip()):
+        return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+    return value
+
+
+def ini_unquote(value):
+    if len(value) >= 2 and value[0] == '"' and value[-1] == '"':
+        return re.sub(r"\\(.)", r"\1", value[1:-1])
+    return value
+
+
+def load_profile(path):
+    """QSettings(IniFormat) 로 저장된 프로파일을 Qt 없이 읽음"""
+    parser = configparser.ConfigParser(interpolation=None)
+    parser.optionxform = str
+    parser.read(path, encoding="utf-8")
+
+    profile = dict(PROFILE_DEFAULTS)
+    if parser.has_section("General"):
+        profile.update((key, ini_unquote(val)) for key, val in parser["General"].items())
+    profile["path"] = path
+    return profile
+
+# ======================
+# Poll 결과 해석
+# ======================
+def new_module_data():
+    return {
+        "volt": None,
+        "status": None,
+        "soc": None,
+        "soh": None,
+        "cells": [0.0] * 15,
+        "temps": [0.0] * 15
+    }
+
+
+def decode_poll_result(value, inventory=None):
+    """bulk walk 결과 {oid: str} → 모듈/알람/요약 snapshot
+
+    GUI 와 headless 모드 모두 이 결과만 사용한다.
+    inventory(InventoryCache.rows) : BaseTable 을 equip ID 열만 walk 한 경우 나머지 열 대신 사용
+    """
+    module_map = {}     # {module_no: {equip_id, swver, model, barcode}}
+    module_data = {}    # {equip_id: {battery data}}
+    alarm_entries = {}
+    summary = {
+        "rack_voltage": None,
+        "rack_current": None,
+        "soc": None,
+        "cycles": None,
+    }
+
+    for oid, val in value.items():
+
+        val_str = str(val)
+        if val_str == SNMP_NO_VALUE:
+            continue
+
+        # Active Alarm Table
+        if oid.startswith(OID_ALARM_TEXT):
+            alarm_entries.setdefault(oid.split(".")[-1], {})["text"] = val_str
+
+        elif oid.startswith(OID_ALARM_TIME):
+            alarm_entries.setdefault(oid.split(".")[-1], {})["time"] = val_str
+
+        elif oid.startswith(OID_ALARM_EQUIP):
+            alarm_entries.setdefault(oid.split(".")[-1], {})["equip"] = int(val_str)
+
+        # Summary 영역
+        elif oid == OID_RACK_VOLTAGE:
+            summary["rack_voltage"] = int(val_str) / 10
+
+        elif oid == OID_RACK_CURRENT:
+            summary["rack_current"] = int(val_str) / 10
+
+        elif oid == OID_RACK_SOC:
+            summary["soc"] = val_str
+
+        elif oid == OID_RACK_CYCLES:
+            summary["cycles"] = val_str
+
+        # hwAcbBaseTable - Module 매핑 (EquipID → ModuleNo)
+        elif oid.startswith(OID_BASE_ENTRY + "2."):
+
+            row_index = oid.split(".")[-1]
+            addr = value.get(f"{OID_BASE_ENTRY}4.{row_index}")
+
+            if addr is None and inventory and row_index in inventory:
+                cached = inventory[row_index]
+                module_map[int(cached["addr"])] = {
+                    "equip_id": row_index,
+                    "swver": cached.get("swver"),
+                    "model": cached.get("model"),
+                    "barcode": cached.get("barcode")
+                }
+
+            elif addr is not None:
+                module_map[int(addr)] = {
+                    "equip_id": row_index,
+                    "swver": value.get(f"{OID_BASE_ENTRY}5.{row_index}"),
+                    "model": value.get(f"{OID_BASE_ENTRY}12.{row_index}"),
+                    "barcode": value.get(f"{OID_BASE_ENTRY}13.{row_index}")
+                }
+
+        # SampTable (실제 배터리 데이터)
+        elif oid.startswith(OID_SAMP_ENTRY):
+
+            parts = oid.split(".")
+            column = int(parts[-2])
+            data = module_data.setdefault(parts[-1], new_module_data())
+
+            try:
+                if column == 1:
+                    data["volt"] = int(val_str) / 10
+                elif column == 3:
+                    data["status"] = int(val_str)
+                elif column == 4:
+                    data["soh"] = int(val_str)
+                elif 6 <= column <= 20:
+                    data["cells"][column - 6] = round(int(val_str) / 100, 2)
+                elif 22 <= column <= 36:
+                    data["temps"][column - 22] = round(int(val_str) / 10, 1)
+                elif column == 52:
+                    data["soc"] = int(val_str)
+            except ValueError:
+                pass
+
+    alarms = list(alarm_entries.values())
+
+    snapshot = {
+        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "module_map": module_map,
+        "module_data": module_data,
+        "alarms": alarms,
+        "summary": summary,
+    }
+    snapshot["stats"] = module_stats(module_map, module_data)
+    snapshot["alarm_flags"] = summary_alarm_flags(alarms)
+    snapshot["faults"] = active_faults(module_map, module_data, alarms)
+    return snapshot
+
+
+def module_stats(module_map, module_data):
+    """Offline/Unknown 모듈을 제외한 모듈 전압 / 셀 온도 Max, Min, Avg"""
+    volt_list = []
+    temp_list = []
+
+    for module_no in sorted(module_map):
+
+        data = module_data.get(module_map[module_no]["equip_id"])
+        if not data or data.get("status") in (1, 255):
+            continue
+
+        if data.get("volt") is not None:
+            volt_list.append(data["volt"])
+
+        temp_list.extend(t for t in data.get("temps", []) if t is not None)
+
+    def stat(values):
+        if not values:
+            return None
+        return max(values), min(values), sum(values) / len(values)
+
+    return {"volt": stat(volt_list), "temp": stat(temp_list)}
+
+
+def summary_alarm_flags(alarms):
+    flags = dict.fromkeys(SUMMARY_ALARMS, False)
+
+    for alarm in alarms:
+        text = alarm.get("text", "")
+        for key, (poll_text, _) in SUMMARY_ALARMS.items():
+            if poll_text in text:
+                flags[key] = True
+                break
+
+    return flags
+
+
+def equip_to_module(module_map, equip_id):
+    for m_no, info in module_map.items():
+        if int(info["equip_id"]) == int(equip_id):
+            return m_no
+    return None
+
+
+def cell_values(module_map, module_data, module_no, cell_no):
+    """(전압, 온도) — 모듈/셀 정보가 없으면 (None, None)"""
+    info = module_map.get(module_no)
+    data = module_data.get(info["equip_id"]) if info else None
+
+    if not data or cell_no < 1 or cell_no > len(data["cells"]):
+        return None, None
+
+    return data["cells"][cell_no - 1], data["temps"][cell_no - 1]
+
+
+def active_faults(module_map, module_data, alarms):
+    """Active Alarm 중 고장 알람 → {(module_no, cell_no): fault}  (cell 0 = Board hardware fault)"""
+    faults = {}
+
+    for alarm in alarms:
+
+        text = alarm.get("text")
+        equip = alarm.get("equip")
+        if text not in FAULT_ALARMS or equip is None:
+            continue
+
+        module_no = equip_to_module(module_map, equip)
+        if module_no is None:
+            continue
+
+        cell_no = 0
+        if "Cell" in text:
+            try:
+                cell_no = int(text.split(" ")[1])
+            except (IndexError, ValueError):
+                pass
+
+        volt, temp = cell_values(module_map, module_data, module_no, cell_no)
+        faults[(module_no, cell_no)] = {
+            "module": module_no,
+            "cell": cell_no,
+            "volt": volt or 0,
+            "temp": temp or 0,
+        }
+
+    return faults
+
+# ======================
+# Trap 해석
+# ======================
+def parse_trap(trap_data, module_map=None, module_data=None):
+    """Trap varBind {oid: str} → 표시/판단용 dict"""
+    trap_oid = trap_data.get(OID_SNMP_TRAP, "")
+
+    display_oid = trap_oid
+    if trap_oid in TRAP_NAME_MAP:
+        display_oid = f"{trap_oid}:{TRAP_NAME_MAP[trap_oid]}"
+
+    if trap_oid in ALARM_TRAP_OIDS:
+        kind = "alarm"
+    elif trap_oid in RESUME_TRAP_OIDS:
+        kind = "resume"
+    else:
+        kind = None
+
+    trap = {
+        "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "trap_oid": trap_oid,
+        "display_oid": display_oid,
+        "kind": kind,
+        "ordinal": "",
+        "alarm": "",
+        "level": "",
+        "equip_id": "",
+        "equip_name": "",
+        "father_name": "",
+        "flag_changes": {},
+        "cell_fault": None,
+        "raw": trap_data,
+    }
+
+    trap_equip = None
+
+    # 동적 index 대응 prefix 매칭
+    for oid, val in trap_data.items():
+
+        if oid == PREFIX_ORDINAL:
+            trap["ordinal"] = val
+        elif oid.startswith(PREFIX_ALARM):
+            trap["alarm"] = val
+        elif oid.startswith(PREFIX_LEVEL):
+            trap["level"] = val
+        elif oid.startswith(PREFIX_EQUIP_NAME):
+            trap["equip_name"] = val
+        elif oid.startswith(PREFIX_EQUIP_ID):
+            trap["equip_id"] = val
+        elif oid.startswith(PREFIX_FATHER_NAME):
+            trap["father_name"] = val
+
+        if oid.startswith(PREFIX_TRAP_EQUIP):
+            trap_equip = int(oid.split(".")[-1])
+
+    # 요약 알람 (과전압/고온/과전류 충전차단) 발생·해제
+    alarm_lower = str(trap["alarm"]).lower()
+    if kind and trap_oid.startswith(ACB_TRAP_PREFIX):
+        for key, (_, keywords) in SUMMARY_ALARMS.items():
+            if any(k in alarm_lower for k in keywords):
+                trap["flag_changes"][key] = (kind == "alarm")
+
+    # Cell N Fault → 고장 정보
+    m = re.search(r'cell\s*(\d+)\s*fault', str(trap["alarm"]), re.IGNORECASE)
+    if m and trap_equip is not None and module_map:
+        module_no = equip_to_module(module_map, trap_equip)
+        if module_no is not None:
+            cell_no = int(m.group(1))
+            volt, temp = cell_values(module_map, module_data or {}, module_no, cell_no)
+            if volt is not None:
+                trap["cell_fault"] = {
+                    "module": module_no,
+                    "cell": cell_no,
+                    "volt": volt,
+                    "temp": temp,
+                }
+
+    return trap
+
+# ======================
+# SNMP stack (지연 로드)
+# ======================
+_snmp = None
+
+
+def load_snmp_stack():
+    """pysnmp 는 import 비용이 커서 첫 접속 시점에 로드 (프로파일 창이 먼저 뜨도록)"""
+    global _snmp
+
+    if _snmp is None:
+        with startup_timing.measure("import pysnmp"):
+            import asyncore
+            from pysnmp import hlapi
+            from pysnmp.hlapi.asyncore import cmdgen as async_cmdgen
+            from pysnmp.entity import engine, config
+            from pysnmp.carrier.asyncore.dgram import udp
+            from pysnmp.entity.rfc3413 import ntfrcv
+
+        _snmp = SimpleNamespace(hlapi=hlapi, async_cmdgen=async_cmdgen, asyncore=asyncore, engine=engine,
+                                config=config, udp=udp, ntfrcv=ntfrcv)
+
+    return _snmp
+
+# ======================
+# 송수신량 집계
+# ======================
+class TrafficCounter:
+    """SNMP 송수신 byte (UDP/IP header 포함) 누적 + 시간대별 집계"""
+
+    def __init__(self, hours=48):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.tx_bytes = 0
+        self.rx_bytes = 0
+        self.tx_packets = 0
+        self.rx_packets = 0
+        self.hours = deque(maxlen=hours)    # [시작 epoch, tx, rx]
+
+    def add(self, tx=0, rx=0, packets=1):
+        now = time.time()
+        hour = int(now // 3600 * 3600)
+
+        with self._lock:
+            if not self.hours or self.hours[-1][0] != hour:
+                if self.hours:
+                    start, htx, hrx = self.hours[-1]
+                    logger.info("traffic hour", extra={"fields": {
+                        "hour": datetime.fromtimestamp(start).strftime("%Y-%m-%d %H:00"),
+                        "tx_bytes": htx, "rx_bytes": hrx}})
+                self.hours.append([hour, 0, 0])
+
+            bucket = self.hours[-1]
+            if tx:
+                self.tx_bytes += tx
+                self.tx_packets += packets
+                bucket[1] += tx
+            if rx:
+                self.rx_bytes += rx
+                self.rx_packets += packets
+                bucket[2] += rx
+
+    def per_hour(self):
+        """최근 1시간 (시작 후 1시간 미만이면 경과시간 기준 환산) → (tx/h, rx/h)"""
+        now = time.time()
+
+        with self._lock:
+            elapsed = now - self.started
+            if elapsed < 3600:
+                scale = 3600 / max(elapsed, 60.0)
+                return self.tx_bytes * scale, self.rx_bytes * scale
+
+            # 현재 시간대 + 이전 시간대 중 최근 1시간에 걸친 비율
+            hour = int(now // 3600 * 3600)
+            tx = rx = 0.0
+            for start, htx, hrx in self.hours:
+                if start == hour:
+                    tx += htx
+                    rx += hrx
+                elif start == hour - 3600:
+                    frac = 1 - (now - hour) / 3600
+                    tx += htx * frac
+                    rx += hrx * frac
+            return tx, rx
+
+    def stats(self):
+        tx_h, rx_h = self.per_hour()
+        return {
+            "tx_bytes": self.tx_bytes,
+            "rx_bytes": self.rx_bytes,
+            "tx_packets": self.tx_packets,
+            "rx_packets": self.rx_packets,
+            "tx_bytes_per_hour": tx_h,
+            "rx_bytes_per_hour": rx_h,
+        }
+
+
+def attach_traffic_observer(snmp_engine, resolve):
+    """pysnmp 송수신 message 크기 집계 (resolve(ip) → TrafficCounter | None)"""
+
+    def observer(snmpEngine, execpoint, variables, cbCtx):
+        try:
+            counter = resolve(variables["transportAddress"][0])
+        except (KeyError, IndexError, TypeError):
+            return
+        if counter is None:
+            return
+
+        if execpoint == "rfc3412.sendPdu":
+            counter.add(tx=len(variables.get("outgoingMessage", b"")) + UDP_IP_OVERHEAD)
+        else:
+            counter.add(rx=len(variables.get("wholeMsg", b"")) + UDP_IP_OVERHEAD)
+
+    try:
+        snmp_engine.observer.registerObserver(
+            observer,
+            "rfc3412.sendPdu",
+            "rfc3412.receiveMessage:response",
+            "rfc3412.receiveMessage:request"
+        )
+    except Exception as e:
+        logger.debug("traffic observer 등록 실패: %s", e)
+
+class PduTimer:
+    """SnmpEngine observer : 요청 PDU 송신 ~ 같은 request-id 응답 수신 시간 (요청 1개당 표본 1개)
+
+    bulkCmd 는 응답 하나의 varBind row 마다 yield 하므로 yield 간격으로 재면 row 수만큼 0 에 가까운
+    표본이 생김 → 송수신 시점에서 직접 잰다. 재전송된 요청은 어느 송신의 응답인지 알 수 없으므로 버림 (Karn).
+    """
+
+    def __init__(self):
+        self.sent = {}              # request-id → 송신 시각 (재전송된 요청은 None)
+        self.samples = []
+
+    def reset(self):
+        self.sent.clear()
+        self.samples = []
+
+    def take(self):
+        samples, self.samples = self.samples, []
+        return samples
+
+    def __call__(self, snmpEngine, execpoint, variables, cbCtx):
+        try:
+            request_id = int(variables["pdu"].getComponentByPosition(0))
+        except Exception:
+            return
+        now = time.perf_counter()
+
+        if execpoint == "rfc3412.sendPdu":
+            self.sent[request_id] = None if request_id in self.sent else now
+        else:
+            sent = self.sent.pop(request_id, None)
+            if sent is not None:
+                self.samples.append(now - sent)
+
+
+_pdu_timers = weakref.WeakKeyDictionary()   # SnmpEngine → PduTimer
+
+
+def pdu_timer(snmp_engine):
+    """엔진에 PduTimer 를 한번만 붙이고 돌려줌 (fleet 모드 worker 엔진은 여러 사이트가 차례로 사용)"""
+    timer = _pdu_timers.get(snmp_engine)
+    if timer is None:
+        timer = _pdu_timers[snmp_engine] = PduTimer()
+        try:
+            snmp_engine.observer.registerObserver(
+                timer, "rfc3412.sendPdu", "rfc3412.receiveMessage:response")
+        except Exception as e:
+            logger.debug("RTT observer 등록 실패: %s", e)
+    return timer
+
+# ======================
+# SNMP 연결 테스트 / Polling / Trap 수신
+# ======================
+def test_connection(ip, port, community, timeout=2, retries=0):
+    """sysUpTime GET 1회 → (성공여부, 값)"""
+    hlapi = load_snmp_stack().hlapi
+
+    errorIndication, errorStatus, errorIndex, varBinds = next(
+        hlapi.getCmd(
+            hlapi.SnmpEngine(),
+            hlapi.CommunityData(community, mpModel=1),
+            hlapi.UdpTransportTarget((ip, int(port)), timeout=timeout, retries=retries),
+            hlapi.ContextData(),
+            hlapi.ObjectType(hlapi.ObjectIdentity(OID_SYS_UPTIME))
+        )
+    )
+
+    if errorIndication or errorStatus:
+        return False, ""
+
+    return True, str(varBinds[0][1]) if varBinds else ""
+
+
+def connect_candidates(community, port, communities=CONNECT_COMMUNITIES, ports=CONNECT_PORTS):
+    """handshake 후보 [(community, port)] - 설정값이 먼저, 중복 제거"""
+    communities = list(dict.fromkeys([community, *communities]))
+    ports = list(dict.fromkeys([int(port), *(int(p) for p in ports)]))
+    return [(c, p) for p in ports for c in communities]
+
+
+class ConnectHandshake:
+    """후보 (community, port) 모두에 sysUpTime GET 을 한번에 보내고 처음 응답한 조합을 채택
+
+    SNMPv2c agent 는 community 가 틀리면 응답하지 않으므로 응답 = 접속 가능한 조합.
+    poller 의 SnmpEngine 으로 보내므로 송수신량 / RTT observer 에도 그대로 잡힌다.
+    채택 후 남은 후보 요청은 timeout 까지 엔진에 남아 있어 첫 walk 가 최대 timeout 만큼 늦어질 수 있음.
+    """
+
+    def __init__(self, snmp_engine, ip, candidates, timeout=CONNECT_TIMEOUT):
+        self.snmp_engine = snmp_engine
+        self.ip = ip
+        self.candidates = list(candidates)
+        self.timeout = timeout
+        self._pending = set()       # 응답 / timeout 을 기다리는 후보 index
+        self._answered = []         # (후보 index, RTT [s])
+        self._sent = {}             # 후보 index → 송신 시각 (첫 요청은 MIB 로드 시간이 섞이므로 요청별로)
+
+    def _on_response(self, snmpEngine, sendRequestHandle, errorIndication, errorStatus,
+                     errorIndex, varBinds, index):
+        self._pending.discard(index)
+        if errorIndication:
+            logger.debug("handshake %s:%s: %s", self.ip, self.candidates[index][1], errorIndication)
+            return
+        # errorStatus 도 agent 가 community 를 받아들였다는 뜻
+        self._answered.append((index, time.perf_counter() - self._sent[index]))
+
+    def run(self, stop_event=None):
+        """→ {"ok", "community", "port", "rtt_ms", "tried"}"""
+        snmp = load_snmp_stack()
+        hlapi = snmp.hlapi
+        result = {"ok": False, "community": None, "port": None, "rtt_ms": None,
+                  "tried": len(self.candidates)}
+
+        for i, (community, port) in enumerate(self.candidates):
+            try:
+                snmp.async_cmdgen.getCmd(
+                    self.snmp_engine,
+                    hlapi.CommunityData(community, mpModel=1),
+                    hlapi.UdpTransportTarget((self.ip, port), timeout=self.timeout, retries=0),
+                    hlapi.ContextData(),
+                    hlapi.ObjectType(hlapi.ObjectIdentity(OID_SYS_UPTIME)),
+                    cbFun=self._on_response, cbCtx=i
+                )
+            except Exception as e:
+                logger.debug("handshake send error %s:%s: %s", self.ip, port, e)
+                continue
+            self._sent[i] = time.perf_counter()
+            self._pending.add(i)
+
+        # runDispatcher 는 모든 요청이 끝나야 돌아오므로 직접 돌리며 첫 응답에서 멈춤
+        # (stop 요청에 반응하도록 짧게 나눠 대기)
+        dispatcher = self.snmp_engine.transportDispatcher
+        while self._pending and not self._answered:
+            if stop_event is not None and stop_event.is_set():
+                break
+            try:
+                snmp.asyncore.loop(0.2, use_poll=True, map=dispatcher.getSocketMap(), count=1)
+            except Exception as e:
+                logger.debug("handshake dispatch error %s: %s", self.ip, e)
+                break
+            dispatcher.handleTimerTick(time.time())
+
+        if self._answered:
+            # 같은 시점에 도착한 응답이 여럿이면 설정값에 가까운 후보 우선
+            best, rtt = min(self._answered)
+            result.update(ok=True, community=self.candidates[best][0],
+                          port=self.candidates[best][1], rtt_ms=rtt * 1000)
+        return result
+
+
+class SnmpPoller(threading.Thread):
+    """배터리 MIB 4개 subtree 를 주기적으로 bulk walk
+
+    candidates 지정 시 첫 walk 전에 ConnectHandshake 로 (community, port) 를 정하고
+    on_connect(result) 호출. 실패하면 thread 종료.
+    health(TargetHealth) 지정 시 요청 timeout / 재시도 / back-off 를 그 상태에 맞춤.
+    """
+
+    def __init__(self, ip, community, port, interval=5.0,
+                 on_tx=None, on_rx=None, on_result=None,
+                 min_gap=0.0, traffic=None,
+                 candidates=None, on_connect=None, health=None, oids=None):
+        super().__init__(name=f"snmp-poll-{ip}", daemon=True)
+        self.ip = ip
+        self.community = community
+        self.port = int(port)
+        self.interval = interval
+        self.min_gap = min_gap
+        self.traffic = traffic
+        self._wake_event = threading.Event()
+        self.on_tx = on_tx or (lambda: None)
+        self.on_rx = on_rx or (lambda: None)
+        self.on_result = on_result or (lambda ok, data: None)
+        self.candidates = candidates
+        self.on_connect = on_connect or (lambda result: None)
+        self.health = health
+        # walk 할 subtree 목록을 돌려주는 함수 (없으면 POLL_BASE_OIDS 전체)
+        self.oids = oids
+        self.snmpEngine = None
+        self._session = None            # ((community, port), CommunityData, UdpTransportTarget, ContextData)
+        self._stop_event = threading.Event()
+        self.last_poll_duration = 0.0
+        # 마지막 poll 의 요청별 RTT [s]
+        self.last_rtts = []
+
+    @property
+    def running(self):
+        return not self._stop_event.is_set()
+
+    def poll_once(self, snmp_engine=None):
+        """한 cycle walk → {oid: str} (실패시 None)
+
+        snmp_engine 지정 시 그 엔진 사용 (fleet 모드: worker thread 별 엔진 공유)
+        """
+        hlapi = load_snmp_stack().hlapi
+        snmp_engine = snmp_engine or self.snmpEngine
+        _, auth, target, context = self.session()
+        result_data = {}
+        timer = pdu_timer(snmp_engine)
+        timer.reset()
+
+        for base_oid in (self.oids() if self.oids else POLL_BASE_OIDS):
+
+            self.on_tx()
+
+            for (errorIndication, errorStatus, errorIndex, varBinds) in hlapi.bulkCmd(
+                    snmp_engine, auth, target, context,
+                    0, 10,
+                    hlapi.ObjectType(hlapi.ObjectIdentity(base_oid)),
+                    lexicographicMode=False):
+
+                if not self.running:
+                    return None
+
+                if errorIndication or errorStatus:
+                    logger.debug("poll error %s: %s", base_oid, errorIndication or errorStatus)
+                    return None
+
+                self.on_rx()
+
+                for varBind in varBinds:
+                    result_data[str(varBind[0])] = varBind[1].prettyPrint()
+
+        # 요청 PDU 별 RTT (PduTimer 가 송수신 시점에서 잰 값)
+        self.last_rtts = timer.take()
+        return result_data
+
+    def session(self):
+        """walk 마다 만들던 인증 / target 객체 (주소 해석 포함) 를 연결 동안 재사용"""
+        key = (self.community, self.port)
+        if self._session is None or self._session[0] != key:
+            hlapi = load_snmp_stack().hlapi
+            self._session = (
+                key,
+                hlapi.CommunityData(self.community, mpModel=1),
+                hlapi.UdpTransportTarget((self.ip, self.port)),
+                hlapi.ContextData(),
+            )
+        return self._session
+
+    def probe_once(self, snmp_engine=None):
+        """sysUpTime GET 1회 (half-open 확인) → RTT [s], 무응답 시 None"""
+        hlapi = load_snmp_stack().hlapi
+        _, auth, target, context = self.session()
+
+        self.on_tx()
+        sent = time.perf_counter()
+        errorIndication, errorStatus, errorIndex, varBinds = next(
+            hlapi.getCmd(
+                snmp_engine or self.snmpEngine, auth, target, context,
+                hlapi.ObjectType(hlapi.ObjectIdentity(OID_SYS_UPTIME))
+            )
+        )
+        if errorIndication or errorStatus:
+            return None
+
+        self.on_rx()
+        return time.perf_counter() - sent
+
+    def attempt(self, snmp_engine=None):
+        """통신 상태를 반영한 poll 1회 → {oid: str} (실패 / 차단 중 확인 실패시 None)
+
+        open 상태면 walk 대신 sysUpTime 1회로 먼저 확인 (죽은 agent 에 walk 로 thread 를 묶지 않음)
+        """
+        health = self.health
+
+        if health is not None:
+            if health.state == OPEN:
+                health.begin_probe()
+                self._apply_health(health)
+                try:
+                    rtt = self.probe_once(snmp_engine)
+                except Exception as e:
+                    logger.debug("probe exception %s: %s", self.ip, e)
+                    rtt = None
+                if rtt is None:
+                    health.on_failure(self.interval)
+                    return None
+                health.record_rtt(rtt)
+            self._apply_health(health)
+
+        try:
+            result_data = self.poll_once(snmp_engine)
+        except Exception as e:
+            logger.warning("poll exception %s: %s", self.ip, e)
+            result_data = None
+
+        if health is not None and self.running:
+            if result_data:
+                health.on_success(self.last_rtts)
+            else:
+                health.on_failure(self.interval)
+
+        return result_data
+
+    def _apply_health(self, health):
+        # pysnmp 는 target 의 timeout / retries 를 요청 시점에 읽음 (lcd 설정 key 에 포함)
+        _, _, target, _ = self.session()
+        target.timeout = health.timeout
+        target.retries = health.retries
+
+    def next_delay(self):
+        return self.health.next_delay(self.interval) if self.health is not None else self.interval
+
+    def wake(self):
+        """다음 주기를 기다리지 않고 walk (min_gap 이내 요청은 하나로 묶음)"""
+        self._wake_event.set()
+
+    def run(self):
+        # polling 용 엔진은 연결 동안 재사용 (handshake 도 같은 엔진으로 송신)
+        self.snmpEngine = load_snmp_stack().hlapi.SnmpEngine()
+        if self.traffic is not None:
+            attach_traffic_observer(self.snmpEngine, lambda ip: self.traffic)
+
+        if self.candidates:
+            result = ConnectHandshake(self.snmpEngine, self.ip, self.candidates).run(self._stop_event)
+            if not self.running:
+                return
+            if result["ok"]:
+                self.community, self.port = result["community"], result["port"]
+                self.session()
+                if self.health is not None:
+                    self.health.record_rtt(result["rtt_ms"] / 1000)
+            self.on_connect(result)
+            if not result["ok"]:
+                return
+
+        while self.running:
+
+            started = time.monotonic()
+            result_data = self.attempt()
+            self.last_poll_duration = time.monotonic() - started
+
+            if not self.running:
+                break
+
+            if result_data:
+                self.on_result(True, result_data)
+            else:
+                self.on_result(False, None)
+
+            # 차단(open) 상태면 back-off 만큼 쉬었다가 확인
+            if self._wake_event.wait(self.next_delay()):
+                # 직전 walk 시작 후 min_gap 동안 들어온 요청은 한번에 처리
+                self._stop_event.wait(max(0.0, self.min_gap - (time.monotonic() - started)))
+                self._wake_event.clear()
+
+    def stop(self):
+        self._stop_event.set()
+        self._wake_event.set()
+        try:
+            if self.snmpEngine is not None:
+                self.snmpEngine.transportDispatcher.closeDispatcher()
+        except Exception:
+            pass
+
+
+class TrapReceiver(threading.Thread):
+    """SNMPv2c Trap 수신 (asyncore dispatcher)
+
+    community 는 문자열 또는 목록 (fleet 모드: 사이트별 community 모두 등록).
+    with_source=True 이면 on_trap(trap_data, 송신 IP) 로 호출.
+    """
+
+    def __init__(self, listen_ip="0.0.0.0", port=1162, community="skt_public", on_trap=None,
+                 with_source=False, traffic_for=None):
+        super().__init__(name=f"snmp-trap-{port}", daemon=True)
+        self.listen_ip = listen_ip
+        self.port = int(port)
+        self.community = community
+        self.with_source = with_source
+        self.traffic_for = traffic_for
+        self.on_trap = on_trap or (lambda trap_data, *source: None)
+        self.snmpEngine = None
+        self.trap_counter = 0
+        self.trap_rate = 0
+        self.last_rate_time = time.time()
+        self.trap_queue = deque(maxlen=TRAP_QUEUE_SIZE)
+
+    def run(self):
+        logger.debug("trap listen %s:%s", self.listen_ip, self.port)
+
+        snmp = load_snmp_stack()
+        self.snmpEngine = snmp.engine.SnmpEngine()
+        if self.traffic_for is not None:
+            attach_traffic_observer(self.snmpEngine, self.traffic_for)
+
+        snmp.config.addTransport(
+            self.snmpEngine,
+            snmp.udp.domainName,
+            snmp.udp.UdpTransport().openServerMode((self.listen_ip, self.port))
+        )
+        communities = [self.community] if isinstance(self.community, str) else list(self.community)
+        for i, community in enumerate(dict.fromkeys(communities)):
+            snmp.config.addV1System(self.snmpEngine, "trap-area" if i == 0 else f"trap-area-{i}", community)
+        snmp.ntfrcv.NotificationReceiver(self.snmpEngine, self.callback)
+
+        self.snmpEngine.transportDispatcher.jobStarted(1)
+
+        try:
+            self.snmpEngine.transportDispatcher.runDispatcher()
+        except Exception as e:
+            if "WinError 10038" not in str(e):
+                logger.debug("trap dispatcher stopped: %s", e)
+        finally:
+            try:
+                self.snmpEngine.transportDispatcher.closeDispatcher()
+            except Exception:
+                pass
+
+    def callback(self, snmpEngine, stateReference, contextEngineId, contextName, varBinds, cbCtx):
+
+        # TRAP RATE 계산
+        self.trap_counter += 1
+        now = time.time()
+        if now - self.last_rate_time >= 1.0:
+            self.trap_rate = self.trap_counter
+            self.trap_counter = 0
+            self.last_rate_time = now
+
+        trap_data = {str(name): val.prettyPrint() for name, val in varBinds}
+
+        self.trap_queue.append(trap_data)
+
+        if self.with_source:
+            try:
+                _, address = snmpEngine.msgAndPduDsp.getTransportInfo(stateReference)
+                source = address[0]
+            except Exception:
+                source = None
+            self.on_trap(trap_data, source)
+        else:
+            self.on_trap(trap_data)
+
+    def stop(self):
+        try:
+            if self.snmpEngine is not None:
+                try:
+                    self.snmpEngine.transportDispatcher.jobFinished(1)
+                except Exception:
+                    pass
+                self.snmpEngine.transportDispatcher.closeDispatcher()
+        except Exception as e:
+            logger.debug("trap closeDispatcher error: %s", e)
+
+# ======================
+# 이력 저장
+# ======================
+class HistoryWriter:
+    """logs/ 아래 일자별 파일에 Trap 로그(csv)와 poll 이력(jsonl) 기록"""
+
+    def __init__(self, log_dir, poll_history=True):
+        self.log_dir = log_dir
+        self.poll_history = poll_history
+        self._lock = threading.Lock()
+        os.makedirs(log_dir, exist_ok=True)
+
+    def _path(self, prefix, ext):
+        date_str = datetime.now().strftime("%Y%m%d")
+        return os.path.join(self.log_dir, f"{prefix}_{date_str}.{ext}")
+
+    def write_trap(self, trap):
+        line = ",".join(str(trap[k]) for k in (
+            "time", "display_oid", "ordinal", "alarm", "level",
+            "equip_id", "equip_name", "father_name"
+        )) + "\n"
+
+        with self._lock, open(self._path("trap", "log"), "a", encoding="utf-8") as f:
+            f.write(line)
+
+    def write_poll(self, snapshot):
+        if not self.poll_history:
+            return
+
+        modules = {}
+        for module_no, info in sorted(snapshot["module_map"].items()):
+            data = snapshot["module_data"].get(info["equip_id"])
+            if data:
+                modules[str(module_no)] = {"equip_id": info["equip_id"], **data}
+
+        record = {
+            "time": snapshot["time"],
+            "summary": snapshot["summary"],
+            "alarms": snapshot["alarms"],
+            "modules": modules,
+        }
+
+        with self._lock, open(self._path("history", "jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+
+# ======================
+# Monitor Engine
+# ======================
+class MonitorEngine:
+    """한 사이트 감시 엔진
+
+    subscribe(callback) 로 등록한 callback(event, payload) 은 poller / trap
+    thread 에서 호출된다. GUI 는 이를 Qt signal 로 넘겨 메인 thread 에서 처리한다.
+
+    event: "tx", "rx", "poll", "poll_error", "trap", "probe"
+    """
+
+    def __init__(self, ip, port=161, community="public",
+                 trap_port=1162, trap_community="public",
+                 listen_ip="0.0.0.0", interval=5.0,
+                 log_dir=None, poll_history=True,
+                 mode=MODE_POLL, heartbeat=TRAP_MODE_HEARTBEAT,
+                 inventory_path=None):
+        self.ip = ip
+        self.port = int(port)
+        self.community = community
+        self.trap_port = int(trap_port)
+        self.trap_community = trap_community
+        self.listen_ip = listen_ip
+        self.interval = interval
+        self.mode = mode if mode in (MODE_POLL, MODE_TRAP) else MODE_POLL
+        self.heartbeat = float(heartbeat)
+
+        # 송수신량 (SNMP walk + trap + 도달성 probe)
+        self.traffic = TrafficCounter()
+        # fleet 모드는 scheduler 가 walk 를 요청받음 (없으면 poller.wake)
+        self.poll_request = None
+        self.last_poll_time = None      # 마지막 walk 성공 time.time()
+
+        # 통신 상태 (healthy / degraded / open) + back-off / timeout
+        self.health = TargetHealth(ip, on_change=lambda health: self._emit("health", health))
+
+        # 모듈 inventory (BaseTable) 캐시 → 평소에는 equip ID 열만 walk
+        self.inventory = InventoryCache(inventory_path)
+        self._full_inventory_walk = True
+
+        self.history = HistoryWriter(log_dir, poll_history) if log_dir else None
+
+        self.poller = None
+        self.trap_receiver = None
+        self.prober = None
+        self.probe_stats = None
+        self._listeners = []
+
+        # 마지막 상태
+        self.snapshot = None
+        self.module_map = self.inventory.module_map()
+        self.module_data = {}
+        self.alarm_flags = dict.fromkeys(SUMMARY_ALARMS, False)
+        self.faults = {}
+
+        # metrics 용 누적값
+        self.poll_count = 0
+        self.poll_error_count = 0
+        self.trap_count = 0
+
+    @classmethod
+    def from_profile(cls, profile, **kwargs):
+        kwargs.setdefault("mode", profile.get("mode", MODE_POLL))
+        kwargs.setdefault("heartbeat", float(profile.get("heartbeat") or TRAP_MODE_HEARTBEAT))
+        if profile.get("path"):
+            kwargs.setdefault("inventory_path", inventory_path(profile["path"]))
+        return cls(
+            ip=profile["ip"],
+            port=profile["port"],
+            community=profile["get_community"],
+            trap_port=profile["trap_port"],
+            trap_community=profile["trap_community"],
+            **kwargs
+        )
+
+    @property
+    def poll_interval(self):
+        return self.heartbeat if self.mode == MODE_TRAP else self.interval
+
+    @property
+    def stale_after(self):
+        """이 시간 [s] 이상 walk 결과가 없으면 화면 값을 오래된 값으로 표시"""
+        return self.poll_interval * 2 + 10
+
+    def data_age(self):
+        return None if self.last_poll_time is None else time.time() - self.last_poll_time
+
+    def request_poll(self):
+        if self.poll_request is not None:
+            self.poll_request()
+        elif self.poller is not None:
+            self.poller.wake()
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _emit(self, event, payload=None):
+        for callback in self._listeners:
+            try:
+                callback(event, payload)
+            except Exception:
+                logger.exception("listener error (%s)", event)
+
+    # ---------- 제어 ----------
+    def make_poller(self, candidates=None):
+        """이 사이트용 SnmpPoller (fleet 모드는 thread 를 띄우지 않고 poll_once 만 사용)"""
+        return SnmpPoller(
+            self.ip, self.community, self.port, self.poll_interval,
+            on_tx=lambda: self._emit("tx"),
+            on_rx=lambda: self._emit("rx", "poll"),
+            on_result=self._on_poll_result,
+            min_gap=TRAP_MODE_MIN_GAP if self.mode == MODE_TRAP else 0.0,
+            traffic=self.traffic,
+            candidates=candidates,
+            on_connect=self._on_connect,
+            health=self.health,
+            oids=self._poll_oids
+        )
+
+    def start(self, handshake=False):
+        """handshake=True : 첫 walk 전에 community / port 후보를 동시에 확인 ("connect" event)"""
+        candidates = connect_candidates(self.community, self.port) if handshake else None
+        self.poller = self.make_poller(candidates)
+        self.trap_receiver = TrapReceiver(
+            self.listen_ip, self.trap_port, self.trap_community,
+            on_trap=self._on_trap,
+            traffic_for=lambda ip: self.traffic if ip == self.ip else None
+        )
+        self.poller.start()
+        self.trap_receiver.start()
+
+        # 도달성 검사는 process 공용 asyncio prober 에 host 만 등록
+        from tbc_prober import shared_prober
+        self.prober = shared_prober()
+        self.prober.add_host(self.ip, self.port, self.community, callback=self._on_probe,
+                             interval=self.probe_interval)
+
+        logger.info("engine started", extra={"fields": {
+            "ip": self.ip, "port": self.port, "trap_port": self.trap_port,
+            "mode": self.mode, "poll_interval": self.poll_interval}})
+
+    def stop(self, timeout=3.0):
+        if self.prober is not None:
+            self.prober.remove_host(self.ip, self._on_probe)
+            self.prober = None
+
+        for worker in (self.poller, self.trap_receiver):
+            if worker is not None:
+                worker.stop()
+        for worker in (self.poller, self.trap_receiver):
+            if worker is not None:
+                worker.join(timeout)
+        self.poller = None
+        self.trap_receiver = None
+        logger.info("engine stopped", extra={"fields": {"ip": self.ip}})
+
+    @property
+    def trap_rate(self):
+        return self.trap_receiver.trap_rate if self.trap_receiver else 0
+
+    @property
+    def trap_queue(self):
+        return self.trap_receiver.trap_queue if self.trap_receiver else None
+
+    @property
+    def probe_interval(self):
+        return TRAP_MODE_PROBE_INTERVAL if self.mode == MODE_TRAP else None
+
+    def metrics(self):
+        """tbc_metrics.MetricsCollector source"""
+        traffic = self.traffic.stats()
+        values = {
+            "trap_rate": self.trap_rate,
+            "polls_total": self.poll_count,
+            "poll_errors_total": self.poll_error_count,
+            "traps_total": self.trap_count,
+            "bytes_sent_total": traffic["tx_bytes"],
+            "bytes_received_total": traffic["rx_bytes"],
+            "bytes_sent_per_hour": traffic["tx_bytes_per_hour"],
+            "bytes_received_per_hour": traffic["rx_bytes_per_hour"],
+        }
+
+        age = self.data_age()
+        if age is not None:
+            values["data_age_seconds"] = age
+
+        health = self.health.to_dict()
+        values["health_state"] = STATE_LEVEL[health["state"]]
+        values["snmp_timeout_ms"] = health["timeout_ms"]
+        values["backoff_seconds"] = health["backoff"]
+        values["consecutive_failures"] = health["consecutive_failures"]
+
+        if self.poller is not None:
+            rtts = self.poller.last_rtts
+            values["poll_duration_ms"] = self.poller.last_poll_duration * 1000
+            if rtts:
+                values["snmp_rtt_ms"] = sum(rtts) / len(rtts) * 1000
+                values["snmp_rtt_max_ms"] = max(rtts) * 1000
+
+        probe = self.probe_stats
+        if probe is not None:
+            values["probe_loss_percent"] = probe["loss_percent"]
+            values["probe_jitter_ms"] = probe["jitter_ms"]
+            if probe["rtt_ms"] is not None:
+                values["probe_rtt_ms"] = probe["rtt_ms"]
+
+        queue = self.trap_queue
+        if queue is not None:
+            values["trap_queue_depth"] = len(queue)
+            values["trap_queue_capacity"] = queue.maxlen
+
+        return values
+
+    def _poll_oids(self):
+        """이번 walk 의 subtree (inventory 캐시가 유효하면 BaseTable 은 equip ID 열만)"""
+        self._full_inventory_walk = self.inventory.needs_full_walk()
+        if self._full_inventory_walk:
+            return POLL_BASE_OIDS
+        return [OID_BASE_EQUIP_COLUMN] + POLL_BASE_OIDS[1:]
+
+    # ---------- 처리 ----------
+    def _on_connect(self, result):
+
+        if result["ok"] and (result["community"], result["port"]) != (self.community, self.port):
+            logger.info("handshake 후보 채택", extra={"fields": {
+                "ip": self.ip, "community": result["community"], "port": result["port"]}})
+            self.community, self.port = result["community"], result["port"]
+            if self.prober is not None:
+                # callback 은 이미 등록됨 → port / community 만 갱신
+                self.prober.add_host(self.ip, self.port, self.community, interval=self.probe_interval)
+
+        logger.info("connect", extra={"fields": {"ip": self.ip, **result}})
+        self._emit("connect", result)
+
+    def _on_poll_result(self, ok, data):
+
+        if not ok:
+            self.poll_error_count += 1
+            logger.warning("poll failed", extra={"fields": {"ip": self.ip}})
+            self._emit("poll_error")
+            return
+
+        self.poll_count += 1
+        self.last_poll_time = time.time()
+
+        if self._full_inventory_walk:
+            snapshot = decode_poll_result(data)
+            self.inventory.update(snapshot["module_map"])
+        else:
+            snapshot = decode_poll_result(data, self.inventory.rows)
+
+            # 모듈 추가 / 제거 / 교체 → 다음 walk 는 BaseTable 전체
+            prefix = OID_BASE_EQUIP_COLUMN + "."
+            equip_ids = [oid[len(prefix):] for oid in data if oid.startswith(prefix)]
+            if not self.inventory.matches(equip_ids):
+                logger.info("inventory 불일치 → 전체 walk", extra={"fields": {
+                    "ip": self.ip, "cached": len(self.inventory.rows), "polled": len(equip_ids)}})
+                self.inventory.invalidate()
+                self.request_poll()
+
+        added = snapshot["faults"].keys() - self.faults.keys()
+        removed = self.faults.keys() - snapshot["faults"].keys()
+
+        self.snapshot = snapshot
+        self.module_map = snapshot["module_map"]
+        self.module_data = snapshot["module_data"]
+        self.alarm_flags = dict(snapshot["alarm_flags"])
+        self.faults = dict(snapshot["faults"])
+
+        summary = snapshot["summary"]
+        logger.info("poll", extra={"fields": {
+            "ip": self.ip,
+            "rack_voltage": summary["rack_voltage"],
+            "rack_current": summary["rack_current"],
+            "soc": summary["soc"],
+            "modules": len(snapshot["module_map"]),
+            "alarms": len(snapshot["alarms"]),
+        }})
+        for key in sorted(added):
+            logger.warning("fault raised", extra={"fields": {"module": key[0], "cell": key[1]}})
+        for key in sorted(removed):
+            logger.info("fault cleared", extra={"fields": {"module": key[0], "cell": key[1]}})
+
+        if self.history:
+            self.history.write_poll(snapshot)
+
+        self._emit("poll", snapshot)
+
+    def _on_probe(self, stats):
+
+        # 도달 가능 ↔ 불가 전환 시에만 로그
+        prev = self.probe_stats
+        if prev is None or prev["reachable"] != stats["reachable"]:
+            logger.info("reachability", extra={"fields": {
+                "ip": self.ip, "reachable": stats["reachable"], "method": stats["method"]}})
+
+        # probe 송수신량도 회선 사용량에 포함
+        prev_tx = prev["tx_bytes"] if prev else 0
+        prev_rx = prev["rx_bytes"] if prev else 0
+        self.traffic.add(tx=max(0, stats["tx_bytes"] - prev_tx), rx=max(0, stats["rx_bytes"] - prev_rx))
+
+        self.probe_stats = stats
+        self._emit("probe", stats)
+
+    def _on_trap(self, trap_data):
+
+        self.trap_count += 1
+        self._emit("rx", "trap")
+
+        trap = parse_trap(trap_data, self.module_map, self.module_data)
+
+        # trap 위주 모드 : 알람 발생/해제 trap 이 오면 전체 walk 로 상태 갱신
+        if self.mode == MODE_TRAP and trap["kind"] in ("alarm", "resume"):
+            self.request_poll()
+
+        self.alarm_flags.update(trap["flag_changes"])
+
+        fault = trap["cell_fault"]
+        if fault is not None:
+            self.faults.setdefault((fault["module"], fault["cell"]), fault)
+
+        logger.info("trap", extra={"fields": {
+            "ip": self.ip,
+            "trap": trap["display_oid"],
+            "alarm": trap["alarm"],
+            "level": trap["level"],
+            "equip_id": trap["equip_id"],
+        }})
+
+        if self.history:
+            self.history.write_trap(trap)
+
+        self._emit("trap", trap)
+
+# ======================
+# 로그 출력
+# ======================
+class JsonLogFormatter(logging.Formatter):
+    """한 줄 JSON 로그 (수집기/grep 용)"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TextLogFormatter(logging.Formatter):
+
+    def format(self, record):
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return text
+
+
+def setup_logging(log_format="text", level=logging.INFO):
+    handler = logging.StreamHandler(sys.stdout)
+    if log_format == "json":
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(TextLogFormatter("[%(asctime)s] %(levelname)s %(message)s"))
+
+    logger.handlers[:] = [handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+# ======================
+# CLI
+# ======================
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="TBC1000B Battery Monitoring System")
+    parser.add_argument("--profile", help="사이트 프로파일 ini 경로")
+    parser.add_argument("--headless", action="store_true", help="GUI 없이 감시 엔진만 실행")
+    parser.add_argument("--ip", help="배터리 시스템 IP (프로파일 값 대신)")
+    parser.add_argument("--port", type=int, help="SNMP port")
+    parser.add_argument("--community", help="GET community")
+    parser.add_argument("--trap-port", type=int, help="Trap 수신 port")
+    parser.add_argument("--trap-community", help="Trap community")
+    parser.add_argument("--interval", type=float, default=5.0, help="poll 주기 [s]")
+    parser.add_argument("--mode", choices=[MODE_POLL, MODE_TRAP],
+                        help="감시 방식 (trap: heartbeat 주기 + 알람 trap 수신 시에만 walk)")
+    parser.add_argument("--heartbeat", type=float, help=f"trap 모드 walk 주기 [s] (기본 {TRAP_MODE_HEARTBEAT:.0f})")
+    parser.add_argument("--log-dir", help="Trap 로그 / poll 이력 저장 폴더")
+    parser.add_argument("--no-history", action="store_true", help="poll 이력(jsonl) 저장 안함")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    parser.add_argument("--debug", action="store_true")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="import / 첫 화면 표시 시간 측정 출력 (TBC_STARTUP_PROFILE=1 과 동일)")
+    parser.add_argument("--startup-report", help="시작 시간 측정 결과 json 저장 경로")
+    parser.add_argument("--startup-exit", action="store_true", help="첫 화면 표시 후 바로 종료 (bench_startup.py 용)")
+    parser.add_argument("--metrics-port", type=int, default=0,
+                        help="127.0.0.1 Prometheus metrics port (0 = 사용 안함)")
+    parser.add_argument("--metrics-file", help="metrics json 파일 경로 (기본: <log-dir>/metrics_<ip>.json)")
+    parser.add_argument("--fleet", nargs="?", const="profiles", metavar="PROFILE_DIR",
+                        help="프로파일 폴더의 모든 사이트 감시 (기본 폴더: profiles)")
+    parser.add_argument("--max-concurrency", type=int, default=16, help="fleet 모드 동시 poll 수")
+    return parser
+
+
+def profile_from_args(args):
+    profile = load_profile(args.profile) if args.profile else dict(PROFILE_DEFAULTS)
+
+    overrides = {
+        "ip": args.ip,
+        "port": args.port,
+        "get_community": args.community,
+        "trap_port": args.trap_port,
+        "trap_community": args.trap_community,
+        "mode": args.mode,
+        "heartbeat": args.heartbeat,
+    }
+    for key, val in overrides.items():
+        if val is not None:
+            profile[key] = str(val)
+    return profile
+
+
+def run_headless(args):
+    setup_logging(args.log_format, logging.DEBUG if args.debug else logging.INFO)
+
+    log_dir = args.log_dir or os.path.join(os.path.dirname(os.path.abspath(__file__)), "logs")
+
+    if args.fleet:
+        from tbc_fleet import FleetEngine
+
+        profile = {"site": "fleet", "system": "", "ip": "fleet", "path": os.path.abspath(args.fleet)}
+        monitor = FleetEngine.from_profile_dir(
+            args.fleet,
+            interval=args.interval,
+            max_concurrency=args.max_concurrency,
+            log_dir=log_dir,
+            poll_history=not args.no_history
+        )
+        if not monitor.sites:
+            logger.error("프로파일 없음: %s", args.fleet)
+            return 1
+    else:
+        profile = profile_from_args(args)
+        monitor = MonitorEngine.from_profile(
+            profile,
+            interval=args.interval,
+            log_dir=log_dir,
+            poll_history=not args.no_history
+        )
+
+    metrics, metrics_server = start_metrics(
+        monitor, {"site": profile.get("site", ""), "ip": profile["ip"]},
+        args.metrics_port, args.metrics_file or os.path.join(log_dir, f"metrics_{profile['ip']}.json")
+    )
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, "SIGTERM"):
+        signal.signal(signal.SIGTERM, request_stop)
+
+    logger.info("headless start", extra={"fields": {
+        "site": profile.get("site", ""), "system": profile.get("system", ""),
+        "profile": profile.get("path", "")}})
+
+    monitor.start()
+    try:
+        expected = time.monotonic() + 1.0
+        while not stop_event.wait(max(0.0, expected - time.monotonic())):
+            now = time.monotonic()
+            metrics.sample(event_loop_lag_ms=max(0.0, now - expected) * 1000)
+            expected = now + 1.0
+    finally:
+        monitor.stop()
+        if metrics_server:
+            metrics_server.stop()
+
+    return 0
+
+
+def start_metrics(monitor, labels, port, json_path):
+    """MetricsCollector (+ port 지정 시 localhost HTTP endpoint) 생성"""
+    from tbc_metrics import MetricsCollector, MetricsServer
+
+    if json_path:
+        os.makedirs(os.path.dirname(os.path.abspath(json_path)), exist_ok=True)
+
+    metrics = MetricsCollector(labels, json_path=json_path)
+    if monitor is not None:
+        metrics.add_source(monitor.metrics)
+
+    server = None
+    if port:
+        try:
+            server = MetricsServer(metrics, port)
+            server.start()
+        except OSError as e:
+            logger.warning("metrics endpoint 시작 실패: %s", e)
+            server = None
+
+    return metrics, server
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    # 이 파일을 직접 실행하면 항상 headless
+    return run_headless(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+# Fleet 모드 : profiles 폴더의 모든 사이트를 한 process 에서 감시
+#
+# - poll : 사이트별 thread 대신 worker 수가 제한된 scheduler (due 시각 heap + thread pool)
+#          worker thread 마다 SnmpEngine 하나를 만들어 여러 사이트가 돌려 씀
+# - trap : trap port 별 TrapReceiver 하나, 송신 IP 로 사이트에 분배
+# - RTT  : 공용 ReachabilityProber
+# - 응답 없는 사이트는 TargetHealth back-off 로 예약 간격을 늘리고, 차단 중에는 walk 대신
+#   sysUpTime 1회만 확인 → 죽은 사이트가 worker 를 오래 잡지 않는다
+# 사이트 상태는 각자의 MonitorEngine 에 그대로 쌓이므로 상세창은 그 엔진에 붙기만 하면 된다.
+
+import heapq
+import itertools
+import logging
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tbc_engine import (
+    TRAP_MODE_MIN_GAP, MODE_TRAP, MonitorEngine, TrapReceiver,
+    attach_traffic_observer, load_profile, load_snmp_stack,
+)
+from tbc_health import DEGRADED
+
+logger = logging.getLogger("tbc.fleet")
+
+FLEET_MAX_CONCURRENCY = 16      # 동시에 진행하는 poll 수
+FLEET_POLL_INTERVAL = 10.0      # [s] 사이트당 poll 주기
+
+
+def load_profiles(profile_dir):
+    """profiles/*.ini → profile dict 목록 (파일명 순)"""
+    if not os.path.isdir(profile_dir):
+        return []
+
+    profiles = []
+    for name in sorted(os.listdir(profile_dir)):
+        if name.endswith(".ini"):
+            try:
+                profiles.append(load_profile(os.path.join(profile_dir, name)))
+            except Exception as e:
+                logger.warning("profile 읽기 실패 %s: %s", name, e)
+    return profiles
+
+
+class FleetSite:
+    """fleet 안의 사이트 하나 (MonitorEngine + 외부에서 구동하는 poller)"""
+
+    def __init__(self, profile, interval, log_dir=None, poll_history=True):
+        self.profile = profile
+        self.key = os.path.splitext(os.path.basename(profile.get("path", profile["ip"])))[0]
+        self.monitor = MonitorEngine.from_profile(
+            profile, interval=interval, log_dir=log_dir, poll_history=poll_history
+        )
+        self.poller = self.monitor.make_poller()
+        self.monitor.poller = self.poller
+
+        self.polling = False
+        self.schedule_token = None      # heap 에서 유효한 예약 (poll_now 로 바뀌면 이전 예약 무시)
+        self.repoll = False             # poll 도중 poll_now 요청 → 끝나면 바로 다시
+        self.last_ok = None             # 마지막 poll 성공 여부
+        self.last_poll_time = None      # time.time()
+        self.last_poll_started = None   # time.monotonic()
+        self.scheduled_due = None       # 유효한 예약의 due
+
+    def summary(self):
+        """fleet 표 한 행"""
+        monitor = self.monitor
+        snapshot = monitor.snapshot or {}
+        rack = snapshot.get("summary", {})
+        probe = monitor.probe_stats or {}
+        age = monitor.data_age()
+
+        return {
+            "key": self.key,
+            "site": self.profile.get("site", ""),
+            "system": self.profile.get("system", ""),
+            "ip": monitor.ip,
+            "rack_voltage": rack.get("rack_voltage"),
+            "rack_current": rack.get("rack_current"),
+            "soc": rack.get("soc"),
+            "alarms": len(snapshot.get("alarms", [])),
+            "faults": len(monitor.faults),
+            "last_update": snapshot.get("time"),
+            "poll_ok": self.last_ok,
+            "rtt_ms": probe.get("rtt_ms"),
+            "loss_percent": probe.get("loss_percent"),
+            "mode": monitor.mode,
+            "health": monitor.health.state,
+            "retry_in": monitor.health.to_dict()["retry_in"],
+            "data_age": age,
+            "stale": age is not None and age > monitor.stale_after,
+        }
+
+
+class FleetEngine:
+    """여러 사이트를 제한된 동시성으로 poll
+
+    subscribe(callback) 로 등록한 callback(site_key, event, payload) 은 worker /
+    trap / prober thread 에서 호출된다. event 는 MonitorEngine 과 같다.
+    """
+
+    def __init__(self, profiles, interval=FLEET_POLL_INTERVAL,
+                 max_concurrency=FLEET_MAX_CONCURRENCY,
+                 listen_ip="0.0.0.0", log_dir=None, poll_history=True):
+        self.interval = interval
+        self.max_concurrency = max_concurrency
+        self.listen_ip = listen_ip
+
+        self.sites = {}
+        for profile in profiles:
+            site = FleetSite(profile, interval, log_dir, poll_history)
+            if site.key in self.sites:
+                logger.warning("중복 site key 무시: %s", site.key)
+                continue
+            self.sites[site.key] = site
+            site.monitor.subscribe(
+                lambda event, payload, key=site.key: self._emit(key, event, payload)
+            )
+            # trap 위주 모드 사이트의 알람 trap → scheduler 에 walk 요청
+            site.monitor.poll_request = lambda key=site.key: self.poll_now(key, min_gap=True)
+
+        self._listeners = []
+        self._by_ip = {}
+        for site in self.sites.values():
+            self._by_ip.setdefault(site.monitor.ip, []).append(site)
+
+        self._heap = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._in_flight = 0
+        self._thread = None
+        self._executor = None
+        self._local = threading.local()
+        self.trap_receivers = []
+
+        # scheduler 상태 (metrics / 상태표시줄)
+        self.poll_count = 0
+        self.poll_lag = 0.0             # due 시각 대비 실제 시작 지연 [s]
+
+    @classmethod
+    def from_profile_dir(cls, profile_dir, **kwargs):
+        return cls(load_profiles(profile_dir), **kwargs)
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def _emit(self, key, event, payload):
+        for callback in self._listeners:
+            try:
+                callback(key, event, payload)
+            except Exception:
+                logger.exception("fleet listener error (%s)", event)
+
+    # ---------- 제어 ----------
+    def start(self):
+        from tbc_prober import shared_prober
+
+        self._running = True
+        self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix="fleet-poll")
+
+        # 시작 시 한꺼번에 몰리지 않도록 첫 poll 을 interval 안에 분산
+        now = time.monotonic()
+        with self._cond:
+            for site in self.sites.values():
+                self._push(now + random.uniform(0, min(self.interval, site.monitor.poll_interval)), site)
+
+        self._thread = threading.Thread(target=self._schedule_loop, name="fleet-scheduler", daemon=True)
+        self._thread.start()
+
+        # trap port 별 receiver 하나
+        ports = {}
+        for site in self.sites.values():
+            ports.setdefault(site.monitor.trap_port, []).append(site.monitor.trap_community)
+        for port, communities in ports.items():
+            receiver = TrapReceiver(self.listen_ip, port, communities,
+                                    on_trap=self._on_trap, with_source=True,
+                                    traffic_for=self._traffic_for)
+            receiver.start()
+            self.trap_receivers.append(receiver)
+
+        prober = shared_prober()
+        for site in self.sites.values():
+            monitor = site.monitor
+            monitor.prober = prober
+            prober.add_host(monitor.ip, monitor.port, monitor.community, callback=monitor._on_probe,
+                            interval=monitor.probe_interval)
+
+        logger.info("fleet started", extra={"fields": {
+            "sites": len(self.sites), "max_concurrency": self.max_concurrency, "interval": self.interval}})
+
+    def stop(self, timeout=3.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        for site in self.sites.values():
+            site.poller.stop()
+            monitor = site.monitor
+            if monitor.prober is not None:
+                monitor.prober.remove_host(monitor.ip, monitor._on_probe)
+                monitor.prober = None
+
+        for receiver in self.trap_receivers:
+            receiver.stop()
+        for receiver in self.trap_receivers:
+            receiver.join(timeout)
+        self.trap_receivers = []
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+        logger.info("fleet stopped")
+
+    def poll_now(self, key, min_gap=False):
+        """해당 사이트를 다음 차례에 바로 poll (상세창 열 때 등)
+
+        min_gap=True : trap 으로 인한 요청 - 직전 poll 시작 후 TRAP_MODE_MIN_GAP 이 지나야 poll
+        """
+        site = self.sites.get(key)
+        if site is None:
+            return
+        with self._cond:
+            due = time.monotonic()
+            if min_gap and site.last_poll_started is not None:
+                due = max(due, site.last_poll_started + TRAP_MODE_MIN_GAP)
+                # 이미 그보다 빠른 예약이 있으면 그대로 둠 (trap 폭주 시 하나로 묶음)
+                if site.scheduled_due is not None and site.scheduled_due <= due:
+                    return
+            self._push(due, site)
+            self._cond.notify()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    # ---------- scheduler ----------
+    def _push(self, due, site):
+        token = next(self._seq)
+        site.schedule_token = token
+        site.scheduled_due = due
+        heapq.heappush(self._heap, (due, token, site))
+
+    def _schedule_loop(self):
+        with self._cond:
+            while self._running:
+
+                if not self._heap or self._in_flight >= self.max_concurrency:
+                    self._cond.wait()
+                    continue
+
+                due, token, site = self._heap[0]
+                if token != site.schedule_token:
+                    heapq.heappop(self._heap)
+                    continue
+
+                wait = due - time.monotonic()
+                if wait > 0:
+                    self._cond.wait(wait)
+                    continue
+
+                heapq.heappop(self._heap)
+                site.scheduled_due = None
+
+                # 진행 중에 poll_now 가 들어온 경우 → 끝나고 바로 다시
+                if site.polling:
+                    site.repoll = True
+                    continue
+
+                site.polling = True
+                self._in_flight += 1
+                self.poll_lag = -wait
+                self._executor.submit(self._poll_site, site)
+
+    def _snmp_engine(self):
+        # pysnmp SnmpEngine 은 thread 간 공유 불가 → worker thread 당 하나
+        engine = getattr(self._local, "engine", None)
+        if engine is None:
+            engine = self._local.engine = load_snmp_stack().hlapi.SnmpEngine()
+            attach_traffic_observer(engine, self._traffic_for)
+        return engine
+
+    def _traffic_for(self, ip):
+        # 같은 IP 의 사이트가 여럿이면 첫 사이트에 집계
+        sites = self._by_ip.get(ip)
+        return sites[0].monitor.traffic if sites else None
+
+    def _poll_site(self, site):
+        poller = site.poller
+        started = time.monotonic()
+        site.last_poll_started = started
+        try:
+            result = poller.attempt(self._snmp_engine())
+        except Exception as e:
+            logger.warning("poll exception %s: %s", site.key, e)
+            result = None
+        poller.last_poll_duration = time.monotonic() - started
+
+        site.last_ok = bool(result)
+        site.last_poll_time = time.time()
+        self.poll_count += 1
+
+        if self._running:
+            try:
+                poller.on_result(bool(result), result or None)
+            except Exception:
+                logger.exception("poll result error %s", site.key)
+
+        with self._cond:
+            site.polling = False
+            self._in_flight -= 1
+            if self._running:
+                health = site.monitor.health
+                if site.repoll:
+                    due = time.monotonic()
+                elif health.is_open:
+                    due = time.monotonic() + health.next_delay(site.monitor.poll_interval)
+                else:
+                    due = started + site.monitor.poll_interval
+                self._push(due, site)
+            site.repoll = False
+            self._cond.notify()
+
+    # ---------- trap ----------
+    def _on_trap(self, trap_data, source):
+        sites = self._by_ip.get(source)
+        if not sites:
+            logger.debug("unknown trap source %s", source)
+            return
+        for site in sites:
+            site.monitor._on_trap(trap_data)
+
+    # ---------- 조회 ----------
+    def summaries(self):
+        return [site.summary() for site in self.sites.values()]
+
+    def metrics(self):
+        """tbc_metrics.MetricsCollector source"""
+        trap_rate = sum(r.trap_rate for r in self.trap_receivers)
+        queue_depth = sum(len(r.trap_queue) for r in self.trap_receivers)
+        polled = [s for s in self.sites.values() if s.last_ok is not None]
+        traffic = [s.monitor.traffic.stats() for s in self.sites.values()]
+
+        return {
+            "trap_rate": trap_rate,
+            "trap_queue_depth": queue_depth,
+            "polls_total": sum(s.monitor.poll_count for s in self.sites.values()),
+            "poll_errors_total": sum(s.monitor.poll_error_count for s in self.sites.values()),
+            "traps_total": sum(s.monitor.trap_count for s in self.sites.values()),
+            "fleet_sites": len(self.sites),
+            "fleet_sites_down": sum(1 for s in polled if not s.last_ok),
+            "fleet_polls_in_flight": self._in_flight,
+            "fleet_schedule_lag_ms": self.poll_lag * 1000,
+            "fleet_sites_open": sum(1 for s in self.sites.values() if s.monitor.health.is_open),
+            "fleet_sites_degraded": sum(1 for s in self.sites.values() if s.monitor.health.state == DEGRADED),
+            "fleet_sites_trap_mode": sum(1 for s in self.sites.values() if s.monitor.mode == MODE_TRAP),
+            "bytes_sent_total": sum(t["tx_bytes"] for t in traffic),
+            "bytes_received_total": sum(t["rx_bytes"] for t in traffic),
+            "bytes_sent_per_hour": sum(t["tx_bytes_per_hour"] for t in traffic),
+            "bytes_received_per_hour": sum(t["rx_bytes_per_hour"] for t in traffic),
+        }
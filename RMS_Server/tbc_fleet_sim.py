@@ -0,0 +1,296 @@
+# fleet 규모 시뮬레이터 : 가상 TBC1000B agent 수백 개를 localhost 에서 실행
+#
+# 설정 파일(json) 하나로 agent 그룹별
+#   - 모듈 수 / 알람 시나리오 (tbc_simulator.AlarmScenario) / 응답 지연·jitter·손실 / trap 발생률
+#   - 주소 : port 방식 (127.0.0.1:20000, 20001, ...) 또는 loopback alias 방식 (127.0.1.1, 127.0.1.2, ... 같은 port)
+# 를 정하고, agent 마다 profiles/*.ini 를 만들어 fleet 모드로 바로 감시할 수 있게 한다.
+#
+#   python tbc_fleet_sim.py sim_fleet.json
+#   python tbc_engine.py --headless --fleet profiles_sim
+#
+# fleet 수신 측은 trap 송신 IP 로 사이트를 구분하므로 trap 집계 시험은 alias 방식을 쓴다.
+# (Linux / Windows 는 127.0.0.0/8 전체가 loopback, macOS 는 ifconfig lo0 alias 추가 필요)
+#
+# 설정 예:
+#   {
+#     "addressing": "alias",            "port" | "alias"
+#     "host": "127.0.0.1",              port 방식 listen 주소
+#     "base_port": 20000,               port 방식 첫 port / alias 방식 공통 port
+#     "alias_base": "127.0.1.1",
+#     "threads": 2,                     event loop thread 수 (agent 를 나눠 담당)
+#     "tick": 1.0,
+#     "seed": 1,
+#     "trap_host": "127.0.0.1", "trap_port": 1162, "trap_community": "skt_public",
+#     "profile_dir": "profiles_sim",
+#     "defaults": {"modules": 16, "community": "public", "latency": 0.005, "jitter": 0.002,
+#                  "loss": 0.0, "trap_rate": 0.0, "alarm_hold": 30, "scenario": null, "mode": "poll"},
+#     "groups": [
+#       {"name": "SIM", "count": 200},
+#       {"name": "LOSSY", "count": 20, "loss": 0.3, "latency": 0.2},
+#       {"name": "ALARM", "count": 10, "modules": 8, "scenario": "scenarios/cell_fault.txt", "trap_rate": 0.5}
+#     ]
+#   }
+# 상대 경로(scenario, profile_dir)는 설정 파일 위치 기준.
+
+import argparse
+import ipaddress
+import json
+import logging
+import os
+import sys
+import time
+
+from tbc_engine import setup_logging
+from tbc_profiles import profile_file_name, write_profile
+from tbc_simulator import AlarmScenario, BatteryModel, SimAgent, SimulatorThread
+
+logger = logging.getLogger("tbc.fleet_sim")
+
+SIM_MAKER = "TBC simulator"     # 생성한 프로파일 표시 (다시 만들 때 이전 것 정리용)
+
+CONFIG_DEFAULTS = {
+    "addressing": "port",
+    "host": "127.0.0.1",
+    "base_port": 20000,
+    "alias_base": "127.0.1.1",
+    "threads": 1,
+    "tick": 1.0,
+    "seed": None,
+    "trap_host": "127.0.0.1",
+    "trap_port": 1162,
+    "trap_community": "skt_public",
+    "profile_dir": "profiles_sim",
+}
+
+AGENT_DEFAULTS = {
+    "modules": 16,
+    "community": "public",
+    "latency": 0.0,             # [s]
+    "jitter": 0.0,              # [s]
+    "loss": 0.0,                # 0~1
+    "trap_rate": 0.0,           # 초당 trap 수 (알람 발생 + 해제)
+    "alarm_hold": 30.0,         # [s] 알람 평균 유지 시간
+    "scenario": None,
+    "mode": "poll",             # 생성 프로파일의 감시 방식
+}
+
+
+class FleetConfigError(ValueError):
+    pass
+
+
+def load_fleet_config(path):
+    """설정 파일 → 기본값을 채운 dict (상대 경로는 설정 파일 기준 절대 경로로)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except (OSError, ValueError) as e:
+        raise FleetConfigError(f"설정 파일 읽기 실패 {path}: {e}")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    config = dict(CONFIG_DEFAULTS)
+    config.update({k: v for k, v in raw.items() if k not in ("defaults", "groups")})
+    config["profile_dir"] = os.path.join(base_dir, config["profile_dir"])
+
+    defaults = dict(AGENT_DEFAULTS)
+    defaults.update(raw.get("defaults") or {})
+
+    groups = []
+    for i, group in enumerate(raw.get("groups") or [{"name": "SIM", "count": 1}], start=1):
+        merged = dict(defaults)
+        merged.update(group)
+        merged.setdefault("name", f"G{i}")
+        merged["count"] = int(merged.get("count", 1))
+        if merged["scenario"]:
+            merged["scenario"] = os.path.join(base_dir, merged["scenario"])
+        groups.append(merged)
+    config["groups"] = groups
+
+    if config["addressing"] not in ("port", "alias"):
+        raise FleetConfigError(f"addressing 값 오류: {config['addressing']}")
+    return config
+
+
+def expand_agents(config):
+    """그룹 → agent 목록 [{name, host, port, modules, community, ...}]"""
+    specs = []
+    alias_base = ipaddress.IPv4Address(config["alias_base"])
+
+    for group in config["groups"]:
+        for n in range(1, group["count"] + 1):
+            i = len(specs)
+            if config["addressing"] == "alias":
+                host = str(alias_base + i)
+                if not ipaddress.IPv4Address(host).is_loopback:
+                    raise FleetConfigError(f"loopback 범위를 넘음: {host} (agent {i + 1}개)")
+                port = config["base_port"]
+            else:
+                host = config["host"]
+                port = config["base_port"] + i
+                if port > 65535:
+                    raise FleetConfigError(f"port 범위를 넘음: {port}")
+
+            spec = {k: group[k] for k in AGENT_DEFAULTS}
+            spec.update(name=f"{group['name']}-{n:04d}", host=host, port=port)
+            specs.append(spec)
+    return specs
+
+
+def write_profiles(specs, config):
+    """agent 마다 profiles/<이름>.ini 생성 → (생성 수, 정리한 이전 생성 파일 수)
+
+    같은 폴더에 이 시뮬레이터가 만든(maker=SIM_MAKER) 파일 중 이번 목록에 없는 것은 지운다.
+    """
+    from tbc_engine import load_profile
+
+    profile_dir = config["profile_dir"]
+    os.makedirs(profile_dir, exist_ok=True)
+
+    written = set()
+    for spec in specs:
+        name = profile_file_name(spec["name"], "TBC1000B")
+        write_profile(os.path.join(profile_dir, name), {
+            "site": spec["name"],
+            "system": "TBC1000B",
+            "ip": spec["host"],
+            "port": str(spec["port"]),
+            "get_community": spec["community"],
+            "trap_community": config["trap_community"],
+            "trap_port": str(config["trap_port"]),
+            "maker": SIM_MAKER,
+            "model": f"{spec['modules']} modules",
+            "mode": spec["mode"],
+        })
+        written.add(name)
+
+    removed = 0
+    for name in os.listdir(profile_dir):
+        path = os.path.join(profile_dir, name)
+        if name.endswith(".ini") and name not in written and load_profile(path).get("maker") == SIM_MAKER:
+            os.remove(path)
+            removed += 1
+
+    logger.info("simulator profiles", extra={"fields": {
+        "dir": profile_dir, "written": len(written), "removed": removed}})
+    return len(written), removed
+
+
+def _raise_fd_limit(needed):
+    """agent 하나당 socket 2개 → 1000 개면 Linux 기본 한도(1024)를 넘음"""
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+        except (ValueError, OSError) as e:
+            logger.warning("file descriptor 한도 변경 실패 (%s → %s): %s", soft, needed, e)
+
+
+class FleetSimulator:
+    """agent 목록을 threads 개 event loop 에 나눠 실행"""
+
+    def __init__(self, specs, config):
+        self.specs = specs
+        self.config = config
+        self.agents = []
+        scenarios = {}
+
+        seed = config.get("seed")
+        trap_targets = [(config["trap_host"], config["trap_port"])] if config["trap_port"] else []
+
+        for i, spec in enumerate(specs):
+            scenario = None
+            if spec["scenario"]:
+                if spec["scenario"] not in scenarios:
+                    scenarios[spec["scenario"]] = AlarmScenario.load(spec["scenario"])
+                scenario = scenarios[spec["scenario"]].copy()
+
+            agent_seed = None if seed is None else seed + i
+            # trap 1건 = 알람 발생 또는 해제 → 발생률은 trap_rate 의 절반
+            source = BatteryModel(spec["modules"], alarm_rate=spec["trap_rate"] / 2,
+                                  alarm_hold=spec["alarm_hold"], seed=agent_seed)
+            self.agents.append(SimAgent(
+                source, spec["host"], spec["port"], (spec["community"],),
+                trap_targets, config["trap_community"], spec["name"],
+                latency=spec["latency"], jitter=spec["jitter"], loss=spec["loss"],
+                scenario=scenario, seed=agent_seed,
+            ))
+
+        count = max(1, min(int(config["threads"]), len(self.agents) or 1))
+        self.threads = [
+            SimulatorThread(self.agents[i::count], config["tick"], name=f"snmp-sim-{i}")
+            for i in range(count)
+        ]
+
+    def start(self):
+        _raise_fd_limit(len(self.agents) * 2 + 64)
+        for thread in self.threads:
+            thread.start()
+        for thread in self.threads:
+            thread.ready.wait()
+        errors = [t.error for t in self.threads if t.error]
+        if errors:
+            self.stop()
+            raise errors[0]
+
+    def stop(self):
+        for thread in self.threads:
+            thread.stop()
+        for thread in self.threads:
+            thread.join(5)
+
+    def is_alive(self):
+        return any(t.is_alive() for t in self.threads)
+
+    def stats(self):
+        total = {"agents": len(self.agents)}
+        for thread in self.threads:
+            for key, value in thread.stats().items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+# ======================
+# CLI
+# ======================
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="TBC1000B 가상 agent fleet 시뮬레이터")
+    parser.add_argument("config", help="fleet 시뮬레이터 설정 파일 (json)")
+    parser.add_argument("--profile-dir", help="프로파일 생성 폴더 (설정 값 대신)")
+    parser.add_argument("--no-profiles", action="store_true", help="프로파일을 만들지 않음")
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="통계 출력 주기 [s]")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    setup_logging(args.log_format)
+
+    try:
+        config = load_fleet_config(args.config)
+        if args.profile_dir:
+            config["profile_dir"] = os.path.abspath(args.profile_dir)
+        specs = expand_agents(config)
+        if not args.no_profiles:
+            write_profiles(specs, config)
+        fleet = FleetSimulator(specs, config)
+        fleet.start()
+    except (FleetConfigError, ValueError, OSError) as e:
+        logger.error("fleet simulator 시작 실패: %s", e)
+        return 1
+
+    try:
+        while fleet.is_alive():
+            time.sleep(args.stats_interval)
+            logger.info("fleet simulator stats", extra={"fields": fleet.stats()})
+    except KeyboardInterrupt:
+        fleet.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
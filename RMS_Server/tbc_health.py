@@ -0,0 +1,171 @@
+# 감시 대상(agent) 별 통신 상태 / back-off
+#
+# 응답이 없는 agent 를 5초마다 계속 walk 하면 요청마다 pysnmp 기본 timeout(1초 x 재시도 5회)을
+# 기다리느라 thread 가 묶인다 (fleet 모드에서는 죽은 사이트 몇 개가 poll 시간을 다 씀).
+#
+#   healthy   : 정상 주기 walk
+#   degraded  : 연속 실패 1~2회 또는 RTT 가 큼 → 주기는 유지
+#   open      : 연속 실패 3회 → walk 중지, back-off (지수 증가 + jitter) 후 half-open 으로
+#   half_open : sysUpTime GET 1회 (재시도 없음) 로 확인 → 성공 시 walk 재개, 실패 시 back-off 두배
+#
+# 요청 timeout 은 RFC 6298 방식 (SRTT + 4 x RTTVAR) 으로 측정 RTT 에 맞춘다.
+
+import logging
+import random
+import threading
+import time
+
+logger = logging.getLogger("tbc.health")
+
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# metrics 용 숫자 값
+STATE_LEVEL = {HEALTHY: 0, DEGRADED: 1, HALF_OPEN: 2, OPEN: 2}
+
+FAILURE_THRESHOLD = 3       # 연속 실패 → open
+BACKOFF_MAX = 300.0         # [s]
+BACKOFF_JITTER = 0.2        # ±20 %
+DEGRADED_RTT = 1.0          # [s] SRTT 가 이보다 크면 degraded
+
+TIMEOUT_INITIAL = 2.0       # [s] RTT 측정 전 (기존 접속 테스트와 같음)
+TIMEOUT_MIN = 0.3
+TIMEOUT_MAX = 5.0
+RTT_ALPHA = 1 / 8
+# pysnmp 는 target 의 (timeout, retries) 조합마다 snmpTargetAddr 항목을 새로 만들고 지우지 않음
+# (hlapi lcd cache key) → 요청에 쓰는 timeout 은 아래 단계 중 RTO 이상인 가장 작은 값으로 고정
+TIMEOUT_STEPS = (0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0)
+RTT_BETA = 1 / 4
+
+
+class TargetHealth:
+    """agent 하나의 통신 상태 (poller / fleet worker thread 에서 갱신)
+
+    on_change(to_dict()) 는 상태가 바뀔 때 호출된다.
+    """
+
+    def __init__(self, name="", failure_threshold=FAILURE_THRESHOLD,
+                 backoff_max=BACKOFF_MAX, on_change=None):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.backoff_max = backoff_max
+        self.on_change = on_change or (lambda health: None)
+        self._lock = threading.Lock()
+
+        self.state = HEALTHY
+        self.consecutive_failures = 0
+        self.backoff = 0.0              # 현재 back-off [s] (open 일 때)
+        self.retry_at = None            # half-open 시도 시각 (time.monotonic)
+        self.opened_at = None           # time.time()
+
+        # RTT 추정 (RFC 6298)
+        self.srtt = None
+        self.rttvar = None
+        self.rto = TIMEOUT_INITIAL
+
+    # ---------- 요청 설정 ----------
+    @property
+    def timeout(self):
+        """요청 timeout [s] : RTO 를 TIMEOUT_STEPS 로 올림"""
+        for step in TIMEOUT_STEPS:
+            if step >= self.rto:
+                return step
+        return TIMEOUT_MAX
+
+    @property
+    def retries(self):
+        # half-open 확인은 한번만 / 그 외에는 패킷 손실 대비 1회 재시도
+        return 0 if self.state in (OPEN, HALF_OPEN) else 1
+
+    @property
+    def is_open(self):
+        return self.state in (OPEN, HALF_OPEN)
+
+    def record_rtt(self, rtt):
+        with self._lock:
+            if self.srtt is None:
+                self.srtt = rtt
+                self.rttvar = rtt / 2
+            else:
+                self.rttvar = (1 - RTT_BETA) * self.rttvar + RTT_BETA * abs(self.srtt - rtt)
+                self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+            self.rto = min(TIMEOUT_MAX, max(TIMEOUT_MIN, self.srtt + 4 * self.rttvar))
+
+    # ---------- 결과 반영 ----------
+    def begin_probe(self):
+        """open → half_open (back-off 가 끝나 확인 요청을 보내기 직전)"""
+        self._set_state(HALF_OPEN)
+
+    def on_success(self, rtts=()):
+        for rtt in rtts:
+            self.record_rtt(rtt)
+
+        with self._lock:
+            self.consecutive_failures = 0
+            self.backoff = 0.0
+            self.retry_at = None
+            self.opened_at = None
+            state = DEGRADED if self.srtt is not None and self.srtt > DEGRADED_RTT else HEALTHY
+        self._set_state(state)
+
+    def on_failure(self, interval):
+        with self._lock:
+            self.consecutive_failures += 1
+
+            if self.state in (OPEN, HALF_OPEN):
+                # half-open 확인 실패 → back-off 두배
+                self.backoff = min(self.backoff_max, max(self.backoff * 2, interval))
+            elif self.consecutive_failures >= self.failure_threshold:
+                self.backoff = min(self.backoff_max, interval * 2)
+                self.opened_at = time.time()
+            else:
+                self.backoff = 0.0
+
+            if self.backoff:
+                self.retry_at = time.monotonic() + self._jitter(self.backoff)
+                state = OPEN
+            else:
+                state = DEGRADED
+
+            # 무응답 동안 timeout 이 너무 짧게 남지 않도록 늘려둠 (RFC 6298 5.5)
+            self.rto = min(TIMEOUT_MAX, self.rto * 2)
+        self._set_state(state)
+
+    @staticmethod
+    def _jitter(delay):
+        # 여러 사이트가 같은 시각에 끊겼다가 동시에 재시도하지 않도록 분산
+        return delay * random.uniform(1 - BACKOFF_JITTER, 1 + BACKOFF_JITTER)
+
+    def next_delay(self, interval):
+        """다음 시도까지 대기 시간 [s] (healthy / degraded 는 정상 주기)"""
+        if self.state in (OPEN, HALF_OPEN) and self.retry_at is not None:
+            return max(0.0, self.retry_at - time.monotonic())
+        return interval
+
+    def _set_state(self, state):
+        if state == self.state:
+            return
+        prev, self.state = self.state, state
+        logger.info("health", extra={"fields": {
+            "target": self.name, "from": prev, "to": state,
+            "failures": self.consecutive_failures, "backoff": round(self.backoff, 1)}})
+        try:
+            self.on_change(self.to_dict())
+        except Exception:
+            logger.exception("health listener error")
+
+    # ---------- 조회 ----------
+    def to_dict(self):
+        retry_in = None
+        if self.retry_at is not None:
+            retry_in = max(0.0, self.retry_at - time.monotonic())
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "backoff": self.backoff,
+            "retry_in": retry_in,
+            "timeout_ms": self.timeout * 1000,
+            "srtt_ms": None if self.srtt is None else self.srtt * 1000,
+        }
@@ -0,0 +1,102 @@
+# 모듈 inventory 캐시 (equip ID → 모듈 주소 / SW 버전 / 모델 / 바코드)
+#
+# hwAcbBaseTable 은 모듈 교체 전에는 거의 바뀌지 않는데 매 poll 마다 전체를 walk 하고 있었음.
+# 프로파일별로 profiles/.inventory/<이름>.json 에 저장해 두고
+#   - 평소 poll 은 equip ID 열(column 2)만 walk → 캐시의 ID 목록과 같으면 캐시 사용
+#   - ID 가 다르거나 INVENTORY_REFRESH 가 지나면 다음 poll 에서 BaseTable 전체 walk
+# 시작 시 캐시를 바로 읽으므로 첫 poll 전에도 모듈 상세창에 바코드 등을 표시할 수 있다.
+
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("tbc.inventory")
+
+INVENTORY_DIR = ".inventory"
+INVENTORY_VERSION = 1
+INVENTORY_REFRESH = 3600.0      # [s] 바뀐 것이 없어도 전체 walk 하는 주기
+INVENTORY_FIELDS = ("swver", "model", "barcode")
+
+
+def inventory_path(profile_path):
+    """profiles/<이름>.ini → profiles/.inventory/<이름>.json"""
+    folder, name = os.path.split(profile_path)
+    return os.path.join(folder, INVENTORY_DIR, os.path.splitext(name)[0] + ".json")
+
+
+class InventoryCache:
+    """rows : {equip_id(str): {"addr": 모듈 번호, "swver", "model", "barcode"}}"""
+
+    def __init__(self, path=None, max_age=INVENTORY_REFRESH):
+        self.path = path
+        self.max_age = max_age
+        self.rows = {}
+        self.updated = None             # 마지막 전체 walk (time.time)
+        self.valid = False
+        if path:
+            self.load()
+
+    # ---------- 파일 ----------
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != INVENTORY_VERSION:
+            return
+
+        self.rows = data.get("rows", {})
+        self.updated = data.get("updated")
+        self.valid = bool(self.rows)
+
+    def save(self):
+        if not self.path:
+            return
+        tmp = self.path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"version": INVENTORY_VERSION, "updated": self.updated, "rows": self.rows},
+                          f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("inventory 저장 실패 %s: %s", self.path, e)
+
+    # ---------- 판단 ----------
+    def needs_full_walk(self):
+        if not self.valid or self.updated is None:
+            return True
+        return time.time() - self.updated > self.max_age
+
+    def matches(self, equip_ids):
+        return set(equip_ids) == set(self.rows)
+
+    def invalidate(self):
+        self.valid = False
+
+    # ---------- 갱신 / 조회 ----------
+    def update(self, module_map):
+        """전체 walk 로 만든 module_map 반영 → 내용이 바뀌었으면 True"""
+        rows = {
+            str(info["equip_id"]): {"addr": module_no, **{k: info.get(k) for k in INVENTORY_FIELDS}}
+            for module_no, info in module_map.items()
+        }
+        changed = rows != self.rows
+
+        self.rows = rows
+        self.updated = time.time()
+        self.valid = bool(rows)
+        self.save()
+
+        if changed:
+            logger.info("inventory 변경", extra={"fields": {"path": self.path, "modules": len(rows)}})
+        return changed
+
+    def module_map(self):
+        """decode_poll_result 와 같은 형식 {module_no: {equip_id, swver, model, barcode}}"""
+        return {
+            int(row["addr"]): {"equip_id": equip_id, **{k: row.get(k) for k in INVENTORY_FIELDS}}
+            for equip_id, row in self.rows.items()
+        }
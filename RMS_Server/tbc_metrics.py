@@ -0,0 +1,262 @@
+# 감시프로그램 자체 상태 metrics
+#
+# 1초마다 process CPU / RSS / thread 수, GUI event loop 지연, poll 소요시간,
+# SNMP RTT, trap rate, queue 길이를 ring buffer 에 모으고
+#   - 127.0.0.1:<port>/metrics       Prometheus text format
+#   - 127.0.0.1:<port>/metrics.json  최근 sample 목록
+#   - metrics json 파일 (최근 sample 몇 개만, 10초마다 별도 thread 에서 갱신)
+# 로 내보낸다. 여러 사이트 PC 에서 메모리 누수 / 지연을 미리 보기 위한 것.
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("tbc.metrics")
+
+METRICS_HISTORY = 600           # ring buffer 크기 (1초 sample → 10분)
+METRICS_HOST = "127.0.0.1"      # localhost 에서만 접근
+# json 파일은 전체 history (수백 KB) 를 매초 다시 쓰면 GUI thread 가 수십 ms 씩 멈춤
+# → 최근 sample 만, 간격을 두고, writer thread 에서 저장 (전체 history 는 /metrics.json)
+METRICS_FILE_TAIL = 30          # json 파일에 넣는 최근 sample 수
+METRICS_FILE_INTERVAL = 10.0    # json 파일 갱신 간격 [s]
+
+# name → (type, help)
+METRIC_DEFS = {
+    "process_cpu_percent":       ("gauge",   "감시프로그램 process CPU 사용률 [%]"),
+    "system_cpu_percent":        ("gauge",   "PC 전체 CPU 사용률 [%]"),
+    "process_rss_bytes":         ("gauge",   "감시프로그램 RSS [byte]"),
+    "process_memory_percent":    ("gauge",   "감시프로그램 RSS / 전체 메모리 [%]"),
+    "process_threads":           ("gauge",   "감시프로그램 thread 수"),
+    "event_loop_lag_ms":         ("gauge",   "GUI event loop 지연 [ms]"),
+    "poll_duration_ms":          ("gauge",   "마지막 SNMP poll cycle 소요시간 [ms]"),
+    "snmp_rtt_ms":               ("gauge",   "마지막 poll 의 SNMP 요청 평균 RTT [ms]"),
+    "snmp_rtt_max_ms":           ("gauge",   "마지막 poll 의 SNMP 요청 최대 RTT [ms]"),
+    "probe_rtt_ms":              ("gauge",   "도달성 probe RTT [ms]"),
+    "probe_jitter_ms":           ("gauge",   "도달성 probe jitter [ms]"),
+    "probe_loss_percent":        ("gauge",   "도달성 probe 손실률 (최근 300회) [%]"),
+    "trap_rate":                 ("gauge",   "초당 trap 수신"),
+    "trap_queue_depth":          ("gauge",   "trap queue 길이"),
+    "trap_queue_capacity":       ("gauge",   "trap queue 최대 길이"),
+    "gui_pending_rows":          ("gauge",   "Trap 로그 테이블에 반영 대기 중인 행"),
+    "polls_total":               ("counter", "성공한 poll 수"),
+    "poll_errors_total":         ("counter", "실패한 poll 수"),
+    "traps_total":               ("counter", "수신한 trap 수"),
+    "bytes_sent_total":          ("counter", "SNMP / probe 송신량 (UDP/IP header 포함) [byte]"),
+    "bytes_received_total":      ("counter", "SNMP / probe 수신량 (UDP/IP header 포함) [byte]"),
+    "bytes_sent_per_hour":       ("gauge",   "최근 1시간 송신량 [byte/h]"),
+    "bytes_received_per_hour":   ("gauge",   "최근 1시간 수신량 [byte/h]"),
+    "data_age_seconds":          ("gauge",   "마지막 walk 성공 후 경과 시간 [s]"),
+    "health_state":              ("gauge",   "agent 통신 상태 (0 healthy / 1 degraded / 2 open)"),
+    "snmp_timeout_ms":           ("gauge",   "RTT 기반 SNMP 요청 timeout [ms]"),
+    "backoff_seconds":           ("gauge",   "차단(open) 상태 재시도 back-off [s]"),
+    "consecutive_failures":      ("gauge",   "연속 poll 실패 수"),
+    "fleet_sites":               ("gauge",   "fleet 모드 감시 사이트 수"),
+    "fleet_sites_down":          ("gauge",   "fleet 모드 마지막 poll 실패 사이트 수"),
+    "fleet_polls_in_flight":     ("gauge",   "fleet 모드 진행 중인 poll 수"),
+    "fleet_schedule_lag_ms":     ("gauge",   "fleet 모드 poll 예약 대비 시작 지연 [ms]"),
+    "fleet_sites_open":          ("gauge",   "fleet 모드 차단(open) 상태 사이트 수"),
+    "fleet_sites_degraded":      ("gauge",   "fleet 모드 degraded 상태 사이트 수"),
+    "fleet_sites_trap_mode":     ("gauge",   "fleet 모드 trap 위주 감시 사이트 수"),
+}
+
+
+class ProcessSampler:
+    """psutil.Process 를 한번만 만들어 재사용 (psutil 은 첫 sample 때 로드)"""
+
+    def __init__(self):
+        self._psutil = None
+        self._process = None
+        self._total_mem = None
+
+    def sample(self):
+        if self._process is None:
+            import psutil
+            self._psutil = psutil
+            self._process = psutil.Process()
+            self._total_mem = psutil.virtual_memory().total
+            # cpu_percent 는 첫 호출 기준점 → 0 반환
+            self._process.cpu_percent(None)
+            psutil.cpu_percent(None)
+
+        process = self._process
+        with process.oneshot():
+            rss = process.memory_info().rss
+            threads = process.num_threads()
+            cpu = process.cpu_percent(None)
+
+        return {
+            "process_cpu_percent": cpu,
+            "system_cpu_percent": self._psutil.cpu_percent(None),
+            "process_rss_bytes": rss,
+            "process_memory_percent": rss / self._total_mem * 100 if self._total_mem else 0.0,
+            "process_threads": threads,
+        }
+
+
+class MetricsCollector:
+    """sample ring buffer + 출력(Prometheus text / json)
+
+    sample(**extra) 을 주기적으로 호출 (GUI: 자원 표시 timer, headless: main loop).
+    sources 로 등록한 함수는 sample 마다 호출되어 dict 를 돌려준다 (engine.metrics 등).
+    """
+
+    def __init__(self, labels=None, history=METRICS_HISTORY, json_path=None,
+                 file_tail=METRICS_FILE_TAIL, file_interval=METRICS_FILE_INTERVAL):
+        self.labels = dict(labels or {})
+        self.samples = deque(maxlen=history)
+        self.json_path = json_path
+        self.file_tail = file_tail
+        self.file_interval = file_interval
+        self.process = ProcessSampler()
+        self._sources = []
+        self._lock = threading.Lock()
+        self._last_write = None
+        self._writer = None
+
+    def add_source(self, fn):
+        self._sources.append(fn)
+
+    def remove_source(self, fn):
+        if fn in self._sources:
+            self._sources.remove(fn)
+
+    def sample(self, **extra):
+        values = {}
+        try:
+            values.update(self.process.sample())
+        except Exception as e:
+            logger.debug("process sample error: %s", e)
+
+        for source in list(self._sources):
+            try:
+                values.update(source())
+            except Exception as e:
+                logger.debug("metrics source error: %s", e)
+
+        values.update(extra)
+        values["time"] = time.time()
+
+        with self._lock:
+            self.samples.append(values)
+
+        if self.json_path:
+            self._schedule_write(values["time"])
+
+        return values
+
+    def _schedule_write(self, now):
+        if self._last_write is not None and now - self._last_write < self.file_interval:
+            return
+        if self._writer is not None and self._writer.is_alive():
+            return      # 이전 저장이 아직 끝나지 않음 → 다음 sample 에서 다시
+        self._last_write = now
+        self._writer = threading.Thread(
+            target=self.write_json, args=(self.json_path, self.file_tail),
+            name="metrics-json", daemon=True)
+        self._writer.start()
+
+    def latest(self):
+        with self._lock:
+            return dict(self.samples[-1]) if self.samples else {}
+
+    def history(self, tail=None):
+        """sample 목록 (tail 지정 시 최근 tail 개)"""
+        with self._lock:
+            if tail is None:
+                return list(self.samples)
+            return list(self.samples)[-tail:] if tail > 0 else []
+
+    # ---------- 출력 ----------
+    def to_json(self, tail=None):
+        return {
+            "labels": self.labels,
+            "updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "latest": self.latest(),
+            "history": self.history(tail),
+        }
+
+    def write_json(self, path, tail=None):
+        # 다른 프로그램이 읽는 도중 깨진 파일을 보지 않도록 교체 방식으로 저장
+        tmp = path + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.to_json(tail), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.debug("metrics json write error: %s", e)
+
+    def to_prometheus(self):
+        latest = self.latest()
+        label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in sorted(self.labels.items()))
+        label_text = "{" + label_text + "}" if label_text else ""
+
+        lines = []
+        for name, (kind, help_text) in METRIC_DEFS.items():
+            value = latest.get(name)
+            if value is None:
+                continue
+            metric = f"tbc_{name}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric}{label_text} {float(value):.6g}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+# ======================
+# localhost HTTP endpoint
+# ======================
+class _MetricsHandler(BaseHTTPRequestHandler):
+
+    collector = None
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+
+        if path == "/metrics":
+            body = self.collector.to_prometheus().encode("utf-8")
+            ctype = "text/plain; version=0.0.4; charset=utf-8"
+        elif path == "/metrics.json":
+            body = json.dumps(self.collector.to_json(), ensure_ascii=False).encode("utf-8")
+            ctype = "application/json; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", ctype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        logger.debug("metrics http: " + fmt, *args)
+
+
+class MetricsServer(threading.Thread):
+    """127.0.0.1 전용 metrics HTTP server (daemon thread)"""
+
+    def __init__(self, collector, port, host=METRICS_HOST):
+        super().__init__(name=f"metrics-http-{port}", daemon=True)
+        handler = type("MetricsHandler", (_MetricsHandler,), {"collector": collector})
+        self.httpd = ThreadingHTTPServer((host, int(port)), handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self):
+        return self.httpd.server_address
+
+    def run(self):
+        logger.info("metrics endpoint http://%s:%s/metrics", *self.address)
+        self.httpd.serve_forever(poll_interval=0.5)
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
@@ -0,0 +1,432 @@
+# 배터리 시스템 도달성(reachability) 검사
+#
+# 기존 PingThread 는 1초마다 외부 ping 프로세스를 띄웠음 (사이트당 fork+exec / 최대 2초 block).
+# 여기서는 asyncio thread 하나가 모든 host 를 검사한다.
+#   1) ICMP echo : 비특권 ICMP datagram socket (Linux ping_group_range, macOS)
+#   2) SNMP GET sysUpTime.0 (UDP) : ICMP socket 을 못 열거나 host 가 ICMP 에 응답하지 않을 때
+# RTT / jitter 는 us 단위 timestamp 로 측정하고, 최근 결과는 host 별 ring buffer 에 보관.
+
+import asyncio
+import itertools
+import logging
+import random
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+logger = logging.getLogger("tbc.prober")
+
+PROBE_INTERVAL = 1.0        # [s]
+PROBE_TIMEOUT = 1.0         # [s]
+PROBE_HISTORY = 300         # host 당 최근 결과 수 (1초 → 5분)
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+
+UDP_IP_OVERHEAD = 28        # IPv4 + UDP header (ICMP 는 IPv4 20 byte)
+IP_OVERHEAD = 20
+
+# 1.3.6.1.2.1.1.3.0 (sysUpTime.0) BER 인코딩
+SYS_UPTIME_OID_BER = bytes([0x2B, 0x06, 0x01, 0x02, 0x01, 0x01, 0x03, 0x00])
+
+
+def now_us():
+    return time.perf_counter_ns() // 1000
+
+# ======================
+# host 별 통계
+# ======================
+class HostStats:
+    """최근 probe 결과 ring buffer → 손실률 / RTT / jitter"""
+
+    def __init__(self, host, history=PROBE_HISTORY):
+        self.host = host
+        self.samples = deque(maxlen=history)    # (송신 시각 us, rtt us | None)
+        self.method = None                      # "icmp" / "snmp"
+        self.jitter_us = 0.0                    # RFC 3550 방식 이동 평균
+        self._last_rtt = None
+        self.consecutive_lost = 0
+        self.tx_bytes = 0                       # IP header 포함
+        self.rx_bytes = 0
+
+    def add(self, sent_us, rtt_us):
+        self.samples.append((sent_us, rtt_us))
+
+        if rtt_us is None:
+            self.consecutive_lost += 1
+            return
+
+        self.consecutive_lost = 0
+        if self._last_rtt is not None:
+            self.jitter_us += (abs(rtt_us - self._last_rtt) - self.jitter_us) / 16
+        self._last_rtt = rtt_us
+
+    @property
+    def last_rtt_us(self):
+        return self.samples[-1][1] if self.samples else None
+
+    def to_dict(self):
+        rtts = [rtt for _, rtt in self.samples if rtt is not None]
+        sent = len(self.samples)
+        lost = sent - len(rtts)
+
+        return {
+            "host": self.host,
+            "method": self.method,
+            "reachable": self.last_rtt_us is not None,
+            "sent": sent,
+            "lost": lost,
+            "loss_percent": lost / sent * 100 if sent else 0.0,
+            "consecutive_lost": self.consecutive_lost,
+            "rtt_ms": self.last_rtt_us / 1000 if self.last_rtt_us is not None else None,
+            "rtt_min_ms": min(rtts) / 1000 if rtts else None,
+            "rtt_avg_ms": sum(rtts) / len(rtts) / 1000 if rtts else None,
+            "rtt_max_ms": max(rtts) / 1000 if rtts else None,
+            "jitter_ms": self.jitter_us / 1000,
+            "tx_bytes": self.tx_bytes,
+            "rx_bytes": self.rx_bytes,
+        }
+
+# ======================
+# packet 생성 / 해석
+# ======================
+def icmp_checksum(data):
+    if len(data) % 2:
+        data += b"\x00"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_icmp_echo(ident, seq, payload=b"tbc-probe"):
+    header = struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    checksum = icmp_checksum(header + payload)
+    return struct.pack("!BBHHH", ICMP_ECHO_REQUEST, 0, checksum, ident, seq) + payload
+
+
+def parse_icmp_echo_reply(data):
+    """echo reply → seq (아니면 None). macOS 는 IP header 포함해서 넘겨줌"""
+    if len(data) >= 20 and data[0] >> 4 == 4:
+        data = data[(data[0] & 0x0F) * 4:]
+    if len(data) < 8:
+        return None
+    icmp_type, _, _, _, seq = struct.unpack_from("!BBHHH", data)
+    return seq if icmp_type == ICMP_ECHO_REPLY else None
+
+
+def _ber_len(n):
+    if n < 0x80:
+        return bytes([n])
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(body)]) + body
+
+
+def _ber(tag, value):
+    return bytes([tag]) + _ber_len(len(value)) + value
+
+
+def _ber_int(n):
+    return _ber(0x02, n.to_bytes(n.bit_length() // 8 + 1, "big", signed=True))
+
+
+def build_snmp_get(community, request_id, oid_ber=SYS_UPTIME_OID_BER):
+    """SNMPv2c GetRequest (pysnmp 없이 직접 인코딩)"""
+    varbind = _ber(0x30, _ber(0x06, oid_ber) + b"\x05\x00")
+    pdu = _ber(0xA0, _ber_int(request_id) + _ber_int(0) + _ber_int(0) + _ber(0x30, varbind))
+    return _ber(0x30, _ber_int(1) + _ber(0x04, community.encode()) + pdu)
+
+
+def _ber_read(data, pos):
+    """(tag, value 시작, value 끝)"""
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        n = length & 0x7F
+        length = int.from_bytes(data[pos:pos + n], "big")
+        pos += n
+    return tag, pos, pos + length
+
+
+def parse_snmp_response_id(data):
+    """GetResponse 의 request-id (형식이 다르면 None)"""
+    try:
+        tag, pos, _ = _ber_read(data, 0)
+        if tag != 0x30:
+            return None
+        _, _, pos = _ber_read(data, pos)            # version
+        _, _, pos = _ber_read(data, pos)            # community
+        tag, pos, _ = _ber_read(data, pos)          # PDU
+        if tag != 0xA2:
+            return None
+        tag, start, end = _ber_read(data, pos)
+        if tag != 0x02:
+            return None
+        return int.from_bytes(data[start:end], "big", signed=True)
+    except IndexError:
+        return None
+
+# ======================
+# socket 별 요청/응답 매칭
+# ======================
+class _DatagramChannel:
+    """non-blocking datagram socket 하나 + 응답 key → future"""
+
+    def __init__(self, loop, sock, match):
+        self.loop = loop
+        self.sock = sock
+        self.match = match
+        self.pending = {}
+        sock.setblocking(False)
+        loop.add_reader(sock.fileno(), self._on_readable)
+
+    def _on_readable(self):
+        while True:
+            try:
+                data, addr = self.sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                logger.debug("recv error: %s", e)
+                return
+
+            # 수신 시각은 깨어난 즉시 기록 (이후 처리 지연이 RTT 에 들어가지 않게)
+            received = now_us()
+            fut = self.pending.get(self.match(data, addr))
+            if fut is not None and not fut.done():
+                fut.set_result((received, len(data)))
+
+    async def request(self, key, packet, addr, timeout):
+        """응답 수신 시각(us) → (RTT(us), 응답 byte), 시간 초과 / 송신 실패 시 (None, 0)"""
+        fut = self.loop.create_future()
+        self.pending[key] = fut
+        try:
+            sent = now_us()
+            self.sock.sendto(packet, addr)
+            received, size = await asyncio.wait_for(fut, timeout)
+            return received - sent, size
+        except (asyncio.TimeoutError, OSError):
+            return None, 0
+        finally:
+            self.pending.pop(key, None)
+
+    def close(self):
+        self.loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+
+
+def open_icmp_socket():
+    """비특권 ICMP socket (권한 없으면 None → SNMP probe 만 사용)"""
+    try:
+        return socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+    except (OSError, AttributeError) as e:
+        logger.info("ICMP datagram socket 사용 불가 (%s) → SNMP probe 사용", e)
+        return None
+
+# ======================
+# Prober
+# ======================
+class _Target:
+
+    def __init__(self, host, port, community, interval=None):
+        self.host = host
+        self.port = int(port)
+        self.community = community
+        self.interval = interval
+        self.addr = None
+        self.stats = HostStats(host)
+        self.callbacks = []
+        self.task = None
+
+
+class ReachabilityProber(threading.Thread):
+    """asyncio thread 하나로 여러 host 를 주기적으로 검사
+
+    add_host(host, port, community, callback) / remove_host(host, callback) 는
+    어느 thread 에서 불러도 된다. callback(stats_dict) 은 prober thread 에서 호출된다.
+    """
+
+    def __init__(self, interval=PROBE_INTERVAL, timeout=PROBE_TIMEOUT, use_icmp=True):
+        super().__init__(name="reachability-prober", daemon=True)
+        self.interval = interval
+        self.timeout = timeout
+        self.use_icmp = use_icmp
+
+        self.loop = None
+        self._targets = {}
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopped = None
+
+        self._icmp = None
+        self._snmp = None
+        self._icmp_seq = itertools.cycle(range(1, 0x10000))
+        self._request_id = itertools.cycle(range(1, 0x7FFFFFFF))
+
+    # ---------- 외부 API ----------
+    def add_host(self, host, port=161, community="public", callback=None, interval=None):
+        """interval 지정 시 해당 host 만 다른 주기 (trap 위주 모드 등)"""
+        with self._lock:
+            target = self._targets.get(host)
+            if target is None:
+                target = self._targets[host] = _Target(host, port, community, interval)
+            else:
+                target.port = int(port)
+                target.community = community
+                target.interval = interval
+            if callback is not None:
+                target.callbacks.append(callback)
+
+        self._ready.wait()
+        self.loop.call_soon_threadsafe(self._ensure_task, target)
+
+    def remove_host(self, host, callback=None):
+        """callback 이 모두 빠지면 해당 host 검사 중지"""
+        with self._lock:
+            target = self._targets.get(host)
+            if target is None:
+                return
+            if callback in target.callbacks:
+                target.callbacks.remove(callback)
+            if target.callbacks and callback is not None:
+                return
+            del self._targets[host]
+
+        if target.task is not None:
+            self.loop.call_soon_threadsafe(target.task.cancel)
+
+    def stats(self, host):
+        with self._lock:
+            target = self._targets.get(host)
+        return target.stats.to_dict() if target else None
+
+    def all_stats(self):
+        with self._lock:
+            targets = list(self._targets.values())
+        return [t.stats.to_dict() for t in targets]
+
+    def stop(self):
+        if self.loop is not None and self._stopped is not None:
+            self.loop.call_soon_threadsafe(self._stopped.set)
+
+    # ---------- thread ----------
+    def run(self):
+        # add_reader 를 쓰므로 Windows 에서도 selector loop 사용
+        self.loop = asyncio.SelectorEventLoop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main())
+        finally:
+            self.loop.close()
+
+    async def _main(self):
+        self._stopped = asyncio.Event()
+
+        icmp_sock = open_icmp_socket() if self.use_icmp else None
+        if icmp_sock is not None:
+            self._icmp = _DatagramChannel(
+                self.loop, icmp_sock,
+                lambda data, addr: (addr[0], parse_icmp_echo_reply(data))
+            )
+
+        snmp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        snmp_sock.bind(("0.0.0.0", 0))
+        self._snmp = _DatagramChannel(
+            self.loop, snmp_sock,
+            lambda data, addr: parse_snmp_response_id(data)
+        )
+
+        self._ready.set()
+        await self._stopped.wait()
+
+        with self._lock:
+            targets = list(self._targets.values())
+        for target in targets:
+            if target.task is not None:
+                target.task.cancel()
+        await asyncio.gather(*(t.task for t in targets if t.task), return_exceptions=True)
+
+        for channel in (self._icmp, self._snmp):
+            if channel is not None:
+                channel.close()
+
+    def _ensure_task(self, target):
+        if target.task is None or target.task.done():
+            target.task = self.loop.create_task(self._probe_loop(target))
+
+    async def _probe_loop(self, target):
+        try:
+            info = await self.loop.getaddrinfo(target.host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM)
+            target.addr = info[0][4][0]
+        except OSError as e:
+            logger.warning("probe host 해석 실패 %s: %s", target.host, e)
+            return
+
+        # host 가 많을 때 송신이 한 순간에 몰리지 않도록 시작 시점 분산
+        await asyncio.sleep(random.uniform(0, min(self.interval, target.interval or self.interval)))
+        next_tick = self.loop.time()
+
+        while True:
+            sent = now_us()
+            rtt = await self._probe(target)
+            target.stats.add(sent, rtt)
+
+            stats = target.stats.to_dict()
+            for callback in list(target.callbacks):
+                try:
+                    callback(stats)
+                except Exception:
+                    logger.exception("probe callback error")
+
+            # probe 가 interval 보다 오래 걸렸으면 밀린 만큼 몰아서 보내지 않음
+            next_tick = max(next_tick + (target.interval or self.interval), self.loop.time())
+            await asyncio.sleep(next_tick - self.loop.time())
+
+    async def _probe(self, target):
+        stats = target.stats
+
+        if self._icmp is not None and stats.method != "snmp":
+            seq = next(self._icmp_seq)
+            packet = build_icmp_echo(0, seq)
+            rtt, size = await self._icmp.request(
+                (target.addr, seq), packet, (target.addr, 0), self.timeout
+            )
+            stats.tx_bytes += len(packet) + IP_OVERHEAD
+            if rtt is not None:
+                stats.rx_bytes += size + IP_OVERHEAD
+                stats.method = "icmp"
+                return rtt
+            if stats.method == "icmp" and stats.consecutive_lost < 3:
+                return None
+
+        # ICMP 불가 / 무응답 → SNMP sysUpTime (응답 오면 이후 SNMP 로 고정)
+        request_id = next(self._request_id)
+        packet = build_snmp_get(target.community, request_id)
+        rtt, size = await self._snmp.request(
+            request_id, packet, (target.addr, target.port), self.timeout
+        )
+        stats.tx_bytes += len(packet) + UDP_IP_OVERHEAD
+        if rtt is not None:
+            stats.method = "snmp"
+            stats.rx_bytes += size + UDP_IP_OVERHEAD
+        return rtt
+
+# ======================
+# process 공용 prober
+# ======================
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_prober():
+    """process 안의 모든 사이트가 같이 쓰는 prober (첫 호출 시 시작)"""
+    global _shared
+
+    with _shared_lock:
+        if _shared is None or not _shared.is_alive():
+            _shared = ReachabilityProber()
+            _shared.start()
+        return _shared
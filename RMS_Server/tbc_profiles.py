@@ -0,0 +1,268 @@
+# 프로파일 색인 / CSV 일괄 가져오기·내보내기
+#
+# profiles/*.ini 를 매번 하나씩 열지 않도록 주요 항목을 profiles/.profile_index.json 에 캐시.
+# refresh() 는 파일 mtime / 크기가 바뀐 ini 만 다시 읽는다.
+# CSV 가져오기는 전체 행을 먼저 검사 → 임시 폴더에 모두 쓴 뒤 한번에 옮기고,
+# 중간에 실패하면 옮긴 파일을 되돌린다 (전부 성공 or 전부 취소).
+
+import csv
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+
+from tbc_engine import PROFILE_DEFAULTS, ini_quote, load_profile
+
+logger = logging.getLogger("tbc.profiles")
+
+INDEX_FILE = ".profile_index.json"
+INDEX_VERSION = 1
+
+# 색인에 보관하는 항목 (검색 대상 포함)
+INDEX_FIELDS = ("site", "system", "ip", "get_community", "maker", "model", "last_connected")
+SEARCH_FIELDS = ("site", "system", "ip", "maker", "model")
+
+# CSV 열 순서 (= ini 키)
+CSV_FIELDS = (
+    "site", "system", "ip", "port", "get_community", "set_community",
+    "trap_community", "trap_port", "equip", "manager", "maker", "model", "serial",
+)
+
+_IP_RE = re.compile(r"^\d{1,3}(\.\d{1,3}){3}$")
+
+
+class ProfileImportError(ValueError):
+    """CSV 검사 실패 (errors: [(행 번호, 메시지), ...])"""
+
+    def __init__(self, errors):
+        self.errors = errors
+        lines = [f"{row}행: {msg}" for row, msg in errors[:20]]
+        if len(errors) > 20:
+            lines.append(f"... 외 {len(errors) - 20}건")
+        super().__init__("\n".join(lines))
+
+
+def profile_file_name(site, system):
+    """GUI 저장 규칙과 같은 파일명"""
+    return re.sub(r"[^\w\-]", "_", f"{site}_{system}") + ".ini"
+
+
+def write_profile(path, values):
+    """QSettings(IniFormat) 와 호환되는 [General] ini 저장"""
+    lines = ["[General]"]
+    lines += [f"{key}={ini_quote(val)}" for key, val in values.items()]
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+class ProfileIndex:
+    """profiles 폴더 색인
+
+    entries : {파일명: {"mtime": ns, "size": byte, site, system, ip, ...}}
+    """
+
+    def __init__(self, profile_dir, index_path=None):
+        self.profile_dir = profile_dir
+        self.index_path = index_path or os.path.join(profile_dir, INDEX_FILE)
+        self.entries = {}
+        self._haystack = {}
+        self._load()
+
+    # ---------- 색인 파일 ----------
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                self.entries = data.get("entries", {})
+        except (OSError, ValueError):
+            self.entries = {}
+        self._haystack = {name: self._search_text(e) for name, e in self.entries.items()}
+
+    def save(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": INDEX_VERSION, "entries": self.entries},
+                      f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    @staticmethod
+    def _search_text(entry):
+        return " ".join(str(entry.get(k, "")) for k in SEARCH_FIELDS).lower()
+
+    def _put(self, name, stat, profile):
+        entry = {"mtime": stat.st_mtime_ns, "size": stat.st_size}
+        entry.update((key, profile.get(key, "")) for key in INDEX_FIELDS)
+        self.entries[name] = entry
+        self._haystack[name] = self._search_text(entry)
+
+    # ---------- 갱신 ----------
+    def refresh(self):
+        """바뀐 ini 만 다시 읽음 → (추가/변경 수, 삭제 수)"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+        seen = set()
+        updated = 0
+
+        with os.scandir(self.profile_dir) as it:
+            for dirent in it:
+                if not dirent.name.endswith(".ini") or not dirent.is_file():
+                    continue
+
+                name = dirent.name
+                seen.add(name)
+                stat = dirent.stat()
+                entry = self.entries.get(name)
+
+                if entry and entry["mtime"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                    continue
+
+                try:
+                    self._put(name, stat, load_profile(dirent.path))
+                    updated += 1
+                except Exception as e:
+                    logger.warning("profile 읽기 실패 %s: %s", name, e)
+
+        removed = [name for name in self.entries if name not in seen]
+        for name in removed:
+            del self.entries[name]
+            self._haystack.pop(name, None)
+
+        if updated or removed:
+            self.save()
+
+        return updated, len(removed)
+
+    # ---------- 조회 ----------
+    def path_of(self, name):
+        return os.path.join(self.profile_dir, name)
+
+    def search(self, text="", **filters):
+        """검색어(설치장소/시스템/IP/제조사/모델 부분일치) + 항목별 정확히 일치 필터
+
+        결과: [(파일명, entry)] - 최근 접속 순, 그 다음 파일명 순
+        """
+        words = text.lower().split()
+        result = []
+
+        for name, entry in self.entries.items():
+            haystack = self._haystack[name]
+            if any(w not in haystack for w in words):
+                continue
+            if any(str(entry.get(k, "")) != str(v) for k, v in filters.items() if v):
+                continue
+            result.append((name, entry))
+
+        result.sort(key=lambda item: item[0])
+        result.sort(key=lambda item: item[1].get("last_connected") or "", reverse=True)
+        return result
+
+    def distinct(self, field):
+        """필터 콤보박스용 값 목록"""
+        return sorted({str(e.get(field, "")) for e in self.entries.values()} - {""})
+
+    # ---------- CSV ----------
+    def export_csv(self, csv_path, names=None):
+        """프로파일 → CSV (Excel 에서 열 수 있게 utf-8-sig)"""
+        names = sorted(self.entries) if names is None else names
+
+        with open(csv_path, "w", encoding="utf-8-sig", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            for name in names:
+                profile = load_profile(self.path_of(name))
+                writer.writerow({k: profile.get(k, "") for k in CSV_FIELDS})
+
+        return len(names)
+
+    def import_csv(self, csv_path, overwrite=False):
+        """CSV → 프로파일 일괄 생성 (전부 성공 or 전부 취소) → 생성/교체 수"""
+        os.makedirs(self.profile_dir, exist_ok=True)
+        rows = self._read_csv(csv_path, overwrite)
+
+        staging = tempfile.mkdtemp(prefix=".import-", dir=self.profile_dir)
+        backup = os.path.join(staging, ".backup")
+        os.makedirs(backup)
+        moved = []
+
+        try:
+            for name, values in rows:
+                write_profile(os.path.join(staging, name), values)
+
+            for name, _ in rows:
+                target = self.path_of(name)
+                if os.path.exists(target):
+                    os.replace(target, os.path.join(backup, name))
+                os.replace(os.path.join(staging, name), target)
+                moved.append(name)
+
+        except Exception:
+            # 되돌리기 : 새로 옮긴 파일 삭제 + 덮어쓴 파일 복원
+            for name in moved:
+                try:
+                    os.remove(self.path_of(name))
+                except OSError:
+                    pass
+            for name in os.listdir(backup):
+                os.replace(os.path.join(backup, name), self.path_of(name))
+            raise
+
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        # 방금 쓴 값으로 바로 색인 (다시 읽지 않음)
+        for name, values in rows:
+            profile = dict(PROFILE_DEFAULTS)
+            profile.update(values)
+            self._put(name, os.stat(self.path_of(name)), profile)
+        self.save()
+
+        logger.info("profile import", extra={"fields": {"csv": csv_path, "count": len(rows)}})
+        return len(rows)
+
+    def _read_csv(self, csv_path, overwrite):
+        with open(csv_path, encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+            missing = {"site", "system", "ip"} - set(reader.fieldnames or [])
+            if missing:
+                raise ProfileImportError([(1, f"필수 열 없음: {', '.join(sorted(missing))}")])
+            raw_rows = list(reader)
+
+        errors = []
+        rows = []
+        names = {}
+
+        for line_no, raw in enumerate(raw_rows, start=2):
+            values = {k: (raw.get(k) or "").strip() for k in CSV_FIELDS}
+
+            if not values["site"] or not values["system"]:
+                errors.append((line_no, "설치장소 / 시스템 이름 없음"))
+                continue
+            if not _IP_RE.match(values["ip"]) or any(int(x) > 255 for x in values["ip"].split(".")):
+                errors.append((line_no, f"IP 형식 오류: {values['ip']}"))
+                continue
+            for key in ("port", "trap_port"):
+                if values[key] and not values[key].isdigit():
+                    errors.append((line_no, f"{key} 숫자 아님: {values[key]}"))
+            for key in ("port", "get_community", "set_community", "trap_community", "trap_port"):
+                if not values[key]:
+                    values[key] = PROFILE_DEFAULTS[key]
+
+            name = profile_file_name(values["site"], values["system"])
+            if name in names:
+                errors.append((line_no, f"{names[name]}행과 같은 설치장소/시스템"))
+                continue
+            if not overwrite and os.path.exists(self.path_of(name)):
+                errors.append((line_no, f"이미 있는 프로파일: {name}"))
+                continue
+
+            names[name] = line_no
+            rows.append((name, values))
+
+        if errors:
+            raise ProfileImportError(errors)
+        return rows
+
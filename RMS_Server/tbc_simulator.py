@@ -0,0 +1,989 @@
+# EMAP 배터리 MIB SNMPv2c agent 시뮬레이터 (하드웨어 없이 감시프로그램 end-to-end 시험)
+#
+# battery_system_mib_test.py 는 값이 바뀔 때마다 snmpsim-data-fold 프로세스를 띄웠고
+# battery_data.conf 는 GroupSampTable 몇 줄짜리 고정 값이었음.
+# 여기서는 asyncio UDP agent 하나가 process 안에서
+#   - hwAcbBaseTable / hwAcbGroupSampTable / hwAcbSampTable / Active Alarm Table 을
+#     GET / GETNEXT / GETBULK 로 응답 (BER 직접 인코딩 → pysnmp 불필요)
+#   - 값은 BatteryModel (셀 전압/온도 랜덤 워크 + 알람 발생/해제) 또는
+#     HistoryReplay (HistoryWriter 가 남긴 logs/history_*.jsonl 재생)
+#   - 알람 발생/해제 시 감시프로그램이 받는 것과 같은 형식의 hwAcbAlarmTrap / hwAcbAlarmResumeTrap 송신
+#
+#   python tbc_simulator.py --port 16100 --modules 16 --trap-port 1162 --alarm-rate 0.2
+#   python tbc_simulator.py --replay logs/history_20250101.jsonl --speed 10
+#   python tbc_engine.py --headless --ip 127.0.0.1 --port 16100 --community public
+
+import argparse
+import asyncio
+import bisect
+import json
+import logging
+import math
+import random
+import shlex
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from tbc_engine import (
+    ALARM_TRAP_OIDS, FAULT_ALARMS, OID_BASE_ENTRY, OID_SAMP_ENTRY, OID_SNMP_TRAP,
+    OID_SYS_UPTIME, PREFIX_ALARM, PREFIX_EQUIP_ID, PREFIX_EQUIP_NAME, PREFIX_FATHER_NAME,
+    PREFIX_LEVEL, PREFIX_ORDINAL, PREFIX_TRAP_EQUIP, RESUME_TRAP_OIDS, SUMMARY_ALARMS, setup_logging,
+)
+
+logger = logging.getLogger("tbc.simulator")
+
+SIM_HOST = "127.0.0.1"
+SIM_PORT = 16100                # 161 은 관리자 권한 필요
+SIM_COMMUNITIES = ("public", "skt_public")
+SIM_TICK = 1.0                  # [s] 값 갱신 주기
+MAX_RESPONSE = 65000            # [byte] GETBULK 응답 최대 크기 (UDP datagram 한도 이하)
+
+OID_SYS_DESCR = "1.3.6.1.2.1.1.1.0"
+OID_SYS_NAME = "1.3.6.1.2.1.1.5.0"
+
+OID_GROUP_ENTRY = "1.3.6.1.4.1.2011.6.164.1.17.1.1."
+OID_ALARM_ENTRY = "1.3.6.1.4.1.2011.6.164.1.1.2.99.1."
+GROUP_INDEX = 96                # GroupSampTable 랙 합계 행
+EQUIP_BASE = 1000               # 모듈 N → equip ID 1000+N
+
+TRAP_ALARM = next(oid for oid in ALARM_TRAP_OIDS if oid.endswith(".3.0.99"))
+TRAP_RESUME = next(oid for oid in RESUME_TRAP_OIDS if oid.endswith(".3.0.100"))
+
+# 모델이 임의로 발생시키는 알람 (text, 모듈 알람 여부, level)
+ALARM_CATALOG = [(text, True, "Major") for text in FAULT_ALARMS] + [
+    (text, False, "Critical") for text, _ in SUMMARY_ALARMS.values()
+] + [
+    ("Battery Low Voltage", False, "Minor"),
+    ("Cell Voltage Imbalance", True, "Minor"),
+]
+
+# =======================================================================================================================
+# BER (SNMPv2c 메시지)
+# =======================================================================================================================
+TAG_INT = 0x02
+TAG_OCTET = 0x04
+TAG_OID = 0x06
+TAG_SEQ = 0x30
+TAG_TIMETICKS = 0x43
+
+NO_SUCH_INSTANCE = b"\x81\x00"
+END_OF_MIB_VIEW = b"\x82\x00"
+
+PDU_GET = 0xA0
+PDU_GETNEXT = 0xA1
+PDU_RESPONSE = 0xA2
+PDU_GETBULK = 0xA5
+PDU_TRAP = 0xA7
+
+
+def ber_len(n):
+    if n < 0x80:
+        return bytes([n])
+    body = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(body)]) + body
+
+
+def ber(tag, value):
+    return bytes([tag]) + ber_len(len(value)) + value
+
+
+def ber_int(n, tag=TAG_INT):
+    return ber(tag, n.to_bytes(n.bit_length() // 8 + 1, "big", signed=True))
+
+
+def ber_oid(oid):
+    """(1, 3, 6, ...) → OID 인코딩"""
+    out = bytearray([oid[0] * 40 + oid[1]])
+    for arc in oid[2:]:
+        chunk = [arc & 0x7F]
+        arc >>= 7
+        while arc:
+            chunk.append(0x80 | (arc & 0x7F))
+            arc >>= 7
+        out.extend(reversed(chunk))
+    return ber(TAG_OID, bytes(out))
+
+
+def decode_oid(data):
+    first = data[0]
+    oid = [first // 40, first % 40]
+    arc = 0
+    for b in data[1:]:
+        arc = (arc << 7) | (b & 0x7F)
+        if not b & 0x80:
+            oid.append(arc)
+            arc = 0
+    return tuple(oid)
+
+
+def ber_read(data, pos):
+    """(tag, value 시작, value 끝)"""
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+    if length & 0x80:
+        n = length & 0x7F
+        length = int.from_bytes(data[pos:pos + n], "big")
+        pos += n
+    if pos + length > len(data):
+        raise ValueError("truncated")
+    return tag, pos, pos + length
+
+
+def oid_tuple(text):
+    return tuple(int(x) for x in text.strip(".").split("."))
+
+
+def encode_value(kind, value):
+    if kind == "int":
+        return ber_int(int(value))
+    if kind == "str":
+        return ber(TAG_OCTET, str(value).encode("utf-8"))
+    if kind == "ticks":
+        return ber_int(int(value), TAG_TIMETICKS)
+    if kind == "oid":
+        return ber_oid(oid_tuple(value))
+    raise ValueError(kind)
+
+
+def parse_request(data):
+    """→ (version, community, pdu, request_id, a, b, [oid]) / 형식 오류면 None
+
+    a, b : GET/GETNEXT 는 error-status/index, GETBULK 는 non-repeaters/max-repetitions
+    """
+    try:
+        tag, pos, end = ber_read(data, 0)
+        if tag != TAG_SEQ:
+            return None
+        _, s, pos = ber_read(data, pos)
+        version = int.from_bytes(data[s:pos], "big")
+        _, s, pos = ber_read(data, pos)
+        community = data[s:pos].decode("utf-8", "replace")
+        pdu, pos, _ = ber_read(data, pos)
+
+        fields = []
+        for _ in range(3):
+            _, s, pos = ber_read(data, pos)
+            fields.append(int.from_bytes(data[s:pos], "big", signed=True))
+
+        _, pos, vb_end = ber_read(data, pos)
+        oids = []
+        while pos < vb_end:
+            _, vb_pos, pos = ber_read(data, pos)
+            _, s, e = ber_read(data, vb_pos)
+            oids.append(decode_oid(data[s:e]))
+
+        return version, community, pdu, fields[0], fields[1], fields[2], oids
+    except (IndexError, ValueError):
+        return None
+
+
+def build_message(version, community, pdu, request_id, varbinds, error_status=0, error_index=0):
+    """varbinds : [(oid tuple, 인코딩된 값)]"""
+    body = b"".join(ber(TAG_SEQ, ber_oid(oid) + value) for oid, value in varbinds)
+    pdu_body = ber_int(request_id) + ber_int(error_status) + ber_int(error_index) + ber(TAG_SEQ, body)
+    return ber(TAG_SEQ, ber_int(version) + ber(TAG_OCTET, community.encode()) + ber(pdu, pdu_body))
+
+# =======================================================================================================================
+# MIB 값
+# =======================================================================================================================
+class MibView:
+    """한 시점의 MIB {oid tuple: (kind, value)} (tick 마다 새로 만들어 교체 → 응답 중 값이 섞이지 않음)"""
+
+    def __init__(self, values, uptime):
+        self.values = values
+        self.oids = sorted(values)
+        self.uptime = uptime            # () → TimeTicks
+
+    def _encode(self, oid):
+        kind, value = self.values[oid]
+        if kind == "uptime":
+            return ber_int(self.uptime(), TAG_TIMETICKS)
+        return encode_value(kind, value)
+
+    def get(self, oid):
+        if oid in self.values:
+            return self._encode(oid)
+        return NO_SUCH_INSTANCE
+
+    def next(self, oid):
+        """→ (다음 oid, 값) / 끝이면 (oid, endOfMibView)"""
+        i = bisect.bisect_right(self.oids, oid)
+        if i >= len(self.oids):
+            return oid, END_OF_MIB_VIEW
+        nxt = self.oids[i]
+        return nxt, self._encode(nxt)
+
+
+class RackSource:
+    """시뮬레이터 값 공급원 공통 부분
+
+    modules : {module_no: {equip_id, swver, model, barcode, volt, status, soh, soc, cells, temps}}
+    summary : {rack_voltage, rack_current, soc, cycles}
+    alarms  : {index: {text, time, equip, level}}
+    advance(dt) 는 agent tick 마다, table() 은 요청이 올 때 호출된다.
+    알람 발생/해제는 events 에 ("alarm" | "resume", alarm) 로 쌓는다.
+    """
+
+    def __init__(self):
+        self.modules = {}
+        self.summary = {"rack_voltage": None, "rack_current": None, "soc": None, "cycles": None}
+        self.alarms = {}
+        self.events = deque()
+        self._next_alarm_index = 1
+        self._lock = threading.Lock()
+
+    def step(self, dt):
+        raise NotImplementedError
+
+    def advance(self, dt):
+        self.step(dt)
+
+    # ---------- 알람 ----------
+    def raise_alarm(self, text, module_no=None, level="Major"):
+        """알람 발생 (이미 있는 같은 알람이면 무시) → index"""
+        equip = self.modules[module_no]["equip_id"] if module_no in self.modules else 0
+        with self._lock:
+            for index, alarm in self.alarms.items():
+                if alarm["text"] == text and alarm["equip"] == equip:
+                    return index
+            index = self._next_alarm_index
+            self._next_alarm_index += 1
+            alarm = {"text": text, "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                     "equip": equip, "level": level, "index": index}
+            self.alarms[index] = alarm
+            self.events.append(("alarm", alarm))
+        return index
+
+    def find_alarm(self, text, module_no=None):
+        equip = self.modules[module_no]["equip_id"] if module_no in self.modules else 0
+        with self._lock:
+            for index, alarm in self.alarms.items():
+                if alarm["text"] == text and str(alarm["equip"]) == str(equip):
+                    return index
+        return None
+
+    def clear_alarm(self, index):
+        with self._lock:
+            alarm = self.alarms.pop(index, None)
+            if alarm:
+                self.events.append(("resume", alarm))
+        return alarm is not None
+
+    def clear_all(self):
+        for index in list(self.alarms):
+            self.clear_alarm(index)
+
+    def drain_events(self):
+        with self._lock:
+            events = list(self.events)
+            self.events.clear()
+        return events
+
+    # ---------- MIB ----------
+    def table(self):
+        """현재 값 → {oid tuple: (kind, value)}"""
+        values = {}
+
+        def put(prefix, suffix, kind, value):
+            if value is not None:
+                values[oid_tuple(f"{prefix}{suffix}")] = (kind, value)
+
+        samp = oid_tuple(OID_SAMP_ENTRY)
+
+        for module_no, m in self.modules.items():
+            equip = int(m["equip_id"])
+            put(OID_BASE_ENTRY, f"2.{equip}", "int", equip)
+            put(OID_BASE_ENTRY, f"3.{equip}", "str", f"Lithium Battery {module_no}")
+            put(OID_BASE_ENTRY, f"4.{equip}", "int", module_no)
+            put(OID_BASE_ENTRY, f"5.{equip}", "str", m.get("swver"))
+            put(OID_BASE_ENTRY, f"12.{equip}", "str", m.get("model"))
+            put(OID_BASE_ENTRY, f"13.{equip}", "str", m.get("barcode"))
+
+            if m.get("volt") is not None:
+                values[samp + (1, equip)] = ("int", round(m["volt"] * 10))
+            for column, key in ((3, "status"), (4, "soh"), (52, "soc")):
+                if m.get(key) is not None:
+                    values[samp + (column, equip)] = ("int", int(m[key]))
+            for i, v in enumerate(m.get("cells") or []):
+                if v is not None:
+                    values[samp + (6 + i, equip)] = ("int", round(v * 100))
+            for i, t in enumerate(m.get("temps") or []):
+                if t is not None:
+                    values[samp + (22 + i, equip)] = ("int", round(t * 10))
+
+        s = self.summary
+        if s.get("rack_voltage") is not None:
+            put(OID_GROUP_ENTRY, f"5.{GROUP_INDEX}", "int", round(s["rack_voltage"] * 10))
+        if s.get("rack_current") is not None:
+            put(OID_GROUP_ENTRY, f"6.{GROUP_INDEX}", "int", round(s["rack_current"] * 10))
+        put(OID_GROUP_ENTRY, f"8.{GROUP_INDEX}", "int", _int_or_none(s.get("soc")))
+        put(OID_GROUP_ENTRY, f"23.{GROUP_INDEX}", "int", _int_or_none(s.get("cycles")))
+
+        with self._lock:
+            alarms = list(self.alarms.items())
+        for index, alarm in alarms:
+            put(OID_ALARM_ENTRY, f"2.{index}", "str", alarm["text"])
+            put(OID_ALARM_ENTRY, f"5.{index}", "str", alarm["time"])
+            put(OID_ALARM_ENTRY, f"10.{index}", "int", int(alarm["equip"]))
+
+        return values
+
+
+def _int_or_none(value):
+    try:
+        return int(float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class BatteryModel(RackSource):
+    """모듈 N 개짜리 가상 랙 (충전/방전 전환 + 셀 전압/온도 랜덤 워크)
+
+    alarm_rate : 초당 평균 알람 발생 수 (발생한 알람은 alarm_hold 평균 시간 뒤 해제)
+
+    값(셀 전압/온도)은 tick 마다 계산하지 않고 밀린 시간만큼 table() 때 한번에 진행한다.
+    fleet 시뮬레이터에서 agent 수백 개가 poll 되지 않는 동안 CPU 를 쓰지 않도록.
+    """
+
+    def __init__(self, modules=16, alarm_rate=0.0, alarm_hold=30.0, seed=None):
+        super().__init__()
+        self.rng = random.Random(seed)
+        self.alarm_rate = alarm_rate
+        self.alarm_hold = alarm_hold
+        self._clear_at = {}
+        self.current = 12.5             # [A] + 충전 / - 방전
+        self.soc = 80.0
+        self.cycles = 120
+        self.forced_status = {}         # {module_no: status} 시나리오로 고정한 상태 (Offline 등)
+        self._pending = 0.0
+
+        for module_no in range(1, modules + 1):
+            self.modules[module_no] = {
+                "equip_id": str(EQUIP_BASE + module_no),
+                "swver": "V100R001C10",
+                "model": "ESM-48100B1",
+                "barcode": f"2102312SIM{module_no:06d}",
+                "status": 4,
+                "soh": self.rng.randint(95, 100),
+                "soc": 80,
+                "cells": [round(3.45 + self.rng.uniform(-0.02, 0.02), 3) for _ in range(15)],
+                "temps": [round(25 + self.rng.uniform(-1, 1), 1) for _ in range(15)],
+                "volt": None,
+            }
+        self._update_totals()
+
+    def advance(self, dt):
+        self._pending += dt
+        self._step_alarms(dt)
+
+    def table(self):
+        if self._pending:
+            self.step(self._pending)
+        return super().table()
+
+    def set_module_status(self, module_no, status=None):
+        """모듈 상태 고정 (None 이면 해제 → 충전/방전 상태로 복귀)"""
+        if status is None:
+            self.forced_status.pop(module_no, None)
+        else:
+            self.forced_status[module_no] = status
+
+    def step(self, dt):
+        rng = self.rng
+        self._pending = 0.0
+
+        # 충전 ↔ 방전 (SOC 끝에서 전환)
+        if self.soc >= 99 and self.current > 0:
+            self.current = -rng.uniform(5, 30)
+            self.cycles += 1
+        elif self.soc <= 20 and self.current < 0:
+            self.current = rng.uniform(5, 30)
+        self.soc = min(100.0, max(0.0, self.soc + self.current * dt / 360))
+        drift = 0.0004 * dt * (1 if self.current > 0 else -1)
+        # 랜덤 워크 : dt 초 동안의 표준편차 = 1초 값 x sqrt(dt)
+        volt_sigma = 0.002 * math.sqrt(dt)
+        temp_sigma = 0.05 * math.sqrt(dt)
+
+        for module_no, m in self.modules.items():
+            m["cells"] = [round(min(3.65, max(2.8, v + drift + rng.gauss(0, volt_sigma))), 3) for v in m["cells"]]
+            m["temps"] = [round(min(60, max(-10, t + rng.gauss(0, temp_sigma))), 1) for t in m["temps"]]
+            m["status"] = self.forced_status.get(module_no, 4 if self.current > 0 else 5)
+            m["soc"] = round(self.soc)
+
+        self._update_totals()
+
+    def _update_totals(self):
+        for m in self.modules.values():
+            m["volt"] = round(sum(m["cells"]), 1)
+        volts = [m["volt"] for m in self.modules.values()]
+        self.summary = {
+            "rack_voltage": round(sum(volts) / len(volts), 1) if volts else None,
+            "rack_current": round(self.current, 1),
+            "soc": round(self.soc),
+            "cycles": self.cycles,
+        }
+
+    def _step_alarms(self, dt):
+        now = time.monotonic()
+        for index, clear_at in list(self._clear_at.items()):
+            if now >= clear_at:
+                del self._clear_at[index]
+                self.clear_alarm(index)
+
+        if self.alarm_rate <= 0:
+            return
+        # dt 동안 발생 수 (Poisson : 지수분포 간격을 dt 안에 몇 개 넣을 수 있는지)
+        count = 0
+        elapsed = self.rng.expovariate(self.alarm_rate)
+        while elapsed < dt:
+            count += 1
+            elapsed += self.rng.expovariate(self.alarm_rate)
+
+        for _ in range(count):
+            text, per_module, level = self.rng.choice(ALARM_CATALOG)
+            module_no = self.rng.choice(list(self.modules)) if per_module and self.modules else None
+            index = self.raise_alarm(text, module_no, level)
+            self._clear_at[index] = now + self.rng.expovariate(1 / self.alarm_hold)
+
+
+class HistoryReplay(RackSource):
+    """HistoryWriter 의 history_*.jsonl 을 기록 시각 간격대로 (speed 배속) 재생
+
+    기록에 없는 SW 버전 / 모델 / 바코드는 임의 값으로 채운다.
+    기록 사이 알람 목록 차이를 발생/해제 trap 으로 보낸다.
+    """
+
+    def __init__(self, path, speed=1.0, loop=True):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.records = self._load(path)
+        if not self.records:
+            raise ValueError(f"재생할 기록 없음: {path}")
+        self.position = 0
+        self.elapsed = 0.0
+        self.finished = False
+        self._apply(self.records[0])
+
+    @staticmethod
+    def _load(path):
+        records = []
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    record["_t"] = datetime.strptime(record["time"], "%Y-%m-%d %H:%M:%S").timestamp()
+                except (ValueError, KeyError, TypeError):
+                    continue
+                records.append(record)
+        if records:
+            t0 = records[0]["_t"]
+            for record in records:
+                record["_t"] -= t0
+        return records
+
+    def step(self, dt):
+        if self.finished:
+            return
+        self.elapsed += dt * self.speed
+
+        while self.position + 1 < len(self.records) and self.records[self.position + 1]["_t"] <= self.elapsed:
+            self.position += 1
+            self._apply(self.records[self.position])
+
+        if self.position + 1 >= len(self.records):
+            if self.loop:
+                self.position = 0
+                self.elapsed = 0.0
+                self._apply(self.records[0])
+            else:
+                self.finished = True
+
+    def _apply(self, record):
+        modules = {}
+        for module_no, data in record.get("modules", {}).items():
+            module_no = int(module_no)
+            prev = self.modules.get(module_no, {})
+            modules[module_no] = {
+                "swver": prev.get("swver", "V100R001C10"),
+                "model": prev.get("model", "ESM-48100B1"),
+                "barcode": prev.get("barcode", f"2102312REP{module_no:06d}"),
+                **data,
+            }
+        self.modules = modules
+        self.summary = dict(record.get("summary") or {})
+
+        # 알람 목록 차이 → 발생 / 해제
+        current = {(a.get("text"), int(a.get("equip") or 0)): a for a in record.get("alarms", [])}
+        with self._lock:
+            active = {(a["text"], a["equip"]): index for index, a in self.alarms.items()}
+        for key, index in active.items():
+            if key not in current:
+                self.clear_alarm(index)
+        for (text, equip), a in current.items():
+            if (text, equip) in active:
+                continue
+            with self._lock:
+                index = self._next_alarm_index
+                self._next_alarm_index += 1
+                alarm = {"text": text, "time": a.get("time") or record["time"],
+                         "equip": equip, "level": "Major", "index": index}
+                self.alarms[index] = alarm
+                self.events.append(("alarm", alarm))
+
+# =======================================================================================================================
+# 시나리오
+# =======================================================================================================================
+class ScenarioError(ValueError):
+    pass
+
+
+class AlarmScenario:
+    """시간표대로 알람 / 장애를 재현하는 스크립트 (agent 마다 인스턴스 하나)
+
+        # 시간[s]  동작      인자
+        5          raise     "Cell 3 Fault"  module=2  level=Major
+        20         clear     "Cell 3 Fault"  module=2
+        30         raise     "Overcharge Protection"
+        40         down      15                  # 15초 동안 무응답
+        60         loss      0.3                 # 요청 30% 무시 (0 이면 해제)
+        70         latency   0.5                 # 응답 지연 [s]
+        80         status    3  1                # 모듈 3 상태 고정 (1 = Offline), 값 없으면 해제
+        90         clear_all
+        120        repeat                        # 처음부터 반복 (주기 120초)
+    """
+
+    ACTIONS = ("raise", "clear", "clear_all", "down", "loss", "latency", "status", "repeat")
+
+    def __init__(self, steps, period=None):
+        self.steps = steps              # [(t, action, args, options)] 시간 순
+        self.period = period
+        self._cycle = 0
+        self._pos = 0
+
+    @classmethod
+    def parse(cls, text, source="<scenario>"):
+        steps = []
+        period = None
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            try:
+                words = shlex.split(line, comments=True)
+            except ValueError as e:
+                raise ScenarioError(f"{source}:{line_no}: {e}")
+            if not words:
+                continue
+            try:
+                t = float(words[0])
+                action = words[1]
+            except (ValueError, IndexError):
+                raise ScenarioError(f"{source}:{line_no}: '시간 동작 ...' 형식 아님")
+            if action not in cls.ACTIONS:
+                raise ScenarioError(f"{source}:{line_no}: 알 수 없는 동작 {action}")
+
+            args = [w for w in words[2:] if "=" not in w]
+            options = dict(w.split("=", 1) for w in words[2:] if "=" in w)
+            if action == "repeat":
+                period = t
+                continue
+            steps.append((t, action, args, options))
+
+        steps.sort(key=lambda step: step[0])
+        return cls(steps, period)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.parse(f.read(), path)
+
+    def copy(self):
+        return AlarmScenario(self.steps, self.period)
+
+    def run_until(self, agent, elapsed):
+        if self.period:
+            cycle = int(elapsed // self.period)
+            if cycle != self._cycle:
+                self._cycle = cycle
+                self._pos = 0
+            elapsed -= cycle * self.period
+
+        while self._pos < len(self.steps) and self.steps[self._pos][0] <= elapsed:
+            _, action, args, options = self.steps[self._pos]
+            self._pos += 1
+            try:
+                self._apply(agent, action, args, options)
+            except (ValueError, IndexError, KeyError) as e:
+                logger.warning("scenario step error (%s %s): %s", action, args, e)
+
+    @staticmethod
+    def _apply(agent, action, args, options):
+        source = agent.source
+        module_no = int(options["module"]) if "module" in options else None
+
+        if action == "raise":
+            source.raise_alarm(args[0], module_no, options.get("level", "Major"))
+        elif action == "clear":
+            index = source.find_alarm(args[0], module_no)
+            if index is not None:
+                source.clear_alarm(index)
+        elif action == "clear_all":
+            source.clear_all()
+        elif action == "down":
+            agent.down_until = time.monotonic() + float(args[0])
+        elif action == "loss":
+            agent.loss = float(args[0])
+        elif action == "latency":
+            agent.latency = float(args[0])
+        elif action == "status" and hasattr(source, "set_module_status"):
+            source.set_module_status(int(args[0]), int(args[1]) if len(args) > 1 else None)
+
+# =======================================================================================================================
+# Agent
+# =======================================================================================================================
+class _AgentProtocol(asyncio.DatagramProtocol):
+
+    def __init__(self, agent):
+        self.agent = agent
+        self.transport = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.agent.received(self.transport, data, addr)
+
+
+class SimAgent:
+    """가상 agent 하나 (socket + MIB + trap). event loop 는 SimulatorThread 가 소유
+
+    latency : 응답 지연 [s] (± jitter), loss : 요청 무시 확률 (0~1)
+    down_until : 이 시각(time.monotonic)까지 무응답 (시나리오의 장애 구간)
+    """
+
+    def __init__(self, source, host=SIM_HOST, port=SIM_PORT, communities=SIM_COMMUNITIES,
+                 trap_targets=(), trap_community="skt_public", name="agent",
+                 latency=0.0, jitter=0.0, loss=0.0, scenario=None, seed=None):
+        self.source = source
+        self.host = host
+        self.port = port
+        self.communities = set(communities)
+        self.trap_targets = list(trap_targets)
+        self.trap_community = trap_community
+        self.name = name
+        self.latency = latency
+        self.jitter = jitter
+        self.loss = loss
+        self.scenario = scenario
+        self.down_until = 0.0
+        self.rng = random.Random(seed)
+
+        self.started = time.monotonic()
+        self.view = None
+        self.dirty = True
+        self.address = None
+        self.loop = None
+        self._transport = None
+        self._trap_transport = None
+        self._trap_ordinal = 0
+        self._trap_request_id = 0
+
+        self.stats = {
+            "rx_packets": 0, "rx_bytes": 0, "tx_packets": 0, "tx_bytes": 0,
+            "get": 0, "getnext": 0, "getbulk": 0, "bad_community": 0, "malformed": 0,
+            "dropped": 0, "traps": 0,
+        }
+
+    def uptime(self):
+        return int((time.monotonic() - self.started) * 100)
+
+    def current_view(self):
+        # 값이 바뀐 뒤 첫 요청에서만 MIB 재구성
+        if self.dirty or self.view is None:
+            values = self.source.table()
+            values[oid_tuple(OID_SYS_DESCR)] = ("str", f"TBC1000B simulator ({len(self.source.modules)} modules)")
+            values[oid_tuple(OID_SYS_UPTIME)] = ("uptime", None)
+            values[oid_tuple(OID_SYS_NAME)] = ("str", self.name)
+            self.view = MibView(values, self.uptime)
+            self.dirty = False
+        return self.view
+
+    # ---------- socket ----------
+    async def open(self, loop):
+        self.loop = loop
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _AgentProtocol(self), local_addr=(self.host, self.port))
+        # trap 은 agent 와 같은 IP 에서 보냄 (수신 측은 송신 IP 로 사이트를 구분)
+        self._trap_transport, _ = await loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, local_addr=(self.host, 0))
+        self.address = self._transport.get_extra_info("sockname")[:2]
+
+    def close(self):
+        for transport in (self._transport, self._trap_transport):
+            if transport is not None:
+                transport.close()
+
+    def received(self, transport, data, addr):
+        self.stats["rx_packets"] += 1
+        self.stats["rx_bytes"] += len(data)
+
+        if time.monotonic() < self.down_until or (self.loss and self.rng.random() < self.loss):
+            self.stats["dropped"] += 1
+            return
+
+        reply = self.handle(data)
+        if reply is None:
+            return
+
+        delay = self.latency + (self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            self.loop.call_later(delay, self.send, transport, reply, addr)
+        else:
+            self.send(transport, reply, addr)
+
+    def send(self, transport, data, addr):
+        if transport.is_closing():
+            return
+        transport.sendto(data, addr)
+        self.stats["tx_packets"] += 1
+        self.stats["tx_bytes"] += len(data)
+
+    # ---------- 요청 처리 ----------
+    def handle(self, data):
+        """요청 datagram → 응답 bytes (응답 안 할 요청은 None)"""
+        request = parse_request(data)
+        if request is None:
+            self.stats["malformed"] += 1
+            return None
+        version, community, pdu, request_id, a, b, oids = request
+
+        if community not in self.communities:
+            # 실제 agent 처럼 community 가 틀리면 응답 없음
+            self.stats["bad_community"] += 1
+            return None
+
+        view = self.current_view()
+        if pdu == PDU_GET:
+            self.stats["get"] += 1
+            varbinds = [(oid, view.get(oid)) for oid in oids]
+        elif pdu == PDU_GETNEXT:
+            self.stats["getnext"] += 1
+            varbinds = [view.next(oid) for oid in oids]
+        elif pdu == PDU_GETBULK and version == 1:
+            self.stats["getbulk"] += 1
+            varbinds = self._bulk(view, oids, max(0, a), max(0, b))
+        else:
+            return None
+
+        return build_message(version, community, PDU_RESPONSE, request_id, varbinds)
+
+    @staticmethod
+    def _bulk(view, oids, non_repeaters, max_repetitions):
+        varbinds = [view.next(oid) for oid in oids[:non_repeaters]]
+        cursors = list(oids[non_repeaters:])
+        size = sum(len(v) + len(o) + 4 for o, v in varbinds)
+
+        for _ in range(max_repetitions):
+            if not cursors:
+                break
+            row = [view.next(oid) for oid in cursors]
+            row_size = sum(len(v) + len(o) + 4 for o, v in row)
+            if varbinds and size + row_size > MAX_RESPONSE:
+                break
+            varbinds.extend(row)
+            size += row_size
+            cursors = [oid for oid, _ in row]
+            if all(value == END_OF_MIB_VIEW for _, value in row):
+                break
+        return varbinds
+
+    # ---------- tick ----------
+    def tick(self, dt, elapsed):
+        """값 진행 + 시나리오 + 알람 trap (SimulatorThread 가 tick 마다 호출)"""
+        if self.scenario is not None:
+            self.scenario.run_until(self, elapsed)
+        self.source.advance(dt)
+        self.dirty = True
+        self.emit_traps()
+
+    # ---------- Trap ----------
+    def build_trap(self, kind, alarm):
+        self._trap_ordinal += 1
+        self._trap_request_id = (self._trap_request_id + 1) & 0x7FFFFFFF
+        index = alarm["index"]
+        equip = int(alarm["equip"] or 0)
+        module_no = next((no for no, m in self.source.modules.items() if int(m["equip_id"]) == equip), None)
+
+        varbinds = [
+            (oid_tuple(OID_SYS_UPTIME), ber_int(self.uptime(), TAG_TIMETICKS)),
+            (oid_tuple(OID_SNMP_TRAP), encode_value("oid", TRAP_ALARM if kind == "alarm" else TRAP_RESUME)),
+            (oid_tuple(PREFIX_ORDINAL), encode_value("str", self._trap_ordinal)),
+            (oid_tuple(f"{PREFIX_ALARM}{index}"), encode_value("str", alarm["text"])),
+            (oid_tuple(f"{PREFIX_LEVEL}{index}"), encode_value("str", alarm["level"])),
+        ]
+        if equip:
+            name = f"Lithium Battery {module_no}" if module_no is not None else f"Equip {equip}"
+            varbinds += [
+                (oid_tuple(f"{PREFIX_TRAP_EQUIP}{equip}"), encode_value("int", equip)),
+                (oid_tuple(f"{PREFIX_EQUIP_NAME}{equip}"), encode_value("str", name)),
+                (oid_tuple(f"{PREFIX_EQUIP_ID}{index}"), encode_value("str", equip)),
+                (oid_tuple(f"{PREFIX_FATHER_NAME}{index}"), encode_value("str", "Battery Group 1")),
+            ]
+        return build_message(1, self.trap_community, PDU_TRAP, self._trap_request_id, varbinds)
+
+    def emit_traps(self):
+        events = self.source.drain_events()
+        if not events or not self.trap_targets or self._trap_transport is None:
+            return
+        for kind, alarm in events:
+            data = self.build_trap(kind, alarm)
+            for target in self.trap_targets:
+                self.send(self._trap_transport, data, target)
+                self.stats["traps"] += 1
+
+
+class SimulatorThread(threading.Thread):
+    """agent 여러 개를 event loop 하나 (자체 thread) 에서 구동
+
+    start() 후 ready.wait() → 각 agent.address 로 실제 port 확인 (port=0 이면 임의 port).
+    """
+
+    def __init__(self, agents, tick=SIM_TICK, name="snmp-sim"):
+        super().__init__(name=name, daemon=True)
+        self.agents = list(agents)
+        self.tick = tick
+        self.ready = threading.Event()
+        self.error = None
+        self.loop = None
+        self._stopped = None
+
+    def run(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._serve())
+        except Exception as e:
+            self.error = e
+            logger.error("simulator error: %s", e)
+            self.ready.set()
+        finally:
+            self.loop.close()
+
+    async def _serve(self):
+        loop = asyncio.get_running_loop()
+        self._stopped = loop.create_future()
+        try:
+            for agent in self.agents:
+                await agent.open(loop)
+            self.ready.set()
+            logger.info("simulator listening", extra={"fields": {
+                "agents": len(self.agents),
+                "first": "%s:%s" % self.agents[0].address if self.agents else None,
+                "tick": self.tick}})
+
+            start = last = time.monotonic()
+            while not self._stopped.done():
+                await asyncio.wait([self._stopped], timeout=self.tick)
+                now = time.monotonic()
+                for agent in self.agents:
+                    agent.tick(now - last, now - start)
+                last = now
+        finally:
+            for agent in self.agents:
+                agent.close()
+
+    def stop(self):
+        if self.loop is None or not self.ready.is_set() or self.error:
+            return
+
+        def _stop():
+            if not self._stopped.done():
+                self._stopped.set_result(None)
+        try:
+            self.loop.call_soon_threadsafe(_stop)
+        except RuntimeError:
+            pass
+
+    def stats(self):
+        total = {}
+        for agent in self.agents:
+            for key, value in agent.stats.items():
+                total[key] = total.get(key, 0) + value
+        return total
+
+
+class SnmpAgentSimulator(SimulatorThread):
+    """agent 하나짜리 시뮬레이터 (시험 코드 / CLI 용)"""
+
+    def __init__(self, source, host=SIM_HOST, port=SIM_PORT, communities=SIM_COMMUNITIES,
+                 trap_targets=(), trap_community="skt_public", tick=SIM_TICK, name="agent", **options):
+        self.agent = SimAgent(source, host, port, communities, trap_targets, trap_community, name, **options)
+        super().__init__([self.agent], tick, name=f"snmp-sim-{name}")
+
+    @property
+    def source(self):
+        return self.agent.source
+
+    @property
+    def address(self):
+        return self.agent.address
+
+# ======================
+# CLI
+# ======================
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="TBC1000B EMAP MIB SNMP agent 시뮬레이터")
+    parser.add_argument("--host", default=SIM_HOST, help="listen 주소")
+    parser.add_argument("--port", type=int, default=SIM_PORT, help="SNMP port")
+    parser.add_argument("--community", action="append", help="허용 community (여러 번 지정 가능)")
+    parser.add_argument("--modules", type=int, default=16, help="모듈 수")
+    parser.add_argument("--tick", type=float, default=SIM_TICK, help="값 갱신 주기 [s]")
+    parser.add_argument("--alarm-rate", type=float, default=0.0, help="초당 평균 알람 발생 수")
+    parser.add_argument("--alarm-hold", type=float, default=30.0, help="알람 평균 유지 시간 [s]")
+    parser.add_argument("--seed", type=int, help="난수 seed (재현용)")
+    parser.add_argument("--scenario", help="알람 / 장애 시나리오 파일 (AlarmScenario 형식)")
+    parser.add_argument("--latency", type=float, default=0.0, help="응답 지연 [s]")
+    parser.add_argument("--loss", type=float, default=0.0, help="요청 무시 확률 (0~1)")
+    parser.add_argument("--replay", help="poll 이력 (logs/history_*.jsonl) 재생")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속")
+    parser.add_argument("--trap-host", default="127.0.0.1", help="Trap 보낼 주소")
+    parser.add_argument("--trap-port", type=int, default=1162, help="Trap 보낼 port (0 = 보내지 않음)")
+    parser.add_argument("--trap-community", default="skt_public", help="Trap community")
+    parser.add_argument("--log-format", choices=["text", "json"], default="text")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    setup_logging(args.log_format)
+
+    if args.replay:
+        source = HistoryReplay(args.replay, speed=args.speed)
+    else:
+        source = BatteryModel(args.modules, alarm_rate=args.alarm_rate,
+                              alarm_hold=args.alarm_hold, seed=args.seed)
+
+    trap_targets = [(args.trap_host, args.trap_port)] if args.trap_port else []
+    agent = SnmpAgentSimulator(source, args.host, args.port, args.community or SIM_COMMUNITIES,
+                               trap_targets, args.trap_community, args.tick,
+                               latency=args.latency, loss=args.loss,
+                               scenario=AlarmScenario.load(args.scenario) if args.scenario else None)
+    agent.start()
+    agent.ready.wait()
+    if agent.error:
+        return 1
+
+    try:
+        while agent.is_alive():
+            agent.join(10)
+            logger.info("simulator stats", extra={"fields": agent.stats()})
+    except KeyboardInterrupt:
+        agent.stop()
+        agent.join(2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())